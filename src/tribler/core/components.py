@@ -137,6 +137,9 @@ class DatabaseComponent(ComponentLauncher):
         """
         Create the database instances we need for Tribler.
         """
+        from tribler.core.database.async_database import AsyncDatabase
+        from tribler.core.database.maintenance import DatabaseMaintenance, MaintenanceScheduler
+        from tribler.core.database.profiler import QueryProfiler
         from tribler.core.database.store import MetadataStore
         from tribler.core.database.tribler_database import TriblerDatabase
         from tribler.core.notifier import Notification
@@ -147,26 +150,73 @@ class DatabaseComponent(ComponentLauncher):
             db_path = ":memory:"
             mds_path = ":memory:"
 
-        session.db = TriblerDatabase(db_path)
+        if session.config.get("database/slow_query_threshold") > 0:
+            session.query_profiler = QueryProfiler(session.config.get("database/slow_query_threshold"))
+        session.db = TriblerDatabase(db_path,
+                                     write_max_latency=session.config.get("database/write_max_latency"),
+                                     write_batch_size=session.config.get("database/write_batch_size"),
+                                     query_profiler=session.query_profiler)
         session.mds = MetadataStore(
             mds_path,
             session.ipv8.keys["anonymous id"].key,
             notifier=session.notifier,
-            disable_sync=False
+            disable_sync=False,
+            wal_mode=session.config.get("database/wal_mode"),
+            read_pool_size=session.config.get("database/read_pool_size"),
+            mmap_size=session.config.get("database/mmap_size"),
+            cache_size=session.config.get("database/cache_size"),
+            bulk_ingest=session.config.get("database/bulk_ingest"),
+            write_max_latency=session.config.get("database/write_max_latency"),
+            write_batch_size=session.config.get("database/write_batch_size"),
+            write_batch_weight=session.config.get("database/write_batch_weight"),
+            buffer_health=session.config.get("database/health_flush_interval") > 0,
+            fts_contentless=session.config.get("database/fts_contentless"),
+            fts_tokenizer=session.config.get("database/fts_tokenizer"),
+            fts_prefix=session.config.get("database/fts_prefix"),
+            defer_fts_rebuild=True,
+            executors=session.executors,
+            query_profiler=session.query_profiler
         )
-        session.notifier.add(Notification.torrent_metadata_added, session.mds.TorrentMetadata.add_ffa_from_dict)
+        session.async_db = AsyncDatabase(session.mds, session.db,
+                                         debug=session.config.get("database/debug_event_loop"),
+                                         executor=session.executors.get("db_read"))
+        session.db_maintenance = MaintenanceScheduler(session.config.get("database/maintenance_interval"))
+        session.db_maintenance.add(DatabaseMaintenance("metadata", session.mds.db, session.mds.write_queue,
+                                                       fts_table="FtsIndex"))
+        session.db_maintenance.add(DatabaseMaintenance("tribler", session.db.instance, session.db.write_queue))
+        session.notifier.add(Notification.torrent_metadata_added, session.mds.add_ffa_from_dict)
 
     def finalize(self, ipv8: IPv8, session: Session, community: Community) -> None:
         """
-        When we are done launching, register our REST API.
-        """
+        When we are done launching, start flushing the buffered torrent health and maintaining the databases, rebuild
+        the FTS index and the auto-completion index if needed, import the configured snapshot into an empty metadata
+        store, and register our REST API.
+        """
+        from tribler.core.database.maintenance import MAINTENANCE_TICK_INTERVAL
+
+        if session.mds.health_buffer is not None:
+            community.register_task("Flush torrent health", session.mds.health_buffer.flush,
+                                    interval=session.config.get("database/health_flush_interval"))
+        community.register_task("Maintain databases", session.db_maintenance.tick, interval=MAINTENANCE_TICK_INTERVAL)
+        if session.mds.fts_rebuild_pending:
+            community.register_task("Rebuild FTS index", session.mds.rebuild_fts_index_threaded)
+        if session.mds.autocomplete_build_pending:
+            community.register_task("Build auto-completion index", session.mds.build_autocomplete_index_threaded)
+        snapshot_path = session.config.get("database/snapshot_path")
+        if snapshot_path and not session.config.get("memory_db"):
+            community.register_task("Import metadata snapshot", session.mds.import_snapshot_if_empty_threaded,
+                                    snapshot_path)
+
         session.rest_manager.get_endpoint("/api/downloads").mds = session.mds
         session.rest_manager.get_endpoint("/api/statistics").mds = session.mds
+        session.rest_manager.get_endpoint("/api/statistics").async_db = session.async_db
+        session.rest_manager.get_endpoint("/api/statistics").query_profiler = session.query_profiler
 
         db_endpoint = session.rest_manager.get_endpoint("/api/metadata")
         db_endpoint.download_manager = session.download_manager
         db_endpoint.mds = session.mds
-        db_endpoint.tribler_db = session.db
+        db_endpoint.async_db = session.async_db
+        db_endpoint.maintenance = session.db_maintenance
 
     def get_endpoints(self) -> list[RESTEndpoint]:
         """
@@ -227,14 +277,19 @@ class RendezvousComponent(BaseLauncher):
 
     def finalize(self, ipv8: IPv8, session: Session, community: Community) -> None:
         """
-        Start listening to peer connections after starting.
+        Start listening to peer connections after starting and maintain the rendezvous database.
         """
+        from tribler.core.database.maintenance import DatabaseMaintenance
         from tribler.core.rendezvous.community import RendezvousCommunity
         from tribler.core.rendezvous.rendezvous_hook import RendezvousHook
 
-        rendezvous_hook = RendezvousHook(cast(RendezvousCommunity, community).composition.database)
+        database = cast(RendezvousCommunity, community).composition.database
+        rendezvous_hook = RendezvousHook(database)
         ipv8.network.add_peer_observer(rendezvous_hook)
 
+        if session.db_maintenance is not None:
+            session.db_maintenance.add(DatabaseMaintenance("rendezvous", database.database, database.write_queue))
+
 
 @precondition('session.config.get("torrent_checker/enabled")')
 class TorrentCheckerComponent(ComponentLauncher):
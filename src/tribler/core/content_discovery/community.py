@@ -26,6 +26,7 @@ from tribler.core.content_discovery.payload import (
 from tribler.core.database.layers.knowledge import ResourceType
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE, entries_to_chunk
 from tribler.core.database.store import MetadataStore, ObjState, ProcessingResult
+from tribler.core.executors import Priority
 from tribler.core.knowledge.community import is_valid_resource
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.dataclasses import HealthInfo
@@ -33,7 +34,7 @@ from tribler.core.torrent_checker.dataclasses import HealthInfo
 if TYPE_CHECKING:
     from ipv8.types import Peer
 
-    from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata, TorrentRecord
     from tribler.core.database.tribler_database import TriblerDatabase
     from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 
@@ -148,9 +149,7 @@ class ContentDiscoveryCommunity(Community):
         if not self.composition.torrent_checker:
             return []
 
-        # Filter torrents that have seeders
-        return [health for health in self.composition.torrent_checker.torrents_checked.values() if
-                health.seeders > 0 and health.leechers >= 0]
+        return self.composition.torrent_checker.torrents_checked.alive()
 
     def gossip_random_torrents_health(self) -> None:
         """
@@ -177,10 +176,9 @@ class ContentDiscoveryCommunity(Community):
         health_list = [HealthInfo(infohash, last_check=last_check, seeders=seeders, leechers=leechers)
                        for infohash, seeders, leechers, last_check in health_tuples]
 
+        await self.composition.metadata_store.process_torrent_health_threaded(health_list)
         for health_info in health_list:
             # Get a single result per infohash to avoid duplicates
-            with db_session:
-                self.composition.metadata_store.process_torrent_health(health_info)
             infohash = hexlify(health_info.infohash).decode()
             self.send_remote_select(peer=peer, infohash=infohash, last=1)
 
@@ -209,12 +207,10 @@ class ContentDiscoveryCommunity(Community):
         """
         Get torrent health info for torrents that were alive, last we know of.
         """
-        checked_and_alive = self.get_alive_checked_torrents()
-        if not checked_and_alive:
+        if not self.composition.torrent_checker:
             return []
 
-        num_torrents_to_send = min(self.composition.random_torrent_count, len(checked_and_alive))
-        return random.sample(checked_and_alive, num_torrents_to_send)
+        return self.composition.torrent_checker.torrents_checked.sample_alive(self.composition.random_torrent_count)
 
     def get_random_peers(self, sample_size: int | None = None) -> list[Peer]:
         """
@@ -311,17 +307,19 @@ class ContentDiscoveryCommunity(Community):
         :raises pony.orm.dbapiprovider.OperationalError: if an illegal query was performed.
         """
         if self.composition.tribler_db:
-            # tags should be extracted because `get_entries_threaded` doesn't expect them as a parameter
+            # tags should be extracted because `get_entry_records_threaded` doesn't expect them as a parameter
             tags = sanitized_parameters.pop("tags", None)
 
             infohash_set = self.composition.tribler_db.instance(self.search_for_tags, tags)
             if infohash_set:
                 sanitized_parameters["infohash_set"] = {bytes.fromhex(s) for s in infohash_set}
 
-            # exclude_deleted should be extracted because `get_entries_threaded` doesn't expect it as a parameter
+            # exclude_deleted should be extracted because `get_entry_records_threaded` doesn't expect it as a parameter
             sanitized_parameters.pop("exclude_deleted", None)
 
-        return await self.composition.metadata_store.get_entries_threaded(**sanitized_parameters)
+        # Remote queries should not delay the searches of our own user
+        return await self.composition.metadata_store.get_entry_records_threaded(**sanitized_parameters,
+                                                                                priority=Priority.BACKGROUND)
 
     @db_session
     def search_for_tags(self, tags: list[str] | None) -> set[str] | None:
@@ -338,7 +336,8 @@ class ContentDiscoveryCommunity(Community):
             case_sensitive=False
         )
 
-    def send_db_results(self, peer: Peer, request_payload_id: int, db_results: list[TorrentMetadata]) -> None:
+    def send_db_results(self, peer: Peer, request_payload_id: int,
+                        db_results: list[TorrentMetadata] | list[TorrentRecord]) -> None:
         """
         Send the given results to the given peer.
         """
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import pony
+from pony.orm import db_session
+
+from tribler.core.executors import Priority, run_in_executor
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from pony.orm import Database
+
+    from tribler.core.database.layers.knowledge import ResourceType, SimpleStatement
+    from tribler.core.database.orm_bindings.torrent_metadata import TorrentRecord
+    from tribler.core.database.store import MetadataStore
+    from tribler.core.database.tribler_database import TriblerDatabase
+
+DATABASE_EXECUTOR_SIZE = 4  # The number of threads that execute the database calls of the event loop
+DATABASE_EXECUTOR_NAME = "Database"  # The name prefix of these threads
+
+IGNORED_STACK_PATHS = (str(Path(pony.__file__).parent), __file__, "<")  # Frames that are not reported as call sites
+
+
+class AsyncDatabase:
+    """
+    Awaitable access to the metadata store and the Tribler database, for code that runs on the event loop.
+
+    Every call is executed in its own ``db_session`` on a bounded pool of named database threads. These threads keep
+    their connections open, so the number of connections is bounded too. The calls are made on behalf of the REST API,
+    so they are interactive: if the pool is an ``ExecutorPool``, they are started before queued background calls.
+
+    In debug mode, the SQL statements that are still executed synchronously on the event loop thread are counted and
+    the call site that executes them is logged (once per call site).
+    """
+
+    def __init__(self, metadata_store: MetadataStore, tribler_db: TriblerDatabase | None = None,
+                 max_workers: int = DATABASE_EXECUTOR_SIZE, debug: bool = False,
+                 executor: Executor | None = None) -> None:
+        """
+        Create a new facade.
+
+        :param metadata_store: the metadata store to access.
+        :param tribler_db: the Tribler database to access, if it exists.
+        :param max_workers: the number of database threads, if no executor is given.
+        :param debug: flag SQL statements that are executed on the current (event loop) thread.
+        :param executor: a shared pool of database threads, which is not shut down by this facade.
+        """
+        super().__init__()
+
+        self.metadata_store = metadata_store
+        self.tribler_db = tribler_db
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=DATABASE_EXECUTOR_NAME)
+
+        self.loop_thread_id: int | None = None
+        self.loop_statements = 0  # The number of SQL statements that were executed on the event loop thread
+        self.loop_call_sites: set[tuple[str, int]] = set()  # The call sites of these statements
+        if debug:
+            self.enable_debug()
+
+    def enable_debug(self) -> None:
+        """
+        Start flagging the SQL statements that are executed on the current thread, which should be the event loop.
+        """
+        self.loop_thread_id = threading.get_ident()
+        for database in self._databases():
+            database.on_connect(self._on_connect)
+            with db_session:
+                connection = database.get_connection()
+            self._trace(connection)
+
+    def _databases(self) -> list[Database]:
+        """
+        Get the Pony databases that this facade accesses.
+        """
+        return [self.metadata_store.db] + ([self.tribler_db.instance] if self.tribler_db is not None else [])
+
+    def _on_connect(self, _: Database, connection: Connection) -> None:
+        """
+        Flag the statements of new connections that are opened on the event loop thread.
+        """
+        if threading.get_ident() == self.loop_thread_id:
+            self._trace(connection)
+
+    def _trace(self, connection: Connection) -> None:
+        """
+        Flag all statements that are executed over the given connection.
+        """
+        connection.set_trace_callback(self._on_loop_statement)
+
+    def _on_loop_statement(self, statement: str) -> None:
+        """
+        Count a statement that was executed on the event loop thread and report its call site, if it is new.
+        """
+        if threading.get_ident() != self.loop_thread_id:
+            return  # Connections to in-memory databases are shared between threads
+        self.loop_statements += 1
+        call_site = next((frame for frame in reversed(traceback.extract_stack()[:-1])
+                          if not frame.filename.startswith(IGNORED_STACK_PATHS)), None)
+        if call_site is None or (call_site.filename, call_site.lineno) in self.loop_call_sites:
+            return
+        self.loop_call_sites.add((call_site.filename, call_site.lineno))
+        self._logger.warning("Synchronous database access on the event loop thread at %s:%d (%s): %s",
+                             call_site.filename, call_site.lineno, call_site.name, statement, stack_info=True)
+
+    def shutdown(self) -> None:
+        """
+        Wait for the pending database calls and stop the database threads, unless they are shared.
+        """
+        if self.owns_executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, func: Callable, *args: Any, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Run ``func`` in a ``db_session`` on one of the database threads.
+
+        :param func: the function to be executed
+        :param args: args for the function call
+        :param kwargs: kwargs for the function call
+        :return: a result of the func call.
+        """
+        def in_session() -> Any:  # noqa: ANN401
+            with db_session:
+                return func(*args, **kwargs)
+
+        return await run_in_executor(self.executor, in_session, priority=Priority.INTERACTIVE)
+
+    async def get_entry_records(self, **kwargs) -> list[TorrentRecord]:
+        """
+        Get a page of entry records, see ``MetadataStore.get_entry_records``.
+        """
+        return await self.run(self.metadata_store.get_entry_records, **kwargs)
+
+    async def get_auto_complete_terms(self, text: str, max_terms: int) -> list[str]:
+        """
+        Get the auto-completion terms for a given query, see ``MetadataStore.get_auto_complete_terms``.
+        """
+        return await self.run(self.metadata_store.get_auto_complete_terms, text, max_terms)
+
+    async def get_num_torrents(self) -> int:
+        """
+        Get the number of torrents in the metadata store.
+        """
+        return await self.run(self.metadata_store.get_num_torrents)
+
+    async def get_db_file_size(self) -> int:
+        """
+        Get the size of the metadata store on disk.
+        """
+        return await self.run(self.metadata_store.get_db_file_size)
+
+    async def get_subjects_intersection(self, objects: set[str], predicate: ResourceType | None,
+                                        subjects_type: ResourceType, case_sensitive: bool = True) -> set[str]:
+        """
+        Get all subjects that have all the given objects, see ``KnowledgeDataAccessLayer.get_subjects_intersection``.
+
+        :raises RuntimeError: if there is no Tribler database.
+        """
+        knowledge = self._get_tribler_db().knowledge
+        return await self.run(knowledge.get_subjects_intersection, objects=objects, predicate=predicate,
+                              subjects_type=subjects_type, case_sensitive=case_sensitive)
+
+    async def get_simple_statements_bulk(self, subjects: Iterable[str], subject_type: ResourceType | None = None,
+                                         case_sensitive: bool = True) -> dict[str, list[SimpleStatement]]:
+        """
+        Get the statements of many subjects, see ``KnowledgeDataAccessLayer.get_simple_statements_bulk``.
+
+        :raises RuntimeError: if there is no Tribler database.
+        """
+        knowledge = self._get_tribler_db().knowledge
+        return await self.run(knowledge.get_simple_statements_bulk, subjects=list(subjects),
+                              subject_type=subject_type, case_sensitive=case_sensitive)
+
+    def _get_tribler_db(self) -> TriblerDatabase:
+        """
+        Get the Tribler database.
+
+        :raises RuntimeError: if there is no Tribler database.
+        """
+        if self.tribler_db is None:
+            msg = "The Tribler database is not available"
+            raise RuntimeError(msg)
+        return self.tribler_db
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import heapq
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from sqlite3 import Cursor
+
+    from pony.orm import Database
+
+AUTOCOMPLETE_SHORT_PREFIX = 3  # The maximum length of the prefixes of which the most popular terms are kept
+AUTOCOMPLETE_TOP_TERMS = 16  # The number of most popular terms that is kept for every short prefix
+AUTOCOMPLETE_NEXT_TERMS = 8  # The maximum number of following terms that is kept for every term
+AUTOCOMPLETE_TERMS_PER_QUERY = 300  # how many terms are looked up per query, to stay below the SQLite variable limit
+
+term_re = re.compile(r"\w(?:[.-]?\w)*", re.UNICODE)
+
+# These tables should never be used from ORM directly. They are created by raw SQL and maintained by AutoCompleteIndex.
+sql_create_autocomplete_tables = [
+    """
+    CREATE TABLE IF NOT EXISTS AutoCompleteTerm (
+        term TEXT NOT NULL PRIMARY KEY,
+        weight INTEGER NOT NULL
+    ) WITHOUT ROWID;""",
+    """
+    CREATE TABLE IF NOT EXISTS AutoCompletePrefix (
+        prefix TEXT NOT NULL,
+        term TEXT NOT NULL,
+        weight INTEGER NOT NULL,
+        PRIMARY KEY (prefix, term)
+    ) WITHOUT ROWID;""",
+    """
+    CREATE TABLE IF NOT EXISTS AutoCompleteNext (
+        term TEXT NOT NULL,
+        next_term TEXT NOT NULL,
+        weight INTEGER NOT NULL,
+        PRIMARY KEY (term, next_term)
+    ) WITHOUT ROWID;"""
+]
+
+
+class AutoCompleteIndex:
+    """
+    A prefix index of the terms in torrent titles, weighted by the number of titles they occur in.
+
+    The index is kept in tables of the database, next to the titles, and is updated in the transactions that add the
+    titles. The terms that start with a prefix form a range of the AutoCompleteTerm table. For short prefixes, which
+    match many terms, the most popular terms are kept in the AutoCompletePrefix table. For every term, the
+    AutoCompleteNext table keeps the terms that most often follow it, to suggest the next word of a query.
+
+    Titles are only ever added to the index, so the weight of a term never decreases.
+    """
+
+    def __init__(self, db: Database) -> None:
+        """
+        Create a new index in the given database.
+        """
+        super().__init__()
+
+        self.db = db
+
+    def create_tables(self) -> None:
+        """
+        Create the (empty) tables of the index, if they do not exist yet.
+        """
+        cursor = self.db.get_connection().cursor()
+        for sql in sql_create_autocomplete_tables:
+            cursor.execute(sql)
+
+    def tables_exist(self) -> bool:
+        """
+        Check if the tables of the index exist.
+        """
+        return bool(self.db.select("name FROM sqlite_master WHERE type = 'table' AND name = 'AutoCompleteTerm'"))
+
+    def add_titles(self, titles: Iterable[str]) -> None:
+        """
+        Add the titles of new torrents to the index, in the current write transaction.
+        """
+        weights: Counter[str] = Counter()
+        next_weights: Counter[tuple[str, str]] = Counter()
+        for title in titles:
+            terms = term_re.findall(title.lower())
+            weights.update(set(terms))
+            next_weights.update(set(zip(terms, terms[1:])))
+        if not weights:
+            return
+
+        cursor = self.db.get_connection().cursor()
+        cursor.executemany("INSERT OR IGNORE INTO AutoCompleteTerm (term, weight) VALUES (?, 0)",
+                           [(term,) for term in weights])
+        cursor.executemany("UPDATE AutoCompleteTerm SET weight = weight + ? WHERE term = ?",
+                           [(weight, term) for term, weight in weights.items()])
+        self._update_top_terms(cursor, dict(self._select(cursor, "term, weight FROM AutoCompleteTerm", "term",
+                                                         list(weights))))
+        self._update_next_terms(cursor, next_weights)
+
+    def _select(self, cursor: Cursor, query: str, column: str, values: list[str]) -> list[tuple]:
+        """
+        Select the rows of which a column has one of the given values, in chunks of values.
+        """
+        rows = []
+        for start in range(0, len(values), AUTOCOMPLETE_TERMS_PER_QUERY):
+            chunk = values[start:start + AUTOCOMPLETE_TERMS_PER_QUERY]
+            cursor.execute(f"SELECT {query} WHERE {column} IN ({', '.join('?' * len(chunk))})", chunk)
+            rows.extend(cursor.fetchall())
+        return rows
+
+    def _update_top_terms(self, cursor: Cursor, weights: dict[str, int]) -> None:
+        """
+        Update the most popular terms of the short prefixes of the given terms, which have the given new weights.
+
+        The weights of the other terms did not change, so only the given terms can replace the current top terms.
+        """
+        candidates: dict[str, dict[str, int]] = {}
+        for term, weight in weights.items():
+            for length in range(1, min(AUTOCOMPLETE_SHORT_PREFIX, len(term)) + 1):
+                candidates.setdefault(term[:length], {})[term] = weight
+
+        top: dict[str, dict[str, int]] = {}
+        for prefix, term, weight in self._select(cursor, "prefix, term, weight FROM AutoCompletePrefix", "prefix",
+                                                 list(candidates)):
+            top.setdefault(prefix, {})[term] = weight
+
+        changed = []
+        removed = []
+        for prefix, terms in candidates.items():
+            current = top.get(prefix, {})
+            merged = {**current, **terms}
+            kept = heapq.nsmallest(AUTOCOMPLETE_TOP_TERMS, merged, key=lambda t: (-merged[t], t))
+            changed.extend((prefix, term, merged[term]) for term in kept if current.get(term) != merged[term])
+            removed.extend((prefix, term) for term in current.keys() - set(kept))
+        cursor.executemany("DELETE FROM AutoCompletePrefix WHERE prefix = ? AND term = ?", removed)
+        cursor.executemany("INSERT OR REPLACE INTO AutoCompletePrefix (prefix, term, weight) VALUES (?, ?, ?)",
+                           changed)
+
+    def _update_next_terms(self, cursor: Cursor, next_weights: Counter[tuple[str, str]]) -> None:
+        """
+        Count that terms are followed by other terms.
+
+        If a term already has the maximum number of following terms, the least frequent one is replaced and the new
+        one inherits its count (i.e., the Space-Saving algorithm), so frequent following terms are never lost.
+        """
+        following: dict[str, dict[str, int]] = {term: {} for term, _ in next_weights}
+        for term, next_term, weight in self._select(cursor, "term, next_term, weight FROM AutoCompleteNext", "term",
+                                                    list(following)):
+            following[term][next_term] = weight
+
+        changed = set()
+        removed = set()
+        for (term, next_term), weight in next_weights.items():
+            next_terms = following[term]
+            if next_term in next_terms:
+                next_terms[next_term] += weight
+            elif len(next_terms) < AUTOCOMPLETE_NEXT_TERMS:
+                next_terms[next_term] = weight
+            else:
+                weakest = min(next_terms, key=next_terms.__getitem__)
+                next_terms[next_term] = next_terms.pop(weakest) + weight
+                changed.discard((term, weakest))
+                removed.add((term, weakest))
+            removed.discard((term, next_term))
+            changed.add((term, next_term))
+        cursor.executemany("DELETE FROM AutoCompleteNext WHERE term = ? AND next_term = ?", list(removed))
+        cursor.executemany("INSERT OR REPLACE INTO AutoCompleteNext (term, next_term, weight) VALUES (?, ?, ?)",
+                           [(term, next_term, following[term][next_term]) for term, next_term in changed])
+
+    def _prefixed_terms(self, prefix: str, count: int) -> list[tuple[str, int]]:
+        """
+        Get the most popular terms that start with the given prefix and their weights, the most popular first.
+        """
+        if len(prefix) <= AUTOCOMPLETE_SHORT_PREFIX and count <= AUTOCOMPLETE_TOP_TERMS:
+            return self.db.select("""
+                term, weight FROM AutoCompletePrefix WHERE prefix = $prefix
+                ORDER BY weight DESC, term LIMIT $count
+            """, globals={"prefix": prefix, "count": count})
+        return self.db.select("""
+            term, weight FROM AutoCompleteTerm WHERE term >= $prefix AND term < $end
+            ORDER BY weight DESC, term LIMIT $count
+        """, globals={"prefix": prefix, "end": prefix + "\U0010ffff", "count": count})
+
+    def _next_terms(self, term: str, prefix: str = "") -> list[tuple[str, int]]:
+        """
+        Get the terms that follow the given term and start with the given prefix, and their counts.
+        """
+        return self.db.select("""
+            next_term, weight FROM AutoCompleteNext WHERE term = $term AND next_term >= $prefix AND next_term < $end
+            ORDER BY weight DESC, next_term
+        """, globals={"term": term, "prefix": prefix, "end": prefix + "\U0010ffff"})
+
+    def complete(self, text: str, max_terms: int) -> list[str]:
+        """
+        Get the suggestions for a query text: the text with its last word completed or with a next word appended.
+
+        :param text: the lower case query text.
+        :param max_terms: the maximum number of suggestions.
+        :return: the suggestions, the most popular first.
+        """
+        words = term_re.findall(text)
+        if not words:
+            return []
+
+        last = words[-1]
+        suggestions: dict[str, int] = {}
+        if text[-1].isalnum() or text[-1] == "_":
+            if len(words) > 1:
+                # Only complete the last word with terms that follow the word before it
+                completions = self._next_terms(words[-2], last)
+            else:
+                completions = self._prefixed_terms(last, max_terms + 1)
+            for term, weight in completions:
+                if term != last:
+                    suggestions[text + term[len(last):]] = weight
+            separator = " "
+        else:
+            separator = ""
+        for term, count in self._next_terms(last):
+            suggestions[text + separator + term] = count
+
+        return heapq.nlargest(max_terms, suggestions, key=suggestions.__getitem__)
@@ -0,0 +1,88 @@
+"""
+Run the database benchmarks and write the results as JSON.
+
+Example: python -m tribler.core.database.benchmark --torrents 100000 --output results.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from ipv8.keyvault.crypto import default_eccrypto
+
+from tribler.core.database.benchmark.generator import SyntheticMetadata, populate
+from tribler.core.database.benchmark.scenarios import Benchmark
+from tribler.core.database.store import MetadataStore
+
+
+def get_commit() -> str | None:
+    """
+    Get the git commit of the benchmarked code, if it is known.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True,  # noqa: S607
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(torrents: int, seed: int, runs: int, scenarios: list[str] | None, db_dir: Path,  # noqa: PLR0913
+                  *, wal_mode: bool = False, query_cache: bool = False) -> dict:
+    """
+    Populate a new metadata store with synthetic torrents and run the benchmark scenarios on it.
+
+    :return: the JSON-serializable results.
+    """
+    metadata_store = MetadataStore(db_dir / "metadata.db", default_eccrypto.generate_key("curve25519"),
+                                   wal_mode=wal_mode)
+    try:
+        synthetic = SyntheticMetadata(seed)
+        generation_time = populate(metadata_store, synthetic, torrents)
+        results = Benchmark(metadata_store, synthetic, runs, query_cache).run(scenarios)
+    finally:
+        metadata_store.shutdown()
+    return {
+        "parameters": {"torrents": torrents, "seed": seed, "runs": runs, "wal_mode": wal_mode,
+                       "query_cache": query_cache},
+        "environment": {"commit": get_commit(), "python": platform.python_version(),
+                        "sqlite": sqlite3.sqlite_version, "platform": platform.platform()},
+        "generation_s": generation_time,
+        "scenarios": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Parse the command line arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(prog="tribler.core.database.benchmark",
+                                     description="Benchmark the metadata store on synthetic torrents")
+    parser.add_argument("--torrents", type=int, default=100000, help="The number of synthetic torrents")
+    parser.add_argument("--seed", type=int, default=42, help="The seed of the synthetic data and the runs")
+    parser.add_argument("--runs", type=int, default=20, help="The number of timed runs per scenario")
+    parser.add_argument("--scenarios", default="", help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument("--output", default="-", help="The file to write the JSON results to (default: stdout)")
+    parser.add_argument("--wal-mode", action="store_true", help="Open the database in WAL mode")
+    parser.add_argument("--query-cache", action="store_true", help="Keep the query cache of the store enabled")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        results = run_benchmark(args.torrents, args.seed, args.runs,
+                                [name for name in args.scenarios.split(",") if name] or None, Path(db_dir),
+                                wal_mode=args.wal_mode, query_cache=args.query_cache)
+
+    output = json.dumps(results, indent=4)
+    if args.output == "-":
+        sys.stdout.write(output + "\n")
+    else:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
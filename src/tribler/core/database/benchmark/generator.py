@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from itertools import accumulate
+from random import Random
+from typing import TYPE_CHECKING
+
+from pony.orm import db_session
+
+from tribler.core.database.orm_bindings.torrent_metadata import infohash_to_id
+from tribler.core.database.serialization import NULL_KEY, REGULAR_TORRENT, TorrentMetadataPayload
+
+if TYPE_CHECKING:
+    from ipv8.types import PrivateKey
+
+    from tribler.core.database.store import MetadataStore
+
+VOCABULARY_SIZE = 20000  # The number of distinct invented words in titles
+ZIPF_EXPONENT = 1.1  # The skew of the word frequencies, like natural language
+CHECKED_FRACTION = 0.3  # The fraction of torrents that has a known health
+RECENTLY_CHECKED_FRACTION = 0.2  # The fraction of checked torrents that was checked during the last day
+INSERT_BATCH_SIZE = 5000  # The number of torrents that is inserted per transaction
+FIRST_TORRENT_DATE = 1104537600  # 2005-01-01
+LAST_TORRENT_DATE = 1704067200  # 2024-01-01
+
+SYLLABLES = ["ka", "ro", "mi", "tan", "el", "vor", "shi", "un", "dra", "pe", "lo", "zen", "ar", "qu", "ix", "ba",
+             "no", "ste", "gul", "ty", "om", "fre", "da", "win", "ha", "cel", "ur", "jo", "mar", "is"]
+RELEASE_TERMS = ["1080p", "720p", "2160p", "x264", "x265", "hevc", "web-dl", "bluray", "hdtv", "aac", "flac", "mp3",
+                 "complete", "collection", "remastered", "extended", "proper", "repack", "multi", "subs"]
+SEPARATORS = [" ", ".", "_", " - "]
+CATEGORIES = ["Video", "VideoClips", "Audio", "Compressed", "Document", "Picture", "Other", "xxx"]
+TRACKERS = ["udp://tracker.example.org:6969/announce", "http://tracker.example.com/announce",
+            "udp://open.example.net:1337/announce", ""]
+
+
+class SyntheticMetadata:
+    """
+    A deterministic generator of realistic torrent metadata and health, for benchmarking.
+
+    Titles consist of invented words, which are drawn with a Zipf distribution, and common release terms. Most
+    torrents have no known health and the seeders and leechers of the others follow a heavy-tailed distribution.
+    The same seed always gives the same torrents.
+    """
+
+    def __init__(self, seed: int, vocabulary_size: int = VOCABULARY_SIZE) -> None:
+        """
+        Create a new generator.
+
+        :param seed: the seed of the random generator.
+        :param vocabulary_size: the number of distinct invented words.
+        """
+        super().__init__()
+
+        self.random = Random(seed)
+        self.vocabulary = self._invent_words(vocabulary_size)
+        self._cumulative_weights = list(accumulate(1 / rank ** ZIPF_EXPONENT
+                                                   for rank in range(1, vocabulary_size + 1)))
+        self.infohashes: list[bytes] = []
+
+    def _invent_words(self, count: int) -> list[str]:
+        """
+        Invent the given number of distinct words.
+        """
+        words: dict[str, None] = {}
+        while len(words) < count:
+            words["".join(self.random.choices(SYLLABLES, k=self.random.randint(1, 4)))] = None
+        return list(words)
+
+    def words(self, count: int) -> list[str]:
+        """
+        Draw words from the vocabulary, frequent words are drawn more often.
+        """
+        return self.random.choices(self.vocabulary, cum_weights=self._cumulative_weights, k=count)
+
+    def title(self) -> str:
+        """
+        Generate a torrent title.
+        """
+        terms = self.words(self.random.randint(1, 6))
+        if self.random.random() < 0.3:
+            terms.append(str(self.random.randint(1970, 2024)))
+        terms.extend(self.random.sample(RELEASE_TERMS, self.random.randint(0, 3)))
+        return self.random.choice(SEPARATORS).join(terms).title()
+
+    def torrent(self) -> TorrentMetadataPayload:
+        """
+        Generate the payload of a new, unsigned torrent.
+        """
+        infohash = self.random.randbytes(20)
+        self.infohashes.append(infohash)
+        timestamp = self.random.randint(FIRST_TORRENT_DATE, LAST_TORRENT_DATE)
+        torrent_date = datetime.utcfromtimestamp(timestamp)  # noqa: DTZ004
+        return TorrentMetadataPayload(REGULAR_TORRENT, 0, NULL_KEY, infohash_to_id(infohash), 0, 0, infohash,
+                                      int(self.random.lognormvariate(20, 2)), torrent_date, self.title(),
+                                      self.random.choice(CATEGORIES), self.random.choice(TRACKERS))
+
+    def signed_torrent(self, key: PrivateKey) -> TorrentMetadataPayload:
+        """
+        Generate the payload of a new torrent, signed with the given key.
+        """
+        payload = self.torrent()
+        payload.id_ = self.random.getrandbits(63)
+        payload.add_signature(key)
+        return payload
+
+    def health(self, now: int) -> tuple[int, int, int]:
+        """
+        Generate the seeders, leechers and last check time of a checked torrent.
+        """
+        seeders = min(int(self.random.paretovariate(1.2)) - 1, 100000)
+        leechers = min(int(self.random.paretovariate(1.5)) - 1, 100000)
+        if self.random.random() < RECENTLY_CHECKED_FRACTION:
+            last_check = now - self.random.randint(0, 60 * 60 * 23)
+        else:
+            last_check = now - self.random.randint(60 * 60 * 24, 60 * 60 * 24 * 365)
+        return seeders, leechers, last_check
+
+
+def populate(metadata_store: MetadataStore, synthetic: SyntheticMetadata, torrents: int) -> float:
+    """
+    Add the given number of synthetic torrents to a metadata store, including the health of some of them.
+
+    :return: the number of seconds that it took.
+    """
+    start = time.perf_counter()
+    now = int(time.time())
+    for batch_start in range(0, torrents, INSERT_BATCH_SIZE):
+        payloads = [synthetic.torrent() for _ in range(min(INSERT_BATCH_SIZE, torrents - batch_start))]
+        health = [(*synthetic.health(now), payload.infohash) for payload in payloads
+                  if synthetic.random.random() < CHECKED_FRACTION]
+        with db_session:
+            metadata_store.process_payloads_bulk(payloads, check_signature=False)
+        with db_session:
+            metadata_store.db.get_connection().cursor().executemany(
+                "UPDATE TorrentState SET seeders = ?, leechers = ?, last_check = ? WHERE infohash = ?", health
+            )
+    return time.perf_counter() - start
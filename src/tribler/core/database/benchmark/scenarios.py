@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from ipv8.keyvault.crypto import default_eccrypto
+from lz4.frame import compress
+from pony.orm import db_session
+
+from tribler.core.database.queries import to_fts_query
+from tribler.core.database.serialization import REGULAR_TORRENT
+from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+if TYPE_CHECKING:
+    from tribler.core.database.benchmark.generator import SyntheticMetadata
+    from tribler.core.database.store import MetadataStore
+
+PAGE_SIZE = 50  # The number of results per page, as requested by the GUI
+MDBLOB_SIZE = 50  # The number of torrents per ingested mdblob
+MDBLOB_KEYS = 4  # The number of peers that sign the ingested torrents
+HEALTH_BATCH_SIZE = 100  # The number of health updates that is processed per transaction
+
+
+@dataclass
+class ScenarioResult:
+    """
+    The timings of the runs of a single scenario.
+    """
+
+    name: str
+    timings: list[float] = field(default_factory=list)  # Seconds per run
+    items: int = 0  # The number of items (e.g., torrents) that all runs processed together
+    setup: float = 0.0  # Seconds of untimed preparation that precedes the first run
+
+    def to_dict(self) -> dict[str, float | int | str]:
+        """
+        Summarize the timings in a JSON-serializable dictionary, in milliseconds.
+        """
+        timings = sorted(self.timings)
+        total = sum(timings)
+        result = {
+            "runs": len(timings),
+            "total_s": total,
+            "setup_s": self.setup,
+            "min_ms": timings[0] * 1000,
+            "median_ms": statistics.median(timings) * 1000,
+            "mean_ms": total / len(timings) * 1000,
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            "max_ms": timings[-1] * 1000,
+        }
+        if self.items:
+            result["items"] = self.items
+            result["items_per_s"] = self.items / total if total else 0.0
+        return result
+
+
+class Benchmark:
+    """
+    Timed scenarios over a metadata store that is populated with synthetic torrents.
+
+    Every scenario prepares the arguments of all its runs (and of a warm-up run) first, from the same generator as the
+    torrents, so the runs are the same for every benchmark with the same seed. The query cache is disabled by default,
+    to measure the queries themselves.
+    """
+
+    def __init__(self, metadata_store: MetadataStore, synthetic: SyntheticMetadata, runs: int,
+                 query_cache: bool = False) -> None:
+        """
+        Create a new benchmark.
+
+        :param metadata_store: the populated metadata store.
+        :param synthetic: the generator that populated the metadata store.
+        :param runs: the number of timed runs per scenario.
+        :param query_cache: whether the query cache of the metadata store should be used.
+        """
+        super().__init__()
+
+        self.metadata_store = metadata_store
+        self.synthetic = synthetic
+        self.runs = runs
+        if not query_cache:
+            self.metadata_store.query_cache.max_size = 0
+
+        self.scenarios: dict[str, Callable[[], ScenarioResult]] = {
+            "keyword_search": self.keyword_search,
+            "popular": self.popular,
+            "deep_pagination": self.deep_pagination,
+            "deep_pagination_continuation": self.deep_pagination_continuation,
+            "autocomplete": self.autocomplete,
+            "mdblob_ingest": self.mdblob_ingest,
+            "health_ingest": self.health_ingest,
+        }
+
+    def run(self, names: list[str] | None = None) -> dict[str, dict[str, float | int | str]]:
+        """
+        Run the given scenarios, or all scenarios, in order.
+
+        :raises KeyError: if a scenario is unknown.
+        """
+        return {name: self.scenarios[name]().to_dict() for name in (names or list(self.scenarios))}
+
+    def _time(self, name: str, arguments: list, operation: Callable, items_per_run: int = 0,
+              setup: float = 0.0) -> ScenarioResult:
+        """
+        Time one run of the given operation for each of the given arguments, except for the first argument: that is
+        used for an untimed warm-up run.
+        """
+        operation(arguments[0])
+        result = ScenarioResult(name, items=items_per_run * (len(arguments) - 1), setup=setup)
+        for argument in arguments[1:]:
+            start = time.perf_counter()
+            operation(argument)
+            result.timings.append(time.perf_counter() - start)
+        return result
+
+    def keyword_search(self) -> ScenarioResult:
+        """
+        Search for the first page of torrents that match one or two (frequent) words.
+        """
+        queries = [" ".join(self.synthetic.words(self.synthetic.random.randint(1, 2)))
+                   for _ in range(self.runs + 1)]
+
+        def search(query: str) -> None:
+            with db_session:
+                self.metadata_store.get_entries(first=1, last=PAGE_SIZE, txt_filter=to_fts_query(query),
+                                                metadata_type=REGULAR_TORRENT)
+
+        return self._time("keyword_search", queries, search)
+
+    def popular(self) -> ScenarioResult:
+        """
+        List the first page of popular torrents.
+        """
+        def list_popular(_: None) -> None:
+            with db_session:
+                self.metadata_store.get_entries(first=1, last=PAGE_SIZE, metadata_type=REGULAR_TORRENT, popular=True)
+
+        return self._time("popular", [None] * (self.runs + 1), list_popular)
+
+    def _deep_offsets(self) -> list[int]:
+        """
+        Get an offset in the deeper half of the torrents for every run.
+        """
+        count = len(self.synthetic.infohashes)
+        return [self.synthetic.random.randint(count // 2, max(count // 2, count - PAGE_SIZE))
+                for _ in range(self.runs + 1)]
+
+    def deep_pagination(self) -> ScenarioResult:
+        """
+        Get a page of torrents, sorted by date, at a deep offset.
+        """
+        def get_page(offset: int) -> None:
+            with db_session:
+                self.metadata_store.get_entries(first=offset + 1, last=offset + PAGE_SIZE, sort_by="torrent_date")
+
+        return self._time("deep_pagination", self._deep_offsets(), get_page)
+
+    def deep_pagination_continuation(self) -> ScenarioResult:
+        """
+        Get a page of torrents, sorted by date, at a deep position of which the continuation token is known.
+        """
+        start = time.perf_counter()
+        tokens = []
+        for offset in self._deep_offsets():
+            with db_session:
+                previous = self.metadata_store.get_entries(first=offset, last=offset, sort_by="torrent_date")
+                tokens.append(self.metadata_store.get_continuation_token(previous, first=offset, last=offset,
+                                                                         sort_by="torrent_date"))
+        setup = time.perf_counter() - start
+
+        def get_page(token: str) -> None:
+            with db_session:
+                self.metadata_store.get_entries(first=1, last=PAGE_SIZE, sort_by="torrent_date", continuation=token)
+
+        return self._time("deep_pagination_continuation", tokens, get_page, setup=setup)
+
+    def autocomplete(self) -> ScenarioResult:
+        """
+        Get the completions of (partially) typed words from the auto-completion index, which is filled on insertion.
+        """
+        texts = []
+        for _ in range(self.runs + 1):
+            words = self.synthetic.words(self.synthetic.random.randint(1, 2))
+            words[-1] = words[-1][:self.synthetic.random.randint(1, len(words[-1]))]
+            texts.append(" ".join(words))
+
+        return self._time("autocomplete", texts,
+                          lambda text: self.metadata_store.get_auto_complete_terms(text, max_terms=5))
+
+    def mdblob_ingest(self) -> ScenarioResult:
+        """
+        Process compressed mdblobs of new torrents that are signed by other peers.
+        """
+        start = time.perf_counter()
+        keys = [default_eccrypto.generate_key("curve25519") for _ in range(MDBLOB_KEYS)]
+        mdblobs = []
+        for _ in range(self.runs + 1):
+            payloads = [self.synthetic.signed_torrent(self.synthetic.random.choice(keys)) for _ in range(MDBLOB_SIZE)]
+            mdblobs.append(compress(b"".join(payload.serialized() + payload.signature for payload in payloads)))
+        setup = time.perf_counter() - start
+
+        return self._time("mdblob_ingest", mdblobs, self.metadata_store.process_compressed_mdblob,
+                          items_per_run=MDBLOB_SIZE, setup=setup)
+
+    def health_ingest(self) -> ScenarioResult:
+        """
+        Process batches of health updates of known torrents.
+        """
+        now = int(time.time())
+        batch_size = min(HEALTH_BATCH_SIZE, len(self.synthetic.infohashes))
+        batches = [[HealthInfo(infohash, *self.synthetic.health(now))
+                    for infohash in self.synthetic.random.sample(self.synthetic.infohashes, batch_size)]
+                   for _ in range(self.runs + 1)]
+
+        def process(batch: list[HealthInfo]) -> None:
+            with db_session:
+                for health in batch:
+                    self.metadata_store.process_torrent_health(health)
+
+        return self._time("health_ingest", batches, process, items_per_run=batch_size)
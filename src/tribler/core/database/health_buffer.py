@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import threading
+from functools import partial
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from tribler.core.database.write_queue import WriteQueue
+    from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+HEALTH_BUFFER_MAX_SIZE = 1000  # The number of buffered torrents at which the buffer is flushed without waiting
+HEALTH_FLUSH_INTERVAL = 5.0  # The default number of seconds between two periodic flushes
+
+
+class HealthBuffer:
+    """
+    An in-memory buffer of torrent health updates, which are written to the database together.
+
+    The buffer keeps a single health per infohash: the caller decides whether a new health replaces the known health,
+    so repeated checks of the same torrent between two flushes cost a single write. A flush writes all buffered
+    health in one transaction on the write queue. Buffered health stays readable until its write is committed.
+    """
+
+    def __init__(self, write_queue: WriteQueue, write: Callable[[HealthInfo], None],
+                 max_size: int = HEALTH_BUFFER_MAX_SIZE, on_flushed: Callable[[], None] | None = None) -> None:
+        """
+        Create a new empty buffer.
+
+        :param write_queue: the write queue to submit flushes to.
+        :param write: the function that writes a single health to the database, in a ``db_session``.
+        :param max_size: the number of buffered torrents at which the buffer is flushed immediately.
+        :param on_flushed: called after the buffered health of a flush has been committed.
+        """
+        super().__init__()
+
+        self.write_queue = write_queue
+        self.write = write
+        self.max_size = max_size
+        self.on_flushed = on_flushed
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.updates = 0  # The number of health updates that were buffered
+        self.flushes = 0  # The number of flushes that were committed
+        self.written = 0  # The number of health updates that were written by these flushes
+
+        self._pending: dict[bytes, HealthInfo] = {}
+        self._flushing: dict[bytes, HealthInfo] = {}  # Health of which the write has not been committed yet
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Get the number of torrents with health that is not written yet.
+        """
+        with self._lock:
+            return len(self._pending.keys() | self._flushing.keys())
+
+    def get(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Get the buffered health of the given torrent.
+
+        :return: the health or None if no health of the torrent is waiting to be written.
+        """
+        with self._lock:
+            return self._pending.get(infohash) or self._flushing.get(infohash)
+
+    def get_all(self) -> list[HealthInfo]:
+        """
+        Get the buffered health of all torrents.
+        """
+        with self._lock:
+            return list({**self._flushing, **self._pending}.values())
+
+    def add(self, health: HealthInfo) -> None:
+        """
+        Buffer the health of a torrent, replacing its previously buffered health.
+        """
+        with self._lock:
+            self._pending[health.infohash] = health
+            self.updates += 1
+            full = len(self._pending) >= self.max_size
+        if full:
+            self.flush()
+
+    def flush(self) -> Future | None:
+        """
+        Write all buffered health to the database.
+
+        :return: the future of the write or None if nothing was buffered.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._flushing.update(batch)
+        if not batch:
+            return None
+        future = self.write_queue.submit(self._write_batch, list(batch.values()))
+        future.add_done_callback(partial(self._on_batch_written, batch))
+        return future
+
+    def _write_batch(self, batch: list[HealthInfo]) -> None:
+        """
+        Write the given health, in the transaction of the write queue.
+        """
+        for health in batch:
+            self.write(health)
+
+    def _on_batch_written(self, batch: dict[bytes, HealthInfo], future: Future) -> None:
+        """
+        Stop serving the health of a flush from the buffer, or buffer it again if its write failed.
+        """
+        exception = future.exception()
+        with self._lock:
+            for infohash, health in batch.items():
+                if self._flushing.get(infohash) is health:
+                    del self._flushing[infohash]
+                    if exception is not None:
+                        self._pending.setdefault(infohash, health)
+            if exception is None:
+                self.flushes += 1
+                self.written += len(batch)
+        if exception is not None:
+            self._logger.warning("Failed to write the health of %d torrents: %s: %s", len(batch),
+                                 type(exception).__name__, exception)
+        elif self.on_flushed is not None:
+            self.on_flushed()
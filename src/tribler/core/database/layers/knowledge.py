@@ -4,14 +4,15 @@ import datetime
 import logging
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import TYPE_CHECKING, Callable, Iterator, List, Set
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Set
 
 from pony import orm
-from pony.orm import raw_sql
 from pony.orm.core import Database, Entity, Query, UnrepeatableReadError, select
 from pony.utils import between
 
 from tribler.core.database.layers.layer import EntityImpl, Layer
+from tribler.core.database.postings import PostingIndex
 from tribler.core.knowledge.payload import StatementOperation
 
 CLOCK_START_VALUE = 0
@@ -20,11 +21,13 @@ PUBLIC_KEY_FOR_AUTO_GENERATED_OPERATIONS = b"auto_generated"
 
 SHOW_THRESHOLD = 1  # how many operation needed for showing a knowledge graph statement in the UI
 HIDE_THRESHOLD = -2  # how many operation needed for hiding a knowledge graph statement in the UI
+BULK_SUBJECTS_PER_QUERY = 500  # how many subjects are looked up per query, to stay below the SQLite variable limit
 
 if TYPE_CHECKING:
     import dataclasses
 
     from tribler.core.database.layers.health import TorrentHealth, Tracker
+    from tribler.core.database.write_queue import WriteQueue
 
 
     @dataclasses.dataclass
@@ -185,12 +188,20 @@ class KnowledgeDataAccessLayer(Layer):
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.instance = instance
-        self.Peer, self.Statement, self.Resource, self.StatementOp = self.define_binding(self.instance)
+        self.postings = PostingIndex(self._load_postings)
+        # The queue of the writes to the database, set by its owner, to update the postings after commit.
+        self.write_queue: WriteQueue | None = None
+        self.Peer, self.Statement, self.Resource, self.StatementOp = self.define_binding(
+            self.instance, on_visibility_changed=self._on_visibility_changed
+        )
 
     @staticmethod
-    def define_binding(db: Database) -> tuple[type[Peer], type[Statement], type[Resource], type[StatementOp]]:
+    def define_binding(db: Database, on_visibility_changed: Callable[[Statement, bool], None] | None = None
+                       ) -> tuple[type[Peer], type[Statement], type[Resource], type[StatementOp]]:
         """
         Create the bindings for this layer.
+
+        :param on_visibility_changed: a callback for when a statement becomes shown (True) or hidden (False).
         """
         class Peer(db.Entity):
             id = orm.PrimaryKey(int, auto=True)
@@ -217,6 +228,11 @@ class KnowledgeDataAccessLayer(Layer):
             def score(self) -> int:
                 return self.added_count - self.removed_count
 
+            @property
+            def shown(self) -> bool:
+                return (self.local_operation == Operation.ADD
+                        or (not self.local_operation and self.score >= SHOW_THRESHOLD))
+
             def update_counter(self, operation: Operation, increment: int = 1, is_local_peer: bool = False) -> None:
                 """
                 Update Statement's counter.
@@ -225,12 +241,15 @@ class KnowledgeDataAccessLayer(Layer):
                 :param increment:
                 :param is_local_peer: The flag indicates whether do we perform operations from a local user.
                 """
+                shown = self.shown
                 if is_local_peer:
                     self.local_operation = operation
                 if operation == Operation.ADD:
                     self.added_count += increment
                 if operation == Operation.REMOVE:
                     self.removed_count += increment
+                if on_visibility_changed and self.shown != shown:
+                    on_visibility_changed(self, not shown)
 
         class Resource(db.Entity):
             id = orm.PrimaryKey(int, auto=True)
@@ -361,6 +380,40 @@ class KnowledgeDataAccessLayer(Layer):
         return self.add_operation(operation, signature=b"", is_local_peer=False, is_auto_generated=True,
                                   counter_increment=SHOW_THRESHOLD)
 
+    def _load_postings(self) -> list[tuple[int, int, str, int]]:
+        """
+        Get the subject id, object id, object name and object type of all shown statements.
+        """
+        with orm.db_session:
+            return self.instance.select("""
+                "s"."subject", "s"."object", "obj"."name", "obj"."type"
+                FROM "Statement" "s"
+                JOIN "Resource" "obj" ON "obj"."id" = "s"."object"
+                WHERE "s"."local_operation" = $ADD
+                    OR ("s"."local_operation" = 0 OR "s"."local_operation" IS NULL)
+                    AND ("s"."added_count" - "s"."removed_count") >= $SHOW_THRESHOLD
+            """, globals={"ADD": Operation.ADD.value, "SHOW_THRESHOLD": SHOW_THRESHOLD})
+
+    def _on_visibility_changed(self, statement: Statement, shown: bool) -> None:
+        """
+        Keep the posting lists up to date with the statements that are shown.
+
+        New statements do not have an id until they are flushed. The posting lists are updated once the transaction
+        of the write queue that changes the statement is committed. If the change is not made on the write queue, the
+        posting lists are updated immediately: if its transaction is rolled back, they are rebuilt on the next start.
+        """
+        if not self.postings.loaded:
+            return
+        if statement.id is None:
+            self.instance.flush()
+        if shown:
+            update = partial(self.postings.add, statement.subject.id, statement.object.id, statement.object.name,
+                             statement.object.type)
+        else:
+            update = partial(self.postings.remove, statement.subject.id, statement.object.id)
+        if self.write_queue is None or not self.write_queue.after_commit(update):
+            update()
+
     @staticmethod
     def _show_condition(s: Statement) -> bool:
         """
@@ -452,6 +505,41 @@ class KnowledgeDataAccessLayer(Layer):
                 self.logger.exception(e)
         return results
 
+    def get_simple_statements_bulk(self, subjects: Iterable[str], subject_type: ResourceType | None = None,
+                                   case_sensitive: bool = True) -> dict[str, list[SimpleStatement]]:
+        """
+        Get the simple statements of many subjects at once, grouped by subject.
+
+        The statements of every subject are in the same order as ``get_simple_statements`` gives them.
+
+        :param subjects: the names of the subjects.
+        :param subject_type: a type of the subjects.
+        :param case_sensitive: if True, then Resources are selected in a case-sensitive manner.
+        :returns: a mapping of every given subject name to its statements.
+        """
+        requested = {subject if case_sensitive else subject.lower(): subject for subject in subjects}
+        results: dict[str, list[SimpleStatement]] = {subject: [] for subject in requested.values()}
+        names = list(requested)
+        statements = self.Statement.select(self._show_condition)
+        if subject_type:
+            statements = statements.filter(lambda s: s.subject.type == subject_type.value)
+
+        for start in range(0, len(names), BULK_SUBJECTS_PER_QUERY):
+            chunk = names[start:start + BULK_SUBJECTS_PER_QUERY]
+            if case_sensitive:
+                query = select((s.subject.name, s.subject.type, s.object.type, s.object.name,
+                                s.added_count - s.removed_count) for s in statements if s.subject.name in chunk)
+            else:
+                query = select((s.subject.name, s.subject.type, s.object.type, s.object.name,
+                                s.added_count - s.removed_count) for s in statements
+                               if s.subject.name.lower() in chunk)
+            for name, type_, predicate, obj, _ in query.order_by(-5):
+                subject = requested.get(name if case_sensitive else name.lower())
+                if subject is not None:
+                    results[subject].append(SimpleStatement(subject_type=type_, subject=name, predicate=predicate,
+                                                            object=obj))
+        return results
+
     def get_suggestions(self, subject_type: ResourceType | None = None, subject: str | None = "",
                         predicate: ResourceType | None = None, case_sensitive: bool = True) -> List[str]:
         """
@@ -479,31 +567,19 @@ class KnowledgeDataAccessLayer(Layer):
                                   case_sensitive: bool = True) -> Set[str]:
         """
         Get all subjects that have a certain predicate.
+
+        The subjects are found by intersecting the posting lists of the objects, which are built on first use.
         """
         if not objects:
             return set()
 
-        if case_sensitive:
-            name_condition = '"obj"."name" = $obj_name'
-        else:
-            name_condition = 'py_lower("obj"."name") = py_lower($obj_name)'
-        query = select(r.name for r in self.Resource if r.type == subjects_type.value)
-        for obj_name in objects:
-            query = query.filter(raw_sql("""
-    r.id IN (
-        SELECT "s"."subject"
-        FROM "Statement" "s"
-        WHERE (
-            "s"."local_operation" = $(Operation.ADD.value)
-        OR
-            ("s"."local_operation" = 0 OR "s"."local_operation" IS NULL)
-            AND ("s"."added_count" - "s"."removed_count") >= $SHOW_THRESHOLD
-        ) AND "s"."object" IN (
-            SELECT "obj"."id" FROM "Resource" "obj"
-            WHERE "obj"."type" = $(predicate.value) AND $name_condition
-        )
-    )"""), globals={"obj_name": obj_name, "name_condition": name_condition, "SHOW_THRESHOLD": SHOW_THRESHOLD})
-        return set(query)
+        self.postings.load()
+        subject_ids = self.postings.intersect(objects, predicate.value if predicate else None, case_sensitive)
+        subjects = set()
+        for start in range(0, len(subject_ids), BULK_SUBJECTS_PER_QUERY):
+            chunk = subject_ids[start:start + BULK_SUBJECTS_PER_QUERY]
+            subjects.update(select(r.name for r in self.Resource if r.id in chunk and r.type == subjects_type.value))
+        return subjects
 
     def get_clock(self, operation: StatementOperation) -> int:
         """
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import logging
+from asyncio import wrap_future
+from dataclasses import asdict, dataclass
+from time import monotonic, time
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from pony.orm import Database
+
+    from tribler.core.database.write_queue import WriteQueue
+
+MAINTENANCE_INTERVAL = 24 * 60 * 60  # The number of seconds between two maintenance cycles of a database
+MAINTENANCE_TICK_INTERVAL = 1.0  # The number of seconds between two checks for maintenance work
+MAINTENANCE_IDLE_TIME = 60.0  # The number of seconds without queued writes after which a database is idle
+MAINTENANCE_SLICE_DURATION = 0.1  # The number of seconds after which a slice of maintenance work is not continued
+
+ANALYSIS_LIMIT = 1000  # The approximate number of rows that ANALYZE looks at per index
+FTS_MERGE_PAGES = 500  # The number of leaf pages that are merged per FTS5 merge step
+VACUUM_PAGES = 256  # The number of free pages that are released per incremental vacuum step
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def enable_incremental_vacuum(database: Database) -> None:
+    """
+    Make new database files release their free pages on incremental vacuum steps.
+
+    This must be called before the database is bound: auto-vacuum can only be enabled before the first table is created.
+    """
+    @database.on_connect
+    def on_connect(_: Database, connection: Connection) -> None:
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+@dataclass
+class MaintenanceStatus:
+    """
+    The status of a maintenance task.
+    """
+
+    name: str
+    runs: int = 0
+    in_progress: bool = False
+    last_started: float | None = None
+    last_finished: float | None = None
+    last_duration: float = 0.0  # The total time of the steps of the last run
+    last_steps: int = 0
+    reclaimed_bytes: int = 0  # The number of bytes that the last run released
+    error: str | None = None
+
+
+class MaintenanceTask:
+    """
+    A maintenance operation that is executed in small steps.
+    """
+
+    name = ""
+    scheduled = True  # Whether the task runs in every maintenance cycle, instead of only when it is triggered
+
+    def __init__(self) -> None:
+        """
+        Create a new task that has not run yet.
+        """
+        super().__init__()
+        self.status = MaintenanceStatus(self.name)
+
+    def start(self) -> None:
+        """
+        Start a new run of this task.
+        """
+        self.status.in_progress = True
+        self.status.last_started = time()
+        self.status.last_duration = 0.0
+        self.status.last_steps = 0
+        self.status.reclaimed_bytes = 0
+        self.status.error = None
+
+    def finish(self, error: str | None = None) -> None:
+        """
+        Finish the current run of this task.
+        """
+        self.status.in_progress = False
+        self.status.last_finished = time()
+        self.status.runs += 1
+        self.status.error = error
+
+    def step(self, database: Database) -> bool:
+        """
+        Execute a step of this task, in a ``db_session``.
+
+        :return: whether the task is done.
+        """
+        raise NotImplementedError
+
+
+class Analyze(MaintenanceTask):
+    """
+    Gather the statistics of the query planner, from a limited sample of every index.
+    """
+
+    name = "analyze"
+
+    def step(self, database: Database) -> bool:
+        """
+        Analyze the database and let SQLite optimize whatever else it deems useful.
+        """
+        database.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        database.execute("ANALYZE")
+        database.execute("PRAGMA optimize")
+        return True
+
+
+class FtsMerge(MaintenanceTask):
+    """
+    Merge the b-trees of an FTS5 index, a limited number of pages at a time.
+    """
+
+    name = "fts_merge"
+
+    def __init__(self, table: str) -> None:
+        """
+        Create a new merge task for the given FTS5 table.
+        """
+        super().__init__()
+        self.table = table
+
+    def step(self, database: Database) -> bool:
+        """
+        Merge some pages, the index is fully merged if this changed (almost) nothing.
+        """
+        changes = database.select("total_changes()")[0]
+        database.execute(f"INSERT INTO {self.table}({self.table}, rank) "  # noqa: S608
+                         f"VALUES ('merge', {FTS_MERGE_PAGES})")
+        return database.select("total_changes()")[0] - changes < 2
+
+
+class FtsOptimize(FtsMerge):
+    """
+    Merge all b-trees of an FTS5 index into one, at once. This is expensive and only runs when it is triggered.
+    """
+
+    name = "fts_optimize"
+    scheduled = False
+
+    def step(self, database: Database) -> bool:
+        """
+        Optimize the index.
+        """
+        database.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('optimize')")  # noqa: S608
+        return True
+
+
+class IncrementalVacuum(MaintenanceTask):
+    """
+    Release the free pages of the database file, a limited number of pages at a time.
+
+    This requires incremental auto-vacuum, which database files created without it do not have.
+    """
+
+    name = "incremental_vacuum"
+
+    def step(self, database: Database) -> bool:
+        """
+        Release some free pages, if possible.
+        """
+        if database.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+            return True
+        free_pages = database.execute("PRAGMA freelist_count").fetchone()[0]
+        if not free_pages:
+            return True
+        database.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()  # Every row releases a page
+        remaining = database.execute("PRAGMA freelist_count").fetchone()[0]
+        self.status.reclaimed_bytes += (free_pages - remaining) * database.execute("PRAGMA page_size").fetchone()[0]
+        return remaining in (0, free_pages)
+
+
+class DatabaseMaintenance:
+    """
+    The maintenance tasks of a single database, which are executed in time-bounded slices on its write queue.
+    """
+
+    def __init__(self, name: str, database: Database, write_queue: WriteQueue, fts_table: str | None = None,
+                 slice_duration: float = MAINTENANCE_SLICE_DURATION) -> None:
+        """
+        Create the maintenance tasks of a database.
+
+        :param name: the name of the database.
+        :param database: the database to maintain.
+        :param write_queue: the write queue of the database, which executes the maintenance steps.
+        :param fts_table: the FTS5 table of the database, if it has one.
+        :param slice_duration: the number of seconds after which a slice is not continued.
+        """
+        super().__init__()
+
+        self.name = name
+        self.database = database
+        self.write_queue = write_queue
+        self.slice_duration = slice_duration
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        tasks: list[MaintenanceTask] = [Analyze()]
+        if fts_table is not None:
+            tasks.append(FtsMerge(fts_table))
+        tasks.append(IncrementalVacuum())
+        if fts_table is not None:
+            tasks.append(FtsOptimize(fts_table))
+        self.tasks: dict[str, MaintenanceTask] = {task.name: task for task in tasks}
+        self.pending: list[MaintenanceTask] = []
+        self.triggered = False  # Whether the pending tasks were triggered manually, instead of scheduled
+        self.last_cycle: float | None = None  # The time at which all scheduled tasks last finished
+        self._last_own_submission: float | None = None
+
+    def is_idle(self, idle_time: float) -> bool:
+        """
+        Check if no writes other than our own maintenance steps were queued for the given number of seconds.
+        """
+        last_submitted = self.write_queue.last_submitted
+        return last_submitted == self._last_own_submission or monotonic() - last_submitted >= idle_time
+
+    def schedule(self, names: Iterable[str] | None = None, triggered: bool = False) -> None:
+        """
+        Schedule the given tasks, or all scheduled tasks.
+
+        :raises ValueError: if a task does not exist for this database.
+        """
+        if names is None:
+            tasks = [task for task in self.tasks.values() if task.scheduled]
+        else:
+            unknown = set(names) - self.tasks.keys()
+            if unknown:
+                msg = f"Unknown maintenance tasks for {self.name}: {', '.join(sorted(unknown))}"
+                raise ValueError(msg)
+            tasks = [task for task in self.tasks.values() if task.name in names]
+        self.pending.extend(task for task in tasks if task not in self.pending)
+        self.triggered = self.triggered or triggered
+
+    async def run_slice(self) -> None:
+        """
+        Execute the steps of the pending tasks until the slice duration is exceeded, on the write queue.
+        """
+        future = self.write_queue.submit(self._run_steps, monotonic() + self.slice_duration)
+        self._last_own_submission = self.write_queue.last_submitted
+        try:
+            await wrap_future(future)
+        except RuntimeError as e:
+            self._logger.debug("Could not run the maintenance of %s: %s", self.name, e)  # The database is shut down
+
+    def _run_steps(self, deadline: float) -> None:
+        """
+        Execute steps of the pending tasks until they are done or the deadline has passed.
+        """
+        while self.pending and monotonic() < deadline:
+            task = self.pending[0]
+            if not task.status.in_progress:
+                task.start()
+            started = monotonic()
+            try:
+                done = task.step(self.database)
+                error = None
+            except Exception as e:
+                self._logger.warning("Maintenance task %s of %s failed: %s: %s", task.name, self.name,
+                                     type(e).__name__, e)
+                done, error = True, f"{type(e).__name__}: {e}"
+            task.status.last_duration += monotonic() - started
+            task.status.last_steps += 1
+            if done:
+                task.finish(error)
+                self.pending.pop(0)
+                self._logger.info("Maintenance task %s of %s finished in %.3f seconds, releasing %d bytes", task.name,
+                                  self.name, task.status.last_duration, task.status.reclaimed_bytes)
+        if not self.pending:
+            if not self.triggered:
+                self.last_cycle = time()
+            self.triggered = False
+
+    def get_status(self) -> dict:
+        """
+        Get the status of the maintenance of this database.
+        """
+        return {"pending": [task.name for task in self.pending],
+                "triggered": self.triggered,
+                "last_cycle": self.last_cycle,
+                "tasks": [asdict(task.status) for task in self.tasks.values()]}
+
+
+class MaintenanceScheduler:
+    """
+    Schedule the maintenance of databases: every interval, when a database is idle, or when it is triggered.
+    """
+
+    def __init__(self, interval: float = MAINTENANCE_INTERVAL, idle_time: float = MAINTENANCE_IDLE_TIME) -> None:
+        """
+        Create a new scheduler without databases.
+
+        :param interval: the number of seconds between two maintenance cycles of a database, 0 to only run triggered
+                         maintenance.
+        :param idle_time: the number of seconds without writes after which scheduled maintenance may run.
+        """
+        super().__init__()
+
+        self.interval = interval
+        self.idle_time = idle_time
+        self.databases: dict[str, DatabaseMaintenance] = {}
+
+    def add(self, maintenance: DatabaseMaintenance) -> None:
+        """
+        Start maintaining a database.
+        """
+        self.databases[maintenance.name] = maintenance
+
+    def trigger(self, name: str | None = None, tasks: Iterable[str] | None = None) -> None:
+        """
+        Run the given maintenance tasks as soon as possible, without waiting for the database to be idle.
+
+        :param name: the name of the database, or None for all databases.
+        :param tasks: the names of the tasks, or None for all scheduled tasks.
+        :raises KeyError: if the database is not maintained.
+        :raises ValueError: if a task does not exist for the database.
+        """
+        for maintenance in [self.databases[name]] if name is not None else self.databases.values():
+            maintenance.schedule(tasks, triggered=True)
+
+    async def tick(self) -> None:
+        """
+        Run a slice of the pending maintenance of every database that is due, idle or triggered.
+        """
+        now = time()
+        for maintenance in self.databases.values():
+            if (self.interval > 0 and not maintenance.pending
+                    and (maintenance.last_cycle is None or now - maintenance.last_cycle >= self.interval)):
+                maintenance.schedule()
+            if maintenance.pending and (maintenance.triggered or maintenance.is_idle(self.idle_time)):
+                await maintenance.run_slice()
+
+    def get_status(self) -> dict:
+        """
+        Get the maintenance status of all databases.
+        """
+        return {name: maintenance.get_status() for name, maintenance in self.databases.items()}
@@ -3,8 +3,9 @@ from __future__ import annotations
 import random
 from binascii import hexlify, unhexlify
 from datetime import datetime
+from functools import partial
 from struct import unpack
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
 
 from lz4.frame import LZ4FrameCompressor
 from pony import orm
@@ -44,6 +45,7 @@ if TYPE_CHECKING:
     from dataclasses import dataclass
 
     from tribler.core.database.orm_bindings.torrent_state import TorrentState
+    from tribler.core.database.tracker_cache import TrackerCache
     from tribler.core.libtorrent.torrentdef import TorrentDef
 
     @dataclass
@@ -112,8 +114,8 @@ def tdef_to_metadata_dict(tdef: TorrentDef) -> dict:
     }
 
 
-def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, start_index: int = 0,
-                     include_health: bool = False) -> tuple[bytes, int]:
+def entries_to_chunk(metadata_list: list[TorrentMetadata] | list[TorrentRecord], chunk_size: int,
+                     start_index: int = 0, include_health: bool = False) -> tuple[bytes, int]:
     """
     Put serialized data of one or more metadata entries into a single binary chunk. The data is added
     incrementally until it stops fitting into the designated chunk size. The first entry is added
@@ -169,10 +171,97 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
     return result, index + 1
 
 
+class HealthRecord(NamedTuple):
+    """
+    The health of a torrent record.
+    """
+
+    seeders: int | None
+    leechers: int | None
+    last_check: int | None
+
+
+class TorrentRecord(NamedTuple):
+    """
+    A read-only projection of a torrent and its health, which is not tracked by Pony's identity map.
+
+    Records support the same conversions as the TorrentMetadata entities that they are selected from.
+    """
+
+    rowid: int
+    metadata_type: int
+    reserved_flags: int
+    public_key: bytes
+    id_: int
+    origin_id: int
+    timestamp: int
+    signature: bytes | None
+    infohash: bytes
+    size: int
+    torrent_date: datetime
+    title: str
+    tags: str
+    tracker_info: str
+    tag_processor_version: int
+    status: int
+    health: HealthRecord
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the serializable fields of this record.
+        """
+        return {name: getattr(self, name) for name in [*TorrentMetadataPayload.names, "signature"]}
+
+    def to_simple_dict(self) -> dict[str, str | float]:
+        """
+        Return a basic dictionary with information about the torrent.
+        """
+        epoch = datetime.utcfromtimestamp(0)  # noqa: DTZ004
+        return {
+            "name": self.title,
+            "category": self.tags,
+            "infohash": hexlify(self.infohash).decode(),
+            "size": self.size,
+            "num_seeders": self.health.seeders,
+            "num_leechers": self.health.leechers,
+            "last_tracker_check": self.health.last_check,
+            "created": int((self.torrent_date - epoch).total_seconds()),
+            "tag_processor_version": self.tag_processor_version,
+            "type": self.metadata_type,
+            "id": self.id_,
+            "origin_id": self.origin_id,
+            "public_key": hexlify(self.public_key).decode(),
+            "status": self.status,
+        }
+
+    def serialized_health(self) -> bytes:
+        """
+        Serialize the health of this record, in the format of the health items of a chunk.
+        """
+        health = self.health
+        if not health.seeders and not health.leechers and not health.last_check:
+            return b";"
+        return b"%d,%d,%d;" % (health.seeders or 0, health.leechers or 0, health.last_check or 0)
+
+    def serialized(self) -> bytes:
+        """
+        Serialize this record and return the result with its signature (blob output).
+        """
+        kwargs = self.to_dict()
+        payload = TorrentMetadataPayload.from_dict(**kwargs)
+        payload.signature = kwargs.pop("signature", None) or payload.signature
+        return payload.serialized() + payload.signature
+
+
 def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
-                   tag_processor_version: int) -> type[TorrentMetadata]:
+                   tag_processor_version: int, tracker_cache: TrackerCache | None = None,
+                   after_commit: Callable[..., None] | None = None) -> type[TorrentMetadata]:
     """
     Define the torrent metadata binding.
+
+    :param tracker_cache: the cache of the tracker URLs and their rowids, to link torrents to their trackers.
+    :param after_commit: a function that calls a callback once the current transaction is committed, to notify about
+                         new torrents only once they are committed. If None, they are notified immediately.
     """
 
     class TorrentMetadata(db.Entity):
@@ -246,15 +335,34 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
                 self.add_tracker(kwargs["tracker_info"])
 
             if notifier:
-                notifier.notify(Notification.new_torrent_metadata_created,
-                                infohash=kwargs.get("infohash"), title=self.title)
+                notify = partial(notifier.notify, Notification.new_torrent_metadata_created,
+                                 infohash=kwargs.get("infohash"), title=self.title)
+                if after_commit is None:
+                    notify()
+                else:
+                    after_commit(notify)
                 self.tag_processor_version = tag_processor_version
 
         def add_tracker(self, tracker_url: str) -> None:
-            sanitized_url = get_uniformed_tracker_url(tracker_url)
-            if sanitized_url:
+            if tracker_cache is None:
+                sanitized_url = get_uniformed_tracker_url(tracker_url)
+                if sanitized_url:
+                    tracker = db.TrackerState.get_for_update(url=sanitized_url) or db.TrackerState(url=sanitized_url)
+                    self.health.trackers.add(tracker)
+                return
+
+            sanitized_url = tracker_cache.normalize(tracker_url)
+            if not sanitized_url:
+                return
+            rowid = tracker_cache.get(sanitized_url)
+            # Look the tracker up by its primary key, without matching its URL
+            tracker = db.TrackerState.get(rowid=rowid) if rowid is not None else None
+            if tracker is None:
                 tracker = db.TrackerState.get_for_update(url=sanitized_url) or db.TrackerState(url=sanitized_url)
-                self.health.trackers.add(tracker)
+                if tracker.rowid is not None:
+                    # New trackers only get a rowid when they are flushed, they are cached when they are found again
+                    tracker_cache.add(sanitized_url, tracker.rowid)
+            self.health.trackers.add(tracker)
 
         def before_update(self) -> None:
             self.add_tracker(self.tracker_info)
@@ -0,0 +1,99 @@
+"""
+Continuation tokens for cursor-based pagination of database queries.
+
+A continuation token refers to the position after the last entry of a page. For queries that are sorted by columns,
+the token holds the sort key of that entry (keyset pagination). The next page is then selected with a condition on
+the sort key, instead of an OFFSET that makes SQLite walk all skipped rows. Queries that are ranked in Python, instead
+of being sorted by the database, can only be continued at an offset.
+"""
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from typing import Any
+
+
+def encode_continuation(data: dict[str, Any]) -> str:
+    """
+    Create an opaque continuation token from the given JSON-serializable data.
+    """
+    return urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_continuation(token: str) -> dict[str, Any]:
+    """
+    Get the data of a continuation token.
+
+    :raises ValueError: if the token is malformed.
+    """
+    try:
+        data = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (BinasciiError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        msg = f"Malformed continuation token: {token}"
+        raise ValueError(msg) from e
+    if not isinstance(data, dict):
+        msg = f"Malformed continuation token: {token}"
+        raise ValueError(msg)  # noqa: TRY004
+    return data
+
+
+def key_to_json(value: Any) -> Any:  # noqa: ANN401
+    """
+    Convert a sort key value to a JSON-serializable value.
+    """
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def key_from_json(value: Any, py_type: type) -> Any:  # noqa: ANN401
+    """
+    Convert a JSON value back to a sort key value of the given type.
+
+    :raises ValueError: if the value does not fit the type.
+    """
+    if value is None:
+        return None
+    if py_type is bytes:
+        return bytes.fromhex(value)
+    if py_type is datetime:
+        return datetime.fromisoformat(value)
+    if py_type is str:
+        return str(value)
+    if py_type is int and not isinstance(value, int):
+        msg = f"Invalid sort key: {value}"
+        raise ValueError(msg)
+    return value
+
+
+def keyset_condition(expressions: list[str], values: list[Any], descending: bool) -> str:
+    """
+    Create a Pony query condition that selects the rows that are sorted after the given sort key values.
+
+    The condition refers to the values as ``keyset[<index>]``, so ``keyset`` should be a local variable of the frame
+    that passes the condition to Pony. SQLite sorts NULL values before all other values, the last expression should
+    never be NULL (e.g., the row id).
+
+    :param expressions: the Pony expressions of the sort key, in order of precedence.
+    :param values: the sort key values of the last row of the previous page.
+    :param descending: whether the rows are sorted in descending order.
+    :return: the condition as a Pony query string.
+    """
+    terms = []
+    for i, expression in enumerate(expressions):
+        if descending:
+            if values[i] is None:
+                continue  # Nothing sorts after NULL
+            after = f"{expression} < keyset[{i}]"
+            if i < len(expressions) - 1:
+                after += f" or {expression} is None"
+        else:
+            after = f"{expression} is not None" if values[i] is None else f"{expression} > keyset[{i}]"
+        equal = [f"{expressions[j]} is None" if values[j] is None else f"{expressions[j]} == keyset[{j}]"
+                 for j in range(i)]
+        terms.append(" and ".join([*equal, f"({after})"]))
+    return " or ".join(f"({term})" for term in terms)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from time import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+
+class PopularTorrents:
+    """
+    An in-memory view of the healthiest torrents with a recent health check, which is kept up to date incrementally.
+
+    The view holds up to ``capacity`` torrents, which should be comfortably more than the number of popular torrents
+    that is requested: not every torrent with a known health also has metadata. Torrents that fall out of the view,
+    because they are outranked or because their health check becomes too old, are not tracked anymore. If too few
+    fresh torrents remain, the view is reloaded from the database on the next lookup. If too few of the tracked
+    torrents have metadata and the view is not ``complete``, the caller should fall back to the database.
+    """
+
+    def __init__(self, capacity: int, freshness_period: float,
+                 loader: Callable[[int, float], list[HealthInfo]]) -> None:
+        """
+        Create a new view of the popular torrents.
+
+        :param capacity: the maximum number of torrents to keep track of.
+        :param freshness_period: the number of seconds after which a health check is too old to be considered.
+        :param loader: a function that loads the healthiest torrents, given the maximum number of torrents and the
+                       oldest acceptable health check time.
+        """
+        super().__init__()
+
+        self.capacity = capacity
+        self.freshness_period = freshness_period
+        self.loader = loader
+
+        self.loaded = False
+        self.complete = False  # Whether the view contains all the torrents that qualify
+        self.reloads = 0
+        self._health: dict[bytes, HealthInfo] = {}
+        self._pending: list[HealthInfo] | None = None  # The updates that are processed while the view is loaded
+        self._loading = 0  # The number of threads that are loading the view
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def rank(health: HealthInfo) -> tuple[int, int, int]:
+        """
+        Get the sort key of a torrent: seeders first, then leechers and then the time of the last check.
+        """
+        return health.seeders, health.leechers, health.last_check
+
+    def is_popular(self, health: HealthInfo, oldest_check: float) -> bool:
+        """
+        Check if the given health qualifies a torrent as popular.
+        """
+        return health.last_check >= oldest_check and (health.seeders > 0 or health.leechers > 0)
+
+    def __contains__(self, infohash: bytes) -> bool:
+        """
+        Check if the torrent with the given infohash is tracked by the view.
+        """
+        with self._lock:
+            return infohash in self._health
+
+    def update(self, health: HealthInfo) -> None:
+        """
+        Process new health information of a torrent.
+        """
+        with self._lock:
+            if self._pending is not None:
+                # The view is being (re)loaded, the loaded torrents might not include this update yet
+                self._pending.append(health)
+            if self.loaded:
+                self._update(health)
+
+    def _update(self, health: HealthInfo) -> None:
+        """
+        Process new health information of a torrent, while holding the lock.
+        """
+        if not self.is_popular(health, time() - self.freshness_period):
+            self._health.pop(health.infohash, None)
+            return
+        self._health[health.infohash] = health
+        if len(self._health) > self.capacity:
+            # The evicted torrent might still qualify, so we no longer know all the torrents that qualify.
+            weakest = min(self._health.values(), key=self.rank)
+            del self._health[weakest.infohash]
+            self.complete = False
+
+    def _ranked(self) -> list[bytes]:
+        """
+        Get the infohashes of the tracked torrents, the healthiest first, while holding the lock.
+        """
+        return [health.infohash for health in sorted(self._health.values(), key=self.rank, reverse=True)]
+
+    def _stop_loading(self) -> list[HealthInfo]:
+        """
+        Stop recording the updates for a thread that loaded the view, while holding the lock.
+
+        :return: the updates that were processed while the view was loaded.
+        """
+        pending = self._pending or []
+        self._loading -= 1
+        if not self._loading:
+            self._pending = None
+        return pending
+
+    def get_infohashes(self) -> list[bytes]:
+        """
+        Get the infohashes of the tracked torrents that are still fresh, the healthiest first.
+
+        The torrents are (re)loaded without holding the lock, so updates are not blocked by the database query. The
+        updates that are processed while the torrents are loaded are applied to the loaded torrents afterwards.
+        """
+        with self._lock:
+            oldest_check = time() - self.freshness_period
+            if self.loaded:
+                for health in [h for h in self._health.values() if h.last_check < oldest_check]:
+                    del self._health[health.infohash]
+                if self.complete or len(self._health) >= self.capacity // 2:
+                    return self._ranked()
+            if self._pending is None:
+                self._pending = []
+            self._loading += 1
+
+        try:
+            loaded = self.loader(self.capacity, oldest_check)
+        except Exception:
+            with self._lock:
+                self._stop_loading()
+            raise
+
+        with self._lock:
+            pending = self._stop_loading()
+            self._health = {health.infohash: health for health in loaded if self.is_popular(health, oldest_check)}
+            self.complete = len(loaded) < self.capacity
+            self.loaded = True
+            self.reloads += 1
+            for health in pending:
+                self._update(health)
+            return self._ranked()
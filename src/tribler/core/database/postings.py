@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable, Iterable
+
+
+def contains(posting: array, value: int) -> bool:
+    """
+    Check if a sorted posting list contains the given value.
+    """
+    i = bisect_left(posting, value)
+    return i < len(posting) and posting[i] == value
+
+
+class PostingIndex:
+    """
+    An in-memory inverted index from the objects of knowledge statements (e.g., tags) to the subjects that have them.
+
+    Every object resource has a posting list: the sorted array of the ids of the subject resources for which a
+    statement with this object is shown. Subjects that have all of a number of objects are then found by looking up
+    every subject of the shortest posting list in the other posting lists, instead of with a subquery per object.
+
+    The index is built on first use and then updated as statements become shown or hidden.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[tuple[int, int, str, int]]]) -> None:
+        """
+        Create a new (empty) index.
+
+        :param loader: a function that gives the subject id, object id, object name and object type of every shown
+                       statement, to build the index on first use.
+        """
+        super().__init__()
+
+        self.loader = loader
+
+        self.loaded = False
+        self._postings: dict[int, array] = {}  # Object id -> sorted subject ids
+        self._objects: dict[str, set[int]] = {}  # Lower case object name -> object ids
+        self._resources: dict[int, tuple[str, int]] = {}  # Object id -> object name and type
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Get the number of objects with a posting list.
+        """
+        return len(self._postings)
+
+    def load(self) -> None:
+        """
+        Build the index from all shown statements that the loader gives, if that has not happened yet.
+        """
+        with self._lock:
+            if self.loaded:
+                return
+            subjects: dict[int, list[int]] = {}
+            for subject_id, object_id, object_name, object_type in self.loader():
+                self._add_object(object_id, object_name, object_type)
+                subjects.setdefault(object_id, []).append(subject_id)
+            self._postings = {object_id: array("q", sorted(set(subject_ids)))
+                              for object_id, subject_ids in subjects.items()}
+            self.loaded = True
+
+    def _add_object(self, object_id: int, object_name: str, object_type: int) -> None:
+        """
+        Make an object resource findable by its name.
+        """
+        if object_id not in self._resources:
+            self._resources[object_id] = (object_name, object_type)
+            self._objects.setdefault(object_name.lower(), set()).add(object_id)
+
+    def add(self, subject_id: int, object_id: int, object_name: str, object_type: int) -> None:
+        """
+        Add a statement that became shown.
+
+        Statements that are shown before the index is built are ignored, the loader gives them when it is built.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            self._add_object(object_id, object_name, object_type)
+            posting = self._postings.setdefault(object_id, array("q"))
+            if not contains(posting, subject_id):
+                insort(posting, subject_id)
+
+    def remove(self, subject_id: int, object_id: int) -> None:
+        """
+        Remove a statement that became hidden.
+        """
+        with self._lock:
+            posting = self._postings.get(object_id)
+            if posting is None or not contains(posting, subject_id):
+                return
+            del posting[bisect_left(posting, subject_id)]
+            if not posting:
+                del self._postings[object_id]
+
+    def _get_posting(self, name: str, object_type: int | None, case_sensitive: bool) -> array:
+        """
+        Get the posting list of all objects with the given name and type.
+        """
+        postings = [self._postings[object_id] for object_id in self._objects.get(name.lower(), ())
+                    if object_id in self._postings
+                    and (object_type is None or self._resources[object_id][1] == object_type)
+                    and (not case_sensitive or self._resources[object_id][0] == name)]
+        if len(postings) == 1:
+            return postings[0]
+        return array("q", sorted({subject_id for posting in postings for subject_id in posting}))
+
+    def intersect(self, names: Iterable[str], object_type: int | None = None, case_sensitive: bool = True) -> list[int]:
+        """
+        Get the ids of the subjects that have all the objects with the given names.
+
+        :param names: the names of the objects.
+        :param object_type: the type of the objects, None for any type.
+        :param case_sensitive: whether the names of the objects should match in a case-sensitive manner.
+        :return: the sorted subject ids.
+        """
+        with self._lock:
+            postings = sorted((self._get_posting(name, object_type, case_sensitive) for name in set(names)), key=len)
+            if not postings:
+                return []
+            shortest, *others = postings
+            return [subject_id for subject_id in shortest
+                    if all(contains(posting, subject_id) for posting in others)]
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from time import perf_counter, time
+from typing import TYPE_CHECKING
+
+from pony.orm import db_session
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+    from pony.orm import Database
+
+SLOW_QUERY_THRESHOLD = 0.5  # The number of seconds after which a query is logged as slow
+SLOW_QUERY_LOG_SIZE = 100  # The number of most recent slow queries that is kept
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)  # The upper bounds of the histogram buckets, in seconds
+MAX_QUERY_SHAPES = 1000  # The number of query shapes with a histogram, other queries are counted together
+MAX_LITERAL_LENGTH = 64  # The number of characters of a literal value in a logged query
+PROGRESS_STEPS = 1000  # The number of SQLite virtual machine instructions between two measurements of a statement
+
+OTHER_QUERIES = "<other>"
+
+_LITERAL = re.compile(r"([xX]?')((?:[^']|'')*)'")
+_IN_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def query_shape(sql: str) -> str:
+    """
+    Get the shape of an SQL query: its text without literals, lists of parameters and formatting.
+    """
+    sql = _NUMBER.sub("?", _LITERAL.sub("?", _WHITESPACE.sub(" ", sql).strip()))
+    return _IN_LIST.sub("?, ...", sql)
+
+
+def shorten_literals(sql: str) -> str:
+    """
+    Shorten the long string and blob literals of an SQL query, such that it can still be explained.
+    """
+    def shorten(match: re.Match) -> str:
+        prefix, text = match.groups()
+        if len(text) <= MAX_LITERAL_LENGTH:
+            return match.group(0)
+        if prefix == "'":
+            # Quotes in strings are escaped in pairs: a trailing quote could be the first half of one.
+            return prefix + text[:MAX_LITERAL_LENGTH].rstrip("'") + "...'"
+        return prefix + text[:MAX_LITERAL_LENGTH] + "'"  # An even number of hex digits: a valid, shorter blob
+
+    return _LITERAL.sub(shorten, sql)
+
+
+@dataclass
+class SlowQuery:
+    """
+    A query that took longer than the threshold of the profiler.
+    """
+
+    database: str
+    sql: str  # The query with its arguments, long literals are shortened
+    duration: float
+    timestamp: float
+    thread: str
+    plan: list[str] | None = None  # The lines of the EXPLAIN QUERY PLAN output, explained when the query is requested
+
+
+@dataclass
+class _Statement:
+    """
+    The statement that is running, or ran last, on a profiled connection.
+    """
+
+    sql: str | None = None
+    timestamp: float = 0.0
+    duration: float = 0.0
+    resumed: float = 0.0  # The time at which the statement was last measured
+
+
+@dataclass
+class QueryShapeStats:
+    """
+    The latency histogram of the queries of a single shape.
+    """
+
+    database: str
+    shape: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def add(self, duration: float) -> None:
+        """
+        Count a query of this shape that took the given number of seconds.
+        """
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+
+class QueryProfiler:
+    """
+    Measure the execution time of the statements of Pony databases.
+
+    The latency of every statement is added to the histogram of its shape. Statements that take longer than the
+    threshold are kept in a ring buffer of slow queries, with their arguments inlined, and explained when requested.
+
+    The profiler traces the SQLite connections of a database: the trace callback marks the start of a statement and
+    the progress handler measures it every ``PROGRESS_STEPS`` virtual machine instructions, so the execution time is
+    the time until the last measured instruction. A statement is added when the next statement on its connection
+    starts. SQLite traces the trigger programs of a statement as the statement itself, so they are counted as part of
+    it, and so are consecutive executions of an identical statement.
+    """
+
+    def __init__(self, threshold: float = SLOW_QUERY_THRESHOLD, log_size: int = SLOW_QUERY_LOG_SIZE) -> None:
+        """
+        Create a new profiler without databases.
+
+        :param threshold: the number of seconds after which a query is logged as slow.
+        :param log_size: the number of most recent slow queries to keep.
+        """
+        super().__init__()
+
+        self.threshold = threshold
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=log_size)
+        self.shapes: dict[tuple[str, str], QueryShapeStats] = {}
+        self.databases: dict[str, Database] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def install(self, name: str, database: Database) -> None:
+        """
+        Start measuring the queries of the given database.
+
+        This must be called before the database is bound, as binding opens the first connection.
+
+        :param name: the name of the database in the statistics.
+        """
+        self.databases[name] = database
+
+        @database.on_connect(provider="sqlite")
+        def on_connect(_: Database, connection: Connection) -> None:
+            self.trace(name, connection)
+
+    def trace(self, name: str, connection: Connection) -> None:
+        """
+        Start measuring the statements of the given connection.
+        """
+        statement = _Statement()
+
+        def on_statement(sql: str) -> None:
+            now = perf_counter()
+            if sql == statement.sql:
+                statement.resumed = now
+                return
+            if statement.sql is not None:
+                self.finish(name, statement)
+            statement.sql = None if sql.startswith("EXPLAIN") else sql
+            statement.timestamp = time()
+            statement.duration = 0.0
+            statement.resumed = now
+
+        def on_progress() -> int:
+            now = perf_counter()
+            statement.duration += now - statement.resumed
+            statement.resumed = now
+            return 0
+
+        connection.set_trace_callback(on_statement)
+        connection.set_progress_handler(on_progress, PROGRESS_STEPS)
+
+    def finish(self, database: str, statement: _Statement) -> None:
+        """
+        Add a statement that is no longer running.
+        """
+        self.add(database, statement.sql, statement.duration)
+        if statement.duration >= self.threshold:
+            self.add_slow_query(SlowQuery(database, shorten_literals(statement.sql), statement.duration,
+                                          statement.timestamp, threading.current_thread().name))
+
+    def explain(self, query: SlowQuery) -> list[str]:
+        """
+        Get the query plan of a select query.
+        """
+        database = self.databases.get(query.database)
+        if database is None or not query.sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            return []
+        try:
+            with db_session:
+                rows = database.execute("EXPLAIN QUERY PLAN " + query.sql.replace("$", "$$")).fetchall()
+        except Exception as e:
+            self._logger.warning("Unable to explain query: %s: %s", type(e).__name__, e)
+            return []
+        depths = {0: -1}
+        plan = []
+        for node_id, parent_id, _, detail in rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            plan.append("  " * depths[node_id] + detail)
+        return plan
+
+    def add(self, database: str, sql: str, duration: float) -> None:
+        """
+        Add the latency of a query to the histogram of its shape.
+        """
+        key = (database, query_shape(sql))
+        with self._lock:
+            stats = self.shapes.get(key)
+            if stats is None:
+                if len(self.shapes) >= MAX_QUERY_SHAPES:
+                    key = (database, OTHER_QUERIES)
+                stats = self.shapes.setdefault(key, QueryShapeStats(*key))
+            stats.add(duration)
+
+    def add_slow_query(self, query: SlowQuery) -> None:
+        """
+        Log a slow query.
+        """
+        self._logger.info("Slow query on %s (%.3f seconds): %s", query.database, query.duration, query_shape(query.sql))
+        with self._lock:
+            self.slow_queries.append(query)
+
+    def get_slow_queries(self) -> list[dict]:
+        """
+        Get the most recent slow queries, the most recent first.
+
+        The queries that were not requested before are explained, which opens a session on their database.
+        """
+        with self._lock:
+            queries = list(reversed(self.slow_queries))
+        for query in queries:
+            if query.plan is None:
+                query.plan = self.explain(query)
+        return [asdict(query) for query in queries]
+
+    def get_histograms(self) -> list[dict]:
+        """
+        Get the latency histograms of all query shapes, the shapes that took the most time first.
+        """
+        with self._lock:
+            shapes = sorted(self.shapes.values(), key=lambda stats: stats.total_time, reverse=True)
+            return [asdict(stats) for stats in shapes]
+
+    def reset(self) -> None:
+        """
+        Forget all measured queries.
+        """
+        with self._lock:
+            self.slow_queries.clear()
+            self.shapes.clear()
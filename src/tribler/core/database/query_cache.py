@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Iterable
+
+QUERY_CACHE_SIZE = 256  # The maximum number of query results to keep
+QUERY_CACHE_TTL = 10.0  # The number of seconds that a query result remains valid, even without invalidation
+
+
+def freeze(value: Any) -> Hashable:  # noqa: ANN401
+    """
+    Convert a query parameter value to a hashable value that compares equal for equal parameters.
+    """
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+class QueryCache:
+    """
+    A bounded LRU cache for query results, of which the entries expire after a fixed time to live.
+
+    Every entry depends on one or more named sources of data, e.g., the torrents or their health. The cache keeps a
+    generation counter per source and invalidating a source bumps its counter: entries that depend on the source and
+    were stored in an earlier generation are treated as misses and are lazily evicted. Entries of other sources are
+    kept. Invalidating without sources invalidates all entries.
+    """
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL) -> None:
+        """
+        Create a new query cache.
+
+        :param max_size: the maximum number of entries, the least recently used entry is evicted first.
+        :param ttl: the number of seconds after which an entry expires.
+        """
+        super().__init__()
+
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.generation = 0  # The generation of all sources
+        self.hits = 0
+        self.misses = 0
+
+        self._generations: dict[str, int] = {}  # The generation per source
+        self._entries: OrderedDict[Hashable, tuple[tuple[str, ...], tuple[int, ...], float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, *sources: str) -> None:
+        """
+        Invalidate all currently cached entries that depend on any of the given sources, or all entries if no sources
+        are given.
+        """
+        with self._lock:
+            if not sources:
+                self.generation += 1
+            for source in sources:
+                self._generations[source] = self._generations.get(source, 0) + 1
+
+    def get_generation(self, sources: Iterable[str] = ()) -> tuple[int, ...]:
+        """
+        Get the current generation of the given sources, to pass to ``put`` after computing a value from them.
+        """
+        with self._lock:
+            return self._get_generation(tuple(sorted(sources)))
+
+    def _get_generation(self, sources: tuple[str, ...]) -> tuple[int, ...]:
+        """
+        Get the current generation of the given sorted sources, while holding the lock.
+        """
+        return (self.generation, *(self._generations.get(source, 0) for source in sources))
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401
+        """
+        Get the value that is cached for the given key.
+
+        :return: the cached value or None if there is no valid entry for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            sources, generation, expires, value = entry
+            if generation != self._get_generation(sources) or expires <= monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: tuple[int, ...],  # noqa: ANN401
+            sources: Iterable[str] = ()) -> None:
+        """
+        Cache a value for the given key.
+
+        The value is only stored if none of its sources were invalidated since it was computed.
+
+        :param generation: the generation of the sources when the computation of the value started.
+        :param sources: the sources that the value depends on.
+        """
+        if self.max_size <= 0:
+            return
+        sources = tuple(sorted(sources))
+        with self._lock:
+            if generation != self._get_generation(sources):
+                return
+            self._entries[key] = (sources, generation, monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries, including entries that are no longer valid.
+        """
+        return len(self._entries)
@@ -5,9 +5,11 @@ Author(s): Jelle Roozenburg, Arno Bakker, Alexander Kozlovsky
 """
 from __future__ import annotations
 
+import heapq
 import re
 import time
 from collections import deque
+from typing import Sequence
 
 SECONDS_IN_DAY = 60 * 60 * 24
 
@@ -48,6 +50,51 @@ def torrent_rank(query: str, title: str, seeders: int = 0, leechers: int = 0, fr
     return tr * sr * fr
 
 
+def torrent_ranks(query: str, titles: Sequence[str | None], seeders: Sequence[int | None],
+                  leechers: Sequence[int | None], freshness: Sequence[float | None]) -> list[float]:
+    """
+    Calculates search ranks for a batch of torrents that were matched by the same query.
+
+    This gives the same results as calling ``torrent_rank`` for every torrent, but the query is only tokenized once
+    and the torrent properties are passed as parallel arrays, instead of being fed in one row at a time by SQLite.
+
+    :param query: a user-defined query string
+    :param titles: the torrent names
+    :param seeders: the number of seeders for each torrent
+    :param leechers: the number of leechers for each torrent
+    :param freshness: the number of seconds since the creation of each torrent, see ``torrent_rank``
+    :return: the torrent rank values in range [0, 1], in the same order as the input
+    """
+    pat_query = word_re.findall((query or '').lower())
+    findall = word_re.findall
+    return [calculate_rank(pat_query, findall((title or '').lower()))
+            * (seeders_rank(num_seeders or 0, num_leechers or 0) + 9) / 10
+            * (freshness_rank(seconds) + 9) / 10
+            for title, num_seeders, num_leechers, seconds in zip(titles, seeders, leechers, freshness)]
+
+
+def top_ranked(ranks: Sequence[float], k: int | None = None, tiebreakers: Sequence[float] | None = None,
+               priorities: Sequence[int] | None = None) -> list[int]:
+    """
+    Get the indices of the (at most) ``k`` highest ranks, the highest rank first.
+
+    :param ranks: the rank values, e.g. as produced by ``torrent_ranks``
+    :param k: the maximum number of indices to return, or None to return all of them
+    :param tiebreakers: optional values to order equally-ranked entries by, higher values first
+    :param priorities: optional values to order entries by before their rank, higher values first
+    :return: the indices of the best-ranked entries
+    """
+    zeros = [0] * len(ranks)
+    priorities = zeros if priorities is None else priorities
+    tiebreakers = zeros if tiebreakers is None else tiebreakers
+
+    def key(i: int) -> tuple[float, float, float]:
+        return priorities[i], ranks[i], tiebreakers[i]
+
+    if k is None or k >= len(ranks):
+        return sorted(range(len(ranks)), key=key, reverse=True)
+    return heapq.nlargest(k, range(len(ranks)), key=key)
+
 
 def seeders_rank(seeders: int, leechers: int = 0) -> float:
     """
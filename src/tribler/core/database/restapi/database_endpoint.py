@@ -9,7 +9,7 @@ from dataclasses import asdict
 from aiohttp import web
 from aiohttp_apispec import docs, querystring_schema
 from ipv8.REST.schema import schema
-from marshmallow.fields import Boolean, Integer, String
+from marshmallow.fields import Boolean, Dict, Float, Integer, Nested, String
 from pony.orm import db_session
 from typing_extensions import Self, TypeAlias
 
@@ -17,6 +17,7 @@ from tribler.core.database.layers.knowledge import ResourceType
 from tribler.core.database.queries import to_fts_query
 from tribler.core.database.restapi.schema import MetadataSchema, SearchMetadataParameters, TorrentSchema
 from tribler.core.database.serialization import REGULAR_TORRENT
+from tribler.core.executors import Priority
 from tribler.core.notifier import Notification
 from tribler.core.restapi.rest_endpoint import (
     HTTP_BAD_REQUEST,
@@ -29,13 +30,14 @@ from tribler.core.restapi.rest_endpoint import (
 if typing.TYPE_CHECKING:
     from multidict import MultiDictProxy, MultiMapping
 
+    from tribler.core.database.async_database import AsyncDatabase
+    from tribler.core.database.maintenance import MaintenanceScheduler
     from tribler.core.database.store import MetadataStore
-    from tribler.core.database.tribler_database import TriblerDatabase
     from tribler.core.libtorrent.download_manager.download_manager import DownloadManager
     from tribler.core.restapi.rest_manager import TriblerRequest
     from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 
-    RequestType: TypeAlias = TriblerRequest[tuple[MetadataStore]]
+    RequestType: TypeAlias = TriblerRequest[tuple[MetadataStore, AsyncDatabase]]
 
 TORRENT_CHECK_TIMEOUT = 20
 
@@ -83,18 +85,21 @@ class DatabaseEndpoint(RESTEndpoint):
         super().__init__(middlewares, client_max_size)
 
         self.mds: MetadataStore | None = None
-        self.required_components = ("mds", )
+        self.async_db: AsyncDatabase | None = None
+        self.required_components = ("mds", "async_db")
 
         self.download_manager: DownloadManager | None = None
         self.torrent_checker: TorrentChecker | None = None
-        self.tribler_db: TriblerDatabase | None = None
+        self.maintenance: MaintenanceScheduler | None = None
 
         self.app.add_routes(
             [
                 web.get("/torrents/{infohash}/health", self.get_torrent_health),
                 web.get("/torrents/popular", self.get_popular_torrents),
                 web.get("/search/local", self.local_search),
-                web.get("/search/completions", self.completions)
+                web.get("/search/completions", self.completions),
+                web.get("/maintenance", self.get_maintenance_status),
+                web.post("/maintenance", self.trigger_maintenance)
             ]
         )
 
@@ -122,26 +127,27 @@ class DatabaseEndpoint(RESTEndpoint):
             sanitized["channel_pk"] = unhexlify(parameters["channel_pk"])
         if "origin_id" in parameters:
             sanitized["origin_id"] = int(parameters["origin_id"])
+        if "continuation" in parameters:
+            sanitized["continuation"] = parameters["continuation"]
         if "popular" in parameters and parse_bool(parameters.get("popular", "false")):
             sanitized["sort_by"] = "HEALTH"
         return sanitized
 
-    @db_session
-    def add_statements_to_metadata_list(self, contents_list: list[dict]) -> None:
+    async def add_statements_to_metadata_list(self, contents_list: list[dict]) -> None:
         """
         Load statements from the database and attach them to the torrent descriptions in the content list.
         """
-        if self.tribler_db is None:
+        if self.async_db is None or self.async_db.tribler_db is None:
             self._logger.error("Cannot add statements to metadata list: tribler_db is not set in %s",
                                self.__class__.__name__)
             return
-        for torrent in contents_list:
-            if torrent["type"] == REGULAR_TORRENT:
-                raw_statements = self.tribler_db.knowledge.get_simple_statements(
-                    subject_type=ResourceType.TORRENT,
-                    subject=torrent["infohash"]
-                )
-                torrent["statements"] = [asdict(stmt) for stmt in raw_statements]
+        torrents = [torrent for torrent in contents_list if torrent["type"] == REGULAR_TORRENT]
+        statements = await self.async_db.get_simple_statements_bulk(
+            subjects=[torrent["infohash"] for torrent in torrents],
+            subject_type=ResourceType.TORRENT
+        )
+        for torrent in torrents:
+            torrent["statements"] = [asdict(stmt) for stmt in statements.get(torrent["infohash"], [])]
 
     @docs(
         tags=["Metadata"],
@@ -230,11 +236,11 @@ class DatabaseEndpoint(RESTEndpoint):
         if t_filter := request.query.get("filter"):
             sanitized["txt_filter"] = t_filter
 
-        with db_session:
-            contents_list = [entry.to_simple_dict() for entry in request.context[0].get_entries(**sanitized)]
+        records = await request.context[1].get_entry_records(**sanitized)
+        contents_list = [record.to_simple_dict() for record in records]
 
         self.add_download_progress_to_metadata_list(contents_list)
-        self.add_statements_to_metadata_list(contents_list)
+        await self.add_statements_to_metadata_list(contents_list)
         response_dict = {
             "results": contents_list,
             "first": sanitized["first"],
@@ -256,6 +262,8 @@ class DatabaseEndpoint(RESTEndpoint):
                         "sort_by": String(),
                         "sort_desc": Integer(),
                         "total": Integer(),
+                        "total_approximate": Boolean(),
+                        "continuation": String(),
                     }
                 )
             }
@@ -272,7 +280,8 @@ class DatabaseEndpoint(RESTEndpoint):
         except (ValueError, KeyError):
             return RESTResponse({"error": "Error processing request parameters"}, status=HTTP_BAD_REQUEST)
 
-        if self.tribler_db is None:
+        mds, async_db = request.context
+        if async_db.tribler_db is None:
             return RESTResponse({"error": "Tribler DB not initialized"}, status=HTTP_NOT_FOUND)
 
         include_total = request.query.get("include_total", "")
@@ -286,40 +295,42 @@ class DatabaseEndpoint(RESTEndpoint):
         sanitized["txt_filter"] = fts
         self._logger.info("FTS: %s", fts)
 
-        mds: MetadataStore = request.context[0]
+        infohash_set: set[str] = set()
 
-        def search_db() -> tuple[list[dict], int, int]:
+        def search_db() -> tuple[list[dict], int, bool, int, str | None]:
+            if infohash_set:
+                sanitized["infohash_set"] = {bytes.fromhex(s) for s in infohash_set}
             with db_session:
-                pony_query = mds.get_entries(**sanitized)
-                search_results = [r.to_simple_dict() for r in pony_query]
+                records = mds.get_entry_records(**sanitized)
+                search_results = [r.to_simple_dict() for r in records]
+                continuation = mds.get_continuation_token(records, **sanitized)
                 if include_total:
-                    total = mds.get_total_count(**sanitized)
+                    total, total_approximate = mds.get_total_count_estimate(**sanitized)
                     max_rowid = mds.get_max_rowid()
                 else:
-                    total = max_rowid = None
+                    total = total_approximate = max_rowid = None
             if self.download_manager is not None:
                 self.download_manager.notifier.notify(Notification.local_query_results,
                                                       query=request.query.get("fts_text"),
                                                       results=list(search_results))
-            return search_results, total, max_rowid
+            return search_results, total, total_approximate, max_rowid, continuation
 
         try:
-            with db_session:
-                if tags:
-                    infohash_set = self.tribler_db.knowledge.get_subjects_intersection(
-                        subjects_type=ResourceType.TORRENT,
-                        objects=set(typing.cast(list[str], tags)),
-                        predicate=ResourceType.TAG,
-                        case_sensitive=False)
-                    if infohash_set:
-                        sanitized["infohash_set"] = {bytes.fromhex(s) for s in infohash_set}
-
-            search_results, total, max_rowid = await mds.run_threaded(search_db)
+            if tags:
+                infohash_set = await async_db.get_subjects_intersection(
+                    subjects_type=ResourceType.TORRENT,
+                    objects=set(typing.cast(list[str], tags)),
+                    predicate=ResourceType.TAG,
+                    case_sensitive=False)
+
+            search_results, total, total_approximate, max_rowid, continuation = await mds.run_threaded_read(
+                search_db, priority=Priority.INTERACTIVE
+            )
         except Exception as e:
             self._logger.exception("Error while performing DB search: %s: %s", type(e).__name__, e)
             return RESTResponse(status=HTTP_BAD_REQUEST)
 
-        self.add_statements_to_metadata_list(search_results)
+        await self.add_statements_to_metadata_list(search_results)
 
         response_dict = {
             "results": search_results,
@@ -327,9 +338,10 @@ class DatabaseEndpoint(RESTEndpoint):
             "last": sanitized["last"],
             "sort_by": sanitized["sort_by"],
             "sort_desc": sanitized["sort_desc"],
+            "continuation": continuation,
         }
         if include_total:
-            response_dict.update(total=total, max_rowid=max_rowid)
+            response_dict.update(total=total, total_approximate=total_approximate, max_rowid=max_rowid)
 
         return RESTResponse(response_dict)
 
@@ -357,5 +369,80 @@ class DatabaseEndpoint(RESTEndpoint):
             return RESTResponse({"error": "query parameter missing"}, status=HTTP_BAD_REQUEST)
 
         keywords = args["q"].strip().lower()
-        results = request.context[0].get_auto_complete_terms(keywords, max_terms=5)
+        results = await request.context[1].get_auto_complete_terms(keywords, max_terms=5)
         return RESTResponse({"completions": results})
+
+    @docs(
+        tags=["Metadata"],
+        summary="Return the status of the maintenance of the databases.",
+        responses={
+            200: {
+                "schema": schema(MaintenanceStatusResponse={
+                    "maintenance": Dict(keys=String, values=Nested(schema(DatabaseMaintenanceStatus={
+                        "pending": [String],
+                        "triggered": Boolean,
+                        "last_cycle": Float,
+                        "tasks": [schema(MaintenanceTaskStatus={
+                            "name": String,
+                            "runs": Integer,
+                            "in_progress": Boolean,
+                            "last_started": Float,
+                            "last_finished": Float,
+                            "last_duration": Float,
+                            "last_steps": Integer,
+                            "reclaimed_bytes": Integer,
+                            "error": String
+                        })]
+                    })))
+                })
+            }
+        }
+    )
+    async def get_maintenance_status(self, _: web.Request) -> RESTResponse:
+        """
+        Return the status of the maintenance of the databases.
+        """
+        if self.maintenance is None:
+            return RESTResponse({"error": "Database maintenance is not available"}, status=HTTP_NOT_FOUND)
+        return RESTResponse({"maintenance": self.maintenance.get_status()})
+
+    @docs(
+        tags=["Metadata"],
+        summary="Run database maintenance as soon as possible, without waiting for the databases to be idle.",
+        parameters=[
+            {
+                "in": "query",
+                "name": "database",
+                "description": "The database to maintain (default: all databases)",
+                "type": "string",
+                "required": False,
+            },
+            {
+                "in": "query",
+                "name": "tasks",
+                "description": "The maintenance tasks to run (default: all scheduled tasks)",
+                "type": "array",
+                "items": {"type": "string"},
+                "required": False,
+            },
+        ],
+        responses={
+            200: {
+                "schema": schema(MaintenanceTriggeredResponse={"triggered": Boolean})
+            }
+        }
+    )
+    async def trigger_maintenance(self, request: web.Request) -> RESTResponse:
+        """
+        Run database maintenance as soon as possible, without waiting for the databases to be idle.
+        """
+        if self.maintenance is None:
+            return RESTResponse({"error": "Database maintenance is not available"}, status=HTTP_NOT_FOUND)
+        name = request.query.get("database")
+        if name is not None and name not in self.maintenance.databases:
+            return RESTResponse({"error": f"Unknown database: {name}"}, status=HTTP_NOT_FOUND)
+        try:
+            self.maintenance.trigger(name, request.query.getall("tasks", None))
+        except ValueError as e:
+            return RESTResponse({"error": str(e)}, status=HTTP_BAD_REQUEST)
+        return RESTResponse({"triggered": True})
@@ -26,6 +26,8 @@ class SearchMetadataParameters(MetadataParameters):
     include_total = Boolean(default=False, description="Include total rows found in query response, expensive if "
                                                        "there is many rows")
     max_rowid = Integer(default=None, description="Only return results with rowid lesser than max_rowid")
+    continuation = String(default=None, description="Continue after the last result of a previous response, instead "
+                                                    "of starting at first")
 
 
 class MetadataSchema(Schema):
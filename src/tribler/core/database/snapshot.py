@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterator, NamedTuple
+
+from ipv8.messaging.serialization import PackError
+from lz4.frame import LZ4FrameFile
+
+from tribler.core.database.serialization import (
+    TorrentMetadataPayload,
+    UnknownBlobTypeException,
+    read_payload_with_offset,
+)
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+SNAPSHOT_MAGIC = b"TRBLSNAP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 5000  # The number of torrents that is exported or imported per transaction
+
+SNAPSHOT_HEADER = struct.Struct(">8sHQ")  # The magic, the version and the number of records
+RECORD_HEADER = struct.Struct(">IQQQ")  # The size of the serialized payload, seeders, leechers and last check
+
+
+class SnapshotFormatError(Exception):
+    """
+    A snapshot file is not a snapshot, has an unsupported version or is corrupt.
+    """
+
+
+class SnapshotRecord(NamedTuple):
+    """
+    A signed torrent and its health, as stored in a snapshot.
+    """
+
+    payload: TorrentMetadataPayload
+    seeders: int
+    leechers: int
+    last_check: int
+
+
+@dataclass
+class SnapshotStats:
+    """
+    The outcome of a snapshot import.
+    """
+
+    records: int = 0  # The number of torrents in the snapshot
+    added: int = 0  # The number of torrents that were new
+    rejected: int = 0  # The number of torrents with a bad signature
+
+
+class SnapshotWriter:
+    """
+    Write torrents and their health to a snapshot file.
+
+    The file format is:
+
+        <magic><version><number of records>
+        <LZ4 frame of records: <payload size><seeders><leechers><last check><serialized payload with signature>>
+
+    The number of records is written when the writer is closed. If the writer is closed because of an exception, the
+    incomplete file is removed.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Create a new writer for the given file.
+        """
+        super().__init__()
+
+        self.path = Path(path)
+        self.count = 0
+        self._file: BinaryIO | None = None
+        self._frame: LZ4FrameFile | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Create the file and write a preliminary header.
+        """
+        self._file = self.path.open("wb")
+        self._file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0))
+        self._frame = LZ4FrameFile(self._file, mode="wb")
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """
+        Finish the file, or remove it if it is incomplete.
+        """
+        self._frame.close()
+        if exc_type is None:
+            self._file.seek(0)
+            self._file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.count))
+        self._file.close()
+        if exc_type is not None:
+            self.path.unlink()
+
+    def write(self, serialized: bytes, seeders: int, leechers: int, last_check: int) -> None:
+        """
+        Write a serialized payload (including its signature) and the health of its torrent.
+        """
+        self._frame.write(RECORD_HEADER.pack(len(serialized), seeders, leechers, last_check) + serialized)
+        self.count += 1
+
+
+class SnapshotReader:
+    """
+    Read the torrents and their health from a snapshot file.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Create a new reader for the given file.
+        """
+        super().__init__()
+
+        self.path = Path(path)
+        self.count = 0
+        self._file: BinaryIO | None = None
+        self._frame: LZ4FrameFile | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Open the file and check its header.
+
+        :raises SnapshotFormatError: if the file is not a snapshot or has an unsupported version.
+        """
+        self._file = self.path.open("rb")
+        try:
+            magic, version, self.count = SNAPSHOT_HEADER.unpack(self._file.read(SNAPSHOT_HEADER.size))
+        except struct.error as e:
+            self._file.close()
+            msg = f"{self.path} is not a snapshot"
+            raise SnapshotFormatError(msg) from e
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._file.close()
+            msg = f"{self.path} is not a snapshot of version {SNAPSHOT_VERSION}"
+            raise SnapshotFormatError(msg)
+        self._frame = LZ4FrameFile(self._file, mode="rb")
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """
+        Close the file.
+        """
+        self._frame.close()
+        self._file.close()
+
+    def _read(self, size: int) -> bytes:
+        """
+        Read exactly the given number of bytes, or nothing at the end of the snapshot.
+
+        :raises SnapshotFormatError: if the snapshot ends in the middle of the bytes or cannot be decompressed.
+        """
+        try:
+            data = self._frame.read(size)
+        except (EOFError, RuntimeError) as e:
+            msg = f"Unable to decompress {self.path}: {e}"
+            raise SnapshotFormatError(msg) from e
+        if data and len(data) != size:
+            msg = f"{self.path} is truncated"
+            raise SnapshotFormatError(msg)
+        return data
+
+    def __iter__(self) -> Iterator[SnapshotRecord]:
+        """
+        Read the records of the snapshot, skipping deprecated payloads.
+
+        :raises SnapshotFormatError: if the snapshot is corrupt.
+        """
+        while header := self._read(RECORD_HEADER.size):
+            size, seeders, leechers, last_check = RECORD_HEADER.unpack(header)
+            serialized = self._read(size)
+            try:
+                payload, _ = read_payload_with_offset(serialized)
+            except (UnknownBlobTypeException, PackError, struct.error) as e:
+                msg = f"{self.path} contains a corrupt payload"
+                raise SnapshotFormatError(msg) from e
+            if isinstance(payload, TorrentMetadataPayload):
+                yield SnapshotRecord(payload, seeders, leechers, last_check)
+
+    def batches(self, size: int = SNAPSHOT_BATCH_SIZE) -> Iterator[list[SnapshotRecord]]:
+        """
+        Read the records of the snapshot in batches of the given size.
+        """
+        batch = []
+        for record in self:
+            batch.append(record)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -1,26 +1,47 @@
 from __future__ import annotations
 
 import enum
+import inspect
 import logging
-import re
+import os
 import threading
-from asyncio import get_running_loop
-from dataclasses import dataclass, field
+from asyncio import gather, get_running_loop, wrap_future
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from functools import partial
 from os.path import getsize
 from pathlib import Path
 from time import sleep, time
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Sequence
 
 from lz4.frame import LZ4FrameDecompressor
 from pony import orm
 from pony.orm import Database, db_session, desc, left_join, raw_sql, select
-from pony.orm.dbproviders.sqlite import keep_exception
+from pony.utils import datetime2timestamp
 
+from tribler.core.database.autocomplete import AutoCompleteIndex
+from tribler.core.database.health_buffer import HEALTH_BUFFER_MAX_SIZE, HealthBuffer
+from tribler.core.database.maintenance import enable_incremental_vacuum
 from tribler.core.database.orm_bindings import misc, torrent_metadata, tracker_state
 from tribler.core.database.orm_bindings import torrent_state as torrent_state_
-from tribler.core.database.orm_bindings.torrent_metadata import NULL_KEY_SUBST
-from tribler.core.database.ranks import torrent_rank
+from tribler.core.database.orm_bindings.torrent_metadata import (
+    COMMITTED,
+    NULL_KEY_SUBST,
+    HealthRecord,
+    TorrentRecord,
+    infohash_to_id,
+)
+from tribler.core.database.pagination import (
+    decode_continuation,
+    encode_continuation,
+    key_from_json,
+    key_to_json,
+    keyset_condition,
+)
+from tribler.core.database.popular import PopularTorrents
+from tribler.core.database.query_cache import QueryCache, freeze
+from tribler.core.database.ranks import top_ranked, torrent_ranks
 from tribler.core.database.serialization import (
     CHANNEL_TORRENT,
     COLLECTION_NODE,
@@ -30,16 +51,35 @@ from tribler.core.database.serialization import (
     TorrentMetadataPayload,
     read_payload_with_offset,
 )
+from tribler.core.database.snapshot import (
+    SNAPSHOT_BATCH_SIZE,
+    SnapshotFormatError,
+    SnapshotReader,
+    SnapshotStats,
+    SnapshotWriter,
+)
+from tribler.core.database.tracker_cache import TrackerCache
+from tribler.core.database.write_queue import (
+    WRITE_QUEUE_MAX_BATCH_SIZE,
+    WRITE_QUEUE_MAX_BATCH_WEIGHT,
+    WRITE_QUEUE_MAX_LATENCY,
+    WriteQueue,
+)
+from tribler.core.executors import ExecutorPool, Priority, run_in_executor
+from tribler.core.notifier import Notification
 from tribler.core.torrent_checker.dataclasses import HealthInfo
 
 if TYPE_CHECKING:
-    from sqlite3 import Connection
+    from sqlite3 import Connection, Cursor
 
     from ipv8.types import PrivateKey
     from pony.orm.core import Entity, Query
 
     from tribler.core.database.layers.layer import EntityImpl
     from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.profiler import QueryProfiler
+    from tribler.core.database.snapshot import SnapshotRecord
+    from tribler.core.executors import ExecutorPools
     from tribler.core.notifier import Notifier
 
 
@@ -77,15 +117,47 @@ MAX_BATCH_SIZE = 1000
 
 POPULAR_TORRENTS_FRESHNESS_PERIOD = 60 * 60 * 24  # Last day
 POPULAR_TORRENTS_COUNT = 100
+POPULAR_TORRENTS_TRACKED = 500  # The number of healthiest torrents that are tracked in memory to find popular torrents
+
+FTS_PREFILTER_LIMIT = 20000  # The number of most recent FTS matches that are considered for a text search
+FTS_CANDIDATES_LIMIT = 2500  # The number of best-seeded FTS matches that are ranked for a text search
+
+# The sources of the data that cached query results depend on, see ``QueryCache``
+QUERY_SOURCE_TORRENTS = "torrents"  # The torrents themselves
+QUERY_SOURCE_HEALTH = "health"  # The health of the torrents in the database
+QUERY_SOURCE_POPULAR = "popular"  # The torrents that have metadata and are in the popular torrents view
+
+TOTAL_COUNT_SAMPLE_SIZE = 1000  # Larger total counts are estimated from the row ids of this many matching rows
+
+BULK_PAYLOADS_PER_QUERY = 300  # how many payloads are looked up per query, to stay below the SQLite variable limit
+
+SIGNATURE_VERIFICATION_WORKERS = min(4, os.cpu_count() or 1)  # The number of threads that verify payload signatures
+
+FTS_REBUILD_PENDING = "fts_rebuild_pending"  # The misc key that is set while the FTS triggers are dropped
+FTS_OPTIONS = "fts_options"  # The misc key of the options that the FTS index was created with
+FTS_REBUILD_ROWID = "fts_rebuild_rowid"  # The misc key of the row id up to which the FTS index has been rebuilt
+FTS_REBUILD_BATCH_SIZE = 10000  # The number of torrents that is indexed per transaction while rebuilding the FTS index
+FTS_TOKENIZER = "porter unicode61 remove_diacritics 1"  # The default FTS tokenizer, "trigram" allows substring search
+FTS_PREFIX = "2 3 4 5"  # The default lengths of the prefixes that are indexed to speed up prefix queries
+
+AUTOCOMPLETE_BUILD_ROWID = "autocomplete_build_rowid"  # The misc key of the row id below which torrents are not indexed
+AUTOCOMPLETE_BUILD_BATCH_SIZE = 5000  # The number of torrents that is indexed per transaction while building the index
 
 # This table should never be used from ORM directly.
 # It is created as a VIRTUAL table by raw SQL and
 # maintained by SQL triggers.
 sql_create_fts_table = """
     CREATE VIRTUAL TABLE IF NOT EXISTS FtsIndex USING FTS5
+        (title, {options});"""
+
+# The definition of the FTS table before its options were stored, which is equivalent to the default options
+sql_legacy_fts_table = """
+    CREATE VIRTUAL TABLE FtsIndex USING FTS5
         (title, content='ChannelNode', prefix = '2 3 4 5',
-         tokenize='porter unicode61 remove_diacritics 1');"""
+         tokenize='porter unicode61 remove_diacritics 1')"""
 
+# The FtsIndex never stores the titles itself: it either reads them from ChannelNode (external content) or it does not
+# have them at all (contentless). Therefore, the old titles are passed to the 'delete' command.
 sql_add_fts_trigger_insert = """
     CREATE TRIGGER IF NOT EXISTS fts_ai AFTER INSERT ON ChannelNode
     BEGIN
@@ -95,15 +167,34 @@ sql_add_fts_trigger_insert = """
 sql_add_fts_trigger_delete = """
     CREATE TRIGGER IF NOT EXISTS fts_ad AFTER DELETE ON ChannelNode
     BEGIN
-        DELETE FROM FtsIndex WHERE rowid = old.rowid;
+        INSERT INTO FtsIndex(FtsIndex, rowid, title) VALUES ('delete', old.rowid, old.title);
     END;"""
 
 sql_add_fts_trigger_update = """
-    CREATE TRIGGER IF NOT EXISTS fts_au AFTER UPDATE ON ChannelNode BEGIN
-        DELETE FROM FtsIndex WHERE rowid = old.rowid;
+    CREATE TRIGGER IF NOT EXISTS fts_au AFTER UPDATE OF title ON ChannelNode BEGIN
+        INSERT INTO FtsIndex(FtsIndex, rowid, title) VALUES ('delete', old.rowid, old.title);
         INSERT INTO FtsIndex(rowid, title) VALUES (new.rowid, new.title);
     END;"""
 
+
+def get_fts_options(contentless: bool = False, tokenizer: str = FTS_TOKENIZER, prefix: str = FTS_PREFIX) -> str:
+    """
+    Get the options of the FTS5 table for the given configuration.
+
+    :param contentless: index the titles without a reference to the ChannelNode table, instead of as external content.
+    :param tokenizer: the FTS5 tokenizer and its arguments, e.g., "unicode61 remove_diacritics 2" or "trigram".
+    :param prefix: the space-separated lengths of the prefixes to index, an empty string to index no prefixes.
+    :raises ValueError: if the tokenizer or prefix cannot be used in the table definition.
+    """
+    if "'" in tokenizer or not all(length.isdigit() for length in prefix.split()):
+        msg = f"Invalid FTS tokenizer {tokenizer!r} or prefix {prefix!r}"
+        raise ValueError(msg)
+    options = "content=''" if contentless else "content='ChannelNode', content_rowid='rowid'"
+    if prefix.split():
+        options += f", prefix='{' '.join(prefix.split())}'"
+    return f"{options}, tokenize='{tokenizer}'"
+
+
 sql_add_torrentstate_trigger_after_insert = """
     CREATE TRIGGER IF NOT EXISTS torrentstate_ai AFTER INSERT ON TorrentState
     BEGIN
@@ -130,17 +221,61 @@ class MetadataStore:
     Storage of metadata for channels and torrents.
     """
 
-    def __init__(
+    def __init__(  # noqa: C901, PLR0913, PLR0915
             self,
             db_filename: str,
             private_key: PrivateKey,
             disable_sync: bool = False,
             notifier: Notifier | None = None,
             check_tables: bool = True,
-            db_version: int = CURRENT_DB_VERSION
+            db_version: int = CURRENT_DB_VERSION,
+            *,
+            wal_mode: bool = False,
+            read_pool_size: int = 4,
+            mmap_size: int = 0,
+            cache_size: int | None = None,
+            bulk_ingest: bool = False,
+            write_max_latency: float = WRITE_QUEUE_MAX_LATENCY,
+            write_batch_size: int = WRITE_QUEUE_MAX_BATCH_SIZE,
+            write_batch_weight: int = WRITE_QUEUE_MAX_BATCH_WEIGHT,
+            buffer_health: bool = False,
+            health_buffer_size: int = HEALTH_BUFFER_MAX_SIZE,
+            fts_contentless: bool = False,
+            fts_tokenizer: str = FTS_TOKENIZER,
+            fts_prefix: str = FTS_PREFIX,
+            defer_fts_rebuild: bool = False,
+            executors: ExecutorPools | None = None,
+            query_profiler: QueryProfiler | None = None
     ) -> None:
         """
         Create a new metadata store.
+
+        :param wal_mode: use write-ahead logging, a pool of persistent read-only connections for searches and a single
+                         persistent connection for threaded writes. This allows readers to proceed concurrently with
+                         the ingestion of remote metadata.
+        :param read_pool_size: the number of read-only connections (and threads) to use in WAL mode.
+        :param mmap_size: the maximum number of bytes of the database file to memory-map (0 disables memory-mapping).
+        :param cache_size: the SQLite page cache size per connection (negative values are in KiB), None to use
+                           the SQLite default.
+        :param bulk_ingest: write the payloads of received mdblobs per batch with raw SQL (see ``process_payloads_bulk``),
+                            instead of creating an ORM entity per payload.
+        :param write_max_latency: the number of seconds that a threaded write may wait for other threaded writes to be
+                                  committed in the same transaction.
+        :param write_batch_size: the maximum number of threaded writes that is committed in one transaction.
+        :param write_batch_weight: the maximum number of payloads and health updates that is committed in one threaded
+                                   write transaction. Larger mdblobs are written in several transactions.
+        :param buffer_health: keep torrent health updates in memory until ``health_buffer`` is flushed, instead of
+                              writing every update immediately.
+        :param health_buffer_size: the number of buffered torrents at which the health buffer is flushed immediately.
+        :param fts_contentless: index the torrent titles in a contentless FTS table (see ``get_fts_options``).
+        :param fts_tokenizer: the tokenizer of the FTS table.
+        :param fts_prefix: the lengths of the prefixes that are indexed in the FTS table.
+        :param defer_fts_rebuild: if the FTS index has to be rebuilt at startup, because its options changed or a
+                                  snapshot import was interrupted, leave it to ``rebuild_fts_index_threaded`` instead
+                                  of rebuilding it in the constructor. Until then, text searches miss torrents.
+        :param executors: the executor pools for threaded reads (without WAL mode), signature verification and
+                          snapshot imports. If None, the store uses its own threads and the default executor.
+        :param query_profiler: the profiler that measures the queries of the store, as the "metadata" database.
         """
         self.notifier = notifier  # Reference to app-level notification service
         self.db_path = db_filename
@@ -152,21 +287,61 @@ class MetadataStore:
         self.batch_size = 10  # reasonable number, a little bit more than typically fits in a single UDP packet
         self.reference_timedelta = timedelta(milliseconds=100)
         self.sleep_on_external_thread = 0.05  # sleep this amount of seconds between batches executed on external thread
+        self.bulk_ingest = bulk_ingest
+        self.fts_contentless = fts_contentless
+        self.fts_options = get_fts_options(fts_contentless, fts_tokenizer, fts_prefix)
+
+        # In WAL mode, threaded reads are executed on dedicated threads that keep their connection open.
+        self.wal_mode = wal_mode
+        self._thread_state = threading.local()
+        # Otherwise, they share the database read pool with other threaded reads.
+        self._own_executors: list[Executor] = []
+        self._read_executor: Executor | None = executors.get("db_read") if executors else None
+        if wal_mode:
+            self._read_executor = ExecutorPool("MetadataStore-read", read_pool_size,
+                                               initializer=self._mark_thread_read_only)
+            self._own_executors.append(self._read_executor)
+
+        # Signatures of received payloads are verified in parallel, before the write transaction is started.
+        if executors:
+            self._verify_executor = executors.get("crypto")
+        else:
+            self._verify_executor = ThreadPoolExecutor(max_workers=SIGNATURE_VERIFICATION_WORKERS,
+                                                       thread_name_prefix="MetadataStore-verify")
+            self._own_executors.append(self._verify_executor)
+        self._import_executor: Executor | None = executors.get("db_write") if executors else None
+        self.rejected_payloads_count = 0
+
+        # Results of ``get_entries`` and ``get_total_count``, invalidated when the torrents or the health that they
+        # depend on change.
+        self.query_cache = QueryCache()
+        self._entries_query_defaults = {name: parameter.default for name, parameter
+                                        in inspect.signature(self.get_entries_query).parameters.items()}
+
+        # The healthiest recently checked torrents, updated whenever torrent health changes.
+        self.popular_torrents = PopularTorrents(POPULAR_TORRENTS_TRACKED, POPULAR_TORRENTS_FRESHNESS_PERIOD,
+                                                self.get_healthiest_torrents)
 
         # We have to dynamically define/init ORM-managed entities here to be able to support
         # multiple sessions in Tribler. ORM-managed classes are bound to the database instance
         # at definition.
         self.db = Database()
+        enable_incremental_vacuum(self.db)
 
         # This attribute is internally called by Pony on startup, though pylint cannot detect it
         # with the static analysis.
         @self.db.on_connect
         def on_connect(_: Database, connection: Connection) -> None:
             cursor = connection.cursor()
-            cursor.execute("PRAGMA journal_mode = DELETE")
+            cursor.execute("PRAGMA journal_mode = WAL" if wal_mode else "PRAGMA journal_mode = DELETE")
             cursor.execute("PRAGMA synchronous = NORMAL")
             cursor.execute("PRAGMA temp_store = MEMORY")
             cursor.execute("PRAGMA foreign_keys = ON")
+            cursor.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+            if cache_size is not None:
+                cursor.execute(f"PRAGMA cache_size = {int(cache_size)}")
+            if getattr(self._thread_state, "read_only", False):
+                cursor.execute("PRAGMA query_only = ON")
 
             # Disable disk sync for special cases
             if disable_sync:
@@ -175,17 +350,18 @@ class MetadataStore:
                 cursor.execute("PRAGMA journal_mode = 0")
                 cursor.execute("PRAGMA synchronous = 0")
 
-            sqlite_rank = keep_exception(torrent_rank)
-            connection.create_function('search_rank', 5, sqlite_rank)
-
         self.MiscData = misc.define_binding(self.db)
 
         self.TrackerState = tracker_state.define_binding(self.db)
         self.TorrentState = torrent_state_.define_binding(self.db)
+        # Torrents are linked to their trackers through the interned tracker URLs.
+        self.tracker_cache = TrackerCache()
         self.TorrentMetadata = torrent_metadata.define_binding(
             self.db,
             notifier=notifier,
-            tag_processor_version=0
+            tag_processor_version=0,
+            tracker_cache=self.tracker_cache,
+            after_commit=self.after_commit
         )
 
         if db_filename == ":memory:":
@@ -195,19 +371,56 @@ class MetadataStore:
             create_db = not Path(db_filename).exists()
             db_path_string = str(db_filename)
 
+        if query_profiler is not None:
+            query_profiler.install("metadata", self.db)
         self.db.bind(provider="sqlite", filename=db_path_string, create_db=create_db, timeout=120.0)
         self.db.generate_mapping(
             create_tables=create_db, check_tables=check_tables
         )  # Must be run out of session scope
+        # The terms of all torrent titles, updated whenever torrents are added.
+        self.autocomplete_index = AutoCompleteIndex(self.db)
         if create_db:
             with db_session(ddl=True):
-                self.db.execute(sql_create_fts_table)
+                self.db.execute(sql_create_fts_table.format(options=self.fts_options))
                 self.create_fts_triggers()
                 self.create_torrentstate_triggers()
+                self.autocomplete_index.create_tables()
 
         if create_db:
             with db_session:
                 self.MiscData(name="db_version", value=str(db_version))
+                self.MiscData(name=FTS_OPTIONS, value=self.fts_options)
+        else:
+            self.migrate_fts_index()
+            self.migrate_autocomplete_index()
+            with db_session:
+                self.tracker_cache.load(self.db.select("rowid, url FROM TrackerState"))
+
+        # Threaded writes are executed on a single writer thread, which commits concurrent writes together.
+        # Their transactions touch a bounded number of entities, however many payloads are ingested.
+        self.write_queue = WriteQueue("MetadataStore", self.db, threaded=db_path_string != ":memory:",
+                                      max_latency=write_max_latency, max_batch_size=write_batch_size,
+                                      max_batch_weight=write_batch_weight)
+        self.tracker_cache.write_queue = self.write_queue
+
+        # A snapshot import or FTS migration may have been interrupted while the FTS triggers were dropped.
+        self.fts_rebuild_pending = False
+        # The torrents that were added before the auto-completion index existed are indexed by
+        # ``build_autocomplete_index``, in batches.
+        self.autocomplete_build_pending = False
+        if not create_db:
+            with db_session:
+                self.autocomplete_build_pending = int(self.get_value(AUTOCOMPLETE_BUILD_ROWID, "0")) > 0
+                self.fts_rebuild_pending = self.get_value(FTS_REBUILD_PENDING) == "1"
+                if self.fts_rebuild_pending and not defer_fts_rebuild:
+                    self._logger.info("Rebuilding the FTS index")
+                    self.resume_fts_triggers()
+
+        # Health updates are coalesced per torrent in memory and flushed in a single transaction, if enabled.
+        self.health_buffer: HealthBuffer | None = None
+        if buffer_health:
+            self.health_buffer = HealthBuffer(self.write_queue, self.write_torrent_health, health_buffer_size,
+                                              on_flushed=partial(self.query_cache.invalidate, QUERY_SOURCE_HEALTH))
 
     def set_value(self, key: str, value: str) -> None:
         """
@@ -274,6 +487,144 @@ class MetadataStore:
         cursor = self.db.get_connection().cursor()
         cursor.execute("insert into FtsIndex(rowid, title) select rowid, title from ChannelNode")
 
+    def rebuild_fts_index(self) -> None:
+        """
+        Rebuild the FTS index from the titles of all torrents, replacing its current contents.
+        """
+        cursor = self.db.get_connection().cursor()
+        if self.fts_contentless:
+            cursor.execute("insert into FtsIndex(FtsIndex) values ('delete-all')")
+            self.fill_fts_index()
+        else:
+            cursor.execute("insert into FtsIndex(FtsIndex) values ('rebuild')")
+
+    def migrate_fts_index(self) -> None:
+        """
+        Recreate the FTS table in place if it was created with other options.
+
+        A table that was created before the options were stored, with the legacy definition, has the default options:
+        these are recorded and only its triggers are replaced. If the options really changed, the new table is empty
+        and the FTS triggers are suspended: the index is filled by ``rebuild_fts_index_batch`` or
+        ``resume_fts_triggers``.
+        """
+        with db_session(ddl=True):
+            options = self.get_value(FTS_OPTIONS)
+            if options is None and self.has_legacy_fts_table():
+                options = get_fts_options()
+                self._logger.info("Recording the options of the legacy FTS index: %s", options)
+                self.set_value(FTS_OPTIONS, options)
+                if self.get_value(FTS_REBUILD_PENDING) != "1":
+                    self.drop_fts_triggers()
+                    self.create_fts_triggers()
+            if options == self.fts_options:
+                return
+            self._logger.info("Migrating the FTS index to the options: %s", self.fts_options)
+            self.suspend_fts_triggers()
+            self.db.execute("DROP TABLE IF EXISTS FtsIndex")
+            self.db.execute(sql_create_fts_table.format(options=self.fts_options))
+            self.set_value(FTS_OPTIONS, self.fts_options)
+
+    def has_legacy_fts_table(self) -> bool:
+        """
+        Check if the FTS table has the definition that it had before its options were stored.
+        """
+        definition = self.db.select("sql FROM sqlite_master WHERE type = 'table' AND name = 'FtsIndex'")
+        return bool(definition) and definition[0].split() == sql_legacy_fts_table.split()
+
+    def migrate_autocomplete_index(self) -> None:
+        """
+        Create the auto-completion index if it did not exist yet.
+
+        The new index is empty: the torrents that are already in the database are indexed by
+        ``build_autocomplete_index``.
+        """
+        with db_session(ddl=True):
+            if self.autocomplete_index.tables_exist():
+                return
+            self._logger.info("Creating the auto-completion index")
+            self.autocomplete_index.create_tables()
+            max_rowid = self.db.select("coalesce(max(rowid), 0) FROM ChannelNode")[0]
+            if max_rowid:
+                self.set_value(AUTOCOMPLETE_BUILD_ROWID, str(max_rowid + 1))
+
+    def build_autocomplete_index(self, batch_size: int = AUTOCOMPLETE_BUILD_BATCH_SIZE) -> bool:
+        """
+        Add the titles of the next batch of torrents that are not yet in the auto-completion index, the newest first.
+
+        :return: whether torrents remain to be indexed.
+        """
+        with db_session:
+            end = int(self.get_value(AUTOCOMPLETE_BUILD_ROWID, "0"))
+            rows = self.db.select("""
+                rowid, title FROM ChannelNode WHERE metadata_type = $REGULAR_TORRENT AND rowid < $end
+                ORDER BY rowid DESC LIMIT $batch_size
+            """, globals={"REGULAR_TORRENT": REGULAR_TORRENT, "end": end, "batch_size": batch_size})
+            self.autocomplete_index.add_titles(title for _, title in rows)
+            end = rows[-1][0] if len(rows) == batch_size else 0
+            self.set_value(AUTOCOMPLETE_BUILD_ROWID, str(end))
+        self.autocomplete_build_pending = end > 0
+        return self.autocomplete_build_pending
+
+    async def build_autocomplete_index_threaded(self) -> None:
+        """
+        Build the auto-completion index on the write queue, one batch per transaction.
+        """
+        while not self._shutting_down and await self.run_threaded(self.build_autocomplete_index):
+            pass
+
+    def suspend_fts_triggers(self) -> None:
+        """
+        Drop the FTS triggers until the FTS index is rebuilt, also if we are shut down in the meantime.
+        """
+        self.set_value(FTS_REBUILD_PENDING, "1")
+        self.set_value(FTS_REBUILD_ROWID, "0")
+        self.drop_fts_triggers()
+        self.fts_rebuild_pending = True
+
+    def resume_fts_triggers(self) -> None:
+        """
+        Create the FTS triggers and rebuild the FTS index, which misses the torrents changed since they were dropped.
+
+        The index is rebuilt in the current transaction: ``rebuild_fts_index_batch`` rebuilds it in batches instead.
+        """
+        self.create_fts_triggers()
+        self.rebuild_fts_index()
+        self.set_value(FTS_REBUILD_PENDING, "0")
+        self.fts_rebuild_pending = False
+
+    def rebuild_fts_index_batch(self, batch_size: int = FTS_REBUILD_BATCH_SIZE) -> bool:
+        """
+        Add the titles of the next batch of torrents to the FTS index while the FTS triggers are suspended.
+
+        The index is cleared before the first batch. Once all torrents are indexed, the FTS triggers are created in the
+        same transaction as the last batch. Until then, text searches only find the torrents that are indexed.
+
+        :return: whether torrents remain to be indexed.
+        """
+        with db_session:
+            last_rowid = int(self.get_value(FTS_REBUILD_ROWID, "0"))
+            cursor = self.db.get_connection().cursor()
+            if last_rowid == 0:
+                cursor.execute("INSERT INTO FtsIndex(FtsIndex) VALUES ('delete-all')")
+            cursor.execute("SELECT rowid, title FROM ChannelNode WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                           (last_rowid, batch_size))
+            rows = cursor.fetchall()
+            cursor.executemany("INSERT INTO FtsIndex(rowid, title) VALUES (?, ?)", rows)
+            if len(rows) == batch_size:
+                self.set_value(FTS_REBUILD_ROWID, str(rows[-1][0]))
+                return True
+            self.create_fts_triggers()
+            self.set_value(FTS_REBUILD_PENDING, "0")
+        self.fts_rebuild_pending = False
+        return False
+
+    async def rebuild_fts_index_threaded(self) -> None:
+        """
+        Rebuild the FTS index on the write queue, one batch per transaction.
+        """
+        while not self._shutting_down and await self.run_threaded(self.rebuild_fts_index_batch):
+            pass
+
     def create_torrentstate_triggers(self) -> None:
         """
         Create the torrent state triggers.
@@ -287,17 +638,60 @@ class MetadataStore:
         Disconnect the connection to the database.
         """
         self._shutting_down = True
+        if self.health_buffer is not None:
+            self.health_buffer.flush()
+        for executor in self._own_executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.write_queue.shutdown()
         self.db.disconnect()
 
+    def _mark_thread_read_only(self) -> None:
+        """
+        Make the connections that are opened on the current thread read-only.
+        """
+        self._thread_state.read_only = True
+
     async def run_threaded(self, func: Callable, *args: Any, **kwargs) -> Any:  # noqa: ANN401
         """
-        Run ``func`` threaded and close DB connection at the end of the execution.
+        Run the writing ``func`` on the single writer thread of the write queue.
+
+        The writer thread keeps its connection open and commits ``func`` together with other concurrent writes, see
+        ``WriteQueue``.
 
         :param func: the function to be executed threaded
         :param args: args for the function call
         :param kwargs: kwargs for the function call
         :return: a result of the func call.
         """
+        return await self.write_queue.write(func, *args, **kwargs)
+
+    def after_commit(self, callback: Callable, *args: Any) -> None:  # noqa: ANN401
+        """
+        Call the given callback once the current write transaction is committed.
+
+        If this thread does not execute an operation of the write queue, its transaction can not be followed and the
+        callback is called immediately.
+        """
+        if not self.write_queue.after_commit(callback, *args):
+            callback(*args)
+
+    async def run_threaded_read(self, func: Callable, *args: Any,  # noqa: ANN401
+                                priority: Priority = Priority.NORMAL, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Run the read-only ``func`` threaded.
+
+        In WAL mode, ``func`` is executed on one of the threads of the read connection pool. These connections are
+        kept open and do not have to wait for concurrent writes. Otherwise, ``func`` is executed on a thread of the
+        database read pool (or the default executor) and the DB connection is closed at the end of the execution.
+
+        :param func: the function to be executed threaded, it should not write to the database
+        :param args: args for the function call
+        :param priority: the priority of the call in the read pool
+        :param kwargs: kwargs for the function call
+        :return: a result of the func call.
+        """
+        if self.wal_mode:
+            return await run_in_executor(self._read_executor, lambda: func(*args, **kwargs), priority=priority)
 
         def wrapper():  # noqa: ANN202
             try:
@@ -307,14 +701,32 @@ class MetadataStore:
                 if not is_main_thread:
                     self.db.disconnect()
 
-        return await get_running_loop().run_in_executor(None, wrapper)
+        return await run_in_executor(self._read_executor, wrapper, priority=priority)
 
-    async def process_compressed_mdblob_threaded(self, compressed_data: bytes, **kwargs) -> list[ProcessingResult]:
+    async def process_compressed_mdblob_threaded(self, compressed_data: bytes,
+                                                 skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
         """
         Decompress the given data in a thread and return a list of uncompressed results.
+
+        Only the database writes are executed on the write queue: the data is decoded and the signatures of its payloads
+        are verified on the crypto executor first, so neither holds the database write lock. The writes are weighted by
+        their number of payloads and health updates and split into chunks of at most ``max_batch_weight`` payloads, so
+        the write queue commits large mdblobs in several transactions.
         """
         try:
-            return await self.run_threaded(self.process_compressed_mdblob, compressed_data, **kwargs)
+            decoded = await run_in_executor(self._verify_executor, self.decode_compressed_mdblob, compressed_data)
+            if decoded is None:
+                return []
+            payloads, health = decoded
+            payloads = await self.verify_payload_signatures_threaded(payloads)
+            writes = []
+            if health:
+                writes.append(self.write_queue.submit_weighted(len(health), self._write_payloads, [], health))
+            chunk_size = self.write_queue.max_batch_weight
+            writes.extend(self.write_queue.submit_weighted(len(chunk), self._write_payloads, chunk, [],
+                                                           skip_personal_metadata_payload)
+                          for chunk in (payloads[i:i + chunk_size] for i in range(0, len(payloads), chunk_size)))
+            return [result for results in await gather(*map(wrap_future, writes)) for result in results]
         except Exception as e:
             self._logger.exception("DB transaction error when tried to process compressed mdblob: %s: %s",
                                    e.__class__.__name__, str(e), exc_info=e)
@@ -325,13 +737,26 @@ class MetadataStore:
         """
         Decompress the given data and return a list of uncompressed results.
         """
+        decoded = self.decode_compressed_mdblob(compressed_data)
+        if decoded is None:
+            return []
+        payloads, health = decoded
+        return self._process_payloads(payloads, health, skip_personal_metadata_payload=skip_personal_metadata_payload)
+
+    def decode_compressed_mdblob(self, compressed_data: bytes) -> tuple[list[TorrentMetadataPayload],
+                                                                        list[HealthInfo]] | None:
+        """
+        Decompress the given data into its payloads and the health of their torrents, without accessing the database.
+
+        :return: the payloads and health or None if the data could not be decompressed.
+        """
         try:
             with LZ4FrameDecompressor() as decompressor:
                 decompressed_data = decompressor.decompress(compressed_data)
                 unused_data = decompressor.unused_data
         except RuntimeError as e:
             self._logger.warning("Unable to decompress mdblob: %s", str(e))
-            return []
+            return None
 
         health_info = None
         if unused_data:
@@ -341,8 +766,37 @@ class MetadataStore:
                 self._logger.warning("Unable to parse health information: %s: %s", type(e).__name__, str(e))
                 raise
 
-        return self.process_squashed_mdblob(decompressed_data, health_info=health_info,
-                                            skip_personal_metadata_payload=skip_personal_metadata_payload)
+        return self.decode_squashed_mdblob(decompressed_data, health_info)
+
+    def decode_squashed_mdblob(self, chunk_data: bytes, health_info: list[tuple[int, int, int]] | None = None
+                               ) -> tuple[list[TorrentMetadataPayload], list[HealthInfo]]:
+        """
+        Split a raw concatenated payloads blob into its payloads and the health of their torrents.
+
+        The health is only used if there is health for every payload.
+        """
+        offset = 0
+        payload_list = []
+        while offset < len(chunk_data):
+            payload, offset = read_payload_with_offset(chunk_data, offset)
+            if payload and isinstance(payload, TorrentMetadataPayload):
+                # Silently ignore deprecated payloads
+                payload_list.append(payload)
+
+        health = []
+        if health_info and len(health_info) == len(payload_list):
+            health = [HealthInfo(payload.infohash, last_check=last_check, seeders=seeders, leechers=leechers)
+                      for payload, (seeders, leechers, last_check) in zip(payload_list, health_info)
+                      if hasattr(payload, "infohash")]
+        return payload_list, health
+
+    async def process_torrent_health_threaded(self, health_list: list[HealthInfo]) -> None:
+        """
+        Write the health of the given torrents on the write queue, as one operation weighted by their number.
+        """
+        if health_list:
+            await wrap_future(self.write_queue.submit_weighted(len(health_list), self._write_payloads, [],
+                                                               health_list))
 
     def process_torrent_health(self, health: HealthInfo) -> bool:
         """
@@ -355,22 +809,95 @@ class MetadataStore:
             self._logger.warning("Invalid health info ignored: %s", str(health))
             return False
 
-        torrent_state = self.TorrentState.get_for_update(infohash=health.infohash)
+        prev_health = self.get_torrent_health(health.infohash)
 
-        if torrent_state and health.should_replace(torrent_state.to_health()):
+        if prev_health and health.should_replace(prev_health):
             self._logger.debug("Update health info %s", str(health))
-            torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
-                              self_checked=False)
+            self.store_torrent_health(replace(health, self_checked=False))
             return False
 
-        if not torrent_state:
+        if not prev_health:
             self._logger.debug("Add health info %s", str(health))
-            self.TorrentState.from_health(health)
+            self.store_torrent_health(health)
             return True
 
         return False
 
-    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,  # noqa: C901
+    @db_session
+    def get_torrent_health(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Get the latest known health of a torrent, which may not have been written to the database yet.
+
+        :return: the health or None if the health of the torrent is unknown.
+        """
+        if self.health_buffer is not None and (health := self.health_buffer.get(infohash)):
+            return health
+        torrent_state = self.TorrentState.get(infohash=infohash)
+        return torrent_state.to_health() if torrent_state else None
+
+    @db_session
+    def store_torrent_health(self, health: HealthInfo) -> None:
+        """
+        Store the health of a torrent, which should replace its known health.
+
+        The health is buffered once the current transaction is committed if health buffering is enabled and written
+        immediately otherwise.
+        """
+        if self.health_buffer is not None:
+            self.after_commit(self.health_buffer.add, health)
+        else:
+            self.write_torrent_health(health)
+        self.on_torrent_health_changed(health)
+
+    def write_torrent_health(self, health: HealthInfo) -> None:
+        """
+        Write the health of a torrent to the database, unless the health in the database should not be replaced.
+        """
+        torrent_state = self.TorrentState.get_for_update(infohash=health.infohash)
+        if not torrent_state:
+            self.TorrentState.from_health(health)
+        elif health.should_replace(torrent_state.to_health()):
+            torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
+                              self_checked=health.self_checked)
+
+    def on_torrent_health_changed(self, health: HealthInfo) -> None:
+        """
+        Update the derived state after the stored health of a torrent has changed.
+
+        The popular torrents are updated once the current transaction is committed. Buffered health invalidates the
+        query cache once it is flushed.
+        """
+        if self.health_buffer is None:
+            self.after_commit(self.query_cache.invalidate, QUERY_SOURCE_HEALTH)
+        self.after_commit(self.popular_torrents.update, health)
+
+    @db_session
+    def get_healthiest_torrents(self, limit: int, oldest_check: float) -> list[HealthInfo]:
+        """
+        Get the health of the torrents with the most seeders and leechers that were checked recently.
+
+        :param limit: the maximum number of torrents to return.
+        :param oldest_check: the oldest time at which the health of a returned torrent was checked.
+        """
+        healthiest = [torrent_state.to_health() for torrent_state in select(
+            health for health in self.TorrentState
+            if health.has_data == 1  # The condition had to be written this way for the partial index to work
+            and health.last_check >= oldest_check and (health.seeders > 0 or health.leechers > 0)
+        ).order_by(
+            lambda health: (desc(health.seeders), desc(health.leechers), desc(health.last_check))
+        ).limit(limit)]
+        if self.health_buffer is None:
+            return healthiest
+
+        health_map = {health.infohash: health for health in healthiest}
+        for health in self.health_buffer.get_all():
+            if self.popular_torrents.is_popular(health, oldest_check):
+                health_map[health.infohash] = health
+            else:
+                health_map.pop(health.infohash, None)
+        return sorted(health_map.values(), key=PopularTorrents.rank, reverse=True)[:limit]
+
+    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,
                                 health_info: list[tuple[int, int, int]] | None = None,
                                 skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
         """
@@ -384,34 +911,36 @@ class MetadataStore:
             imperfections. It only makes sense to use it when this routine runs on a non-reactor thread.
         :return: a list of tuples of (<metadata or payload>, <action type>)
         """
-        offset = 0
-        payload_list = []
-        while offset < len(chunk_data):
-            payload, offset = read_payload_with_offset(chunk_data, offset)
-            if payload and isinstance(payload, TorrentMetadataPayload):
-                # Silently ignore deprecated payloads
-                payload_list.append(payload)
+        payload_list, health = self.decode_squashed_mdblob(chunk_data, health_info)
+        return self._process_payloads(payload_list, health, external_thread, skip_personal_metadata_payload)
 
-        if health_info and len(health_info) == len(payload_list):
+    def _process_payloads(self, payload_list: list[TorrentMetadataPayload], health: list[HealthInfo],
+                          external_thread: bool = False,
+                          skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
+        """
+        Process decoded payloads and the health of their torrents in batches, see ``process_squashed_mdblob``.
+        """
+        # Like the write queue, bound the number of entities per transaction by its maximum batch weight
+        max_batch_weight = self.write_queue.max_batch_weight
+        for start in range(0, len(health), max_batch_weight):
             with db_session:
-                for payload, (seeders, leechers, last_check) in zip(payload_list, health_info):
-                    if hasattr(payload, "infohash"):
-                        health = HealthInfo(payload.infohash, last_check=last_check,
-                                            seeders=seeders, leechers=leechers)
-                        self.process_torrent_health(health)
+                for health_info in health[start:start + max_batch_weight]:
+                    self.process_torrent_health(health_info)
+
+        # Verify all signatures up front, so that this does not happen while we hold the database write lock
+        payload_list = self.verify_payload_signatures(payload_list)
 
         result = []
         total_size = len(payload_list)
         start = 0
         while start < total_size:
-            end = start + self.batch_size
+            end = start + min(self.batch_size, max_batch_weight)
             batch = payload_list[start:end]
             batch_start_time = datetime.now()  # noqa: DTZ005
 
             # We separate the sessions to minimize database locking.
             with db_session(immediate=True):
-                for payload in batch:
-                    result.extend(self.process_payload(payload, skip_personal_metadata_payload))
+                result.extend(self._write_payloads(batch, [], skip_personal_metadata_payload))
 
             # Batch size adjustment
             batch_end_time = datetime.now() - batch_start_time  # noqa: DTZ005
@@ -440,27 +969,32 @@ class MetadataStore:
 
         return result
 
-    @db_session
-    def process_payload(self, payload: TorrentMetadataPayload,
+    def _write_payloads(self, payloads: list[TorrentMetadataPayload], health: list[HealthInfo],
                         skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
         """
-        Write a payload to our database (if necessary).
+        Write the health of torrents and payloads of which the signatures were verified, in the current transaction.
         """
-        # Don't process our own torrents
-        if skip_personal_metadata_payload and payload.public_key == self.my_public_key_bin:
-            return []
+        for health_info in health:
+            self.process_torrent_health(health_info)
+        if self.bulk_ingest:
+            return self.process_payloads_bulk(payloads, skip_personal_metadata_payload, check_signature=False)
+        return [result for payload in payloads
+                for result in self.process_payload(payload, skip_personal_metadata_payload, check_signature=False)]
 
-        # Don't process unknown/deprecated payloads
-        if payload.metadata_type != REGULAR_TORRENT:
-            return []
+    @db_session
+    def process_payload(self, payload: TorrentMetadataPayload, skip_personal_metadata_payload: bool = True,
+                        check_signature: bool = True) -> list[ProcessingResult]:
+        """
+        Write a payload to our database (if necessary).
 
-        # Don't process torrents with a bad signature
-        if payload.has_signature() and not payload.check_signature():
+        :param check_signature: False if the signature of the payload was already verified.
+        """
+        if not self.should_process_payload(payload, skip_personal_metadata_payload, check_signature):
             return []
 
         # Process unsigned torrents
         if payload.public_key == NULL_KEY:
-            node = self.TorrentMetadata.add_ffa_from_dict(payload.to_dict())
+            node = self.add_ffa_from_dict(payload.to_dict())
             return [ProcessingResult(md_obj=node, obj_state=ObjState.NEW_OBJECT)] if node else []
 
         # Do we already know about this object? In that case, we keep the first one (i.e., no versioning).
@@ -470,8 +1004,368 @@ class MetadataStore:
 
         # Process signed torrents
         obj = self.TorrentMetadata.from_payload(payload)
+        self.on_torrents_added([obj.infohash], [obj.title])
         return [ProcessingResult(md_obj=obj, obj_state=ObjState.NEW_OBJECT)]
 
+    def should_process_payload(self, payload: TorrentMetadataPayload, skip_personal_metadata_payload: bool = True,
+                               check_signature: bool = True) -> bool:
+        """
+        Check if a payload should be written to our database at all.
+        """
+        # Don't process our own torrents
+        if skip_personal_metadata_payload and payload.public_key == self.my_public_key_bin:
+            return False
+
+        # Don't process unknown/deprecated payloads
+        if payload.metadata_type != REGULAR_TORRENT:
+            return False
+
+        # Don't process torrents with a bad signature
+        return not check_signature or not payload.has_signature() or payload.check_signature()
+
+    def verify_payload_signatures(self, payloads: list[TorrentMetadataPayload]) -> list[TorrentMetadataPayload]:
+        """
+        Verify the signatures of the given payloads in parallel and drop the payloads with a bad signature.
+
+        The number of dropped payloads is added to ``rejected_payloads_count``.
+
+        :return: the payloads that are unsigned or have a valid signature, in their original order.
+        """
+        if not payloads:
+            return []
+
+        verified = [valid for chunk in self._verify_executor.map(self._verify_chunk, self._verification_chunks(payloads))
+                    for valid in chunk]
+        return self._drop_rejected_payloads(payloads, verified)
+
+    async def verify_payload_signatures_threaded(self, payloads: list[TorrentMetadataPayload]
+                                                 ) -> list[TorrentMetadataPayload]:
+        """
+        Verify the signatures of the given payloads in parallel on the crypto executor, see
+        ``verify_payload_signatures``.
+        """
+        if not payloads:
+            return []
+
+        verified = [valid for chunk in await gather(*(run_in_executor(self._verify_executor, self._verify_chunk, chunk)
+                                                      for chunk in self._verification_chunks(payloads)))
+                    for valid in chunk]
+        return self._drop_rejected_payloads(payloads, verified)
+
+    @staticmethod
+    def _verification_chunks(payloads: list[TorrentMetadataPayload]) -> list[list[TorrentMetadataPayload]]:
+        """
+        Split the given payloads into one chunk per verification worker.
+        """
+        chunk_size = -(-len(payloads) // SIGNATURE_VERIFICATION_WORKERS)
+        return [payloads[i:i + chunk_size] for i in range(0, len(payloads), chunk_size)]
+
+    def _drop_rejected_payloads(self, payloads: list[TorrentMetadataPayload],
+                                verified: list[bool]) -> list[TorrentMetadataPayload]:
+        """
+        Drop the payloads of which the signature is not valid and count them in ``rejected_payloads_count``.
+        """
+        result = [payload for payload, valid in zip(payloads, verified) if valid]
+        rejected = len(payloads) - len(result)
+        if rejected:
+            self._logger.info("Dropped %d payloads with a bad signature", rejected)
+            self.rejected_payloads_count += rejected
+        return result
+
+    @staticmethod
+    def _verify_chunk(payloads: list[TorrentMetadataPayload]) -> list[bool]:
+        """
+        Check if the given payloads are unsigned or have a valid signature.
+        """
+        return [not payload.has_signature() or payload.check_signature() for payload in payloads]
+
+    @db_session
+    def process_payloads_bulk(self, payloads: list[TorrentMetadataPayload], skip_personal_metadata_payload: bool = True,
+                              check_signature: bool = True) -> list[ProcessingResult]:
+        """
+        Write a batch of payloads to our database, with the same outcome as calling ``process_payload`` for each of
+        them.
+
+        Instead of looking up and creating ORM entities one by one, the known torrents are filtered out with a single
+        query and the new torrents, their torrent states and their tracker links are inserted with ``executemany``.
+        The ``new_torrent_metadata_created`` notifications of the new torrents are sent together, with ``notify_many``,
+        once the current transaction is committed.
+
+        The raw inserts bypass the ORM cache: entities that were already loaded in the current ``db_session`` do not
+        see the new torrents. Therefore, this method should get a ``db_session`` of its own.
+        """
+        payloads = [payload for payload in payloads
+                    if self.should_process_payload(payload, skip_personal_metadata_payload, check_signature)]
+        if not payloads:
+            return []
+
+        outcomes, known_rowids, new_payloads = self._add_payloads(payloads)
+        if new_payloads:
+            self.on_torrents_added([payload.infohash for payload in new_payloads],
+                                   [payload.title for payload in new_payloads])
+            if self.notifier:
+                self.after_commit(self.notifier.notify_many, Notification.new_torrent_metadata_created,
+                                  [{"infohash": payload.infohash, "title": payload.title} for payload in new_payloads])
+
+        rowids = [known_rowids[key] for key, _ in outcomes if key in known_rowids]
+        entries = {entry.rowid: entry for query in self._select_by_rowids(rowids) for entry in query}
+        return [ProcessingResult(md_obj=entries[known_rowids[key]], obj_state=obj_state)
+                for key, obj_state in outcomes
+                if key in known_rowids and known_rowids[key] in entries]
+
+    def _add_payloads(self, payloads: list[TorrentMetadataPayload]) -> tuple[list[tuple[tuple[bytes, int], ObjState]],
+                                                                             dict[tuple[bytes, int], int],
+                                                                             list[TorrentMetadataPayload]]:
+        """
+        Insert the given payloads that are not known yet, with raw SQL.
+
+        :return: the outcome per processed payload by its public key and id, the row ids by public key and id, and the
+                 new payloads.
+        """
+        # Unsigned (free-for-all) torrents are stored with an empty public key and an id derived from the infohash.
+        keys = [(b"", infohash_to_id(payload.infohash)) if payload.public_key == NULL_KEY
+                else (payload.public_key, payload.id_) for payload in payloads]
+
+        self.db.flush()  # Raw queries do not see pending ORM changes otherwise
+        cursor = self.db.get_connection().cursor()
+        known_rowids = {}
+        known_infohashes = set()
+        for start in range(0, len(payloads), BULK_PAYLOADS_PER_QUERY):
+            chunk = payloads[start:start + BULK_PAYLOADS_PER_QUERY]
+            chunk_keys = keys[start:start + BULK_PAYLOADS_PER_QUERY]
+            cursor.execute(f"""
+                SELECT rowid, public_key, id_, infohash FROM ChannelNode
+                WHERE infohash IN ({", ".join("?" * len(chunk))})
+                   OR (public_key, id_) IN (VALUES {", ".join(["(?, ?)"] * len(chunk_keys))})
+            """, [payload.infohash for payload in chunk]  # noqa: S608
+                           + [value for key in chunk_keys for value in key])
+            for rowid, public_key, id_, infohash in cursor.fetchall():
+                known_rowids[(public_key, id_)] = rowid
+                known_infohashes.add(infohash)
+
+        # Same as in process_payload: the first known entry wins and unsigned torrents are only added if their
+        # infohash is completely unknown.
+        outcomes = []
+        new_payloads = {}
+        for payload, key in zip(payloads, keys):
+            is_ffa = key[0] == b""
+            if key in known_rowids or key in new_payloads or (is_ffa and payload.infohash in known_infohashes):
+                if not is_ffa:
+                    outcomes.append((key, ObjState.DUPLICATE_OBJECT))
+                continue
+            new_payloads[key] = payload
+            known_infohashes.add(payload.infohash)
+            outcomes.append((key, ObjState.NEW_OBJECT))
+
+        if new_payloads:
+            self._insert_payloads(cursor, new_payloads)
+            new_keys = list(new_payloads)
+            for start in range(0, len(new_keys), BULK_PAYLOADS_PER_QUERY):
+                chunk_keys = new_keys[start:start + BULK_PAYLOADS_PER_QUERY]
+                cursor.execute(f"""
+                    SELECT rowid, public_key, id_ FROM ChannelNode
+                    WHERE (public_key, id_) IN (VALUES {", ".join(["(?, ?)"] * len(chunk_keys))})
+                """, [value for key in chunk_keys for value in key])  # noqa: S608
+                for rowid, public_key, id_ in cursor.fetchall():
+                    known_rowids[(public_key, id_)] = rowid
+        return outcomes, known_rowids, list(new_payloads.values())
+
+    def _insert_payloads(self, cursor: Cursor, payloads: dict[tuple[bytes, int], TorrentMetadataPayload]) -> None:
+        """
+        Insert the given new payloads, keyed by their public key and id, including their health and trackers.
+        """
+        infohashes = list({payload.infohash for payload in payloads.values()})
+        cursor.executemany("""
+            INSERT OR IGNORE INTO TorrentState (infohash, seeders, leechers, last_check, self_checked)
+            VALUES (?, 0, 0, 0, 0)
+        """, [(infohash,) for infohash in infohashes])
+        health_rowids = {}
+        for start in range(0, len(infohashes), BULK_PAYLOADS_PER_QUERY):
+            chunk = infohashes[start:start + BULK_PAYLOADS_PER_QUERY]
+            cursor.execute(f"""
+                SELECT rowid, infohash FROM TorrentState WHERE infohash IN ({", ".join("?" * len(chunk))})
+            """, chunk)  # noqa: S608
+            health_rowids.update({infohash: rowid for rowid, infohash in cursor.fetchall()})
+
+        added_on = datetime2timestamp(datetime.utcnow())  # noqa: DTZ003
+        cursor.executemany("""
+            INSERT OR IGNORE INTO ChannelNode (infohash, size, torrent_date, tracker_info, title, tags, metadata_type,
+                                               reserved_flags, origin_id, public_key, id_, timestamp, signature,
+                                               added_on, status, xxx, health, tag_processor_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, 0)
+        """, [(payload.infohash, payload.size, datetime2timestamp(payload.torrent_date), payload.tracker_info,
+               payload.title, payload.tags, payload.metadata_type, payload.reserved_flags, payload.origin_id,
+               public_key, id_, payload.timestamp, payload.signature if public_key else None, added_on, COMMITTED,
+               health_rowids[payload.infohash]) for (public_key, id_), payload in payloads.items()])
+
+        tracker_urls = {}
+        for payload in payloads.values():
+            tracker_url = self.tracker_cache.normalize(payload.tracker_info) if payload.tracker_info else None
+            if tracker_url:
+                tracker_urls.setdefault(tracker_url, set()).add(health_rowids[payload.infohash])
+        if not tracker_urls:
+            return
+        tracker_rowids = {url: self.tracker_cache.get(url) for url in tracker_urls}
+        new_urls = [url for url, rowid in tracker_rowids.items() if rowid is None]
+        if new_urls:
+            cursor.executemany("INSERT OR IGNORE INTO TrackerState (url, last_check, alive, failures) "
+                               "VALUES (?, 0, 1, 0)", [(url,) for url in new_urls])
+            for start in range(0, len(new_urls), BULK_PAYLOADS_PER_QUERY):
+                chunk = new_urls[start:start + BULK_PAYLOADS_PER_QUERY]
+                cursor.execute(f"""
+                    SELECT rowid, url FROM TrackerState WHERE url IN ({", ".join("?" * len(chunk))})
+                """, chunk)  # noqa: S608
+                for tracker_rowid, url in cursor.fetchall():
+                    tracker_rowids[url] = tracker_rowid
+                    self.tracker_cache.add(url, tracker_rowid)
+        cursor.executemany("""
+            INSERT OR IGNORE INTO TorrentState_TrackerState (torrentstate, trackerstate) VALUES (?, ?)
+        """, [(health_rowid, tracker_rowids[url]) for url, torrents in tracker_urls.items()
+              if tracker_rowids[url] is not None for health_rowid in torrents])
+
+    def export_snapshot(self, path: Path | str, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+        """
+        Write all torrents, with their signatures and health, to a snapshot file.
+
+        :return: the number of exported torrents.
+        """
+        last_rowid = 0
+        with SnapshotWriter(path) as writer:
+            while True:
+                with db_session:
+                    query = self.TorrentMetadata.select(lambda g: g.metadata_type == REGULAR_TORRENT
+                                                        and g.rowid > last_rowid)  # noqa: B023
+                    records = [self.to_record(row) for row in self.project_records(query).order_by(1)[:batch_size]]
+                for record in records:
+                    writer.write(record.serialized(), record.health.seeders or 0, record.health.leechers or 0,
+                                 record.health.last_check or 0)
+                if len(records) < batch_size:
+                    return writer.count
+                last_rowid = records[-1].rowid
+
+    def import_snapshot(self, path: Path | str, batch_size: int = SNAPSHOT_BATCH_SIZE) -> SnapshotStats:
+        """
+        Add the torrents and health of a snapshot file that was written by ``export_snapshot``.
+
+        Like the payloads of received mdblobs, the signatures of the torrents are verified in parallel and only unknown
+        torrents are added. However, the torrents are inserted in large batches with raw SQL, without notifications,
+        and the FTS triggers are dropped during the import: the FTS index is rebuilt once, at the end, in batches.
+
+        The batches are written on the write queue and this method blocks until they are committed. Therefore, it
+        should be called on a thread of its own, except for in-memory databases.
+
+        :raises SnapshotFormatError: if the file is not a valid snapshot, torrents that were read before are kept.
+        """
+        stats = SnapshotStats()
+        with SnapshotReader(path) as reader:
+            stats.records = reader.count
+            self.write_queue.submit(self.suspend_fts_triggers).result()
+            try:
+                for records in reader.batches(batch_size):
+                    health = {record.payload.infohash: record for record in records}
+                    payloads = self.verify_payload_signatures([record.payload for record in records])
+                    stats.rejected += len(records) - len(payloads)
+                    stats.added += self.write_queue.submit(self._import_snapshot_batch, payloads,
+                                                           [health[payload.infohash] for payload in payloads]).result()
+                    if self._shutting_down:
+                        break
+            finally:
+                while self.write_queue.submit(self.rebuild_fts_index_batch).result() and not self._shutting_down:
+                    pass
+        self._logger.info("Imported %d new torrents of %d torrents from %s", stats.added, stats.records, path)
+        return stats
+
+    async def import_snapshot_threaded(self, path: Path | str) -> SnapshotStats | None:
+        """
+        Import a snapshot file in a thread.
+
+        :return: the outcome of the import or None if the file is not a valid snapshot.
+        """
+        try:
+            return await get_running_loop().run_in_executor(self._import_executor, self.import_snapshot, path)
+        except (OSError, SnapshotFormatError) as e:
+            self._logger.warning("Unable to import snapshot %s: %s: %s", path, type(e).__name__, e)
+            return None
+
+    async def import_snapshot_if_empty_threaded(self, path: Path | str) -> SnapshotStats | None:
+        """
+        Import a snapshot file in a thread if there are no torrents yet, to bootstrap a new metadata store.
+
+        The check for torrents is a threaded read as well, so neither blocks the event loop.
+
+        :return: the outcome of the import or None if there are torrents or the file is not a valid snapshot.
+        """
+        if await self.run_threaded_read(self.has_torrents):
+            return None
+        return await self.import_snapshot_threaded(path)
+
+    def _import_snapshot_batch(self, payloads: list[TorrentMetadataPayload], health: list[SnapshotRecord]) -> int:
+        """
+        Insert the unknown torrents of a batch of verified snapshot payloads and update the health of all of them.
+
+        :return: the number of new torrents.
+        """
+        payloads = [payload for payload in payloads if self.should_process_payload(payload, check_signature=False)]
+        if not payloads:
+            return 0
+        _, _, new_payloads = self._add_payloads(payloads)
+
+        cursor = self.db.get_connection().cursor()
+        cursor.executemany("""
+            UPDATE TorrentState SET seeders = ?, leechers = ?, last_check = ?, self_checked = 0
+            WHERE infohash = ? AND last_check < ?
+        """, [(record.seeders, record.leechers, record.last_check, record.payload.infohash, record.last_check)
+              for record in health if record.last_check])
+
+        # The stored health of new and known torrents may have changed, so the popular torrents get the stored health
+        infohashes = [record.payload.infohash for record in health if record.last_check]
+        for start in range(0, len(infohashes), BULK_PAYLOADS_PER_QUERY):
+            chunk = infohashes[start:start + BULK_PAYLOADS_PER_QUERY]
+            cursor.execute(f"""
+                SELECT infohash, seeders, leechers, last_check, self_checked FROM TorrentState
+                WHERE infohash IN ({", ".join("?" * len(chunk))})
+            """, chunk)  # noqa: S608
+            for infohash, seeders, leechers, last_check, self_checked in cursor.fetchall():
+                self.after_commit(self.popular_torrents.update,
+                                  HealthInfo(infohash, seeders=seeders, leechers=leechers, last_check=last_check,
+                                             self_checked=bool(self_checked)))
+        self.on_torrents_added([payload.infohash for payload in new_payloads],
+                               [payload.title for payload in new_payloads])
+        return len(new_payloads)
+
+    @db_session
+    def add_ffa_from_dict(self, metadata: dict) -> TorrentMetadata | None:
+        """
+        Add an unsigned (free-for-all) torrent, if it is not yet known.
+
+        :param metadata: the metadata of the torrent, as used by ``TorrentMetadata.from_dict``
+        :return: the new torrent or None if the torrent was already known.
+        """
+        node = self.TorrentMetadata.add_ffa_from_dict(metadata)
+        if node:
+            self.on_torrents_added([node.infohash], [node.title])
+        return node
+
+    def on_torrents_added(self, infohashes: list[bytes], titles: list[str]) -> None:
+        """
+        Update the derived state of the database after torrents with the given infohashes and titles were added.
+
+        The query cache is invalidated once the torrents are committed, so results that were read before the commit
+        can not be cached as if they include the torrents.
+        """
+        if any(infohash in self.popular_torrents for infohash in infohashes):
+            self.after_commit(self.query_cache.invalidate, QUERY_SOURCE_TORRENTS, QUERY_SOURCE_POPULAR)
+        else:
+            self.after_commit(self.query_cache.invalidate, QUERY_SOURCE_TORRENTS)
+        self.autocomplete_index.add_titles(titles)
+
+    @db_session
+    def has_torrents(self) -> bool:
+        """
+        Check if there are any torrents in the database, without counting them.
+        """
+        return self.TorrentMetadata.select(lambda g: g.metadata_type == REGULAR_TORRENT).exists()
+
     @db_session
     def get_num_torrents(self) -> int:
         """
@@ -502,37 +1396,37 @@ class MetadataStore:
             # of thousands of matching torrents. The ranking of this number of torrents may be very expensive: we need
             # to retrieve each matching torrent info and the torrent state from the database for proper ordering.
             # They are scattered randomly through the entire database file, so fetching all these torrents is slow.
-            # Also, the torrent_rank function used inside the final ORDER BY section is written in Python. It is about
-            # 30 times slower than a possible similar function written in C due to SQLite-Python communication cost.
+            # Also, the torrent_rank function is written in Python, so it should never be called per row by SQLite.
             #
             # To speed up the query, we limit and filter search results in several iterations, and each time apply
             # a more expensive ranking algorithm:
-            #   * First, we quickly fetch at most 10000 of the most recent torrents that match the search criteria
-            #     and ignore older torrents. This way, we avoid sorting all hundreds of thousands of matching torrents
-            #     in degenerative cases. In typical cases, when the text query is specific enough, the number of
-            #     matching torrents is not that big.
-            #   * Then, we sort these 10000 torrents to prioritize torrents with seeders and restrict the number
-            #     of torrents to just 1000.
-            #   * Finally, in the main query, we apply a slow ranking function to these 1000 torrents to show the most
-            #     relevant torrents at the top of the search result list.
+            #   * First, we quickly fetch at most FTS_PREFILTER_LIMIT of the most recent torrents that match the
+            #     search criteria and ignore older torrents. This way, we avoid sorting all hundreds of thousands of
+            #     matching torrents in degenerative cases. In typical cases, when the text query is specific enough,
+            #     the number of matching torrents is not that big.
+            #   * Then, we sort these torrents to prioritize torrents with seeders and restrict the number
+            #     of torrents to just FTS_CANDIDATES_LIMIT.
+            #   * Finally, ``get_entries`` fetches the title and health of these candidates in a single query and
+            #     ranks them all at once in Python (see ``get_ranked_entries``), to show the most relevant torrents at
+            #     the top of the search result list.
             #
-            # This multistep sort+limit sequence allows speedup queries up to two orders of magnitude. To further
-            # speed up full-text search queries, we can rewrite the torrent_rank function to C one day.
+            # This multistep sort+limit sequence allows speedup queries up to two orders of magnitude.
             fts_ids = raw_sql("""
                 SELECT fts.rowid
                 FROM (
-                    SELECT rowid FROM FtsIndex WHERE FtsIndex MATCH $query ORDER BY rowid DESC LIMIT 10000
+                    SELECT rowid FROM FtsIndex WHERE FtsIndex MATCH $query ORDER BY rowid DESC LIMIT $FTS_PREFILTER_LIMIT
                 ) fts
                 LEFT JOIN ChannelNode cn on fts.rowid = cn.rowid
                 LEFT JOIN main.TorrentState ts on cn.health = ts.rowid
                 ORDER BY coalesce(ts.seeders, 0) DESC, fts.rowid DESC
-                LIMIT 1000
+                LIMIT $FTS_CANDIDATES_LIMIT
             """)
         return left_join(g for g in self.TorrentMetadata if g.rowid in fts_ids)
 
     @db_session
-    def get_entries_query(  # noqa: C901, PLR0913
+    def get_entries_query(  # noqa: PLR0913
             self,
+            *,
             metadata_type: int | None = None,
             channel_pk: bytes | None = None,
             hide_xxx: bool = False,
@@ -548,10 +1442,17 @@ class MetadataStore:
             self_checked_torrent: bool | None = None,
             health_checked_after: int | None = None,
             popular: bool | None = None,
+            continuation: str | None = None,
     ) -> Query:
         """
         This method implements REST-friendly way to get entries from the database.
 
+        Note that text searches (``txt_filter``) without an explicit ``sort_by`` are not ordered by relevance here.
+        The relevance ranking is applied by ``get_entries``, on the complete candidate set at once.
+
+        A ``continuation`` token, as given by ``get_continuation_token``, restricts the query to the entries that are
+        sorted after the last entry of the previous page.
+
         :return: PonyORM query object corresponding to the given params.
         """
         # Warning! For Pony magic to work, iteration variable name (e.g. 'g') should be the same everywhere!
@@ -563,14 +1464,20 @@ class MetadataStore:
                 msg = "With `popular=True`, only `metadata_type=REGULAR_TORRENT` is allowed"
                 raise TypeError(msg)
 
-            t = time() - POPULAR_TORRENTS_FRESHNESS_PERIOD
-            return select(
+            # Instead of sorting the whole health table, only consider the healthiest torrents that we keep track of
+            infohashes = self.popular_torrents.get_infohashes()
+            pony_query = select(g for g in self.TorrentMetadata if g.infohash in infohashes)
+            if not self.popular_torrents.complete and pony_query.count() < POPULAR_TORRENTS_COUNT:
+                # Torrents without metadata took the places of torrents with metadata in the view
+                t = time() - POPULAR_TORRENTS_FRESHNESS_PERIOD
+                pony_query = select(
                     g for g in self.TorrentMetadata
                     for health in self.TorrentState
                     if health.has_data == 1  # The condition had to be written this way for the partial index to work
                     and health.last_check >= t and (health.seeders > 0 or health.leechers > 0)
                     and g.health == health
-                ).order_by(
+                )
+            return pony_query.order_by(
                     lambda g: (desc(g.health.seeders), desc(g.health.leechers), desc(g.health.last_check))
                 ).limit(POPULAR_TORRENTS_COUNT)
         else:
@@ -606,6 +1513,15 @@ class MetadataStore:
             pony_query = pony_query.where(lambda g: g.health.has_data == 1  # Has to be written this way for index
                                           and g.health.last_check >= health_checked_after)
 
+        if continuation is not None:
+            pony_query = self.continue_query(pony_query, continuation, sort_by, sort_desc)
+
+        return self.sort_entries_query(pony_query, sort_by, sort_desc)
+
+    def sort_entries_query(self, pony_query: Query, sort_by: str | None, sort_desc: bool) -> Query:
+        """
+        Sort a query of ``get_entries_query``, or a projection thereof, by the given column and then by row id.
+        """
         # Sort the query
         pony_query = pony_query.sort_by("desc(g.rowid)" if sort_desc else "g.rowid")
 
@@ -624,59 +1540,109 @@ class MetadataStore:
             sort_expression = raw_sql(f"g.{sort_by} COLLATE NOCASE" + (" DESC" if sort_desc else ""))
             pony_query = pony_query.sort_by(sort_expression)
 
-        if sort_by is None and txt_filter:
-            """
-            The following call of `sort_by` produces an ORDER BY expression that looks like this:
-
-            ORDER BY
-                case when "g"."metadata_type" = $CHANNEL_TORRENT then 1
-                     when "g"."metadata_type" = $COLLECTION_NODE then 2
-                     else 3 end,
-
-                search_rank(
-                    $QUERY_STRING,
-                    g.title,
-                    torrentstate.seeders,
-                    torrentstate.leechers,
-                    $CURRENT_TIME - strftime('%s', g.torrent_date)
-                ) DESC,
-
-                "torrentstate"."last_check" DESC,
-
-            So, the channel torrents and channel folders are always on top if they are not filtered out.
-            Then regular torrents are selected in order of their relevance according to a search_rank() result.
-            If two torrents have the same search rank, they are ordered by the last time they were checked.
-
-            The search_rank() function is called directly from the SQLite query, but is implemented in Python,
-            it is actually the torrent_rank() function from core/utilities/search_utils.py, wrapped with
-            keep_exception() to return possible exception from SQLite to Python.
-
-            The search_rank() function receives the following arguments:
-              - the current query string (like "Big Buck Bunny");
-              - the title of the current torrent;
-              - the number of seeders;
-              - the number of leechers;
-              - the number of seconds since the torrent's creation time.
-            """
+        return pony_query
 
-            pony_query = pony_query.sort_by(
-                f"""
-                (1 if g.metadata_type == {CHANNEL_TORRENT} else 2 if g.metadata_type == {COLLECTION_NODE} else 3),
-                raw_sql('''search_rank(
-                    $txt_filter, g.title, torrentstate.seeders, torrentstate.leechers,
-                    $int(time()) - strftime('%s', g.torrent_date)
-                ) DESC'''),
-                desc(g.health.last_check)  # just to trigger the TorrentState table inclusion into the left join
-            """
-            )
+    def get_sort_key_columns(self, sort_by: str | None) -> list[tuple[str, type]]:
+        """
+        Get the Pony expressions and types of the columns that ``get_entries_query`` sorts on, before the row id.
 
-        return pony_query
+        Text columns are sorted with the NOCASE collation, which only folds ASCII characters, so they are compared in
+        raw SQL with the same collation. Pony does not compare binary values, so binary columns are compared in raw SQL
+        too.
+
+        :raises ValueError: if the query can not be sorted on the given column.
+        """
+        if sort_by is None:
+            return []
+        if sort_by == "HEALTH":
+            return [("g.health.seeders", int), ("g.health.leechers", int)]
+        attr = getattr(self.TorrentMetadata, sort_by, None)
+        if not isinstance(attr, orm.core.Attribute):
+            msg = f"Unknown sort column: {sort_by}"
+            raise ValueError(msg)  # noqa: TRY004
+        if attr.py_type is str:
+            return [(f"raw_sql('g.{sort_by} COLLATE NOCASE')", str)]
+        if attr.py_type is bytes:
+            return [(f"raw_sql('g.{sort_by}')", bytes)]
+        return [(f"g.{sort_by}", attr.py_type)]
+
+    def continue_query(self, pony_query: Query, continuation: str, sort_by: str | None, sort_desc: bool) -> Query:
+        """
+        Restrict a query to the entries that are sorted after the position of a continuation token.
 
-    async def get_entries_threaded(self, **kwargs) -> list[TorrentMetadata]:
+        :raises ValueError: if the token is malformed or if it belongs to a query with a different order.
+        """
+        data = decode_continuation(continuation)
+        columns = self.get_sort_key_columns(sort_by)
+        keys = data.get("keys")
+        rowid = data.get("rowid")
+        if (data.get("sort_by") != sort_by or data.get("sort_desc") != sort_desc or not isinstance(keys, list)
+                or len(keys) != len(columns) or not isinstance(rowid, int)):
+            msg = f"Continuation token does not match the query: {continuation}"
+            raise ValueError(msg)
+        try:
+            keyset = [key_from_json(key, py_type) for key, (_, py_type) in zip(keys, columns)]
+        except (TypeError, ValueError) as e:
+            msg = f"Malformed continuation token: {continuation}"
+            raise ValueError(msg) from e
+        keyset.append(rowid)
+
+        # The condition refers to the local ``keyset`` variable
+        return pony_query.where(keyset_condition([expression for expression, _ in columns] + ["g.rowid"],
+                                                 keyset, sort_desc))
+
+    def get_continuation_token(self, entries: Sequence[TorrentMetadata], first: int = 1, last: int | None = None,
+                               continuation: str | None = None, **kwargs) -> str | None:
+        """
+        Get the token to fetch the page after the given page of entries, which was fetched with the given arguments.
+
+        The next page is fetched by passing the same arguments to ``get_entries``, with the token as ``continuation``.
+        The token of a query that is sorted by the database holds the sort key of the last entry of the page. Ranked
+        text searches are ordered in Python, so their tokens hold the offset of the next page instead.
+
+        :return: the continuation token, or None if there is no next page.
+        """
+        if not entries or last is None or len(entries) < last - (first or 1) + 1 or kwargs.get("popular"):
+            return None
+        if kwargs.get("txt_filter") and kwargs.get("sort_by") is None:
+            offset = self.get_continuation_offset(continuation) if continuation else (first or 1) - 1
+            return encode_continuation({"offset": offset + len(entries)})
+
+        sort_by = kwargs.get("sort_by")
+        entry = entries[-1]
+        if sort_by is None:
+            keys = []
+        elif sort_by == "HEALTH":
+            keys = [entry.health.seeders, entry.health.leechers] if entry.health else [None, None]
+        else:
+            keys = [key_to_json(getattr(entry, sort_by))]
+        return encode_continuation({"sort_by": sort_by, "sort_desc": kwargs.get("sort_desc", True),
+                                    "keys": keys, "rowid": entry.rowid})
+
+    @staticmethod
+    def get_continuation_offset(continuation: str) -> int:
+        """
+        Get the offset of the next page from the continuation token of a ranked text search.
+
+        :raises ValueError: if the token is malformed.
+        """
+        offset = decode_continuation(continuation).get("offset")
+        if not isinstance(offset, int) or offset < 0:
+            msg = f"Continuation token does not match the query: {continuation}"
+            raise ValueError(msg)
+        return offset
+
+    async def get_entries_threaded(self, priority: Priority = Priority.NORMAL, **kwargs) -> list[TorrentMetadata]:
         """
         Retrieve entries in a thread and return a list of results.
         """
-        return await self.run_threaded(self.get_entries, **kwargs)
+        return await self.run_threaded_read(self.get_entries, priority=priority, **kwargs)
+
+    async def get_entry_records_threaded(self, priority: Priority = Priority.NORMAL, **kwargs) -> list[TorrentRecord]:
+        """
+        Retrieve entry records in a thread and return a list of results.
+        """
+        return await self.run_threaded_read(self.get_entry_records, priority=priority, **kwargs)
 
     @db_session
     def get_entries(self, first: int = 1, last: int | None = None, **kwargs) -> list[TorrentMetadata]:
@@ -684,31 +1650,271 @@ class MetadataStore:
         Get some torrents. Optionally sort the results by a specific field, or filter the channels based
         on a keyword/whether you are subscribed to it.
 
+        Results are cached by their row ids in the query cache, so repeated calls with the same parameters only
+        have to load the entities of the page.
+
+        If a ``continuation`` token is given, the page of ``last - first + 1`` entries after the position of the
+        token is returned, instead of the entries ``first`` through ``last``.
+
         :return: A list of class members
         """
-        pony_query = self.get_entries_query(**kwargs)
-        result = pony_query[(first or 1) - 1: last]
+        key = self._query_cache_key("entries", first=first or 1, last=last, **kwargs)
+        rowids = self.query_cache.get(key)
+        if rowids is not None:
+            result = self.get_entries_by_rowids(rowids)
+        else:
+            sources = self._query_cache_sources(kwargs)
+            generation = self.query_cache.get_generation(sources)
+            result = self._get_entries_page(first, last, kwargs, records=False)
+            self.query_cache.put(key, tuple(entry.rowid for entry in result), generation, sources)
         for entry in result:
             # ACHTUNG! This is necessary in order to load entry.health inside db_session,
             # to be able to perform successfully `entry.to_simple_dict()` later
             entry.to_simple_dict()
         return result
 
+    @db_session
+    def get_entry_records(self, first: int = 1, last: int | None = None, **kwargs) -> list[TorrentRecord]:
+        """
+        Get the same torrents as ``get_entries``, as read-only records instead of entities.
+
+        The records are projected from a single query that selects only the columns of the torrents and their health,
+        so Pony does not have to create (and keep track of) an entity for every torrent and its health. Health that is
+        still buffered replaces the health of the records (but the records are selected and sorted by the database).
+
+        :return: A list of torrent records
+        """
+        key = self._query_cache_key("entries", first=first or 1, last=last, **kwargs)
+        rowids = self.query_cache.get(key)
+        if rowids is not None:
+            return self.with_buffered_health(self.get_records_by_rowids(rowids))
+        sources = self._query_cache_sources(kwargs)
+        generation = self.query_cache.get_generation(sources)
+        result = self._get_entries_page(first, last, kwargs, records=True)
+        self.query_cache.put(key, tuple(record.rowid for record in result), generation, sources)
+        return self.with_buffered_health(result)
+
+    def with_buffered_health(self, records: list[TorrentRecord]) -> list[TorrentRecord]:
+        """
+        Replace the health of the given records with the health that is not written to the database yet.
+        """
+        if self.health_buffer is None or not len(self.health_buffer):
+            return records
+        result = []
+        for record in records:
+            health = self.health_buffer.get(record.infohash)
+            result.append(record if health is None
+                          else record._replace(health=HealthRecord(health.seeders, health.leechers, health.last_check)))
+        return result
+
+    def _get_entries_page(self, first: int | None, last: int | None, kwargs: dict[str, Any],
+                          records: bool) -> list[TorrentMetadata] | list[TorrentRecord]:
+        """
+        Get a page of torrents that match the given ``get_entries_query`` parameters, as entities or as records.
+        """
+        continuation = kwargs.get("continuation")
+        if continuation is None:
+            start, stop = (first or 1) - 1, last
+        else:
+            start, stop = 0, None if last is None else last - (first or 1) + 1
+
+        if kwargs.get("txt_filter") and kwargs.get("sort_by") is None:
+            if continuation is not None:
+                offset = self.get_continuation_offset(kwargs.pop("continuation"))
+                start, stop = offset, None if stop is None else offset + stop
+            rowids = self.get_ranked_rowids(start + 1, stop, **kwargs)
+            return self.get_records_by_rowids(rowids) if records else self.get_entries_by_rowids(rowids)
+
+        pony_query = self.get_entries_query(**kwargs)
+        if not records:
+            return pony_query[start:stop]
+        if kwargs.get("popular"):
+            # The popular torrents are limited before they are sorted, we can not project that
+            return self.get_records_by_rowids([entry.rowid for entry in pony_query[start:stop]])
+        pony_query = self.sort_entries_query(self.project_records(pony_query.order_by(None)),
+                                             kwargs.get("sort_by"), kwargs.get("sort_desc", True))
+        return [self.to_record(row) for row in pony_query[start:stop]]
+
+    @db_session
+    def get_ranked_entries(self, first: int = 1, last: int | None = None, **kwargs) -> list[TorrentMetadata]:
+        """
+        Get the torrents that match a text search, ordered by their relevance to the search text.
+
+        :return: A list of class members, the most relevant first
+        """
+        return self.get_entries_by_rowids(self.get_ranked_rowids(first, last, **kwargs))
+
+    @db_session
+    def get_ranked_rowids(self, first: int = 1, last: int | None = None, **kwargs) -> list[int]:
+        """
+        Get the row ids of the torrents that match a text search, ordered by their relevance to the search text.
+
+        Instead of calling the ranking function from SQLite for every candidate row, we fetch the columns that the
+        ranking depends on for all candidates in one query and rank them in a single batch. Only the torrents of the
+        requested page have to be loaded afterward.
+
+        Like before, channels come first, then collections, and then regular torrents in order of their relevance.
+
+        :return: A list of row ids, the most relevant first
+        """
+        pony_query = self.get_entries_query(**kwargs).order_by(None)
+        sources = self._query_cache_sources(kwargs)
+        generation = self.query_cache.get_generation(sources)
+        candidates = left_join((g.rowid, g.metadata_type, g.title, g.health.seeders, g.health.leechers,
+                                g.torrent_date, g.health.last_check) for g in pony_query)[:]
+
+        # We have all candidates at hand, so the total count of this search comes for free
+        count_kwargs = {key: value for key, value in kwargs.items() if key not in ("sort_by", "sort_desc")}
+        self.query_cache.put(self._query_cache_key("total", **count_kwargs), len(candidates), generation, sources)
+        if not candidates:
+            return []
+        rowids, metadata_types, titles, seeders, leechers, torrent_dates, last_checks = zip(*candidates)
+
+        now = time()
+        epoch = datetime.utcfromtimestamp(0)  # noqa: DTZ004
+        freshness = [now - (torrent_date - epoch).total_seconds() if torrent_date else None
+                     for torrent_date in torrent_dates]
+        ranks = torrent_ranks(kwargs["txt_filter"], titles, seeders, leechers, freshness)
+        priorities = [2 if metadata_type == CHANNEL_TORRENT else 1 if metadata_type == COLLECTION_NODE else 0
+                      for metadata_type in metadata_types]
+        page = top_ranked(ranks, last, tiebreakers=[last_check or 0 for last_check in last_checks],
+                          priorities=priorities)
+        return [rowids[i] for i in page[(first or 1) - 1:]]
+
+    def _select_by_rowids(self, rowids: list[int]) -> list[Query]:
+        """
+        Select the torrents with the given row ids, with one query per ``BULK_PAYLOADS_PER_QUERY`` row ids.
+        """
+        def select(chunk: list[int]) -> Query:
+            return self.TorrentMetadata.select(lambda g: g.rowid in chunk)
+
+        return [select(rowids[start:start + BULK_PAYLOADS_PER_QUERY])
+                for start in range(0, len(rowids), BULK_PAYLOADS_PER_QUERY)]
+
+    @db_session
+    def get_entries_by_rowids(self, rowids: Sequence[int]) -> list[TorrentMetadata]:
+        """
+        Load the torrents with the given row ids, in chunks of row ids.
+
+        :return: A list of class members, in the order of the given row ids (unknown row ids are skipped)
+        """
+        if not rowids:
+            return []
+        rowids = list(rowids)
+        entries = {entry.rowid: entry for query in self._select_by_rowids(rowids) for entry in query}
+        return [entries[rowid] for rowid in rowids if rowid in entries]
+
+    @db_session
+    def get_records_by_rowids(self, rowids: Sequence[int]) -> list[TorrentRecord]:
+        """
+        Select the records of the torrents with the given row ids, in chunks of row ids.
+
+        :return: A list of torrent records, in the order of the given row ids (unknown row ids are skipped)
+        """
+        if not rowids:
+            return []
+        rowids = list(rowids)
+        records = {record.rowid: record for query in self._select_by_rowids(rowids)
+                   for record in map(self.to_record, self.project_records(query))}
+        return [records[rowid] for rowid in rowids if rowid in records]
+
+    @staticmethod
+    def project_records(pony_query: Query) -> Query:
+        """
+        Project a query of torrents to the columns of their records, see ``to_record``.
+        """
+        return left_join((g.rowid, g.metadata_type, g.reserved_flags, g.public_key, g.id_, g.origin_id, g.timestamp,
+                          g.signature, g.infohash, g.size, g.torrent_date, g.title, g.tags, g.tracker_info,
+                          g.tag_processor_version, g.status, g.health.seeders, g.health.leechers, g.health.last_check)
+                         for g in pony_query)
+
+    @staticmethod
+    def to_record(row: tuple) -> TorrentRecord:
+        """
+        Convert a row of a ``project_records`` query to a torrent record.
+        """
+        return TorrentRecord(*row[:-3], HealthRecord(*row[-3:]))
+
     @db_session
     def get_total_count(self, **kwargs) -> int | None:
         """
         Get total count of torrents that would be returned if there would be no pagination/limits/sort.
         """
-        for p in ["first", "last", "sort_by", "sort_desc"]:
+        for p in ["first", "last", "sort_by", "sort_desc", "continuation"]:
             kwargs.pop(p, None)
-        return self.get_entries_query(**kwargs).count()
+
+        key = self._query_cache_key("total", **kwargs)
+        count = self.query_cache.get(key)
+        if count is None:
+            sources = self._query_cache_sources(kwargs)
+            generation = self.query_cache.get_generation(sources)
+            count = self.get_entries_query(**kwargs).count()
+            self.query_cache.put(key, count, generation, sources)
+        return count
+
+    @db_session
+    def get_total_count_estimate(self, **kwargs) -> tuple[int, bool]:
+        """
+        Get the total count of torrents that would be returned if there would be no pagination/limits/sort, or
+        an estimate thereof if counting them exactly would be expensive.
+
+        A count is exact if it is cached, if it belongs to a text search (these are limited to FTS_CANDIDATES_LIMIT
+        candidates) or if there are at most TOTAL_COUNT_SAMPLE_SIZE matches. Otherwise, the count is extrapolated from
+        the row ids of the TOTAL_COUNT_SAMPLE_SIZE matches with the highest row ids: the fraction of rows between them
+        and the highest row id that matches, is assumed to be the same for all rows.
+
+        :return: the (estimated) count and whether the count is an estimate.
+        """
+        for p in ["first", "last", "sort_by", "sort_desc", "continuation"]:
+            kwargs.pop(p, None)
+
+        count = self.query_cache.get(self._query_cache_key("total", **kwargs))
+        if count is not None:
+            return count, False
+        if kwargs.get("txt_filter") or kwargs.get("popular"):
+            return self.get_total_count(**kwargs), False
+
+        sources = self._query_cache_sources(kwargs)
+        generation = self.query_cache.get_generation(sources)
+        sample = select(g.rowid for g in self.get_entries_query(**kwargs)).order_by(-1)[:TOTAL_COUNT_SAMPLE_SIZE + 1]
+        if len(sample) <= TOTAL_COUNT_SAMPLE_SIZE:
+            self.query_cache.put(self._query_cache_key("total", **kwargs), len(sample), generation, sources)
+            return len(sample), False
+
+        max_rowid = sample[0]
+        sampled_rows = max_rowid - sample[-1] + 1
+        return max(len(sample), round(len(sample) * max_rowid / sampled_rows)), True
+
+    def _query_cache_key(self, kind: str, **kwargs) -> Hashable:
+        """
+        Get the query cache key for the given ``get_entries_query`` parameters.
+
+        Parameters that are omitted and parameters that are explicitly given their default value map to the same key.
+        """
+        return kind, freeze(dict(self._entries_query_defaults, **kwargs))
+
+    @staticmethod
+    def _query_cache_sources(kwargs: dict[str, Any]) -> tuple[str, ...]:
+        """
+        Get the sources of the data that the result of ``get_entries_query`` with the given parameters depends on.
+
+        Only queries that are filtered or ordered by health depend on the health of the torrents. Text searches do,
+        because their candidates are the best-seeded matches. The popular torrents only depend on the torrents that are
+        in the popular torrents view.
+        """
+        if kwargs.get("popular"):
+            return QUERY_SOURCE_HEALTH, QUERY_SOURCE_POPULAR
+        if (kwargs.get("txt_filter") or kwargs.get("sort_by") == "HEALTH"
+                or kwargs.get("self_checked_torrent") is not None or kwargs.get("health_checked_after") is not None):
+            return QUERY_SOURCE_TORRENTS, QUERY_SOURCE_HEALTH
+        return (QUERY_SOURCE_TORRENTS,)
 
     @db_session
     def get_entries_count(self, **kwargs) -> int | None:
         """
         Get the count of torrents that would be returned if there would be no pagination/limits.
         """
-        for p in ["first", "last"]:
+        for p in ["first", "last", "continuation"]:
             kwargs.pop(p, None)
         return self.get_entries_query(**kwargs).count()
 
@@ -719,46 +1925,13 @@ class MetadataStore:
         """
         return select(max(obj.rowid) for obj in self.TorrentMetadata).get() or 0
 
-    fts_keyword_search_re = re.compile(r'\w+', re.UNICODE)
-
+    @db_session
     def get_auto_complete_terms(self, text: str, max_terms: int) -> list[str]:
         """
         Get the auto-completion terms for a given query.
+
+        The suggestions come from the auto-completion index, the terms that occur in the most titles first.
         """
         if not text:
             return []
-
-        words = self.fts_keyword_search_re.findall(text)
-        if not words:
-            return []
-
-        fts_query = '"{}"*'.format(" ".join(f"{word}" for word in words))
-        suggestion_pattern = r'\W+'.join(word for word in words) + r'(\W*)((?:[.-]?\w)*)'
-        suggestion_re = re.compile(suggestion_pattern, re.UNICODE)
-
-        with db_session:
-            titles = self.db.select("""
-                cn.title
-                FROM ChannelNode cn
-                LEFT JOIN TorrentState ts ON cn.health = ts.rowid
-                WHERE cn.rowid in (
-                    SELECT rowid FROM FtsIndex WHERE FtsIndex MATCH $fts_query ORDER BY rowid DESC LIMIT $max_terms
-                )
-                ORDER BY coalesce(ts.seeders, 0) DESC
-            """, globals={"fts_query": fts_query, "max_terms": max_terms})
-
-        result = []
-        for title in titles:
-            match = suggestion_re.search(title.lower())
-            if match:
-                # group(2) is the ending of the last word (if the word is not finished) or the next word
-                continuation = match.group(2)
-                if re.match(r'^.*\w$', text) and match.group(1):  # group(1) is non-word symbols (spaces, commas, etc.)
-                    continuation = match.group(1) + continuation
-                suggestion = text + continuation
-                if suggestion not in result:
-                    result.append(suggestion)
-                    if len(result) >= max_terms:
-                        break
-
-        return result
+        return self.autocomplete_index.complete(text.lower(), max_terms)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable
+
+from tribler.core.libtorrent.trackers import get_uniformed_tracker_url
+
+if TYPE_CHECKING:
+    from tribler.core.database.write_queue import WriteQueue
+
+TRACKER_CACHE_MAX_URLS = 10000  # The number of raw tracker URLs of which the normalized URL is remembered
+
+
+class TrackerCache:
+    """
+    Intern the tracker URLs of torrents: remember the normalized URL of raw URLs and the rowid of normalized URLs.
+
+    Millions of torrents share a few thousand trackers, so nearly every torrent that is ingested can be linked to its
+    ``TrackerState`` without parsing its tracker URL or looking it up in the database.
+
+    The rowids of trackers that are found or created by an operation of the write queue are only remembered once its
+    transaction is committed: if it is rolled back, they are forgotten. Rowids that are found outside the write queue
+    are ignored, as their transaction can not be followed. Trackers that are deleted should be removed.
+    """
+
+    def __init__(self, max_urls: int = TRACKER_CACHE_MAX_URLS) -> None:
+        """
+        Create a new, empty, tracker cache.
+
+        :param max_urls: the maximum number of raw URLs to remember, the least recently used URL is evicted first.
+        """
+        super().__init__()
+
+        self.max_urls = max_urls
+        self.write_queue: WriteQueue | None = None  # The write queue of the transactions that find or create trackers
+
+        self.hits = 0
+        self.misses = 0
+
+        self._urls: OrderedDict[str, str | None] = OrderedDict()  # Raw URL -> normalized URL, None if invalid
+        self._rowids: dict[str, int] = {}  # Normalized URL -> committed TrackerState rowid
+        self._lock = threading.Lock()
+
+    def load(self, trackers: Iterable[tuple[int, str]]) -> None:
+        """
+        Warm the cache with the (committed) rowids and URLs of the known trackers.
+        """
+        rowids = {url: rowid for rowid, url in trackers}
+        with self._lock:
+            self._rowids.update(rowids)
+
+    def normalize(self, url: str) -> str | None:
+        """
+        Get the normalized URL of a raw tracker URL.
+
+        :return: the normalized URL or None if the URL is not a valid tracker URL.
+        """
+        with self._lock:
+            if url in self._urls:
+                self._urls.move_to_end(url)
+                return self._urls[url]
+        normalized = get_uniformed_tracker_url(url)
+        with self._lock:
+            self._urls[url] = normalized
+            if len(self._urls) > self.max_urls:
+                self._urls.popitem(last=False)
+        return normalized
+
+    def get(self, url: str) -> int | None:
+        """
+        Get the rowid of the tracker with the given normalized URL.
+
+        :return: the rowid or None if the tracker is unknown to the cache.
+        """
+        with self._lock:
+            rowid = self._rowids.get(url)
+            if rowid is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return rowid
+
+    def add(self, url: str, rowid: int) -> None:
+        """
+        Remember the rowid of a tracker that was found or created by the write queue operation of this thread, once its
+        transaction is committed.
+        """
+        if self.write_queue is not None:
+            self.write_queue.after_commit(self.load, [(rowid, url)])
+
+    def remove(self, url: str) -> None:
+        """
+        Forget a tracker that is deleted.
+        """
+        with self._lock:
+            self._rowids.pop(url, None)
+
+    def __len__(self) -> int:
+        """
+        Get the number of trackers of which the rowid is known.
+        """
+        with self._lock:
+            return len(self._rowids)
@@ -10,10 +10,14 @@ from pony.orm import Database, db_session
 
 from tribler.core.database.layers.health import HealthDataAccessLayer
 from tribler.core.database.layers.knowledge import KnowledgeDataAccessLayer
+from tribler.core.database.maintenance import enable_incremental_vacuum
+from tribler.core.database.write_queue import WRITE_QUEUE_MAX_BATCH_SIZE, WRITE_QUEUE_MAX_LATENCY, WriteQueue
 
 if TYPE_CHECKING:
     import dataclasses
 
+    from tribler.core.database.profiler import QueryProfiler
+
 
     @dataclasses.dataclass
     class Misc:
@@ -43,11 +47,19 @@ class TriblerDatabase:
     CURRENT_VERSION = 1
     _SCHEME_VERSION_KEY = "scheme_version"
 
-    def __init__(self, filename: str | None = None, *, create_tables: bool = True, **generate_mapping_kwargs) -> None:
+    def __init__(self, filename: str | None = None, *, create_tables: bool = True,
+                 write_max_latency: float = WRITE_QUEUE_MAX_LATENCY, write_batch_size: int = WRITE_QUEUE_MAX_BATCH_SIZE,
+                 query_profiler: QueryProfiler | None = None, **generate_mapping_kwargs) -> None:
         """
         Create a new tribler database.
+
+        :param write_max_latency: the number of seconds that a queued write may wait for other queued writes to be
+                                  committed in the same transaction.
+        :param write_batch_size: the maximum number of queued writes that is committed in one transaction.
+        :param query_profiler: the profiler that measures the queries of the database, as the "tribler" database.
         """
         self.instance = Database()
+        enable_incremental_vacuum(self.instance)
 
         self.knowledge = KnowledgeDataAccessLayer(self.instance)
         self.health = HealthDataAccessLayer(self.knowledge)
@@ -68,6 +80,8 @@ class TriblerDatabase:
         if filename != MEMORY:
             Path(filename).parent.mkdir(parents=True, exist_ok=True)
 
+        if query_profiler is not None:
+            query_profiler.install("tribler", self.instance)
         self.instance.bind(provider='sqlite', filename=filename, create_db=db_does_not_exist)
         generate_mapping_kwargs['create_tables'] = create_tables
         self.instance.generate_mapping(**generate_mapping_kwargs)
@@ -76,6 +90,11 @@ class TriblerDatabase:
         if db_does_not_exist:
             self.fill_default_data()
 
+        # Writes from the event loop are queued and committed together on a single writer thread.
+        self.write_queue = WriteQueue("TriblerDatabase", self.instance, threaded=filename != MEMORY,
+                                      max_latency=write_max_latency, max_batch_size=write_batch_size)
+        self.knowledge.write_queue = self.write_queue
+
     @staticmethod
     def define_binding(db: Database) -> type[Misc]:
         """
@@ -132,4 +151,5 @@ class TriblerDatabase:
         """
         Disconnect from the database.
         """
+        self.write_queue.shutdown()
         self.instance.disconnect()
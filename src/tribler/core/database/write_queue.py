@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import logging
+import threading
+from asyncio import wrap_future
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from pony.orm import db_session
+
+if TYPE_CHECKING:
+    from pony.orm import Database
+
+WRITE_QUEUE_MAX_LATENCY = 0.05  # The number of seconds that a write may wait for other writes to commit with
+WRITE_QUEUE_MAX_BATCH_SIZE = 100  # The maximum number of writes that is committed in one transaction
+WRITE_QUEUE_MAX_BATCH_WEIGHT = 10000  # The maximum total weight of the writes that is committed in one transaction
+
+
+class WriteOperation(NamedTuple):
+    """
+    A queued write and the future of its result.
+    """
+
+    func: Callable
+    args: tuple
+    kwargs: dict
+    future: Future
+    queued_at: float
+    weight: int = 1
+
+
+class WriteQueue:
+    """
+    A queue of write operations on a database that are committed together, in group transactions.
+
+    A single writer thread takes the queued operations and executes them in one ``db_session``. It waits at most
+    ``max_latency`` seconds after an operation was queued for other operations to join its transaction, so concurrent
+    writers share a single commit (and fsync) instead of contending for the database lock.
+
+    If an operation raises an exception, the transaction of its group is rolled back and the operations of the group
+    are retried in a transaction of their own. Operations should therefore only have side effects on the database:
+    other side effects should be registered with ``after_commit``, which calls them once the transaction is committed.
+
+    Pony keeps every entity that a ``db_session`` touches in memory until it ends. Operations that write many rows
+    should be submitted with a weight, e.g., their number of rows: a group is committed once the total weight of its
+    operations reaches ``max_batch_weight``, so its entities are released. Large writes should be split into several
+    operations, which are then committed in separate transactions.
+
+    In-memory databases can only be accessed by the thread that created them: their operations are executed
+    immediately, on the calling thread.
+    """
+
+    def __init__(self, name: str, database: Database, threaded: bool = True,
+                 max_latency: float = WRITE_QUEUE_MAX_LATENCY, max_batch_size: int = WRITE_QUEUE_MAX_BATCH_SIZE,
+                 max_batch_weight: int = WRITE_QUEUE_MAX_BATCH_WEIGHT) -> None:
+        """
+        Create a new write queue and start its writer thread.
+
+        :param name: the name of the database, used to name the writer thread.
+        :param database: the database to write to.
+        :param threaded: whether operations are executed on the writer thread or immediately.
+        :param max_latency: the number of seconds that an operation may wait for other operations.
+        :param max_batch_size: the maximum number of operations per transaction.
+        :param max_batch_weight: the maximum total weight of the operations per transaction.
+        """
+        super().__init__()
+
+        self.name = name
+        self.database = database
+        self.max_latency = max_latency
+        self.max_batch_size = max_batch_size
+        self.max_batch_weight = max_batch_weight
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.transactions = 0
+        self.operations = 0
+        self.retried_operations = 0
+        self.total_weight = 0  # The total weight of the committed operations
+        self.last_batch_weight = 0  # The total weight of the operations of the last transaction
+        self.peak_batch_weight = 0  # The largest total weight of the operations that were committed together
+        self.last_submitted = monotonic()  # The time at which the last operation was queued
+
+        self._shutting_down = False
+        self._local = threading.local()  # The post-commit callbacks of the transaction that this thread executes
+        self._queue: SimpleQueue[WriteOperation | None] = SimpleQueue()
+        self._thread: threading.Thread | None = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name=f"{name}-write", daemon=True)
+            self._thread.start()
+
+    def submit(self, func: Callable, *args: Any, **kwargs) -> Future:  # noqa: ANN401
+        """
+        Queue a write operation.
+
+        :param func: the function that writes to the database, it is called in a ``db_session``.
+        :param args: args for the function call
+        :param kwargs: kwargs for the function call
+        :return: the future of the result of the func call.
+        """
+        return self.submit_weighted(1, func, *args, **kwargs)
+
+    def submit_weighted(self, weight: int, func: Callable, *args: Any, **kwargs) -> Future:  # noqa: ANN401
+        """
+        Queue a write operation of the given weight, e.g., the number of rows that it writes.
+
+        :param weight: the weight of the operation, see ``max_batch_weight``.
+        :param func: the function that writes to the database, it is called in a ``db_session``.
+        :param args: args for the function call
+        :param kwargs: kwargs for the function call
+        :return: the future of the result of the func call.
+        """
+        operation = WriteOperation(func, args, kwargs, Future(), monotonic(), weight)
+        self.last_submitted = operation.queued_at
+        if self._shutting_down:
+            operation.future.set_exception(RuntimeError(f"The write queue of {self.name} is shut down"))
+        elif self._thread is None:
+            if operation.future.set_running_or_notify_cancel():
+                self._commit([operation])
+        else:
+            self._queue.put(operation)
+        return operation.future
+
+    async def write(self, func: Callable, *args: Any, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Queue a write operation and wait for it to be committed.
+
+        :return: the result of the func call.
+        """
+        return await wrap_future(self.submit(func, *args, **kwargs))
+
+    def after_commit(self, callback: Callable, *args: Any) -> bool:  # noqa: ANN401
+        """
+        Call the given callback once the transaction of the operation that this thread is executing is committed.
+
+        The callbacks of a transaction are called in the order in which they were registered, before the futures of its
+        operations are done. If the transaction is rolled back, its callbacks are dropped: operations that are retried
+        register them again.
+
+        :return: whether the callback was registered, False if this thread is not executing an operation of this queue.
+        """
+        callbacks = getattr(self._local, "callbacks", None)
+        if callbacks is None:
+            return False
+        callbacks.append((callback, args))
+        return True
+
+    def get_stats(self) -> dict:
+        """
+        Get the statistics of the committed transactions.
+
+        The weight of a transaction is the total weight of its operations, e.g., the number of entities that it wrote.
+        """
+        return {"transactions": self.transactions, "operations": self.operations,
+                "retried_operations": self.retried_operations, "total_weight": self.total_weight,
+                "mean_batch_weight": self.total_weight / self.transactions if self.transactions else 0.0,
+                "last_batch_weight": self.last_batch_weight, "peak_batch_weight": self.peak_batch_weight}
+
+    def shutdown(self) -> None:
+        """
+        Commit the queued operations and stop the writer thread.
+        """
+        self._shutting_down = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """
+        Commit the queued operations in groups, until the queue is shut down.
+        """
+        stopped = False
+        next_operation = None  # An operation that did not fit in the weight of the previous group
+        while not stopped:
+            operation = next_operation or self._queue.get()
+            next_operation = None
+            if operation is None:
+                break
+            batch = [operation] if operation.future.set_running_or_notify_cancel() else []
+            weight = operation.weight if batch else 0
+            deadline = operation.queued_at + self.max_latency
+            while len(batch) < self.max_batch_size and weight < self.max_batch_weight:
+                try:
+                    operation = self._queue.get(timeout=max(0.0, deadline - monotonic()))
+                except Empty:
+                    break
+                if operation is None:
+                    stopped = True
+                    break
+                if batch and weight + operation.weight > self.max_batch_weight:
+                    next_operation = operation
+                    break
+                if operation.future.set_running_or_notify_cancel():
+                    batch.append(operation)
+                    weight += operation.weight
+            if batch:
+                self._commit(batch)
+        self.database.disconnect()
+
+    def _commit(self, batch: list[WriteOperation]) -> None:
+        """
+        Execute the given operations in a single transaction and set the results of their futures.
+        """
+        previous_callbacks = getattr(self._local, "callbacks", None)
+        callbacks: list[tuple[Callable, tuple]] = []
+        self._local.callbacks = callbacks
+        try:
+            with db_session(immediate=True):
+                results = [operation.func(*operation.args, **operation.kwargs) for operation in batch]
+        except Exception as e:
+            self._local.callbacks = previous_callbacks
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            self._logger.warning("Retrying %d writes to %s separately: %s: %s", len(batch), self.name,
+                                 type(e).__name__, e)
+            self.retried_operations += len(batch)
+            for operation in batch:
+                self._commit([operation])
+            return
+        self._local.callbacks = previous_callbacks
+        if previous_callbacks is not None:
+            # An immediate operation of another operation joins the transaction of the other operation
+            previous_callbacks.extend(callbacks)
+        else:
+            for callback, args in callbacks:
+                try:
+                    callback(*args)
+                except Exception:
+                    self._logger.exception("Post-commit callback of %s failed", self.name)
+        self.transactions += 1
+        self.operations += len(batch)
+        self.last_batch_weight = sum(operation.weight for operation in batch)
+        self.total_weight += self.last_batch_weight
+        self.peak_batch_weight = max(self.peak_batch_weight, self.last_batch_weight)
+        for operation, result in zip(batch, results):
+            operation.future.set_result(result)
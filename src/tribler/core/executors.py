@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import logging
+import threading
+from asyncio import get_running_loop, wrap_future
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from itertools import count
+from queue import PriorityQueue
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+EXECUTOR_POOLS = {  # The names of the executor pools and their default number of threads
+    "db_read": 4,  # Reads of the databases for the REST API and remote searches
+    "db_write": 1,  # Long-running jobs that feed the write queues of the databases, like snapshot imports
+    "disk_io": 2,  # Reading and writing (torrent) files
+    "crypto": 4,  # Verifying the signatures of received metadata
+    "hashing": 1,  # Hashing the pieces of created torrents
+}
+
+
+class Priority(IntEnum):
+    """
+    The priority of a call in an executor pool: queued calls of a lower value are started first.
+    """
+
+    INTERACTIVE = 0  # Calls that a user is waiting for, e.g., from the REST API
+    NORMAL = 1
+    BACKGROUND = 2  # Calls on behalf of other peers, e.g., gossip and remote queries
+
+
+@dataclass
+class PoolStats:
+    """
+    The statistics of an executor pool.
+    """
+
+    name: str
+    max_workers: int
+    threads: int = 0  # The number of started threads
+    queued: int = 0  # The number of calls that are waiting for a thread
+    max_queued: int = 0  # The largest number of calls that were ever waiting for a thread
+    running: int = 0  # The number of calls that are being executed
+    completed: int = 0  # The number of calls that were executed
+    total_wait: float = 0.0  # The number of seconds that all calls waited for a thread together
+    max_wait: float = 0.0  # The largest number of seconds that a call waited for a thread
+
+
+class _WorkItem:
+    """
+    A call that is queued in an executor pool.
+    """
+
+    def __init__(self, future: Future, func: Callable, args: tuple, kwargs: dict) -> None:
+        """
+        Create a new work item for the given call.
+        """
+        super().__init__()
+
+        self.future = future
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted = perf_counter()
+
+    def run(self) -> None:
+        """
+        Execute the call and store its outcome in the future, unless the future is cancelled.
+        """
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class ExecutorPool(Executor):
+    """
+    A bounded pool of named threads that starts queued calls in the order of their priority.
+
+    Threads are started on demand, up to ``max_workers``. Calls of the same priority are started in the order in which
+    they were submitted. Unlike ``ThreadPoolExecutor``, the pool keeps statistics of its queue: how many calls are
+    waiting and for how long they waited.
+    """
+
+    def __init__(self, name: str, max_workers: int, initializer: Callable[[], None] | None = None) -> None:
+        """
+        Create a new pool without threads.
+
+        :param name: the name of the pool, which is also the name prefix of its threads.
+        :param max_workers: the maximum number of threads.
+        :param initializer: a function that is called on every new thread.
+        """
+        super().__init__()
+
+        if max_workers <= 0:
+            msg = f"The executor pool {name} needs at least one thread, not {max_workers}"
+            raise ValueError(msg)
+
+        self.name = name
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.stats = PoolStats(name, max_workers)
+
+        self._queue: PriorityQueue[tuple[int, int, _WorkItem | None]] = PriorityQueue()
+        self._sequence = count()
+        self._threads: list[threading.Thread] = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs) -> Future:  # noqa: ANN401
+        """
+        Schedule a call of normal priority.
+        """
+        return self.submit_with_priority(Priority.NORMAL, fn, *args, **kwargs)
+
+    def submit_with_priority(self, priority: Priority, fn: Callable, /, *args: Any, **kwargs) -> Future:  # noqa: ANN401
+        """
+        Schedule a call of the given priority.
+
+        :raises RuntimeError: if the pool is shut down.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                msg = f"Cannot schedule new calls after the executor pool {self.name} is shut down"
+                raise RuntimeError(msg)
+            self._queue.put((priority, next(self._sequence), _WorkItem(future, fn, args, kwargs)))
+            self.stats.queued += 1
+            self.stats.max_queued = max(self.stats.max_queued, self.stats.queued)
+            self._adjust_thread_count()
+        return future
+
+    async def run(self, func: Callable, *args: Any, priority: Priority = Priority.NORMAL, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Execute a call of the given priority on the pool and wait for its outcome.
+        """
+        return await wrap_future(self.submit_with_priority(priority, func, *args, **kwargs))
+
+    def _adjust_thread_count(self) -> None:
+        """
+        Start a new thread if no thread is idle and the pool is not full.
+        """
+        if self._idle.acquire(timeout=0) or len(self._threads) >= self.max_workers:
+            return
+        thread = threading.Thread(target=self._work, name=f"{self.name}_{len(self._threads)}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        self.stats.threads = len(self._threads)
+
+    def _work(self) -> None:
+        """
+        Execute queued calls until the pool is shut down.
+        """
+        if self.initializer is not None:
+            self.initializer()
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                return
+            wait = perf_counter() - item.submitted
+            with self._lock:
+                self.stats.queued -= 1
+                self.stats.running += 1
+                self.stats.total_wait += wait
+                self.stats.max_wait = max(self.stats.max_wait, wait)
+            try:
+                item.run()
+            except BaseException:
+                self._logger.exception("Unable to finish a call of the executor pool %s", self.name)
+            with self._lock:
+                self.stats.running -= 1
+                self.stats.completed += 1
+            self._idle.release()
+
+    def get_stats(self) -> dict:
+        """
+        Get a copy of the statistics of this pool.
+        """
+        with self._lock:
+            return asdict(self.stats)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the threads after the queued calls are finished, or cancelled.
+        """
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while not self._queue.empty():
+                    _, _, item = self._queue.get_nowait()
+                    if item is not None:
+                        item.future.cancel()
+                        self.stats.queued -= 1
+            for _ in self._threads:
+                self._queue.put((len(Priority), next(self._sequence), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class ExecutorPools:
+    """
+    The named executor pools of a session, one per kind of blocking work.
+
+    Blocking work of one kind, e.g., a burst of metadata ingestion, can therefore not starve work of another kind,
+    e.g., reading files. Within a pool, interactive calls are started before background calls.
+    """
+
+    def __init__(self, sizes: Mapping[str, int] | None = None) -> None:
+        """
+        Create the pools.
+
+        :param sizes: the number of threads per pool name, pools that are not given get their default size.
+        """
+        super().__init__()
+
+        sizes = {**EXECUTOR_POOLS, **(sizes or {})}
+        self.pools = {name: ExecutorPool(name, size) for name, size in sizes.items()}
+
+    @classmethod
+    def from_config(cls: type[Self], get: Callable[[str], Any]) -> Self:
+        """
+        Create the pools with the sizes of the "executors" section of a config.
+
+        :param get: the getter of the config, e.g., ``TriblerConfigManager.get``.
+        """
+        return cls({name: get(f"executors/{name}") for name in EXECUTOR_POOLS})
+
+    def get(self, name: str) -> ExecutorPool:
+        """
+        Get the pool of the given name.
+
+        :raises KeyError: if there is no such pool.
+        """
+        return self.pools[name]
+
+    async def run(self, name: str, func: Callable, *args: Any, priority: Priority = Priority.NORMAL,  # noqa: ANN401
+                  **kwargs) -> Any:  # noqa: ANN401
+        """
+        Execute a call on the pool of the given name and wait for its outcome.
+        """
+        return await self.get(name).run(func, *args, priority=priority, **kwargs)
+
+    def get_stats(self) -> list[dict]:
+        """
+        Get the statistics of all pools.
+        """
+        return [pool.get_stats() for pool in self.pools.values()]
+
+    def shutdown(self) -> None:
+        """
+        Cancel the queued calls and stop the threads of all pools, after the running calls are finished.
+        """
+        for pool in self.pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def run_in_executor(executor: Executor | None, func: Callable, *args: Any,  # noqa: ANN401
+                          priority: Priority = Priority.NORMAL) -> Any:  # noqa: ANN401
+    """
+    Execute a call on the given executor, with the given priority if it is an executor pool.
+
+    :param executor: the executor, or None for the default executor of the event loop.
+    """
+    if isinstance(executor, ExecutorPool):
+        return await executor.run(func, *args, priority=priority)
+    return await get_running_loop().run_in_executor(executor, func, *args)
@@ -1,15 +1,16 @@
+from __future__ import annotations
+
 import random
 from binascii import unhexlify
+from functools import partial
+from typing import TYPE_CHECKING
 
 from cryptography.exceptions import InvalidSignature
 from ipv8.community import Community, CommunitySettings
-from ipv8.keyvault.private.libnaclkey import LibNaCLSK
 from ipv8.lazy_community import lazy_wrapper
-from ipv8.types import Key, Peer
 from pony.orm import db_session
 
 from tribler.core.database.layers.knowledge import Operation, ResourceType
-from tribler.core.database.tribler_database import TriblerDatabase
 from tribler.core.knowledge.operations_requests import OperationsRequests, PeerValidationError
 from tribler.core.knowledge.payload import (
     RawStatementOperationMessage,
@@ -19,6 +20,14 @@ from tribler.core.knowledge.payload import (
     StatementOperationSignature,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from ipv8.keyvault.private.libnaclkey import LibNaCLSK
+    from ipv8.types import Key, Peer
+
+    from tribler.core.database.tribler_database import TriblerDatabase
+
 REQUESTED_OPERATIONS_COUNT = 10
 CLEAR_ALL_REQUESTS_INTERVAL = 10 * 60  # 10 minutes
 
@@ -85,11 +94,8 @@ class KnowledgeCommunity(Community):
                                   operation=operation)
             self.validate_operation(operation)
 
-            with db_session():
-                is_added = self.db.knowledge.add_operation(operation, signature.signature)
-                if is_added:
-                    s = f"+ operation added ({operation.object!r} \"{operation.predicate}\" {operation.subject!r})"
-                    self.logger.info(s)
+            future = self.db.write_queue.submit(self.db.knowledge.add_operation, operation, signature.signature)
+            future.add_done_callback(partial(self.on_operation_added, operation))
 
         except PeerValidationError as e:  # peer has exhausted his response count
             self.logger.warning(e)
@@ -98,6 +104,17 @@ class KnowledgeCommunity(Community):
         except InvalidSignature as e:  # signature verification error
             self.logger.warning(e)
 
+    def on_operation_added(self, operation: StatementOperation, future: Future[bool]) -> None:
+        """
+        Callback for when a received operation has been written to the database.
+        """
+        exception = future.exception()
+        if exception is not None:
+            self.logger.warning("Unable to add operation %s: %s: %s", operation, type(exception).__name__, exception)
+        elif future.result():
+            s = f"+ operation added ({operation.object!r} \"{operation.predicate}\" {operation.subject!r})"
+            self.logger.info(s)
+
     @lazy_wrapper(RequestStatementOperationMessage)
     def on_request(self, peer: Peer, operation: RequestStatementOperationMessage) -> None:
         """
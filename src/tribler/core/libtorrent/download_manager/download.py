@@ -498,7 +498,8 @@ class Download(TaskManager):
             self.tdef = TorrentDef.load_from_dict(metadata)
             with suppress(RuntimeError):
                 # Try to load the torrent info in the background if we have a loop.
-                get_running_loop().run_in_executor(None, self.tdef.load_torrent_info)
+                executor = self.download_manager.get_executor("disk_io") if self.download_manager else None
+                get_running_loop().run_in_executor(executor, self.tdef.load_torrent_info)
         except ValueError as ve:
             self._logger.exception(ve)
             return
@@ -33,6 +33,9 @@ from tribler.core.notifier import Notification, Notifier
 from tribler.tribler_config import VERSION_SUBDIR
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from tribler.core.executors import ExecutorPools
     from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
     from tribler.tribler_config import TriblerConfigManager
 
@@ -86,12 +89,15 @@ class DownloadManager(TaskManager):
     """
 
     def __init__(self, config: TriblerConfigManager, notifier: Notifier,
-                 metadata_tmpdir: TemporaryDirectory | None = None) -> None:
+                 metadata_tmpdir: TemporaryDirectory | None = None, executors: ExecutorPools | None = None) -> None:
         """
         Create a new download manager.
+
+        :param executors: the executor pools for blocking file operations, the default executor is used if None.
         """
         super().__init__()
         self.config = config
+        self.executors = executors
 
         self.state_dir = Path(config.get_version_state_dir())
         self.ltsettings: dict[lt.session, dict] = {}  # Stores a copy of the settings dict for each libtorrent session
@@ -674,7 +680,7 @@ class DownloadManager(TaskManager):
                 msg = "Torrent file must be provided if tdef is not given"
                 raise ValueError(msg)
             # try to get the torrent from the given torrent file
-            tdef = await TorrentDef.load(torrent_file)
+            tdef = await TorrentDef.load(torrent_file, self.get_executor("disk_io"))
 
         assert tdef is not None, "tdef MUST not be None after loading torrent"
 
@@ -1062,6 +1068,12 @@ class DownloadManager(TaskManager):
         else:
             self._logger.warning("Download is back, restarted? Cancelling removal! %s", hexlify(infohash))
 
+    def get_executor(self, name: str) -> Executor | None:
+        """
+        Get the executor pool of the given name, or None for the default executor if there are no pools.
+        """
+        return None if self.executors is None else self.executors.get(name)
+
     def get_checkpoint_dir(self) -> Path:
         """
         Returns the directory in which to checkpoint the Downloads in this Session.
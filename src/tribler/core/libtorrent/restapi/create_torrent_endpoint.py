@@ -1,4 +1,3 @@
-import asyncio
 import base64
 import json
 from pathlib import Path
@@ -10,6 +9,7 @@ from aiohttp_apispec import docs, json_schema
 from ipv8.REST.schema import schema
 from marshmallow.fields import String
 
+from tribler.core.executors import Priority, run_in_executor
 from tribler.core.knowledge.restapi.knowledge_endpoint import HandledErrorSchema
 from tribler.core.libtorrent.download_manager.download_config import DownloadConfig
 from tribler.core.libtorrent.download_manager.download_manager import DownloadManager
@@ -123,9 +123,9 @@ class CreateTorrentEndpoint(RESTEndpoint):
         save_path = export_dir / (f"{name}.torrent") if export_dir and export_dir.exists() else None
 
         try:
-            result = await asyncio.get_event_loop().run_in_executor(None, create_torrent_file,
-                                                                    file_path_list, recursive_bytes(params),
-                                                                    save_path)
+            result = await run_in_executor(self.download_manager.get_executor("hashing"), create_torrent_file,
+                                           file_path_list, recursive_bytes(params), save_path,
+                                           priority=Priority.INTERACTIVE)
         except (OSError, UnicodeDecodeError, RuntimeError) as e:
             self._logger.exception(e)
             return return_handled_exception(e)
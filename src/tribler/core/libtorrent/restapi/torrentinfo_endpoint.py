@@ -140,7 +140,7 @@ class TorrentInfoEndpoint(RESTEndpoint):
         if scheme == "file":
             file_path = url_to_path(uri)
             try:
-                tdef = await TorrentDef.load(file_path)
+                tdef = await TorrentDef.load(file_path, self.download_manager.get_executor("disk_io"))
                 metainfo = tdef.metainfo
             except (OSError, TypeError, ValueError, RuntimeError):
                 return RESTResponse({"error": f"error while decoding torrent file: {file_path}"},
@@ -19,6 +19,7 @@ from tribler.core.libtorrent.torrent_file_tree import TorrentFileTree
 from tribler.core.libtorrent.trackers import is_valid_url
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from os import PathLike
 
 
@@ -300,13 +301,14 @@ class TorrentDef:
         return TorrentDef.load_from_memory(file_content)
 
     @staticmethod
-    async def load(filepath: str | bytes | PathLike) -> TorrentDef:
+    async def load(filepath: str | bytes | PathLike, executor: Executor | None = None) -> TorrentDef:
         """
         Create a TorrentDef object from a .torrent file.
 
         :param filepath: The path to the .torrent file
+        :param executor: The executor that reads the file, the default executor if None
         """
-        return await get_running_loop().run_in_executor(None, TorrentDef._threaded_load_job, filepath)
+        return await get_running_loop().run_in_executor(executor, TorrentDef._threaded_load_job, filepath)
 
     @staticmethod
     def load_from_memory(bencoded_data: bytes) -> TorrentDef:
@@ -3,7 +3,7 @@ from __future__ import annotations
 import typing
 from collections import defaultdict
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable
 
 from ipv8.messaging.anonymization.tunnel import Circuit
 
@@ -73,11 +73,27 @@ class Notifier:
         Notify all observers that have subscribed to the given topic.
         """
         notification = getattr(Notification, topic) if isinstance(topic, str) else topic
-        topic_name, args, types = notification.value
-        if set(args) ^ set(kwargs.keys()):
-            message = f"{topic_name} expecting arguments {args} (of types {types}) but received {kwargs}"
-            raise ValueError(message)
+        self._check_args(notification, kwargs)
         for observer in self.observers[notification]:
             observer(**kwargs)
         for delegate in self.delegates:
             delegate(notification, **kwargs)
+
+    def notify_many(self, topic: Notification, items: list[dict[str, Any]]) -> None:
+        """
+        Notify all observers of the given topic of multiple events, given as the kwargs of each event.
+        """
+        for kwargs in items:
+            self.notify(topic, **kwargs)
+
+    @staticmethod
+    def _check_args(notification: Notification, kwargs: dict[str, Any]) -> None:
+        """
+        Check if the kwargs of a notification match the fields of its topic.
+
+        :raises ValueError: if a field is missing or there is an unknown field.
+        """
+        topic_name, args, types = notification.value
+        if set(args) ^ set(kwargs.keys()):
+            message = f"{topic_name} expecting arguments {args} (of types {types}) but received {kwargs}"
+            raise ValueError(message)
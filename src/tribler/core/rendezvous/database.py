@@ -7,9 +7,12 @@ from typing import TYPE_CHECKING
 from ipv8.messaging.interfaces.udp.endpoint import UDPv6Address
 from pony.orm import Database, db_session, select
 
+from tribler.core.database.maintenance import enable_incremental_vacuum
+from tribler.core.database.write_queue import WriteQueue
 from tribler.core.rendezvous.orm_bindings import certificate
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from os import PathLike
 
     from ipv8.peer import Peer
@@ -30,23 +33,35 @@ class RendezvousDatabase:
         db_path_string = ":memory:" if db_path == ":memory:" else str(db_path)
 
         self.database = Database()
+        enable_incremental_vacuum(self.database)
         self.Certificate = certificate.define_binding(self.database)
         self.database.bind(provider="sqlite", filename=db_path_string, create_db=create_db, timeout=120.0)
         self.database.generate_mapping(create_tables=create_db)
 
-    def add(self, peer: Peer, start_timestamp: float, stop_timestamp: float) -> None:
+        # The session times of peers are written on a single writer thread, in group transactions.
+        self.write_queue = WriteQueue("RendezvousDatabase", self.database, threaded=db_path_string != ":memory:")
+
+    def add(self, peer: Peer, start_timestamp: float, stop_timestamp: float) -> Future[None]:
+        """
+        Queue a write of a peer's session time to the database.
+
+        :return: the future that is done once the session time is committed.
+        """
+        address = peer.address
+        family = socket.AF_INET6 if isinstance(address, UDPv6Address) else socket.AF_INET
+        return self.write_queue.submit(self._write_certificate,
+                                       public_key=peer.public_key.key_to_bin(),
+                                       ip=socket.inet_pton(family, address[0]),
+                                       port=address[1],
+                                       ping=peer.get_median_ping() or -1.0,
+                                       start=start_timestamp,
+                                       stop=stop_timestamp)
+
+    def _write_certificate(self, **kwargs) -> None:
         """
-        Write a peer's session time to the database.
+        Write a certificate, without returning it: its ``db_session`` ends on the writer thread.
         """
-        with db_session(immediate=True):
-            address = peer.address
-            family = socket.AF_INET6 if isinstance(address, UDPv6Address) else socket.AF_INET
-            self.Certificate(public_key=peer.public_key.key_to_bin(),
-                             ip=socket.inet_pton(family, address[0]),
-                             port=address[1],
-                             ping=peer.get_median_ping() or -1.0,
-                             start=start_timestamp,
-                             stop=stop_timestamp)
+        self.Certificate(**kwargs)
 
     def get(self, peer: Peer) -> list[RendezvousCertificate]:
         """
@@ -68,6 +83,7 @@ class RendezvousDatabase:
 
     def shutdown(self) -> None:
         """
-        Disconnect from the database.
+        Write the queued session times and disconnect from the database.
         """
+        self.write_queue.shutdown()
         self.database.disconnect()
@@ -5,14 +5,19 @@ from typing import TYPE_CHECKING
 from aiohttp import web
 from aiohttp_apispec import docs
 from ipv8.REST.schema import schema
-from marshmallow.fields import Integer, String
+from marshmallow.fields import Float, Integer, String
 
-from tribler.core.restapi.rest_endpoint import MAX_REQUEST_SIZE, RESTEndpoint, RESTResponse
+from tribler.core.database.profiler import LATENCY_BUCKETS
+from tribler.core.executors import Priority, run_in_executor
+from tribler.core.restapi.rest_endpoint import HTTP_NOT_FOUND, MAX_REQUEST_SIZE, RESTEndpoint, RESTResponse
 
 if TYPE_CHECKING:
     from ipv8.types import IPv8
 
+    from tribler.core.database.async_database import AsyncDatabase
+    from tribler.core.database.profiler import QueryProfiler
     from tribler.core.database.store import MetadataStore
+    from tribler.core.executors import ExecutorPools
 
 
 class StatisticsEndpoint(RESTEndpoint):
@@ -29,10 +34,15 @@ class StatisticsEndpoint(RESTEndpoint):
         super().__init__(middlewares, client_max_size)
 
         self.mds: MetadataStore | None = None
+        self.async_db: AsyncDatabase | None = None
         self.ipv8: IPv8 | None = None
+        self.query_profiler: QueryProfiler | None = None
+        self.executors: ExecutorPools | None = None
 
         self.app.add_routes([web.get("/tribler", self.get_tribler_stats),
-                             web.get("/ipv8", self.get_ipv8_stats)])
+                             web.get("/ipv8", self.get_ipv8_stats),
+                             web.get("/queries", self.get_query_stats),
+                             web.get("/executors", self.get_executor_stats)])
 
     @docs(
         tags=["General"],
@@ -56,14 +66,20 @@ class StatisticsEndpoint(RESTEndpoint):
             }
         }
     )
-    def get_tribler_stats(self, _: web.Request) -> RESTResponse:
+    async def get_tribler_stats(self, _: web.Request) -> RESTResponse:
         """
         Return general statistics of Tribler.
         """
         stats_dict = {}
-        if self.mds:
-            stats_dict = {"db_size": self.mds.get_db_file_size(),
-                          "num_torrents": self.mds.get_num_torrents()}
+        if self.mds and self.async_db:
+            stats_dict = {"db_size": await self.async_db.get_db_file_size(),
+                          "num_torrents": await self.async_db.get_num_torrents(),
+                          "query_cache_hits": self.mds.query_cache.hits,
+                          "query_cache_misses": self.mds.query_cache.misses,
+                          "tracker_cache_hits": self.mds.tracker_cache.hits,
+                          "tracker_cache_misses": self.mds.tracker_cache.misses,
+                          "rejected_payloads": self.mds.rejected_payloads_count,
+                          "write_queue": self.mds.write_queue.get_stats()}
 
         return RESTResponse({"tribler_statistics": stats_dict})
 
@@ -92,3 +108,74 @@ class StatisticsEndpoint(RESTEndpoint):
                 "total_down": self.ipv8.endpoint.bytes_down
             }
         return RESTResponse({"ipv8_statistics": stats_dict})
+
+    @docs(
+        tags=["General"],
+        summary="Return the most recent slow database queries and the latency histograms of all query shapes.",
+        responses={
+            200: {
+                "schema": schema(QueryStatisticsResponse={
+                    "threshold": Float,
+                    "buckets": [Float],
+                    "slow_queries": [schema(SlowQuery={
+                        "database": String,
+                        "sql": String,
+                        "duration": Float,
+                        "timestamp": Float,
+                        "thread": String,
+                        "plan": [String]
+                    })],
+                    "histograms": [schema(QueryShapeStatistics={
+                        "database": String,
+                        "shape": String,
+                        "count": Integer,
+                        "total_time": Float,
+                        "max_time": Float,
+                        "buckets": [Integer]
+                    })]
+                })
+            }
+        }
+    )
+    async def get_query_stats(self, _: web.Request) -> RESTResponse:
+        """
+        Return the most recent slow database queries and the latency histograms of all query shapes.
+        """
+        if self.query_profiler is None:
+            return RESTResponse({"error": "Query profiling is not enabled"}, status=HTTP_NOT_FOUND)
+        # Explaining the new slow queries reads the databases.
+        slow_queries = await run_in_executor(self.executors.get("db_read") if self.executors else None,
+                                             self.query_profiler.get_slow_queries, priority=Priority.INTERACTIVE)
+        return RESTResponse({"threshold": self.query_profiler.threshold,
+                             "buckets": LATENCY_BUCKETS,
+                             "slow_queries": slow_queries,
+                             "histograms": self.query_profiler.get_histograms()})
+
+    @docs(
+        tags=["General"],
+        summary="Return the queue depth and wait times of the executor pools.",
+        responses={
+            200: {
+                "schema": schema(ExecutorStatisticsResponse={
+                    "executors": [schema(ExecutorPoolStatistics={
+                        "name": String,
+                        "max_workers": Integer,
+                        "threads": Integer,
+                        "queued": Integer,
+                        "max_queued": Integer,
+                        "running": Integer,
+                        "completed": Integer,
+                        "total_wait": Float,
+                        "max_wait": Float
+                    })]
+                })
+            }
+        }
+    )
+    def get_executor_stats(self, _: web.Request) -> RESTResponse:
+        """
+        Return the queue depth and wait times of the executor pools.
+        """
+        if self.executors is None:
+            return RESTResponse({"error": "The executor pools are not available"}, status=HTTP_NOT_FOUND)
+        return RESTResponse({"executors": self.executors.get_stats()})
@@ -23,6 +23,7 @@ from tribler.core.components import (
     TunnelComponent,
     VersioningComponent,
 )
+from tribler.core.executors import ExecutorPools
 from tribler.core.libtorrent.download_manager.download_manager import DownloadManager
 from tribler.core.libtorrent.restapi.create_torrent_endpoint import CreateTorrentEndpoint
 from tribler.core.libtorrent.restapi.downloads_endpoint import DownloadsEndpoint
@@ -42,6 +43,9 @@ from tribler.core.socks5.server import Socks5Server
 if TYPE_CHECKING:
     from types import TracebackType
 
+    from tribler.core.database.async_database import AsyncDatabase
+    from tribler.core.database.maintenance import MaintenanceScheduler
+    from tribler.core.database.profiler import QueryProfiler
     from tribler.core.database.store import MetadataStore
     from tribler.core.database.tribler_database import TriblerDatabase
     from tribler.core.torrent_checker.torrent_checker import TorrentChecker
@@ -106,9 +110,10 @@ class Session:
 
         self.shutdown_event = Event()
         self.notifier = Notifier()
+        self.executors = ExecutorPools.from_config(self.config.get)
 
         # Libtorrent
-        self.download_manager = DownloadManager(self.config, self.notifier)
+        self.download_manager = DownloadManager(self.config, self.notifier, executors=self.executors)
         self.socks_servers = [Socks5Server(port) for port in self.config.get("libtorrent/socks_listen_ports")]
 
         # IPv8
@@ -122,6 +127,9 @@ class Session:
         # Optional globals, set by components:
         self.db: TriblerDatabase | None = None
         self.mds: MetadataStore | None = None
+        self.async_db: AsyncDatabase | None = None
+        self.db_maintenance: MaintenanceScheduler | None = None
+        self.query_profiler: QueryProfiler | None = None
         self.torrent_checker: TorrentChecker | None = None
 
     def register_launchers(self) -> None:
@@ -209,6 +217,7 @@ class Session:
         # REST (2/2)
         self.rest_manager.get_endpoint("/api/ipv8").initialize(self.ipv8)
         self.rest_manager.get_endpoint("/api/statistics").ipv8 = self.ipv8
+        self.rest_manager.get_endpoint("/api/statistics").executors = self.executors
         if self.config.get("statistics"):
             self.rest_manager.get_endpoint("/api/ipv8").endpoints["/overlays"].enable_overlay_statistics(True, None,
                                                                                                          True)
@@ -249,12 +258,16 @@ class Session:
             await server.stop()
 
         # Stop database activities
+        if self.async_db:
+            self.async_db.shutdown()
+        self.executors.get("db_read").shutdown(wait=True, cancel_futures=True)
         if self.db:
             self.notifier.notify(Notification.tribler_shutdown_state, state="Shutting down general-purpose database.")
             self.db.shutdown()
         if self.mds:
             self.notifier.notify(Notification.tribler_shutdown_state, state="Shutting down metadata database.")
             self.mds.shutdown()
+        self.executors.shutdown()
 
         # Stop communication with the GUI
         self.notifier.notify(Notification.tribler_shutdown_state, state="Shutting down GUI connection. Going dark.")
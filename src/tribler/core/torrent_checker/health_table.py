@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import random
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterator
+
+from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+HEALTH_TABLE_CAPACITY = 100000  # The default maximum number of torrents in a health table
+INFOHASH_LENGTH = 20
+
+MAX_RANKED_SEEDERS = 2 ** 31 - 1  # Torrents with more seeders are ranked as if they have this many seeders
+SLOT_BITS = 32  # The lowest bits of a ranking key hold the slot of the torrent
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class HealthTable:
+    """
+    A compact in-memory table of torrent health, ordered by the number of seeders.
+
+    The health of every torrent is stored in a slot of parallel arrays (infohash bytes, seeders, leechers, last check
+    and whether it was checked by us), instead of as a HealthInfo object. The ranking is a sorted array of integer keys
+    that combine the number of seeders (descending) with the slot, so the k healthiest torrents are found in O(k). A
+    torrent is found in the ranking with a binary search, but adding or removing its key shifts the keys after it: an
+    update is O(n), a memmove of 8 bytes per torrent with fewer seeders. Only the fields of the health that are gossiped
+    are kept: the source and tracker of a health check are not.
+
+    If the table is full, the torrent with the fewest seeders is evicted to make room for a new one.
+    """
+
+    def __init__(self, capacity: int = HEALTH_TABLE_CAPACITY) -> None:
+        """
+        Create a new empty table.
+
+        :param capacity: the maximum number of torrents to keep.
+        """
+        super().__init__()
+
+        self.capacity = capacity
+
+        self._infohashes = bytearray()
+        self._seeders = array("q")
+        self._leechers = array("q")
+        self._last_check = array("q")
+        self._self_checked = array("b")
+        self._slots: dict[bytes, int] = {}
+        self._free_slots: list[int] = []
+        self._ranking = array("q")
+
+    def __len__(self) -> int:
+        """
+        Get the number of torrents in this table.
+        """
+        return len(self._slots)
+
+    def __contains__(self, infohash: bytes) -> bool:
+        """
+        Check if the health of the given torrent is in this table.
+        """
+        return infohash in self._slots
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Iterate over the infohashes of the torrents in this table, the healthiest first.
+        """
+        for key in self._ranking:
+            yield self._infohash(key & SLOT_MASK)
+
+    @staticmethod
+    def _rank_key(seeders: int, slot: int) -> int:
+        """
+        Get the ranking key of a slot: keys of torrents with more seeders are smaller.
+        """
+        return ((MAX_RANKED_SEEDERS - min(max(seeders, 0), MAX_RANKED_SEEDERS)) << SLOT_BITS) | slot
+
+    def _infohash(self, slot: int) -> bytes:
+        """
+        Get the infohash in the given slot.
+        """
+        return bytes(self._infohashes[slot * INFOHASH_LENGTH:(slot + 1) * INFOHASH_LENGTH])
+
+    def _health(self, slot: int) -> HealthInfo:
+        """
+        Get the health in the given slot.
+        """
+        return HealthInfo(self._infohash(slot), self._seeders[slot], self._leechers[slot], self._last_check[slot],
+                          bool(self._self_checked[slot]))
+
+    def get(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Get the health of the given torrent.
+
+        :return: the health or None if the torrent is not in this table.
+        """
+        slot = self._slots.get(infohash)
+        return None if slot is None else self._health(slot)
+
+    def add(self, health: HealthInfo) -> None:
+        """
+        Add the health of a torrent, or replace its health if the torrent is already in this table.
+        """
+        slot = self._slots.get(health.infohash)
+        if slot is not None:
+            self._unrank(slot)
+        else:
+            if len(self._slots) >= self.capacity:
+                if not self._ranking or self._ranking[-1] < self._rank_key(health.seeders, 0):
+                    return  # The new torrent has fewer seeders than all torrents in this table
+                self.remove(self._infohash(self._ranking[-1] & SLOT_MASK))
+            slot = self._allocate(health.infohash)
+        self._seeders[slot] = health.seeders
+        self._leechers[slot] = health.leechers
+        self._last_check[slot] = health.last_check
+        self._self_checked[slot] = health.self_checked
+        insort(self._ranking, self._rank_key(health.seeders, slot))
+
+    def remove(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Remove the health of the given torrent.
+
+        :return: the removed health or None if the torrent was not in this table.
+        """
+        slot = self._slots.pop(infohash, None)
+        if slot is None:
+            return None
+        health = self._health(slot)
+        self._unrank(slot)
+        self._free_slots.append(slot)
+        return health
+
+    def _allocate(self, infohash: bytes) -> int:
+        """
+        Reserve a slot for the given infohash.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._infohashes[slot * INFOHASH_LENGTH:(slot + 1) * INFOHASH_LENGTH] = infohash
+        else:
+            slot = len(self._seeders)
+            self._infohashes += infohash
+            for column in (self._seeders, self._leechers, self._last_check, self._self_checked):
+                column.append(0)
+        self._slots[infohash] = slot
+        return slot
+
+    def _unrank(self, slot: int) -> None:
+        """
+        Remove the given slot from the ranking.
+        """
+        del self._ranking[bisect_left(self._ranking, self._rank_key(self._seeders[slot], slot))]
+
+    def count_alive(self) -> int:
+        """
+        Get the number of torrents with seeders.
+        """
+        return bisect_left(self._ranking, self._rank_key(0, 0))
+
+    def top(self, limit: int) -> list[HealthInfo]:
+        """
+        Get the health of the torrents with the most seeders, the healthiest first.
+        """
+        return [self._health(key & SLOT_MASK) for key in self._ranking[:limit]]
+
+    def alive(self) -> list[HealthInfo]:
+        """
+        Get the health of all torrents with seeders, the healthiest first.
+        """
+        return self.top(self.count_alive())
+
+    def sample_alive(self, size: int) -> list[HealthInfo]:
+        """
+        Get the health of a random sample of the torrents with seeders.
+
+        :param size: the maximum number of torrents in the sample.
+        """
+        alive = self.count_alive()
+        return [self._health(self._ranking[i] & SLOT_MASK) for i in random.sample(range(alive), min(size, alive))]
+
+    def values(self) -> list[HealthInfo]:
+        """
+        Get the health of all torrents, the healthiest first.
+        """
+        return self.top(len(self._ranking))
@@ -7,7 +7,7 @@ import time
 from asyncio import CancelledError, DatagramTransport
 from binascii import hexlify
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, cast
+from typing import TYPE_CHECKING, Any, List, Tuple, cast
 
 from ipv8.taskmanager import TaskManager
 from pony.orm import db_session, desc, select
@@ -16,6 +16,7 @@ from pony.utils import between
 from tribler.core.libtorrent.trackers import MalformedTrackerURLException, is_valid_url
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.dataclasses import HEALTH_FRESHNESS_SECONDS, HealthInfo, TrackerResponse
+from tribler.core.torrent_checker.health_table import HEALTH_TABLE_CAPACITY, HealthTable
 from tribler.core.torrent_checker.torrentchecker_session import (
     FakeDHTSession,
     TrackerSession,
@@ -37,7 +38,7 @@ MAX_TORRENTS_CHECKED_PER_SESSION = 5  # (5 random + 5 per tracker = 10 torrents)
 
 TORRENT_SELECTION_POOL_SIZE = 2  # How many torrents to check (popular or random) during periodic check
 USER_CHANNEL_TORRENT_SELECTION_POOL_SIZE = 5  # How many torrents to check from user's channel during periodic check
-TORRENTS_CHECKED_RETURN_SIZE = 240  # Estimated torrents checked on default 4 hours idle run
+TORRENTS_CHECKED_LOGGED = 10  # How many of the initially loaded self-checked torrents to log
 
 
 def aggregate_responses_for_infohash(infohash: bytes, responses: List[TrackerResponse]) -> HealthInfo:
@@ -84,12 +85,15 @@ class TorrentChecker(TaskManager):
 
         # We keep track of the results of popular torrents checked by you.
         # The content_discovery community gossips this information around.
-        self._torrents_checked: Dict[bytes, HealthInfo] | None = None
+        self._torrents_checked = HealthTable()
+        # The latest health of the torrents that are checked before the checked torrents are loaded from the database.
+        self._checked_before_load: dict[bytes, HealthInfo] | None = {}
 
     async def initialize(self) -> None:
         """
         Start all the looping tasks for the checker and creata socket.
         """
+        self.register_task("load checked torrents", self.load_torrents_checked)
         self.register_task("check random tracker", self.check_random_tracker, interval=TRACKER_SELECTION_INTERVAL)
         self.register_task("check local torrents", self.check_local_torrents, interval=TORRENT_SELECTION_INTERVAL)
         await self.create_socket_or_schedule()
@@ -206,41 +210,63 @@ class TorrentChecker(TaskManager):
         self._logger.info("Got response from %s in %f seconds: %s", session.__class__.__name__, round(t2 - t1, 3),
                           str(result))
 
-        with db_session:
-            for health in result.torrent_health_list:
-                self.update_torrent_health(health)
+        await asyncio.gather(*(self.update_torrent_health(health) for health in result.torrent_health_list))
 
         return result
 
     @property
-    def torrents_checked(self) -> Dict[bytes, HealthInfo]:
+    def torrents_checked(self) -> HealthTable:
         """
         Get the checked torrents and their health information.
+
+        Until ``load_torrents_checked`` is done, these are only the torrents that were checked since we started.
         """
-        if self._torrents_checked is None:
-            self._torrents_checked = self.load_torrents_checked_from_db()
-            lines = '\n'.join(f'    {health}' for health in sorted(self._torrents_checked.values(),
-                                                                   key=lambda health: -health.last_check))
-            self._logger.info("Initially loaded self-checked torrents:\n%s", lines)
         return self._torrents_checked
 
+    async def load_torrents_checked(self) -> None:
+        """
+        Load the checked torrents from the database in a thread, and apply the checks that were done in the meantime.
+        """
+        torrents_checked = await self.mds.run_threaded_read(self.load_torrents_checked_from_db)
+        checked_before_load, self._checked_before_load = self._checked_before_load or {}, None
+        self._torrents_checked = torrents_checked
+        for health in checked_before_load.values():
+            self._update_torrents_checked(health)
+        lines = '\n'.join(f'    {health}' for health in torrents_checked.top(TORRENTS_CHECKED_LOGGED))
+        self._logger.info("Initially loaded %d self-checked torrents, the healthiest are:\n%s",
+                          len(torrents_checked), lines)
+
+    def _update_torrents_checked(self, health: HealthInfo) -> None:
+        """
+        Add the health of a torrent that we checked to the checked torrents, or remove it if the torrent is dead.
+        """
+        if self._checked_before_load is not None:
+            self._checked_before_load[health.infohash] = health
+        if health.seeders > 0 or health.leechers > 0:
+            self._torrents_checked.add(health)
+        else:
+            self._torrents_checked.remove(health.infohash)
+
     @db_session
-    def load_torrents_checked_from_db(self) -> Dict[bytes, HealthInfo]:
+    def load_torrents_checked_from_db(self) -> HealthTable:
         """
         Load the health information from the database.
+
+        This loads up to ``HEALTH_TABLE_CAPACITY`` torrents: it should be called in a thread, see
+        ``load_torrents_checked``.
         """
-        result = {}
+        result = HealthTable()
         now = int(time.time())
         last_fresh_time = now - HEALTH_FRESHNESS_SECONDS
         checked_torrents = list(self.mds.TorrentState
                                 .select(lambda g: g.has_data == 1  # Had to be written this way for index to work
                                         and g.self_checked and between(g.last_check, last_fresh_time, now))
                                 .order_by(lambda g: (desc(g.seeders), g.last_check))
-                                .limit(TORRENTS_CHECKED_RETURN_SIZE))
+                                .limit(HEALTH_TABLE_CAPACITY))
 
         for torrent in checked_torrents:
-            result[torrent.infohash] = HealthInfo(torrent.infohash, torrent.seeders, torrent.leechers,
-                                                  last_check=torrent.last_check, self_checked=True)
+            result.add(HealthInfo(torrent.infohash, torrent.seeders, torrent.leechers,
+                                  last_check=torrent.last_check, self_checked=True))
         return result
 
     @db_session
@@ -308,8 +334,10 @@ class TorrentChecker(TaskManager):
         """
         Get a set of valid trackers for torrent. Also remove any invalid torrent.
         """
-        db_tracker_list = self.mds.TorrentState.get(infohash=infohash).trackers
-        return {tracker.url for tracker in db_tracker_list
+        torrent_state = self.mds.TorrentState.get(infohash=infohash)
+        if torrent_state is None:
+            return set()  # The health of the torrent is known, but not written yet
+        return {tracker.url for tracker in torrent_state.trackers
                 if is_valid_url(tracker.url) and not self.is_blacklisted_tracker(tracker.url)}
 
     async def check_torrent_health(self, infohash: bytes, timeout: float = 20, scrape_now: bool = False) -> HealthInfo:
@@ -324,18 +352,17 @@ class TorrentChecker(TaskManager):
         self._logger.info("Check health for the torrent: %s", infohash_hex)
         tracker_set = []
 
-        # We first check whether the torrent is already in the database and checked before
+        # We first check whether the torrent is already known and checked before
         with db_session:
-            torrent_state = self.mds.TorrentState.get(infohash=infohash)
-            if torrent_state:
-                last_check = torrent_state.last_check
-                time_diff = time.time() - last_check
+            known_health = self.mds.get_torrent_health(infohash)
+            if known_health:
+                time_diff = time.time() - known_health.last_check
                 if time_diff < MIN_TORRENT_CHECK_INTERVAL and not scrape_now:
                     self._logger.info("Time interval too short, not doing torrent health check for %s", infohash_hex)
-                    return torrent_state.to_health()
+                    return known_health
 
                 # get torrent's tracker list from DB
-                tracker_set = self.get_valid_trackers_of_torrent(torrent_state.infohash)
+                tracker_set = self.get_valid_trackers_of_torrent(infohash)
                 self._logger.info("Trackers for %s: %s", infohash_hex, str(tracker_set))
 
         coroutines = []
@@ -357,7 +384,7 @@ class TorrentChecker(TaskManager):
         if health.last_check == 0:
             self.notify(health)  # We don't need to store this in the db, but we still need to notify the GUI
         else:
-            self.update_torrent_health(health)
+            await self.update_torrent_health(health)
         return health
 
     def create_session_for_request(self, tracker_url: str, timeout: float = 20) -> TrackerSession | None:
@@ -394,10 +421,12 @@ class TorrentChecker(TaskManager):
         await session.cleanup()
         self._logger.debug('Session has been cleaned up')
 
-    def update_torrent_health(self, health: HealthInfo) -> bool:
+    async def update_torrent_health(self, health: HealthInfo) -> bool:
         """
         Updates the torrent state in the database if it already exists, otherwise do nothing.
         Returns True if the update was successful, False otherwise.
+
+        The known health is read, compared and replaced in a single operation of the write queue of the metadata store.
         """
         if not health.is_valid():
             self._logger.warning("Invalid health info ignored: %s", health)
@@ -408,30 +437,36 @@ class TorrentChecker(TaskManager):
             return False
 
         self._logger.debug("Update torrent health: %s", health)
-        with db_session:
-            # Update torrent state
-            torrent_state = self.mds.TorrentState.get_for_update(infohash=health.infohash)
-            if not torrent_state:
-                self._logger.warning("Unknown torrent: %s", hexlify(health.infohash).decode())
-                return False
-
-            prev_health = torrent_state.to_health()
-            if not health.should_replace(prev_health):
-                self._logger.info("Skip health update, the health in the database is fresher or have more seeders")
-                self.notify(prev_health)  # to update UI state from "Checking..."
-                return False
+        prev_health = await self.mds.run_threaded(self._replace_torrent_health, health)
+        if not prev_health:
+            self._logger.warning("Unknown torrent: %s", hexlify(health.infohash).decode())
+            return False
 
-            torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
-                              self_checked=True)
+        if prev_health is not health:
+            self._logger.info("Skip health update, the known health is fresher or have more seeders")
+            self.notify(prev_health)  # to update UI state from "Checking..."
+            return False
 
-        if health.seeders > 0 or health.leechers > 0:
-            self.torrents_checked[health.infohash] = health
-        else:
-            self.torrents_checked.pop(health.infohash, None)
+        self._update_torrents_checked(health)
 
         self.notify(health)
         return True
 
+    def _replace_torrent_health(self, health: HealthInfo) -> HealthInfo | None:
+        """
+        Store the given health of a known torrent if it should replace the known health, on the write queue.
+
+        :return: the given health if it was stored, the known health if it was not replaced, or None if the torrent is
+                 unknown.
+        """
+        prev_health = self.mds.get_torrent_health(health.infohash)
+        if not prev_health or not health.should_replace(prev_health):
+            return prev_health
+
+        # Update torrent state, or buffer the update
+        self.mds.store_torrent_health(health)
+        return health
+
     def notify(self, health: HealthInfo) -> None:
         """
         Send a health update to the GUI.
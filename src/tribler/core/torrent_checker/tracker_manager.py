@@ -28,6 +28,7 @@ class TrackerManager:
         self._logger = logging.getLogger(self.__class__.__name__)
         self.state_dir = state_dir
         self.TrackerState = metadata_store.TrackerState
+        self.tracker_cache = metadata_store.tracker_cache
 
         self.blacklist: list[str] = []
         self.load_blacklist()
@@ -103,6 +104,7 @@ class TrackerManager:
         with db_session:
             options = self.TrackerState.select(lambda g: g.url in [tracker_url, sanitized_tracker_url])
             for option in options[:]:
+                self.tracker_cache.remove(option.url)
                 option.delete()
 
     @db_session
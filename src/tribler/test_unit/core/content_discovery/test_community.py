@@ -23,6 +23,7 @@ from tribler.core.database.layers.knowledge import ResourceType
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE
 from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.notifier import Notification, Notifier
+from tribler.core.torrent_checker.health_table import HealthTable
 from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 from tribler.core.torrent_checker.torrentchecker_session import HealthInfo
 
@@ -43,13 +44,15 @@ class MockTorrentChecker(TorrentChecker):
         Create a new mocked TorrentChecker.
         """
         super().__init__(None, None, None, None, None)
-        self._torrents_checked = {self.infohash: HealthInfo(self.infohash, 7, 42, 1337)}
+        self.set_torrents_checked({self.infohash: HealthInfo(self.infohash, 7, 42, 1337)})
 
     def set_torrents_checked(self, value: dict[bytes, HealthInfo]) -> None:
         """
         Overwrite the default test value for torrents_checked.
         """
-        self._torrents_checked = value
+        self._torrents_checked = HealthTable()
+        for health in value.values():
+            self._torrents_checked.add(health)
 
 
 class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
@@ -71,7 +74,8 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         """
         overwrite_settings = ContentDiscoverySettings(
             torrent_checker=MockTorrentChecker(),
-            metadata_store=Mock(get_entries_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock())
+            metadata_store=Mock(get_entry_records_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock(),
+                                process_torrent_health_threaded=AsyncMock())
         )
         out = super().create_node(overwrite_settings, create_dht, enable_statistics)
         out.overlay.cancel_all_pending_tasks()
@@ -243,7 +247,7 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         """
         async_mock = AsyncMock()
         self.overlay(0).composition.tribler_db = Mock(instance=Mock(return_value={"01" * 20}))
-        self.overlay(0).composition.metadata_store.get_entries_threaded = async_mock
+        self.overlay(0).composition.metadata_store.get_entry_records_threaded = async_mock
 
         await self.overlay(0).process_rpc_query({'first': 0, 'infohash_set': None, 'last': 100})
 
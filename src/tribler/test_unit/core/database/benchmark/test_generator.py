@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import count, db_session
+
+from tribler.core.database.benchmark.generator import SyntheticMetadata, populate
+from tribler.core.database.store import MetadataStore
+
+
+class TestSyntheticMetadata(TestBase):
+    """
+    Tests for the SyntheticMetadata class.
+    """
+
+    def test_deterministic(self) -> None:
+        """
+        Test if the same seed gives the same torrents.
+        """
+        first = SyntheticMetadata(1, vocabulary_size=100)
+        second = SyntheticMetadata(1, vocabulary_size=100)
+
+        self.assertEqual([first.torrent().serialized() for _ in range(10)],
+                         [second.torrent().serialized() for _ in range(10)])
+        self.assertEqual(first.infohashes, second.infohashes)
+
+    def test_words_from_vocabulary(self) -> None:
+        """
+        Test if words are drawn from the vocabulary.
+        """
+        synthetic = SyntheticMetadata(1, vocabulary_size=100)
+
+        words = synthetic.words(50)
+
+        self.assertEqual(100, len(set(synthetic.vocabulary)))
+        self.assertTrue(set(words) <= set(synthetic.vocabulary))
+
+    def test_signed_torrent(self) -> None:
+        """
+        Test if a signed torrent has a valid signature.
+        """
+        synthetic = SyntheticMetadata(1, vocabulary_size=100)
+
+        payload = synthetic.signed_torrent(default_eccrypto.generate_key("curve25519"))
+
+        self.assertTrue(payload.check_signature())
+
+    def test_health(self) -> None:
+        """
+        Test if a generated health is non-negative and checked before now.
+        """
+        synthetic = SyntheticMetadata(1, vocabulary_size=100)
+
+        seeders, leechers, last_check = synthetic.health(1000000000)
+
+        self.assertLessEqual(0, seeders)
+        self.assertLessEqual(0, leechers)
+        self.assertGreaterEqual(1000000000, last_check)
+
+    def test_populate(self) -> None:
+        """
+        Test if a metadata store can be populated with synthetic torrents, some of which have a known health.
+        """
+        metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"), check_tables=False)
+        synthetic = SyntheticMetadata(1, vocabulary_size=100)
+
+        populate(metadata_store, synthetic, 200)
+
+        with db_session:
+            torrents = count(metadata_store.TorrentMetadata.select())
+            checked = count(metadata_store.TorrentState.select(lambda g: g.seeders > 0 or g.last_check > 0))
+        metadata_store.shutdown()
+        self.assertEqual(200, torrents)
+        self.assertEqual(200, len(synthetic.infohashes))
+        self.assertLess(0, checked)
+        self.assertGreater(200, checked)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+
+from tribler.core.database.benchmark.generator import SyntheticMetadata, populate
+from tribler.core.database.benchmark.scenarios import Benchmark, ScenarioResult
+from tribler.core.database.store import MetadataStore
+
+
+class TestScenarioResult(TestBase):
+    """
+    Tests for the ScenarioResult class.
+    """
+
+    def test_to_dict(self) -> None:
+        """
+        Test if timings are summarized in milliseconds.
+        """
+        result = ScenarioResult("test", [0.003, 0.001, 0.002])
+
+        summary = result.to_dict()
+
+        self.assertEqual(3, summary["runs"])
+        self.assertAlmostEqual(1.0, summary["min_ms"])
+        self.assertAlmostEqual(2.0, summary["median_ms"])
+        self.assertAlmostEqual(3.0, summary["max_ms"])
+        self.assertNotIn("items_per_s", summary)
+
+    def test_to_dict_items(self) -> None:
+        """
+        Test if the throughput is given for scenarios that process items.
+        """
+        result = ScenarioResult("test", [0.5, 0.5], items=10)
+
+        self.assertAlmostEqual(10.0, result.to_dict()["items_per_s"])
+
+
+class TestBenchmark(TestBase):
+    """
+    Tests for the Benchmark class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a small populated metadata store.
+        """
+        super().setUp()
+        self.metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"),
+                                            check_tables=False)
+        self.synthetic = SyntheticMetadata(1, vocabulary_size=100)
+        populate(self.metadata_store, self.synthetic, 200)
+        self.benchmark = Benchmark(self.metadata_store, self.synthetic, 2)
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the metadata store.
+        """
+        self.metadata_store.shutdown()
+        await super().tearDown()
+
+    def test_query_cache_disabled(self) -> None:
+        """
+        Test if the query cache is disabled by default.
+        """
+        self.assertEqual(0, self.metadata_store.query_cache.max_size)
+
+    def test_run_all(self) -> None:
+        """
+        Test if all scenarios are run the given number of times.
+        """
+        results = self.benchmark.run()
+
+        self.assertEqual(list(self.benchmark.scenarios), list(results))
+        self.assertTrue(all(result["runs"] == 2 for result in results.values()))
+
+    def test_run_selection(self) -> None:
+        """
+        Test if only the given scenarios are run.
+        """
+        results = self.benchmark.run(["popular", "mdblob_ingest"])
+
+        self.assertEqual(["popular", "mdblob_ingest"], list(results))
+        self.assertEqual(100, results["mdblob_ingest"]["items"])
+
+    def test_run_unknown(self) -> None:
+        """
+        Test if an unknown scenario raises a KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.benchmark.run(["unknown"])
@@ -4,9 +4,11 @@ from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 from ipv8.test.base import TestBase
+from pony.orm import db_session
 
 from tribler.core.database.layers.health import ResourceType
-from tribler.core.database.layers.knowledge import KnowledgeDataAccessLayer, Operation
+from tribler.core.database.layers.knowledge import KnowledgeDataAccessLayer, Operation, SimpleStatement
+from tribler.core.database.tribler_database import TriblerDatabase
 from tribler.core.knowledge.payload import StatementOperation
 
 if TYPE_CHECKING:
@@ -287,3 +289,119 @@ class TestKnowledgeDataAccessLayer(TestBase):
         self.assertEqual(0, selected.clock)
         self.assertEqual(0, selected.id)
         self.assertEqual(Operation.ADD.value, selected.operation)
+
+
+class TestKnowledgeDataAccessLayerBulk(TestBase):
+    """
+    Tests for the bulk lookups of the KnowledgeDataAccessLayer, on an actual database.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a database with a few statements about torrents.
+        """
+        super().setUp()
+        self.db = TriblerDatabase(":memory:")
+        with db_session:
+            for subject, obj in [("AA", "tag1"), ("AA", "tag2"), ("BB", "tag3"), ("Cc", "tag4")]:
+                self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, subject, ResourceType.TAG, obj)
+            self.db.knowledge.add_auto_generated_operation(ResourceType.TAG, "AA", ResourceType.TAG, "tag5")
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the database.
+        """
+        self.db.shutdown()
+        await super().tearDown()
+
+    @db_session
+    def test_get_simple_statements_bulk(self) -> None:
+        """
+        Test if the statements of multiple subjects are grouped by subject.
+        """
+        value = self.db.knowledge.get_simple_statements_bulk(["AA", "BB", "DD"], ResourceType.TORRENT)
+
+        self.assertEqual(["AA", "BB", "DD"], list(value))
+        self.assertEqual({"tag1", "tag2"}, {statement.object for statement in value["AA"]})
+        self.assertEqual([SimpleStatement(ResourceType.TORRENT, "BB", ResourceType.TAG, "tag3")], value["BB"])
+        self.assertEqual([], value["DD"])
+
+    @db_session
+    def test_get_simple_statements_bulk_order(self) -> None:
+        """
+        Test if the statements of a subject are ordered by their score.
+        """
+        statement = self.db.knowledge.Statement.select(lambda s: s.object.name == "tag2").first()
+        statement.added_count += 5
+
+        value = self.db.knowledge.get_simple_statements_bulk(["AA"], ResourceType.TORRENT)
+
+        self.assertEqual(["tag2", "tag1"], [statement.object for statement in value["AA"]])
+
+    @db_session
+    def test_get_simple_statements_bulk_hidden(self) -> None:
+        """
+        Test if statements that should not be shown are not given.
+        """
+        statement = self.db.knowledge.Statement.select(lambda s: s.object.name == "tag3").first()
+        statement.removed_count += 5
+
+        value = self.db.knowledge.get_simple_statements_bulk(["BB"], ResourceType.TORRENT)
+
+        self.assertEqual([], value["BB"])
+
+    @db_session
+    def test_get_simple_statements_bulk_case_insensitive(self) -> None:
+        """
+        Test if statements can be looked up in a case-insensitive manner, grouped by the given subject names.
+        """
+        value = self.db.knowledge.get_simple_statements_bulk(["cc"], ResourceType.TORRENT, case_sensitive=False)
+
+        self.assertEqual([SimpleStatement(ResourceType.TORRENT, "Cc", ResourceType.TAG, "tag4")], value["cc"])
+
+    @db_session
+    def test_get_simple_statements_bulk_any_type(self) -> None:
+        """
+        Test if the statements of subjects of any type are given if no subject type is given.
+        """
+        value = self.db.knowledge.get_simple_statements_bulk(["AA"])
+
+        self.assertEqual({"tag1", "tag2", "tag5"}, {statement.object for statement in value["AA"]})
+
+    @db_session
+    def test_get_subjects_intersection(self) -> None:
+        """
+        Test if only the subjects that have all the given objects are given.
+        """
+        self.assertEqual({"AA"}, self.db.knowledge.get_subjects_intersection({"tag1", "tag2"}, ResourceType.TAG))
+        self.assertEqual(set(), self.db.knowledge.get_subjects_intersection({"tag1", "tag3"}, ResourceType.TAG))
+
+    @db_session
+    def test_get_subjects_intersection_case_insensitive(self) -> None:
+        """
+        Test if objects can be looked up in a case-insensitive manner.
+        """
+        self.assertEqual(set(), self.db.knowledge.get_subjects_intersection({"TAG1"}, ResourceType.TAG))
+        self.assertEqual({"AA"}, self.db.knowledge.get_subjects_intersection({"TAG1"}, ResourceType.TAG,
+                                                                             case_sensitive=False))
+
+    @db_session
+    def test_get_subjects_intersection_subject_type(self) -> None:
+        """
+        Test if only subjects of the given type are given.
+        """
+        self.assertEqual(set(), self.db.knowledge.get_subjects_intersection({"tag5"}, ResourceType.TAG))
+        self.assertEqual({"AA"}, self.db.knowledge.get_subjects_intersection({"tag5"}, ResourceType.TAG,
+                                                                             ResourceType.TAG))
+
+    @db_session
+    def test_get_subjects_intersection_updated(self) -> None:
+        """
+        Test if statements that become shown or hidden after the posting lists are built are taken into account.
+        """
+        self.db.knowledge.get_subjects_intersection({"tag1"}, ResourceType.TAG)
+        self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "BB", ResourceType.TAG, "tag1")
+        self.db.knowledge.add_operation(StatementOperation(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag1",
+                                                           Operation.REMOVE, 1, b"me"), b"", is_local_peer=True)
+
+        self.assertEqual({"BB"}, self.db.knowledge.get_subjects_intersection({"tag1"}, ResourceType.TAG))
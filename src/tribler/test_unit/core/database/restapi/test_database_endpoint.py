@@ -10,11 +10,13 @@ from multidict import MultiDict, MultiDictProxy
 
 from tribler.core.database.layers.knowledge import ResourceType, SimpleStatement
 from tribler.core.database.restapi.database_endpoint import DatabaseEndpoint, parse_bool
-from tribler.core.database.serialization import REGULAR_TORRENT
-from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST
+from tribler.core.database.serialization import REGULAR_TORRENT, SNIPPET
+from tribler.core.executors import Priority
+from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST, HTTP_NOT_FOUND
 from tribler.test_unit.base_restapi import MockRequest, response_to_json
 
 if TYPE_CHECKING:
+    from tribler.core.database.async_database import AsyncDatabase
     from tribler.core.database.store import MetadataStore
 
 
@@ -44,12 +46,12 @@ class PopularTorrentsRequest(MockRequest):
     A MockRequest that mimics PopularTorrentsRequests.
     """
 
-    def __init__(self, query: dict, mds: MetadataStore | None) -> None:
+    def __init__(self, query: dict, mds: MetadataStore | None, async_db: AsyncDatabase | None = None) -> None:
         """
         Create a new PopularTorrentsRequest.
         """
         super().__init__(query, "GET", "/metadata/torrents/popular")
-        self.context = (mds,)
+        self.context = (mds, async_db)
 
 
 class SearchLocalRequest(MockRequest):
@@ -57,14 +59,14 @@ class SearchLocalRequest(MockRequest):
     A MockRequest that mimics SearchLocalRequests.
     """
 
-    def __init__(self, query: dict, mds: MetadataStore | None) -> None:
+    def __init__(self, query: dict, mds: MetadataStore | None, async_db: AsyncDatabase | None = None) -> None:
         """
         Create a new SearchLocalRequest.
         """
         default_query = {"fts_text": ""}
         default_query.update(query)
         super().__init__(default_query, "GET", "/metadata/search/local")
-        self.context = (mds,)
+        self.context = (mds, async_db)
 
 
 class SearchCompletionsRequest(MockRequest):
@@ -72,12 +74,24 @@ class SearchCompletionsRequest(MockRequest):
     A MockRequest that mimics SearchCompletionsRequests.
     """
 
-    def __init__(self, query: dict, mds: MetadataStore | None) -> None:
+    def __init__(self, query: dict, mds: MetadataStore | None, async_db: AsyncDatabase | None = None) -> None:
         """
         Create a new SearchCompletionsRequest.
         """
         super().__init__(query, "GET", "/metadata/search/completions")
-        self.context = (mds, )
+        self.context = (mds, async_db)
+
+
+class MaintenanceRequest(MockRequest):
+    """
+    A MockRequest that mimics MaintenanceRequests.
+    """
+
+    def __init__(self, query: dict | list[tuple[str, str]], method: str = "GET") -> None:
+        """
+        Create a new MaintenanceRequest.
+        """
+        super().__init__(query, method, "/metadata/maintenance")
 
 
 class TestDatabaseEndpoint(TestBase):
@@ -85,9 +99,10 @@ class TestDatabaseEndpoint(TestBase):
     Tests for the DatabaseEndpoint REST endpoint.
     """
 
-    async def mds_run_now(self, callback: Callable[[], tuple[dict, int, int]]) -> tuple[dict, int, int]:
+    async def mds_run_now(self, callback: Callable[[], tuple[dict, int, int]],
+                          priority: Priority = Priority.NORMAL) -> tuple[dict, int, int]:
         """
-        Run an mds callback immediately.
+        Run an mds callback immediately, regardless of its priority.
         """
         await sleep(0)
         return callback()
@@ -99,7 +114,7 @@ class TestDatabaseEndpoint(TestBase):
         soiled = MultiDictProxy(MultiDict([("first", "7"), ("last", "42"), ("sort_by", "name"), ("sort_desc", "0"),
                                            ("hide_xxx", "0"), ("category", "TEST"), ("origin_id", "13"),
                                            ("tags", "tag1"), ("tags", "tag2"), ("tags", "tag3"),
-                                           ("max_rowid", "1337"), ("channel_pk", "AA")]))
+                                           ("max_rowid", "1337"), ("channel_pk", "AA"), ("continuation", "abc")]))
 
         sanitized = DatabaseEndpoint.sanitize_parameters(soiled)
 
@@ -113,6 +128,7 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(["tag1", "tag2", "tag3"], sanitized["tags"])
         self.assertEqual(1337, sanitized["max_rowid"])
         self.assertEqual(b"\xaa", sanitized["channel_pk"])
+        self.assertEqual("abc", sanitized["continuation"])
 
     def test_parse_bool(self) -> None:
         """
@@ -123,22 +139,41 @@ class TestDatabaseEndpoint(TestBase):
         self.assertFalse(parse_bool("false"))
         self.assertFalse(parse_bool("0"))
 
-    def test_add_statements_to_metadata_list(self) -> None:
+    async def test_add_statements_to_metadata_list(self) -> None:
         """
         Test if statements can be added to an existing metadata dict.
         """
         metadata = {"type": REGULAR_TORRENT, "infohash": "AA"}
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements=Mock(return_value=[
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={"AA": [
             SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
-        ])))
-        endpoint.add_statements_to_metadata_list([metadata])
+        ]}))
+        await endpoint.add_statements_to_metadata_list([metadata])
 
         self.assertEqual(ResourceType.TORRENT, metadata["statements"][0]["subject_type"])
         self.assertEqual("AA", metadata["statements"][0]["subject"])
         self.assertEqual(ResourceType.TAG, metadata["statements"][0]["predicate"])
         self.assertEqual("tag", metadata["statements"][0]["object"])
 
+    async def test_add_statements_to_metadata_list_bulk(self) -> None:
+        """
+        Test if the statements of all torrents are looked up at once and missing statements are empty.
+        """
+        metadata = [{"type": REGULAR_TORRENT, "infohash": "AA"}, {"type": REGULAR_TORRENT, "infohash": "BB"},
+                    {"type": SNIPPET, "infohash": "CC"}]
+        endpoint = DatabaseEndpoint()
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={"AA": [
+            SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
+        ]}))
+        await endpoint.add_statements_to_metadata_list(metadata)
+
+        endpoint.async_db.get_simple_statements_bulk.assert_called_once_with(
+            subjects=["AA", "BB"], subject_type=ResourceType.TORRENT
+        )
+        self.assertEqual("tag", metadata[0]["statements"][0]["object"])
+        self.assertEqual([], metadata[1]["statements"])
+        self.assertNotIn("statements", metadata[2])
+
     async def test_get_torrent_health_bad_timeout(self) -> None:
         """
         Test if a bad timeout value in get_torrent_health leads to a HTTP_BAD_REQUEST status.
@@ -221,15 +256,15 @@ class TestDatabaseEndpoint(TestBase):
         """
         metadata = {"type": REGULAR_TORRENT, "infohash": "AA"}
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements=Mock(return_value=[
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={"AA": [
             SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
-        ])))
+        ]}))
         download = Mock(get_state=Mock(return_value=Mock(get_progress=Mock(return_value=1.0))),
                         tdef=Mock(infohash="AA"))
         endpoint.download_manager = Mock(get_download=Mock(return_value=download), metainfo_requests=[])
-        endpoint.mds = Mock(get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value=metadata))]))
+        endpoint.async_db.get_entry_records = AsyncMock(return_value=[Mock(to_simple_dict=Mock(return_value=metadata))])
 
-        response = await endpoint.get_popular_torrents(PopularTorrentsRequest(metadata, endpoint.mds))
+        response = await endpoint.get_popular_torrents(PopularTorrentsRequest(metadata, endpoint.mds, endpoint.async_db))
         response_body_json = await response_to_json(response)
         response_results = response_body_json["results"][0]
 
@@ -261,9 +296,9 @@ class TestDatabaseEndpoint(TestBase):
         The exception here stems from the ``mds`` being set to ``None``.
         """
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock()
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={}))
 
-        response = await endpoint.local_search(SearchLocalRequest({}, endpoint.mds))
+        response = await endpoint.local_search(SearchLocalRequest({}, endpoint.mds, endpoint.async_db))
 
         self.assertEqual(HTTP_BAD_REQUEST, response.status)
 
@@ -272,12 +307,12 @@ class TestDatabaseEndpoint(TestBase):
         Test if performing a local search without a tribler db set returns mds results.
         """
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock()
-        endpoint.mds = Mock(run_threaded=self.mds_run_now, get_total_count=Mock(), get_max_rowid=Mock(),
-                            get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={}))
+        endpoint.mds = Mock(run_threaded_read=self.mds_run_now, get_total_count_estimate=Mock(), get_max_rowid=Mock(),
+                            get_continuation_token=Mock(return_value=None), get_entry_records=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
                                                                                                   "type": -1}))]))
 
-        response = await endpoint.local_search(SearchLocalRequest({}, endpoint.mds))
+        response = await endpoint.local_search(SearchLocalRequest({}, endpoint.mds, endpoint.async_db))
         response_body_json = await response_to_json(response)
 
         self.assertEqual(200, response.status)
@@ -286,19 +321,39 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(50, response_body_json["last"])
         self.assertEqual(None, response_body_json["sort_by"])
         self.assertEqual(True, response_body_json["sort_desc"])
+        self.assertIsNone(response_body_json["continuation"])
+
+    async def test_local_search_continuation(self) -> None:
+        """
+        Test if a local search passes on the continuation token and returns the token of the next page.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={}))
+        endpoint.mds = Mock(run_threaded_read=self.mds_run_now, get_continuation_token=Mock(return_value="def"),
+                            get_entry_records=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
+                                                                                                  "type": -1}))]))
+
+        response = await endpoint.local_search(SearchLocalRequest({"continuation": "abc"}, endpoint.mds,
+                                                                  endpoint.async_db))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(200, response.status)
+        self.assertEqual("abc", endpoint.mds.get_entry_records.call_args.kwargs["continuation"])
+        self.assertEqual("def", response_body_json["continuation"])
 
     async def test_local_search_no_knowledge_include_total(self) -> None:
         """
         Test if performing a local search with requested total, includes a total.
         """
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock()
-        endpoint.mds = Mock(run_threaded=self.mds_run_now, get_total_count=Mock(return_value=1),
-                            get_max_rowid=Mock(return_value=7),
-                            get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={}))
+        endpoint.mds = Mock(run_threaded_read=self.mds_run_now, get_total_count_estimate=Mock(return_value=(1, True)),
+                            get_max_rowid=Mock(return_value=7), get_continuation_token=Mock(return_value=None),
+                            get_entry_records=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
                                                                                                   "type": -1}))]))
 
-        response = await endpoint.local_search(SearchLocalRequest({"include_total": "I would like this"}, endpoint.mds))
+        response = await endpoint.local_search(SearchLocalRequest({"include_total": "I would like this"}, endpoint.mds,
+                                                                  endpoint.async_db))
         response_body_json = await response_to_json(response)
 
         self.assertEqual(200, response.status)
@@ -308,8 +363,36 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(None, response_body_json["sort_by"])
         self.assertEqual(True, response_body_json["sort_desc"])
         self.assertEqual(1, response_body_json["total"])
+        self.assertTrue(response_body_json["total_approximate"])
         self.assertEqual(7, response_body_json["max_rowid"])
 
+    async def test_local_search_no_tribler_db(self) -> None:
+        """
+        Test if performing a local search without a Tribler database leads to a not found status.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.async_db = Mock(tribler_db=None)
+
+        response = await endpoint.local_search(SearchLocalRequest({}, endpoint.mds, endpoint.async_db))
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+
+    async def test_local_search_tags(self) -> None:
+        """
+        Test if a local search with tags is restricted to the torrents that have all these tags.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.async_db = Mock(get_simple_statements_bulk=AsyncMock(return_value={}),
+                                 get_subjects_intersection=AsyncMock(return_value={"aa"}))
+        endpoint.mds = Mock(run_threaded_read=self.mds_run_now, get_continuation_token=Mock(return_value=None),
+                            get_entry_records=Mock(return_value=[]))
+
+        response = await endpoint.local_search(SearchLocalRequest({"tags": "tag1"}, endpoint.mds, endpoint.async_db))
+
+        self.assertEqual(200, response.status)
+        self.assertEqual({"tag1"}, endpoint.async_db.get_subjects_intersection.call_args.kwargs["objects"])
+        self.assertEqual({b"\xaa"}, endpoint.mds.get_entry_records.call_args.kwargs["infohash_set"])
+
     async def test_completions_bad_query(self) -> None:
         """
         Test if a missing query leads to a bad request status.
@@ -325,25 +408,86 @@ class TestDatabaseEndpoint(TestBase):
         Test if a normal lowercase search leads to results.
         """
         endpoint = DatabaseEndpoint()
-        endpoint.mds = Mock(get_auto_complete_terms=Mock(return_value=["test1", "test2"]))
+        endpoint.async_db = Mock(get_auto_complete_terms=AsyncMock(return_value=["test1", "test2"]))
 
-        response = await endpoint.completions(SearchCompletionsRequest({"q": "test"}, endpoint.mds))
+        response = await endpoint.completions(SearchCompletionsRequest({"q": "test"}, endpoint.mds, endpoint.async_db))
         response_body_json = await response_to_json(response)
 
         self.assertEqual(200, response.status)
         self.assertEqual(["test1", "test2"], response_body_json["completions"])
-        self.assertEqual(call("test", max_terms=5), endpoint.mds.get_auto_complete_terms.call_args)
+        self.assertEqual(call("test", max_terms=5), endpoint.async_db.get_auto_complete_terms.call_args)
 
     async def test_completions_mixed_case_search(self) -> None:
         """
         Test if a mixed case search leads to results.
         """
         endpoint = DatabaseEndpoint()
-        endpoint.mds = Mock(get_auto_complete_terms=Mock(return_value=["test1", "test2"]))
+        endpoint.async_db = Mock(get_auto_complete_terms=AsyncMock(return_value=["test1", "test2"]))
 
-        response = await endpoint.completions(SearchCompletionsRequest({"q": "TeSt"}, endpoint.mds))
+        response = await endpoint.completions(SearchCompletionsRequest({"q": "TeSt"}, endpoint.mds, endpoint.async_db))
         response_body_json = await response_to_json(response)
 
         self.assertEqual(200, response.status)
         self.assertEqual(["test1", "test2"], response_body_json["completions"])
-        self.assertEqual(call("test", max_terms=5), endpoint.mds.get_auto_complete_terms.call_args)
+        self.assertEqual(call("test", max_terms=5), endpoint.async_db.get_auto_complete_terms.call_args)
+
+    async def test_get_maintenance_status_no_maintenance(self) -> None:
+        """
+        Test if the maintenance status is not found without database maintenance.
+        """
+        endpoint = DatabaseEndpoint()
+
+        response = await endpoint.get_maintenance_status(MaintenanceRequest({}))
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+
+    async def test_get_maintenance_status(self) -> None:
+        """
+        Test if the maintenance status of all databases is returned.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.maintenance = Mock(get_status=Mock(return_value={"metadata": {"pending": []}}))
+
+        response = await endpoint.get_maintenance_status(MaintenanceRequest({}))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(200, response.status)
+        self.assertEqual({"metadata": {"pending": []}}, response_body_json["maintenance"])
+
+    async def test_trigger_maintenance_unknown_database(self) -> None:
+        """
+        Test if triggering the maintenance of an unknown database leads to a not found status.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.maintenance = Mock(databases={"metadata": Mock()})
+
+        response = await endpoint.trigger_maintenance(MaintenanceRequest({"database": "unknown"}, "POST"))
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+        endpoint.maintenance.trigger.assert_not_called()
+
+    async def test_trigger_maintenance_unknown_task(self) -> None:
+        """
+        Test if triggering an unknown maintenance task leads to a bad request status.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.maintenance = Mock(databases={"metadata": Mock()}, trigger=Mock(side_effect=ValueError("unknown")))
+
+        response = await endpoint.trigger_maintenance(MaintenanceRequest({"tasks": "unknown"}, "POST"))
+
+        self.assertEqual(HTTP_BAD_REQUEST, response.status)
+
+    async def test_trigger_maintenance(self) -> None:
+        """
+        Test if the given maintenance tasks of the given database can be triggered.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.maintenance = Mock(databases={"metadata": Mock()})
+        query = [("database", "metadata"), ("tasks", "analyze"), ("tasks", "fts_optimize")]
+
+        response = await endpoint.trigger_maintenance(MaintenanceRequest(query, "POST"))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(200, response.status)
+        self.assertTrue(response_body_json["triggered"])
+        self.assertEqual(call("metadata", ["analyze", "fts_optimize"]), endpoint.maintenance.trigger.call_args)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import db_session
+
+from tribler.core.database.async_database import AsyncDatabase
+from tribler.core.database.layers.knowledge import ResourceType
+from tribler.core.database.store import MetadataStore
+from tribler.core.database.tribler_database import TriblerDatabase
+
+
+class TestAsyncDatabase(TestBase):
+    """
+    Tests for the AsyncDatabase class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a metadata store and a Tribler database on disk, in-memory databases cannot be used from other threads.
+        """
+        super().setUp()
+        directory = Path(self.temporary_directory())
+        self.metadata_store = MetadataStore(directory / "metadata.db", default_eccrypto.generate_key("curve25519"))
+        self.tribler_db = TriblerDatabase(str(directory / "tribler.db"))
+        self.async_db = AsyncDatabase(self.metadata_store, self.tribler_db, max_workers=2)
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the databases.
+        """
+        self.async_db.shutdown()
+        self.metadata_store.shutdown()
+        self.tribler_db.shutdown()
+        await super().tearDown()
+
+    async def test_run(self) -> None:
+        """
+        Test if functions are run on a database thread.
+        """
+        thread_name = await self.async_db.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(thread_name.startswith("Database"))
+
+    async def test_run_in_session(self) -> None:
+        """
+        Test if functions are run in a db_session.
+        """
+        self.assertEqual(0, await self.async_db.run(self.metadata_store.TorrentMetadata.select().count))
+
+    async def test_get_entry_records(self) -> None:
+        """
+        Test if entry records can be retrieved.
+        """
+        with db_session:
+            self.metadata_store.TorrentMetadata(title="test", infohash=b"\x01" * 20)
+
+        records = await self.async_db.get_entry_records(first=1, last=10)
+
+        self.assertEqual(["test"], [record.title for record in records])
+        self.assertEqual(1, await self.async_db.get_num_torrents())
+
+    async def test_get_simple_statements_bulk(self) -> None:
+        """
+        Test if the statements of subjects can be retrieved.
+        """
+        with db_session:
+            self.tribler_db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
+
+        statements = await self.async_db.get_simple_statements_bulk(["AA"], ResourceType.TORRENT)
+
+        self.assertEqual(["tag"], [statement.object for statement in statements["AA"]])
+
+    async def test_get_simple_statements_bulk_no_tribler_db(self) -> None:
+        """
+        Test if retrieving statements without a Tribler database raises a RuntimeError.
+        """
+        self.async_db.tribler_db = None
+
+        with self.assertRaises(RuntimeError):
+            await self.async_db.get_simple_statements_bulk(["AA"], ResourceType.TORRENT)
+
+    async def test_debug_loop_statements(self) -> None:
+        """
+        Test if statements on the event loop thread are flagged once per call site in debug mode.
+        """
+        self.async_db.enable_debug()
+
+        for _ in range(2):
+            with db_session:
+                self.metadata_store.get_num_torrents()
+
+        self.assertLess(0, self.async_db.loop_statements)
+        self.assertEqual(1, len(self.async_db.loop_call_sites))
+
+    async def test_debug_executor_statements(self) -> None:
+        """
+        Test if statements on the database threads are not flagged in debug mode.
+        """
+        self.async_db.enable_debug()
+
+        await self.async_db.get_num_torrents()
+
+        self.assertEqual(0, self.async_db.loop_statements)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+from pony.orm import Database, db_session
+
+from tribler.core.database.autocomplete import AutoCompleteIndex
+
+
+class TestAutoCompleteIndex(TestBase):
+    """
+    Tests for the AutoCompleteIndex class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an index in an in-memory database and add a few titles.
+        """
+        super().setUp()
+        self.database = Database()
+        self.database.bind(provider="sqlite", filename=":memory:", create_db=True)
+        self.database.generate_mapping(create_tables=True)
+        self.index = AutoCompleteIndex(self.database)
+        with db_session:
+            self.index.create_tables()
+        self.add_titles(["Big Buck Bunny", "Big Buck Bunny 1080p", "Bigger Fish", "Big Bad Wolf", "Sintel x264-Group"])
+
+    async def tearDown(self) -> None:
+        """
+        Disconnect from the database.
+        """
+        self.database.disconnect()
+        await super().tearDown()
+
+    def add_titles(self, titles: list[str]) -> None:
+        """
+        Add titles to the index in a transaction of their own.
+        """
+        with db_session:
+            self.index.add_titles(titles)
+
+    def complete(self, text: str, max_terms: int) -> list[str]:
+        """
+        Get the suggestions for a query text.
+        """
+        with db_session:
+            return self.index.complete(text, max_terms)
+
+    def get_top_terms(self, prefix: str) -> list[tuple[str, int]]:
+        """
+        Get the most popular terms that are kept for a short prefix.
+        """
+        with db_session:
+            return self.database.select("term, weight FROM AutoCompletePrefix WHERE prefix = $prefix "
+                                        "ORDER BY weight DESC", globals={"prefix": prefix})
+
+    def test_create_tables(self) -> None:
+        """
+        Test if the tables of the index are created.
+        """
+        with db_session:
+            self.assertTrue(self.index.tables_exist())
+            self.assertEqual(10, self.database.select("count(*) FROM AutoCompleteTerm")[0])
+
+    def test_complete_prefix(self) -> None:
+        """
+        Test if an unfinished word is completed, the term that occurs in the most titles first.
+        """
+        self.assertEqual(["big", "bigger"], self.complete("bi", 5))
+
+    def test_complete_next_term(self) -> None:
+        """
+        Test if a finished word is followed by the terms that follow it most often.
+        """
+        self.assertEqual(["big buck", "bigger", "big bad"], self.complete("big", 5))
+
+    def test_complete_separator(self) -> None:
+        """
+        Test if a text that ends with a separator is followed by a next term without an additional separator.
+        """
+        self.assertEqual(["big buck", "big bad"], self.complete("big ", 5))
+
+    def test_complete_phrase(self) -> None:
+        """
+        Test if the last word of a phrase is only completed with terms that follow the word before it.
+        """
+        self.assertEqual(["big buck"], self.complete("big bu", 5))
+
+    def test_complete_compound_term(self) -> None:
+        """
+        Test if terms that contain dots or dashes are completed as a whole.
+        """
+        self.assertEqual(["x264-group"], self.complete("x264-g", 5))
+
+    def test_complete_max_terms(self) -> None:
+        """
+        Test if no more than the maximum number of suggestions are given.
+        """
+        self.assertEqual(["big buck"], self.complete("big", 1))
+
+    def test_complete_no_words(self) -> None:
+        """
+        Test if a text without words gives no suggestions.
+        """
+        self.assertEqual([], self.complete("  ", 5))
+
+    def test_add_titles(self) -> None:
+        """
+        Test if the weights of the terms of added titles are increased.
+        """
+        self.add_titles(["Biggest", "Biggest Fish"])
+
+        self.assertEqual(["biggest", "bigger"], self.complete("bigg", 5))
+
+    def test_add_titles_top_terms(self) -> None:
+        """
+        Test if a term replaces the least popular term of a short prefix once it is more popular.
+        """
+        with patch("tribler.core.database.autocomplete.AUTOCOMPLETE_TOP_TERMS", 2):
+            self.add_titles(["Bingo"])
+            top_before = self.get_top_terms("bi")
+            self.add_titles(["Bingo", "Bingo", "Bingo Bongo"])
+            top_after = self.get_top_terms("bi")
+
+        self.assertEqual([("big", 3), ("bigger", 1)], top_before)
+        self.assertEqual([("bingo", 4), ("big", 3)], top_after)
+
+    def test_add_titles_chunked(self) -> None:
+        """
+        Test if the terms of many titles are looked up in chunks.
+        """
+        with patch("tribler.core.database.autocomplete.AUTOCOMPLETE_TERMS_PER_QUERY", 2):
+            self.add_titles(["Biggest Fish Ever", "Biggest Wolf"])
+
+        self.assertEqual(["biggest", "bigger"], self.complete("bigg", 5))
+        self.assertEqual(["biggest fish", "biggest wolf"], self.complete("biggest ", 5))
+
+    def test_complete_long_prefix(self) -> None:
+        """
+        Test if terms with a prefix that is longer than the short prefixes are found in the term table.
+        """
+        with patch("tribler.core.database.autocomplete.AUTOCOMPLETE_SHORT_PREFIX", 1):
+            self.assertEqual(["bigger"], self.complete("bigg", 5))
+
+    def test_next_terms_bounded(self) -> None:
+        """
+        Test if the least frequent following term is replaced when a term has too many following terms.
+        """
+        with patch("tribler.core.database.autocomplete.AUTOCOMPLETE_NEXT_TERMS", 2):
+            self.add_titles(["Big Ben"])
+
+        self.assertEqual(["big ben", "big buck"], self.complete("big ", 5))
+        with db_session:
+            self.assertEqual(2, self.database.select("count(*) FROM AutoCompleteNext WHERE term = 'big'")[0])
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+from pony.orm import Database
+
+from tribler.core.database.health_buffer import HealthBuffer
+from tribler.core.database.write_queue import WriteQueue
+from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+
+class TestHealthBuffer(TestBase):
+    """
+    Tests for the HealthBuffer class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a buffer that writes to a list.
+        """
+        super().setUp()
+        self.written = []
+        self.on_flushed = Mock()
+        self.health_buffer = HealthBuffer(WriteQueue("Test", Database(), threaded=False), self.written.append,
+                                          max_size=3, on_flushed=self.on_flushed)
+
+    def test_coalesce(self) -> None:
+        """
+        Test if only the last health per torrent is written.
+        """
+        self.health_buffer.add(HealthInfo(b"\x01" * 20, seeders=1))
+        self.health_buffer.add(HealthInfo(b"\x01" * 20, seeders=2))
+        self.health_buffer.add(HealthInfo(b"\x02" * 20, seeders=3))
+
+        self.health_buffer.flush()
+
+        self.assertEqual([2, 3], [health.seeders for health in self.written])
+        self.assertEqual(3, self.health_buffer.updates)
+        self.assertEqual(2, self.health_buffer.written)
+        self.assertEqual(1, self.health_buffer.flushes)
+        self.on_flushed.assert_called_once()
+
+    def test_get(self) -> None:
+        """
+        Test if buffered health can be read until it is written.
+        """
+        self.health_buffer.add(HealthInfo(b"\x01" * 20, seeders=1))
+
+        buffered = self.health_buffer.get(b"\x01" * 20)
+        self.health_buffer.flush()
+
+        self.assertEqual(1, buffered.seeders)
+        self.assertIsNone(self.health_buffer.get(b"\x01" * 20))
+        self.assertEqual(0, len(self.health_buffer))
+
+    def test_get_flushing(self) -> None:
+        """
+        Test if health is served from the buffer while its write has not been committed.
+        """
+        self.health_buffer.write_queue = Mock()
+        self.health_buffer.add(HealthInfo(b"\x01" * 20, seeders=1))
+
+        self.health_buffer.flush()
+
+        self.assertEqual(1, self.health_buffer.get(b"\x01" * 20).seeders)
+        self.assertEqual(1, len(self.health_buffer.get_all()))
+
+    def test_flush_empty(self) -> None:
+        """
+        Test if nothing is written if nothing is buffered.
+        """
+        self.assertIsNone(self.health_buffer.flush())
+        self.on_flushed.assert_not_called()
+
+    def test_flush_full(self) -> None:
+        """
+        Test if the buffer is flushed immediately when it reaches its maximum size.
+        """
+        for i in range(3):
+            self.health_buffer.add(HealthInfo(bytes([i]) * 20, seeders=i))
+
+        self.assertEqual(3, len(self.written))
+        self.assertEqual(0, len(self.health_buffer))
+
+    def test_flush_failed(self) -> None:
+        """
+        Test if health is buffered again if its write fails, unless newer health was buffered in the meantime.
+        """
+        self.health_buffer.write = Mock(side_effect=ValueError)
+        self.health_buffer.add(HealthInfo(b"\x01" * 20, seeders=1))
+
+        future = self.health_buffer.flush()
+
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(1, self.health_buffer.get(b"\x01" * 20).seeders)
+        self.assertEqual(0, self.health_buffer.flushes)
+        self.on_flushed.assert_not_called()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import db_session
+
+from tribler.core.database.maintenance import DatabaseMaintenance, MaintenanceScheduler
+from tribler.core.database.store import MetadataStore
+
+
+class TestMaintenance(TestBase):
+    """
+    Tests for the database maintenance.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a metadata store with some torrents and its maintenance.
+        """
+        super().setUp()
+        self.metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"),
+                                            check_tables=False)
+        with db_session:
+            for i in range(300):
+                self.metadata_store.add_ffa_from_dict({"infohash": i.to_bytes(2, "big") * 10, "title": f"torrent {i}"})
+        self.maintenance = DatabaseMaintenance("metadata", self.metadata_store.db, self.metadata_store.write_queue,
+                                               fts_table="FtsIndex", slice_duration=10.0)
+        self.scheduler = MaintenanceScheduler(interval=60, idle_time=60)
+        self.scheduler.add(self.maintenance)
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the metadata store.
+        """
+        self.metadata_store.shutdown()
+        await super().tearDown()
+
+    def get_status(self, task: str) -> dict:
+        """
+        Get the status of the given maintenance task.
+        """
+        return next(status for status in self.scheduler.get_status()["metadata"]["tasks"] if status["name"] == task)
+
+    async def test_scheduled(self) -> None:
+        """
+        Test if all scheduled tasks run when the database is idle.
+        """
+        self.metadata_store.write_queue.last_submitted -= 60
+
+        await self.scheduler.tick()
+
+        with db_session:
+            analyzed = self.metadata_store.db.select("count(*) FROM sqlite_master WHERE name = 'sqlite_stat1'")[0]
+        self.assertEqual(1, analyzed)
+        self.assertEqual(1, self.get_status("analyze")["runs"])
+        self.assertEqual(1, self.get_status("fts_merge")["runs"])
+        self.assertEqual(1, self.get_status("incremental_vacuum")["runs"])
+        self.assertEqual(0, self.get_status("fts_optimize")["runs"])
+        self.assertEqual([], self.maintenance.pending)
+        self.assertIsNotNone(self.maintenance.last_cycle)
+
+    async def test_not_idle(self) -> None:
+        """
+        Test if scheduled tasks wait for the database to be idle.
+        """
+        await self.scheduler.tick()
+
+        self.assertEqual(3, len(self.maintenance.pending))
+        self.assertEqual(0, self.get_status("analyze")["runs"])
+
+    async def test_not_due(self) -> None:
+        """
+        Test if no tasks are scheduled before the interval has passed since the last cycle.
+        """
+        self.metadata_store.write_queue.last_submitted -= 60
+        await self.scheduler.tick()
+
+        await self.scheduler.tick()
+
+        self.assertEqual(1, self.get_status("analyze")["runs"])
+
+    async def test_triggered(self) -> None:
+        """
+        Test if triggered tasks run without waiting for the database to be idle, and do not count as a cycle.
+        """
+        self.scheduler.interval = 0
+
+        self.scheduler.trigger("metadata", ["fts_optimize"])
+        await self.scheduler.tick()
+
+        self.assertEqual(1, self.get_status("fts_optimize")["runs"])
+        self.assertEqual(0, self.get_status("analyze")["runs"])
+        self.assertIsNone(self.maintenance.last_cycle)
+
+    def test_trigger_unknown_task(self) -> None:
+        """
+        Test if triggering an unknown task raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.scheduler.trigger("metadata", ["unknown"])
+
+    async def test_slice(self) -> None:
+        """
+        Test if no steps are started after the duration of a slice has passed.
+        """
+        self.maintenance.slice_duration = 0
+        self.scheduler.trigger()
+
+        await self.scheduler.tick()
+        pending = [task.name for task in self.maintenance.pending]
+
+        self.assertEqual(["analyze", "fts_merge", "incremental_vacuum"], pending)
+
+    async def test_incremental_vacuum(self) -> None:
+        """
+        Test if the free pages of deleted torrents are released and counted.
+        """
+        with db_session:
+            self.metadata_store.TorrentMetadata.select().delete(bulk=True)
+
+        self.scheduler.trigger("metadata", ["incremental_vacuum"])
+        await self.scheduler.tick()
+
+        with db_session:
+            free_pages = self.metadata_store.db.execute("PRAGMA freelist_count").fetchone()[0]
+        self.assertEqual(0, free_pages)
+        self.assertLess(0, self.get_status("incremental_vacuum")["reclaimed_bytes"])
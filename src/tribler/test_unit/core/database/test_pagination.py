@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.pagination import (
+    decode_continuation,
+    encode_continuation,
+    key_from_json,
+    key_to_json,
+    keyset_condition,
+)
+
+
+class TestPagination(TestBase):
+    """
+    Tests for the continuation token helpers.
+    """
+
+    def test_encode_decode(self) -> None:
+        """
+        Test if a continuation token can be decoded to the data it was created from.
+        """
+        data = {"sort_by": "title", "sort_desc": True, "keys": ["abc"], "rowid": 42}
+
+        self.assertEqual(data, decode_continuation(encode_continuation(data)))
+
+    def test_decode_malformed(self) -> None:
+        """
+        Test if decoding a malformed continuation token raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            decode_continuation("not a token")
+
+    def test_decode_not_a_dict(self) -> None:
+        """
+        Test if decoding a continuation token that does not hold a dictionary raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            decode_continuation(encode_continuation([1, 2]))
+
+    def test_key_bytes(self) -> None:
+        """
+        Test if binary sort keys survive the conversion to JSON.
+        """
+        self.assertEqual(b"\x01\x02", key_from_json(key_to_json(b"\x01\x02"), bytes))
+
+    def test_key_datetime(self) -> None:
+        """
+        Test if date sort keys survive the conversion to JSON.
+        """
+        value = datetime(2024, 1, 2, 3, 4, 5)  # noqa: DTZ001
+
+        self.assertEqual(value, key_from_json(key_to_json(value), datetime))
+
+    def test_key_text(self) -> None:
+        """
+        Test if text sort keys are kept as they are, the NOCASE collation is applied by the database.
+        """
+        self.assertEqual("ABCÉ", key_from_json("ABCÉ", str))
+
+    def test_key_invalid_int(self) -> None:
+        """
+        Test if a non-integer sort key for an integer column raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            key_from_json("1", int)
+
+    def test_keyset_condition_descending(self) -> None:
+        """
+        Test if the condition for descending keys includes NULL values, except for the last key.
+        """
+        condition = keyset_condition(["g.size", "g.rowid"], [10, 3], True)
+
+        self.assertEqual("((g.size < keyset[0] or g.size is None)) or (g.size == keyset[0] and (g.rowid < keyset[1]))",
+                         condition)
+
+    def test_keyset_condition_ascending_null(self) -> None:
+        """
+        Test if the condition for ascending keys after a NULL value selects the non-NULL values.
+        """
+        condition = keyset_condition(["g.size", "g.rowid"], [None, 3], False)
+
+        self.assertEqual("((g.size is not None)) or (g.size is None and (g.rowid > keyset[1]))", condition)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.popular import PopularTorrents
+from tribler.core.torrent_checker.dataclasses import HealthInfo
+
+
+class TestPopularTorrents(TestBase):
+    """
+    Tests for the PopularTorrents class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a view of the popular torrents with a capacity of 4 that initially loads two torrents.
+        """
+        super().setUp()
+        self.now = int(time.time())
+        self.loader = Mock(return_value=[HealthInfo(b"\x01" * 20, 10, 0, self.now),
+                                         HealthInfo(b"\x02" * 20, 5, 0, self.now)])
+        self.popular = PopularTorrents(4, 60, self.loader)
+
+    def test_get_infohashes_load(self) -> None:
+        """
+        Test if the torrents are loaded on the first lookup, the healthiest first.
+        """
+        infohashes = self.popular.get_infohashes()
+
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20], infohashes)
+        self.assertEqual(4, self.loader.call_args.args[0])
+
+    def test_get_infohashes_cached(self) -> None:
+        """
+        Test if the torrents are only loaded once if all torrents that qualify are known.
+        """
+        self.popular.get_infohashes()
+        self.popular.get_infohashes()
+
+        self.assertEqual(1, self.popular.reloads)
+
+    def test_update_not_loaded(self) -> None:
+        """
+        Test if updates are ignored before the torrents are loaded.
+        """
+        self.popular.update(HealthInfo(b"\x03" * 20, 20, 0, self.now))
+
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20], self.popular.get_infohashes())
+
+    def test_update_add(self) -> None:
+        """
+        Test if new healthy torrents are ranked among the loaded torrents.
+        """
+        self.popular.get_infohashes()
+
+        self.popular.update(HealthInfo(b"\x03" * 20, 7, 0, self.now))
+
+        self.assertEqual([b"\x01" * 20, b"\x03" * 20, b"\x02" * 20], self.popular.get_infohashes())
+
+    def test_update_dead(self) -> None:
+        """
+        Test if torrents without seeders and leechers are removed.
+        """
+        self.popular.get_infohashes()
+
+        self.popular.update(HealthInfo(b"\x01" * 20, 0, 0, self.now))
+
+        self.assertEqual([b"\x02" * 20], self.popular.get_infohashes())
+
+    def test_update_evict(self) -> None:
+        """
+        Test if the least healthy torrent is evicted when the capacity is exceeded.
+        """
+        self.popular.get_infohashes()
+
+        for i, seeders in ((3, 3), (4, 4), (5, 6)):
+            self.popular.update(HealthInfo(bytes([i]) * 20, seeders, 0, self.now))
+
+        self.assertEqual([b"\x01" * 20, b"\x05" * 20, b"\x02" * 20, b"\x04" * 20], self.popular.get_infohashes())
+        self.assertFalse(self.popular.complete)
+
+    def test_expire(self) -> None:
+        """
+        Test if torrents with an old health check are no longer returned.
+        """
+        self.popular.get_infohashes()
+
+        self.popular.update(HealthInfo(b"\x03" * 20, 20, 0, self.now - 61))
+
+        self.assertNotIn(b"\x03" * 20, self.popular.get_infohashes())
+
+    def test_reload_incomplete(self) -> None:
+        """
+        Test if the torrents are reloaded when too few torrents remain after evictions.
+        """
+        self.popular.get_infohashes()
+        for i in range(3, 6):
+            self.popular.update(HealthInfo(bytes([i]) * 20, i, 0, self.now))
+        for i in range(2, 6):
+            self.popular.update(HealthInfo(bytes([i]) * 20, 0, 0, self.now))
+
+        self.popular.get_infohashes()
+
+        self.assertEqual(2, self.popular.reloads)
+
+    def test_update_while_loading(self) -> None:
+        """
+        Test if updates are not blocked while the torrents are loaded and are applied to the loaded torrents.
+        """
+        def load(capacity: int, oldest_check: float) -> list[HealthInfo]:
+            self.popular.update(HealthInfo(b"\x03" * 20, 7, 0, self.now))
+            self.popular.update(HealthInfo(b"\x01" * 20, 0, 0, self.now))
+            return [HealthInfo(b"\x01" * 20, 10, 0, self.now), HealthInfo(b"\x02" * 20, 5, 0, self.now)]
+
+        self.popular.loader = load
+
+        self.assertEqual([b"\x03" * 20, b"\x02" * 20], self.popular.get_infohashes())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.postings import PostingIndex
+
+
+class TestPostingIndex(TestBase):
+    """
+    Tests for the PostingIndex class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an index of a few statements.
+        """
+        super().setUp()
+        self.statements = [(1, 10, "tag", 101), (2, 10, "tag", 101), (3, 10, "tag", 101),
+                           (2, 11, "other", 101), (3, 11, "other", 101), (2, 12, "Tag", 101), (4, 13, "tag", 1)]
+        self.index = PostingIndex(lambda: self.statements)
+
+    def test_load(self) -> None:
+        """
+        Test if the index is built once.
+        """
+        self.index.load()
+        self.statements = []
+        self.index.load()
+
+        self.assertTrue(self.index.loaded)
+        self.assertEqual(4, len(self.index))
+
+    def test_intersect(self) -> None:
+        """
+        Test if the subjects that have all the given objects are found.
+        """
+        self.index.load()
+
+        self.assertEqual([2, 3], self.index.intersect(["tag", "other"], 101))
+
+    def test_intersect_unknown(self) -> None:
+        """
+        Test if no subjects are found for an unknown object.
+        """
+        self.index.load()
+
+        self.assertEqual([], self.index.intersect(["tag", "unknown"], 101))
+
+    def test_intersect_case_insensitive(self) -> None:
+        """
+        Test if the posting lists of objects that only differ in case are merged in a case-insensitive intersection.
+        """
+        self.index.load()
+
+        self.assertEqual([2], self.index.intersect(["Tag"], 101))
+        self.assertEqual([1, 2, 3], self.index.intersect(["TAG"], 101, case_sensitive=False))
+
+    def test_intersect_any_type(self) -> None:
+        """
+        Test if objects of any type are matched if no type is given.
+        """
+        self.index.load()
+
+        self.assertEqual([1, 2, 3, 4], self.index.intersect(["tag"]))
+
+    def test_add(self) -> None:
+        """
+        Test if a subject can be added to a posting list.
+        """
+        self.index.load()
+        self.index.add(1, 11, "other", 101)
+        self.index.add(1, 11, "other", 101)
+
+        self.assertEqual([1, 2, 3], self.index.intersect(["tag", "other"], 101))
+
+    def test_add_not_loaded(self) -> None:
+        """
+        Test if adding to an index that is not built yet is ignored.
+        """
+        self.index.add(1, 11, "other", 101)
+
+        self.assertFalse(self.index.loaded)
+        self.assertEqual(0, len(self.index))
+
+    def test_remove(self) -> None:
+        """
+        Test if a subject can be removed from a posting list, and if empty posting lists are dropped.
+        """
+        self.index.load()
+        self.index.remove(4, 13)
+        self.index.remove(2, 10)
+        self.index.remove(2, 10)
+
+        self.assertEqual(3, len(self.index))
+        self.assertEqual([3], self.index.intersect(["tag", "other"], 101))
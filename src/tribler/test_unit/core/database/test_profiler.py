@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import db_session
+
+from tribler.core.database.profiler import MAX_LITERAL_LENGTH, QueryProfiler, query_shape, shorten_literals
+from tribler.core.database.store import MetadataStore
+
+
+class TestQueryProfiler(TestBase):
+    """
+    Tests for the QueryProfiler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a metadata store with a profiler that logs every query as slow, after its tables are created.
+        """
+        super().setUp()
+        self.profiler = QueryProfiler(threshold=0.0, log_size=2)
+        self.metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"),
+                                            check_tables=False, query_profiler=self.profiler)
+        self.profiler.reset()
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the metadata store.
+        """
+        self.metadata_store.shutdown()
+        await super().tearDown()
+
+    def finish_statements(self) -> None:
+        """
+        Run another statement, such that the last statement is measured.
+        """
+        with db_session:
+            self.metadata_store.db.select("NULL")
+
+    def test_query_shape(self) -> None:
+        """
+        Test if queries that only differ in literals, parameter lists and formatting have the same shape.
+        """
+        self.assertEqual(query_shape("SELECT x FROM t WHERE y IN (?, ?) AND z = 'a''b'\nLIMIT 5"),
+                         query_shape("SELECT x  FROM t WHERE y IN (?,?,?) AND z = x'0102' LIMIT 10"))
+
+    def test_shorten_literals(self) -> None:
+        """
+        Test if long string and blob literals are shortened to valid literals.
+        """
+        self.assertEqual("SELECT 'abc', x'0102'", shorten_literals("SELECT 'abc', x'0102'"))
+        self.assertEqual(f"SELECT '{'a' * MAX_LITERAL_LENGTH}...'", shorten_literals(f"SELECT '{'a' * 1000}'"))
+        self.assertEqual("SELECT 'a...'", shorten_literals("SELECT 'a" + "''" * 1000 + "'"))
+        self.assertEqual(f"SELECT x'{'01' * (MAX_LITERAL_LENGTH // 2)}'", shorten_literals(f"SELECT x'{'01' * 1000}'"))
+
+    def test_slow_query(self) -> None:
+        """
+        Test if a slow query is logged with its arguments and explained.
+        """
+        with db_session:
+            self.metadata_store.db.select("rowid FROM ChannelNode WHERE infohash = $infohash",
+                                          globals={"infohash": b"\x01" * 20})
+        self.finish_statements()
+
+        query, = [query for query in self.profiler.get_slow_queries() if "ChannelNode" in query["sql"]]
+        self.assertEqual("metadata", query["database"])
+        self.assertIn(f"x'{'01' * 20}'", query["sql"])
+        self.assertTrue(any("idx_channelnode__infohash" in line for line in query["plan"]))
+
+    def test_slow_query_log_size(self) -> None:
+        """
+        Test if only the most recent slow queries are kept.
+        """
+        with db_session:
+            for i in range(3):
+                self.metadata_store.db.select(f"{i}")
+        self.finish_statements()
+
+        self.assertEqual(["select 2", "select 1"], [query["sql"] for query in self.profiler.get_slow_queries()])
+
+    def test_histograms(self) -> None:
+        """
+        Test if the latencies of queries of the same shape are counted in one histogram.
+        """
+        self.profiler.threshold = 10.0
+
+        self.metadata_store.get_entries(txt_filter="abc", sort_by="size")
+        self.metadata_store.get_entries(txt_filter="def", sort_by="size")
+        self.finish_statements()
+
+        stats, = [stats for stats in self.profiler.get_histograms() if "FtsIndex MATCH" in stats["shape"]]
+        self.assertEqual(2, stats["count"])
+        self.assertEqual(2, sum(stats["buckets"]))
+        self.assertEqual([], self.profiler.get_slow_queries())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.query_cache import QueryCache, freeze
+
+
+class TestQueryCache(TestBase):
+    """
+    Tests for the QueryCache class.
+    """
+
+    def test_freeze_equal(self) -> None:
+        """
+        Test if equal parameters are frozen to equal keys.
+        """
+        self.assertEqual(freeze({"a": [1, 2], "b": {b"x", b"y"}}), freeze({"b": {b"y", b"x"}, "a": [1, 2]}))
+
+    def test_get_miss(self) -> None:
+        """
+        Test if getting an unknown key is counted as a miss.
+        """
+        cache = QueryCache()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_get_hit(self) -> None:
+        """
+        Test if getting a stored key is counted as a hit.
+        """
+        cache = QueryCache()
+        cache.put("key", 42, cache.get_generation())
+
+        self.assertEqual(42, cache.get("key"))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(0, cache.misses)
+
+    def test_invalidate(self) -> None:
+        """
+        Test if entries of an earlier generation are no longer returned.
+        """
+        cache = QueryCache()
+        cache.put("key", 42, cache.get_generation())
+
+        cache.invalidate()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(0, len(cache))
+
+    def test_put_outdated(self) -> None:
+        """
+        Test if values that were computed before an invalidation are not stored.
+        """
+        cache = QueryCache()
+        generation = cache.get_generation()
+        cache.invalidate()
+
+        cache.put("key", 42, generation)
+
+        self.assertEqual(0, len(cache))
+
+    def test_invalidate_source(self) -> None:
+        """
+        Test if invalidating a source only invalidates the entries that depend on it.
+        """
+        cache = QueryCache()
+        cache.put("key1", 1, cache.get_generation(["torrents"]), ["torrents"])
+        cache.put("key2", 2, cache.get_generation(["torrents", "health"]), ["torrents", "health"])
+
+        cache.invalidate("health")
+
+        self.assertEqual(1, cache.get("key1"))
+        self.assertIsNone(cache.get("key2"))
+
+    def test_put_outdated_source(self) -> None:
+        """
+        Test if values that were computed before an invalidation of one of their sources are not stored.
+        """
+        cache = QueryCache()
+        generation = cache.get_generation(["torrents", "health"])
+        cache.invalidate("health")
+
+        cache.put("key", 42, generation, ["health", "torrents"])
+
+        self.assertEqual(0, len(cache))
+
+    def test_expired(self) -> None:
+        """
+        Test if entries are no longer returned after their time to live.
+        """
+        cache = QueryCache(ttl=10.0)
+        with patch("tribler.core.database.query_cache.monotonic", return_value=100.0):
+            cache.put("key", 42, cache.get_generation())
+        with patch("tribler.core.database.query_cache.monotonic", return_value=110.0):
+            value = cache.get("key")
+
+        self.assertIsNone(value)
+
+    def test_evict_least_recently_used(self) -> None:
+        """
+        Test if the least recently used entry is evicted when the cache is full.
+        """
+        cache = QueryCache(max_size=2)
+        cache.put("key1", 1, cache.get_generation())
+        cache.put("key2", 2, cache.get_generation())
+        cache.get("key1")
+
+        cache.put("key3", 3, cache.get_generation())
+
+        self.assertEqual(1, cache.get("key1"))
+        self.assertIsNone(cache.get("key2"))
+        self.assertEqual(3, cache.get("key3"))
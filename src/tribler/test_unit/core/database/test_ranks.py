@@ -9,7 +9,9 @@ from tribler.core.database.ranks import (
     freshness_rank,
     seeders_rank,
     title_rank,
+    top_ranked,
     torrent_rank,
+    torrent_ranks,
 )
 
 
@@ -167,6 +169,51 @@ class TestRanks(TestBase):
         self.assertGreaterEqual(rank2, rank3)
         self.assertGreaterEqual(rank3, rank4)
 
+    def test_torrent_ranks_batch(self) -> None:
+        """
+        Test if ranking a batch of torrents gives the same ranks as ranking them one by one.
+        """
+        titles = ["Big Buck Bunny", "Big Bunny Buck", None, "Boring Big Buck Bunny"]
+        seeders = [0, 1000, 3, None]
+        leechers = [0, 10, None, 7]
+        freshness = [None, 100, -1, 1]
+
+        ranks = torrent_ranks("Big Buck Bunny", titles, seeders, leechers, freshness)
+
+        self.assertEqual(4, len(ranks))
+        for rank, args in zip(ranks, zip(titles, seeders, leechers, freshness)):
+            self.assertAlmostEqual(torrent_rank("Big Buck Bunny", *args), rank)
+
+    def test_torrent_ranks_empty(self) -> None:
+        """
+        Test if ranking an empty batch of torrents gives no ranks.
+        """
+        self.assertEqual([], torrent_ranks("Big Buck Bunny", [], [], [], []))
+
+    def test_top_ranked_all(self) -> None:
+        """
+        Test if all indices are returned, highest rank first, if no k is given.
+        """
+        self.assertEqual([1, 2, 0], top_ranked([0.1, 0.9, 0.5]))
+
+    def test_top_ranked_k(self) -> None:
+        """
+        Test if only the k highest ranked indices are returned.
+        """
+        self.assertEqual([1, 3], top_ranked([0.1, 0.9, 0.5, 0.7], 2))
+
+    def test_top_ranked_tiebreakers(self) -> None:
+        """
+        Test if equal ranks are ordered by their tiebreakers.
+        """
+        self.assertEqual([2, 0, 1], top_ranked([0.5, 0.5, 0.5], 3, tiebreakers=[2, 1, 3]))
+
+    def test_top_ranked_priorities(self) -> None:
+        """
+        Test if entries of a higher priority come first, regardless of their rank.
+        """
+        self.assertEqual([2, 0, 1], top_ranked([0.1, 0.9, 0.5], priorities=[1, 0, 1]))
+
     def test_find_word_first(self) -> None:
         """
         Test if a matched first word gets popped from the queue.
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.serialization import NULL_KEY, REGULAR_TORRENT, TorrentMetadataPayload, int2time
+from tribler.core.database.snapshot import (
+    SNAPSHOT_HEADER,
+    SNAPSHOT_MAGIC,
+    SnapshotFormatError,
+    SnapshotReader,
+    SnapshotWriter,
+)
+
+
+class TestSnapshot(TestBase):
+    """
+    Tests for the snapshot file format.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a path for a snapshot file.
+        """
+        super().setUp()
+        self.path = Path(self.temporary_directory()) / "metadata.snapshot"
+
+    def create_payload(self, i: int) -> TorrentMetadataPayload:
+        """
+        Create an unsigned torrent payload.
+        """
+        return TorrentMetadataPayload(REGULAR_TORRENT, 0, NULL_KEY, i, 0, 0, bytes([i]) * 20, 42, int2time(0),
+                                      f"torrent {i}", "", "")
+
+    def write_snapshot(self, count: int) -> list[TorrentMetadataPayload]:
+        """
+        Write a snapshot with the given number of torrents.
+        """
+        payloads = [self.create_payload(i) for i in range(count)]
+        with SnapshotWriter(self.path) as writer:
+            for i, payload in enumerate(payloads):
+                writer.write(payload.serialized() + payload.signature, i, i * 2, 1000 + i)
+        return payloads
+
+    def test_write_read(self) -> None:
+        """
+        Test if the torrents and their health can be read from a written snapshot.
+        """
+        payloads = self.write_snapshot(3)
+
+        with SnapshotReader(self.path) as reader:
+            records = list(reader)
+
+        self.assertEqual(3, reader.count)
+        self.assertEqual([payload.infohash for payload in payloads], [record.payload.infohash for record in records])
+        self.assertEqual("torrent 2", records[2].payload.title)
+        self.assertEqual((2, 4, 1002), records[2][1:])
+
+    def test_batches(self) -> None:
+        """
+        Test if the records of a snapshot can be read in batches.
+        """
+        self.write_snapshot(5)
+
+        with SnapshotReader(self.path) as reader:
+            batches = list(reader.batches(2))
+
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batches])
+
+    def test_write_failed(self) -> None:
+        """
+        Test if an incomplete snapshot is removed.
+        """
+        with self.assertRaises(ValueError), SnapshotWriter(self.path):
+            raise ValueError
+
+        self.assertFalse(self.path.exists())
+
+    def test_read_not_a_snapshot(self) -> None:
+        """
+        Test if reading a file that is not a snapshot raises a SnapshotFormatError.
+        """
+        self.path.write_bytes(b"\x00" * SNAPSHOT_HEADER.size)
+
+        with self.assertRaises(SnapshotFormatError), SnapshotReader(self.path):
+            pass
+
+    def test_read_unsupported_version(self) -> None:
+        """
+        Test if reading a snapshot of an unknown version raises a SnapshotFormatError.
+        """
+        self.path.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 2, 0))
+
+        with self.assertRaises(SnapshotFormatError), SnapshotReader(self.path):
+            pass
+
+    def test_read_truncated(self) -> None:
+        """
+        Test if reading a truncated snapshot raises a SnapshotFormatError.
+        """
+        self.write_snapshot(3)
+        self.path.write_bytes(self.path.read_bytes()[:-20])
+
+        with self.assertRaises(SnapshotFormatError), SnapshotReader(self.path) as reader:
+            list(reader)
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
 from ipv8.community import Community, CommunitySettings
 from ipv8.keyvault.crypto import default_eccrypto
 from ipv8.test.base import TestBase
@@ -7,8 +12,19 @@ from ipv8.test.mocking.ipv8 import MockIPv8
 from pony.orm import db_session
 
 from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk
-from tribler.core.database.serialization import NULL_KEY, int2time
-from tribler.core.database.store import MetadataStore, ObjState
+from tribler.core.database.serialization import NULL_KEY, REGULAR_TORRENT, SignedPayload, int2time
+from tribler.core.database.store import (
+    FTS_OPTIONS,
+    QUERY_SOURCE_HEALTH,
+    QUERY_SOURCE_TORRENTS,
+    MetadataStore,
+    ObjState,
+    get_fts_options,
+    sql_legacy_fts_table,
+)
+from tribler.core.executors import ExecutorPools, Priority
+from tribler.core.notifier import Notification
+from tribler.core.torrent_checker.dataclasses import HealthInfo
 
 
 class MockCommunity(Community):
@@ -58,6 +74,100 @@ class TestMetadataStore(TestBase[MockCommunity]):
 
         self.assertEqual(signatures, [d.md_obj.signature for d in uncompressed])
 
+    async def test_process_compressed_mdblob_threaded(self) -> None:
+        """
+        Test if the signatures of a compressed mdblob are verified before its payloads are written on the write queue.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        with db_session:
+            md_list = [metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20,
+                                                      torrent_date=int2time(i)) for i in range(3)]
+            chunk, _ = entries_to_chunk(md_list, chunk_size=999999999999999)
+            for d in md_list:
+                d.delete()
+        has_signature = SignedPayload.has_signature
+        verifying_threads = []
+
+        def record_thread(payload: SignedPayload) -> bool:
+            verifying_threads.append(threading.current_thread().name)
+            return has_signature(payload)
+
+        with patch.object(SignedPayload, "has_signature", record_thread):
+            results = await metadata_store.process_compressed_mdblob_threaded(chunk,
+                                                                              skip_personal_metadata_payload=False)
+        with db_session:
+            titles = [result.md_obj.title for result in results]
+        metadata_store.shutdown()
+
+        self.assertEqual([f"test torrent {i}" for i in range(3)], titles)
+        self.assertLess(0, len(verifying_threads))
+        self.assertNotIn("MetadataStore-write", verifying_threads)
+
+    async def test_process_compressed_mdblob_threaded_invalid(self) -> None:
+        """
+        Test if invalid compressed data is ignored without writing to the database.
+        """
+        self.metadata_store.write_queue = Mock()
+
+        self.assertEqual([], await self.metadata_store.process_compressed_mdblob_threaded(b"abcdefg"))
+        self.metadata_store.write_queue.submit_weighted.assert_not_called()
+
+    def test_notify_new_torrent_after_commit(self) -> None:
+        """
+        Test if new torrents are only notified once their write is committed.
+        """
+        notifier = Mock()
+        metadata_store = MetadataStore(":memory:", self.private_key(0), notifier=notifier)
+
+        def add_and_fail() -> None:
+            metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "failed"})
+            raise ValueError
+
+        metadata_store.write_queue.submit(add_and_fail)
+        notified_after_failure = notifier.notify.call_count
+        metadata_store.write_queue.submit(metadata_store.add_ffa_from_dict, {"infohash": b"\x02" * 20, "title": "ok"})
+        metadata_store.shutdown()
+
+        self.assertEqual(0, notified_after_failure)
+        notifier.notify.assert_called_once_with(Notification.new_torrent_metadata_created, infohash=b"\x02" * 20,
+                                                title="ok")
+
+    async def test_process_compressed_mdblob_threaded_chunked(self) -> None:
+        """
+        Test if the payloads of a large mdblob are written in transactions of at most the maximum batch weight.
+        """
+        with db_session:
+            md_list = [self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20,
+                                                           torrent_date=int2time(i)) for i in range(10)]
+            chunk, _ = entries_to_chunk(md_list, chunk_size=999999999999999)
+            for d in md_list:
+                d.delete()
+        self.metadata_store.write_queue.max_batch_weight = 4
+
+        results = await self.metadata_store.process_compressed_mdblob_threaded(chunk,
+                                                                               skip_personal_metadata_payload=False)
+
+        with db_session:
+            self.assertEqual(10, self.metadata_store.get_num_torrents())
+            self.assertEqual("test torrent 9", results[9].md_obj.title)
+        self.assertEqual(3, self.metadata_store.write_queue.transactions)
+        self.assertEqual(4, self.metadata_store.write_queue.peak_batch_weight)
+
+    async def test_process_torrent_health_threaded(self) -> None:
+        """
+        Test if the health of torrents is written in one write queue operation, weighted by the number of torrents.
+        """
+        now = int(time.time())
+
+        await self.metadata_store.process_torrent_health_threaded([HealthInfo(bytes([i]) * 20, seeders=i,
+                                                                              last_check=now) for i in range(1, 4)])
+
+        with db_session:
+            self.assertEqual(2, self.metadata_store.get_torrent_health(b"\x02" * 20).seeders)
+        self.assertEqual(1, self.metadata_store.write_queue.transactions)
+        self.assertEqual(3, self.metadata_store.write_queue.last_batch_weight)
+
     @db_session
     def test_squash_mdblobs_multiple_chunks(self) -> None:
         """
@@ -147,6 +257,42 @@ class TestMetadataStore(TestBase[MockCommunity]):
 
         self.assertEqual([], self.metadata_store.process_payload(payload))
 
+    @db_session
+    def test_verify_payload_signatures(self) -> None:
+        """
+        Test if payloads with a bad signature are dropped and counted before processing.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        payloads = []
+        for i in range(5):
+            md = self.metadata_store.TorrentMetadata(title=f"torrent {i}", infohash=bytes([i]) * 20, id_=i,
+                                                     torrent_date=int2time(0), public_key=other_key.key_to_bin())
+            payloads.append(md.payload_class.from_signed_blob(md.serialized(other_key)))
+            md.delete()
+        payloads[1].signature = bytes(127 ^ byte for byte in payloads[1].signature)
+        payloads[3].signature = bytes(127 ^ byte for byte in payloads[3].signature)
+
+        verified = self.metadata_store.verify_payload_signatures(payloads)
+
+        self.assertEqual([payloads[0], payloads[2], payloads[4]], verified)
+        self.assertEqual(2, self.metadata_store.rejected_payloads_count)
+
+    @db_session
+    def test_squash_mdblobs_bad_signature(self) -> None:
+        """
+        Test if payloads with a bad signature in an mdblob are not processed.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0, timestamp=0,
+                                                 torrent_date=int2time(0), public_key=other_key.key_to_bin())
+        blob = md.serialized(other_key)
+        md.delete()
+
+        results = self.metadata_store.process_squashed_mdblob(blob[:-64] + bytes(127 ^ byte for byte in blob[-64:]))
+
+        self.assertEqual([], results)
+        self.assertEqual(1, self.metadata_store.rejected_payloads_count)
+
     @db_session
     def test_process_payload_invalid_metadata_type(self) -> None:
         """
@@ -197,6 +343,444 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertIsNotNone(self.metadata_store.TorrentMetadata.get(title=ffa_title))
         self.assertEqual([], self.metadata_store.process_payload(ffa_payload))
 
+    def test_squash_mdblobs_bulk(self) -> None:
+        """
+        Test if mdblobs can be squashed and processed again in bulk ingest mode.
+        """
+        self.metadata_store.bulk_ingest = True
+        with db_session:
+            md_list = [
+                self.metadata_store.TorrentMetadata(title=f'test torrent {i}', infohash=bytes([i]) * 20,
+                                                    torrent_date=int2time(i))
+                for i in range(10)
+            ]
+            chunk, _ = entries_to_chunk(md_list, chunk_size=999999999999999)
+            signatures = [d.signature for d in md_list]
+            for d in md_list:
+                d.delete()
+
+        with db_session:
+            uncompressed = self.metadata_store.process_compressed_mdblob(chunk, skip_personal_metadata_payload=False)
+
+            self.assertEqual(signatures, [d.md_obj.signature for d in uncompressed])
+            self.assertEqual(int2time(3), uncompressed[3].md_obj.torrent_date)
+
+    def test_process_payloads_bulk_external(self) -> None:
+        """
+        Test if processing external payloads in bulk creates the torrents, their health and their trackers.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        with db_session:
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0,
+                                                     timestamp=0, torrent_date=int2time(0),
+                                                     public_key=other_key.key_to_bin(),
+                                                     tracker_info="http://tracker.org/announce")
+            payload = md.payload_class.from_signed_blob(md.serialized(other_key))
+            md.delete()
+            self.metadata_store.TrackerState.select().delete()
+
+        result, = self.metadata_store.process_payloads_bulk([payload])
+        duplicate, = self.metadata_store.process_payloads_bulk([payload])
+
+        with db_session:
+            torrent = self.metadata_store.TorrentMetadata.get(infohash=b"\x01" * 20)
+            self.assertEqual(ObjState.NEW_OBJECT, result.obj_state)
+            self.assertEqual(ObjState.DUPLICATE_OBJECT, duplicate.obj_state)
+            self.assertEqual("test torrent", torrent.title)
+            self.assertEqual(payload.signature, torrent.signature)
+            self.assertEqual(b"\x01" * 20, torrent.health.infohash)
+            self.assertEqual(["http://tracker.org/announce"], [t.url for t in torrent.health.trackers])
+
+    def test_process_payloads_bulk_chunked(self) -> None:
+        """
+        Test if payloads are looked up in several queries, if there are more than fit in one query.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        with db_session:
+            payloads = []
+            for i in range(5):
+                md = self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20, id_=i,
+                                                         timestamp=0, torrent_date=int2time(0),
+                                                         public_key=other_key.key_to_bin(),
+                                                         tracker_info=f"http://tracker{i}.org/announce")
+                payloads.append(md.payload_class.from_signed_blob(md.serialized(other_key)))
+                md.delete()
+            self.metadata_store.TrackerState.select().delete()
+
+        with patch("tribler.core.database.store.BULK_PAYLOADS_PER_QUERY", 2):
+            results = self.metadata_store.process_payloads_bulk(payloads)
+            duplicates = self.metadata_store.process_payloads_bulk(payloads)
+
+        with db_session:
+            self.assertEqual([ObjState.NEW_OBJECT] * 5, [result.obj_state for result in results])
+            self.assertEqual([ObjState.DUPLICATE_OBJECT] * 5, [result.obj_state for result in duplicates])
+            self.assertEqual([f"test torrent {i}" for i in range(5)], [result.md_obj.title for result in results])
+            self.assertEqual(5, self.metadata_store.TrackerState.select().count())
+            self.assertEqual(5, self.metadata_store.TorrentState.select().count())
+
+    def test_get_by_rowids_chunked(self) -> None:
+        """
+        Test if torrents are loaded by their row ids in several queries, in the order of the given row ids.
+        """
+        with db_session:
+            entries = [self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20)
+                       for i in range(5)]
+            self.metadata_store.db.flush()
+            rowids = [entry.rowid for entry in entries]
+        rowids = [*reversed(rowids), 999]
+
+        with patch("tribler.core.database.store.BULK_PAYLOADS_PER_QUERY", 2):
+            entries = self.metadata_store.get_entries_by_rowids(rowids)
+            records = self.metadata_store.get_records_by_rowids(rowids)
+
+        with db_session:
+            self.assertEqual([f"test torrent {i}" for i in reversed(range(5))], [entry.title for entry in entries])
+        self.assertEqual([f"test torrent {i}" for i in reversed(range(5))], [record.title for record in records])
+
+    def test_process_payloads_bulk_cached_tracker(self) -> None:
+        """
+        Test if processing external payloads in bulk links torrents to a cached tracker.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        with db_session:
+            tracker = self.metadata_store.TrackerState(url="http://tracker.org/announce")
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0,
+                                                     timestamp=0, torrent_date=int2time(0),
+                                                     public_key=other_key.key_to_bin(),
+                                                     tracker_info="http://tracker.org:80/announce")
+            payload = md.payload_class.from_signed_blob(md.serialized(other_key))
+            md.delete()
+            tracker.flush()
+        self.metadata_store.tracker_cache.load([(tracker.rowid, tracker.url)])
+
+        self.metadata_store.process_payloads_bulk([payload])
+
+        with db_session:
+            torrent = self.metadata_store.TorrentMetadata.get(infohash=b"\x01" * 20)
+            self.assertEqual(["http://tracker.org/announce"], [t.url for t in torrent.health.trackers])
+        self.assertEqual(1, self.metadata_store.tracker_cache.hits)
+
+    def test_add_tracker_cached(self) -> None:
+        """
+        Test if torrents are linked to a tracker that is known to the tracker cache.
+        """
+        for infohash in [b"\x01" * 20, b"\x02" * 20, b"\x03" * 20]:
+            self.metadata_store.write_queue.submit(self.metadata_store.TorrentMetadata, infohash=infohash,
+                                                   tracker_info="http://tracker.org/announce")
+
+        with db_session:
+            tracker = self.metadata_store.TrackerState.get(url="http://tracker.org/announce")
+            infohashes = sorted(torrent.infohash for torrent in tracker.torrents)
+
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20, b"\x03" * 20], infohashes)
+        self.assertEqual(1, self.metadata_store.tracker_cache.hits)
+        self.assertEqual(tracker.rowid, self.metadata_store.tracker_cache.get(tracker.url))
+
+    def test_tracker_cache_warm(self) -> None:
+        """
+        Test if the tracker cache knows the trackers of the database at startup.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        with db_session:
+            tracker = metadata_store.TrackerState(url="http://tracker.org/announce")
+            tracker.flush()
+            rowid = tracker.rowid
+        metadata_store.shutdown()
+
+        metadata_store = MetadataStore(path, self.private_key(0))
+        cached = metadata_store.tracker_cache.get("http://tracker.org/announce")
+        metadata_store.shutdown()
+
+        self.assertEqual(rowid, cached)
+
+    def test_process_payloads_bulk_duplicate_in_batch(self) -> None:
+        """
+        Test if repeated payloads in a single batch are flagged as duplicates.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        with db_session:
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0,
+                                                     timestamp=0, torrent_date=int2time(0),
+                                                     public_key=other_key.key_to_bin())
+            payload = md.payload_class.from_signed_blob(md.serialized(other_key))
+            md.delete()
+
+        with db_session:
+            results = self.metadata_store.process_payloads_bulk([payload, payload])
+
+            self.assertEqual([ObjState.NEW_OBJECT, ObjState.DUPLICATE_OBJECT], [r.obj_state for r in results])
+            self.assertEqual(results[0].md_obj, results[1].md_obj)
+
+    def test_process_payloads_bulk_ffa(self) -> None:
+        """
+        Test if FFA entries are only added in bulk if their infohash is unknown.
+        """
+        with db_session:
+            ffa_torrent = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"1" * 20,
+                                                                                 "title": "abc"})
+            ffa_payload = self.metadata_store.TorrentMetadata.payload_class.from_signed_blob(ffa_torrent.serialized())
+            ffa_torrent.delete()
+
+        with db_session:
+            result, = self.metadata_store.process_payloads_bulk([ffa_payload, ffa_payload])
+
+            self.assertEqual(ObjState.NEW_OBJECT, result.obj_state)
+            self.assertEqual(b"", result.md_obj.public_key)
+            self.assertIsNone(result.md_obj.signature)
+        self.assertEqual([], self.metadata_store.process_payloads_bulk([ffa_payload]))
+
+    def test_process_payloads_bulk_notify(self) -> None:
+        """
+        Test if the notifications of all new torrents of a batch are sent together.
+        """
+        self.metadata_store.notifier = Mock()
+        other_key = default_eccrypto.generate_key("curve25519")
+        payloads = []
+        with db_session:
+            for i in range(3):
+                md = self.metadata_store.TorrentMetadata(title=f"torrent {i}", infohash=bytes([i]) * 20, id_=i,
+                                                         torrent_date=int2time(0), public_key=other_key.key_to_bin())
+                payloads.append(md.payload_class.from_signed_blob(md.serialized(other_key)))
+                md.delete()
+
+        self.metadata_store.process_payloads_bulk(payloads)
+
+        self.metadata_store.notifier.notify_many.assert_called_once_with(
+            Notification.new_torrent_metadata_created,
+            [{"infohash": bytes([i]) * 20, "title": f"torrent {i}"} for i in range(3)]
+        )
+
+    def create_snapshot(self, bad_signature: bool = False) -> Path:
+        """
+        Export a signed torrent with health and an unsigned torrent from another metadata store to a snapshot.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"), check_tables=False)
+        with db_session:
+            md = metadata_store.TorrentMetadata(title="signed torrent", infohash=b"\x01" * 20, id_=1,
+                                                torrent_date=int2time(0), public_key=other_key.key_to_bin())
+            payload = md.payload_class.from_signed_blob(md.serialized(other_key))
+            md.delete()
+            if bad_signature:
+                payload.signature = bytes(127 ^ byte for byte in payload.signature)
+            metadata_store.process_payload(payload, check_signature=False)
+            metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=7, leechers=3, last_check=1337))
+            metadata_store.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "unsigned torrent"})
+        path = Path(self.temporary_directory()) / "metadata.snapshot"
+        metadata_store.export_snapshot(path)
+        metadata_store.shutdown()
+        return path
+
+    async def test_import_snapshot_if_empty(self) -> None:
+        """
+        Test if a snapshot is only imported into a metadata store without torrents.
+        """
+        metadata_store = MetadataStore(Path(self.temporary_directory()) / "metadata.db", self.private_key(0))
+        metadata_store.import_snapshot_threaded = AsyncMock()
+
+        await metadata_store.import_snapshot_if_empty_threaded("metadata.snapshot")
+        metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu"})
+        result = await metadata_store.import_snapshot_if_empty_threaded("metadata.snapshot")
+        metadata_store.shutdown()
+
+        self.assertIsNone(result)
+        metadata_store.import_snapshot_threaded.assert_awaited_once_with("metadata.snapshot")
+
+    def test_import_snapshot(self) -> None:
+        """
+        Test if the torrents, signatures and health of a snapshot are imported and can be found afterwards.
+        """
+        stats = self.metadata_store.import_snapshot(self.create_snapshot(), batch_size=1)
+
+        with db_session:
+            signed = self.metadata_store.TorrentMetadata.get(infohash=b"\x01" * 20)
+            unsigned = self.metadata_store.TorrentMetadata.get(infohash=b"\x02" * 20)
+            found = {md.title for md in self.metadata_store.search_keyword("torrent")}
+            self.assertEqual((2, 2, 0), (stats.records, stats.added, stats.rejected))
+            self.assertIsNotNone(signed.signature)
+            self.assertEqual((7, 3, 1337), (signed.health.seeders, signed.health.leechers, signed.health.last_check))
+            self.assertEqual(b"", unsigned.public_key)
+            self.assertEqual({"signed torrent", "unsigned torrent"}, found)
+            self.assertEqual("0", self.metadata_store.get_value("fts_rebuild_pending"))
+
+    def test_import_snapshot_known(self) -> None:
+        """
+        Test if the known torrents of a snapshot are not imported again.
+        """
+        path = self.create_snapshot()
+        self.metadata_store.import_snapshot(path)
+
+        stats = self.metadata_store.import_snapshot(path)
+
+        self.assertEqual(0, stats.added)
+        self.assertEqual(2, self.metadata_store.get_num_torrents())
+
+    def test_import_snapshot_known_health(self) -> None:
+        """
+        Test if the stored health of the known torrents of a snapshot is given to the popular torrents.
+        """
+        path = self.create_snapshot()
+        self.metadata_store.import_snapshot(path)
+
+        with patch.object(self.metadata_store.popular_torrents, "update") as update:
+            self.metadata_store.import_snapshot(path)
+
+        update.assert_called_once_with(HealthInfo(b"\x01" * 20, seeders=7, leechers=3, last_check=1337))
+
+    def test_import_snapshot_bad_signature(self) -> None:
+        """
+        Test if torrents with a bad signature are not imported from a snapshot.
+        """
+        stats = self.metadata_store.import_snapshot(self.create_snapshot(bad_signature=True))
+
+        with db_session:
+            self.assertEqual((1, 1), (stats.added, stats.rejected))
+            self.assertIsNone(self.metadata_store.TorrentMetadata.get(infohash=b"\x01" * 20))
+
+    async def test_import_snapshot_threaded_invalid(self) -> None:
+        """
+        Test if importing a file that is not a snapshot in a thread fails gracefully.
+        """
+        path = Path(self.temporary_directory()) / "metadata.snapshot"
+        path.write_bytes(b"not a snapshot")
+
+        self.assertIsNone(await self.metadata_store.import_snapshot_threaded(path))
+
+    def test_interrupted_snapshot_import(self) -> None:
+        """
+        Test if the FTS triggers are restored and the FTS index is rebuilt after an interrupted snapshot import.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        metadata_store.write_queue.submit(metadata_store.suspend_fts_triggers).result()
+        metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "test torrent"})
+        metadata_store.shutdown()
+
+        metadata_store = MetadataStore(path, self.private_key(0))
+        with db_session:
+            found = [md.title for md in metadata_store.search_keyword("test")]
+            triggers = metadata_store.db.select("name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'fts_%'")
+        metadata_store.shutdown()
+
+        self.assertEqual(["test torrent"], found)
+        self.assertEqual(3, len(triggers))
+
+    @db_session
+    def test_fts_title_updated(self) -> None:
+        """
+        Test if the old title of a torrent is removed from the FTS index when its title changes.
+        """
+        torrent = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "old"})
+        self.metadata_store.db.flush()
+        torrent.title = "new"
+        self.metadata_store.db.flush()
+
+        self.assertEqual([], list(self.metadata_store.search_keyword("old")))
+        self.assertEqual(["new"], [md.title for md in self.metadata_store.search_keyword("new")])
+
+    def test_fts_contentless(self) -> None:
+        """
+        Test if torrents can be searched in a contentless FTS index with the trigram tokenizer.
+        """
+        metadata_store = MetadataStore(":memory:", self.private_key(0), fts_contentless=True, fts_tokenizer="trigram",
+                                       fts_prefix="")
+        with db_session:
+            torrent = metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu"})
+            found = [md.title for md in metadata_store.search_keyword("untu")]
+            torrent.title = "debian"
+            found_after_update = [md.title for md in metadata_store.search_keyword("untu")]
+            metadata_store.rebuild_fts_index()
+            found_after_rebuild = [md.title for md in metadata_store.search_keyword("bia")]
+        metadata_store.shutdown()
+
+        self.assertEqual(["ubuntu"], found)
+        self.assertEqual([], found_after_update)
+        self.assertEqual(["debian"], found_after_rebuild)
+
+    def test_migrate_fts_index(self) -> None:
+        """
+        Test if the FTS index of an existing database is recreated and filled if its options change.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu"})
+        metadata_store.shutdown()
+
+        metadata_store = MetadataStore(path, self.private_key(0), fts_contentless=True, fts_tokenizer="trigram")
+        with db_session:
+            found = [md.title for md in metadata_store.search_keyword("untu")]
+            options = metadata_store.get_value(FTS_OPTIONS)
+        metadata_store.shutdown()
+
+        self.assertEqual(["ubuntu"], found)
+        self.assertEqual(get_fts_options(True, "trigram"), options)
+
+    def test_migrate_fts_index_deferred(self) -> None:
+        """
+        Test if the FTS index is only filled in batches, and its triggers restored, if its rebuild is deferred.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu"})
+        metadata_store.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "ubuntu server"})
+        metadata_store.shutdown()
+
+        metadata_store = MetadataStore(path, self.private_key(0), fts_prefix="", defer_fts_rebuild=True)
+        pending = metadata_store.fts_rebuild_pending
+        with db_session:
+            found_before = list(metadata_store.search_keyword("ubuntu"))
+        remaining = [metadata_store.write_queue.submit(metadata_store.rebuild_fts_index_batch, 1).result()
+                     for _ in range(3)]
+        metadata_store.add_ffa_from_dict({"infohash": b"\x03" * 20, "title": "ubuntu desktop"})
+        with db_session:
+            found_after = {md.title for md in metadata_store.search_keyword("ubuntu")}
+        metadata_store.shutdown()
+
+        self.assertTrue(pending)
+        self.assertEqual([True, True, False], remaining)
+        self.assertFalse(metadata_store.fts_rebuild_pending)
+        self.assertEqual([], found_before)
+        self.assertEqual({"ubuntu", "ubuntu server", "ubuntu desktop"}, found_after)
+
+    def test_migrate_fts_index_legacy(self) -> None:
+        """
+        Test if the FTS index that was created before its options were stored is kept, and only gets new triggers.
+        """
+        path = Path(self.temporary_directory()) / "metadata.db"
+        metadata_store = MetadataStore(path, self.private_key(0))
+        metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu"})
+        with db_session(ddl=True):
+            metadata_store.drop_fts_triggers()
+            metadata_store.db.execute("DROP TABLE FtsIndex")
+            metadata_store.db.execute(sql_legacy_fts_table)
+            metadata_store.fill_fts_index()
+            metadata_store.MiscData.get(name=FTS_OPTIONS).delete()
+        metadata_store.shutdown()
+
+        metadata_store = MetadataStore(path, self.private_key(0))
+        with db_session:
+            options = metadata_store.get_value(FTS_OPTIONS)
+            triggers = metadata_store.db.select("name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'fts_%'")
+            legacy = metadata_store.has_legacy_fts_table()
+            found = [md.title for md in metadata_store.search_keyword("ubuntu")]
+        metadata_store.shutdown()
+
+        self.assertFalse(metadata_store.fts_rebuild_pending)
+        self.assertEqual(get_fts_options(), options)
+        self.assertEqual(3, len(triggers))
+        self.assertTrue(legacy)
+        self.assertEqual(["ubuntu"], found)
+
+    def test_fts_options_invalid(self) -> None:
+        """
+        Test if FTS options that cannot be used in the table definition are refused.
+        """
+        with self.assertRaises(ValueError):
+            get_fts_options(tokenizer="trigram'")
+        with self.assertRaises(ValueError):
+            get_fts_options(prefix="2, 3")
+
     @db_session
     def test_get_entries_query_sort_by_size(self) -> None:
         """
@@ -210,3 +794,494 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertEqual(20, ordered1.size)
         self.assertEqual(10, ordered2.size)
         self.assertEqual(1, ordered3.size)
+
+    @db_session
+    def test_get_entries_ranked(self) -> None:
+        """
+        Test if text search results are ordered by their relevance.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Bad Buck Bunny"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "Big Buck Bunny"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xef" * 20, "title": "Buck Big Bunny"})
+
+        entries = self.metadata_store.get_entries(txt_filter='"big" "buck" "bunny"')
+
+        self.assertEqual(["Big Buck Bunny", "Big Bad Buck Bunny", "Buck Big Bunny"], [e.title for e in entries])
+
+    @db_session
+    def test_get_entries_ranked_page(self) -> None:
+        """
+        Test if text search results can be paginated.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Bad Buck Bunny"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "Big Buck Bunny"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xef" * 20, "title": "Buck Big Bunny"})
+
+        entries = self.metadata_store.get_entries(first=2, last=2, txt_filter='"big" "buck" "bunny"')
+
+        self.assertEqual(["Big Bad Buck Bunny"], [e.title for e in entries])
+
+    @db_session
+    def test_get_entries_ranked_no_results(self) -> None:
+        """
+        Test if text searches without matches give no results.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Buck Bunny"})
+
+        self.assertEqual([], self.metadata_store.get_entries(txt_filter='"sintel"'))
+
+    @db_session
+    def test_get_entry_records(self) -> None:
+        """
+        Test if entry records convert to the same dicts and blobs as the entities they are selected from.
+        """
+        for i, size in enumerate([20, 1, 10]):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i), "size": size})
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=3, leechers=2, last_check=4))
+        entries = self.metadata_store.get_entries(sort_by="size")
+        self.metadata_store.query_cache.invalidate()
+
+        records = self.metadata_store.get_entry_records(sort_by="size")
+
+        self.assertEqual([entry.to_simple_dict() for entry in entries], [record.to_simple_dict() for record in records])
+        self.assertEqual(entries_to_chunk(entries, 1024, include_health=True),
+                         entries_to_chunk(records, 1024, include_health=True))
+
+    @db_session
+    def test_get_entry_records_page(self) -> None:
+        """
+        Test if entry records can be paginated.
+        """
+        for i, size in enumerate([20, 1, 10]):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i), "size": size})
+
+        records = self.metadata_store.get_entry_records(first=2, last=3, sort_by="size", sort_desc=False)
+
+        self.assertEqual(["2", "0"], [record.title for record in records])
+
+    @db_session
+    def test_get_entry_records_ranked(self) -> None:
+        """
+        Test if entry records of text searches are ordered by their relevance.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Bad Buck Bunny"})
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "Big Buck Bunny"})
+
+        records = self.metadata_store.get_entry_records(txt_filter='"big" "buck" "bunny"')
+
+        self.assertEqual(["Big Buck Bunny", "Big Bad Buck Bunny"], [record.title for record in records])
+
+    @db_session
+    def test_get_entries_popular(self) -> None:
+        """
+        Test if popular torrents are ordered by their health and updated when their health changes.
+        """
+        now = int(time.time())
+        for i in range(1, 4):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i)})
+            self.metadata_store.process_torrent_health(HealthInfo(bytes([i]) * 20, seeders=i, last_check=now))
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x04" * 20, "title": "4"})
+        popular1 = self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=10, last_check=now + 1))
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x04" * 20, seeders=4, last_check=now))
+        popular2 = self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.assertEqual(["3", "2", "1"], [entry.title for entry in popular1])
+        self.assertEqual(["1", "4", "3", "2"], [entry.title for entry in popular2])
+        self.assertEqual(1, self.metadata_store.popular_torrents.reloads)
+
+    @db_session
+    def test_get_entries_popular_without_metadata(self) -> None:
+        """
+        Test if popular torrents are found in the database if the view tracks too many torrents without metadata.
+        """
+        now = int(time.time())
+        self.metadata_store.popular_torrents.capacity = 2
+        for i in range(1, 4):
+            self.metadata_store.process_torrent_health(HealthInfo(bytes([i]) * 20, seeders=10 + i, last_check=now))
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x04" * 20, "title": "4"})
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x04" * 20, seeders=1, last_check=now))
+
+        popular = self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.assertEqual(["4"], [entry.title for entry in popular])
+        self.assertFalse(self.metadata_store.popular_torrents.complete)
+
+    @db_session
+    def test_get_entries_continuation(self) -> None:
+        """
+        Test if entries can be paginated with continuation tokens, including entries with equal sort keys.
+        """
+        for i, size in enumerate([20, 1, 10, 10, 5]):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i), "size": size})
+
+        page1 = self.metadata_store.get_entries(first=1, last=2, sort_by="size")
+        token1 = self.metadata_store.get_continuation_token(page1, first=1, last=2, sort_by="size")
+        page2 = self.metadata_store.get_entries(first=1, last=2, sort_by="size", continuation=token1)
+        token2 = self.metadata_store.get_continuation_token(page2, first=1, last=2, sort_by="size",
+                                                            continuation=token1)
+        page3 = self.metadata_store.get_entries(first=1, last=2, sort_by="size", continuation=token2)
+        token3 = self.metadata_store.get_continuation_token(page3, first=1, last=2, sort_by="size",
+                                                            continuation=token2)
+
+        self.assertEqual(["0", "3"], [entry.title for entry in page1])
+        self.assertEqual(["2", "4"], [entry.title for entry in page2])
+        self.assertEqual(["1"], [entry.title for entry in page3])
+        self.assertIsNone(token3)
+
+    def get_all_pages(self, **kwargs) -> list[str]:
+        """
+        Get the titles of all entries, by following the continuation tokens of pages of a single entry.
+        """
+        titles = []
+        token = None
+        for _ in range(10):
+            page = self.metadata_store.get_entries(first=1, last=1, continuation=token, **kwargs)
+            titles.extend(entry.title for entry in page)
+            token = self.metadata_store.get_continuation_token(page, first=1, last=1, continuation=token, **kwargs)
+            if token is None:
+                break
+        return titles
+
+    @db_session
+    def test_get_entries_continuation_non_ascii(self) -> None:
+        """
+        Test if entries with non-ASCII titles are paginated in the order of the NOCASE collation, in both directions.
+        """
+        for i, title in enumerate(["Ézz", "éaa", "abc", "Zed", "ébb"]):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": title})
+
+        ascending = self.get_all_pages(sort_by="title", sort_desc=False)
+        descending = self.get_all_pages(sort_by="title", sort_desc=True)
+
+        self.assertEqual(["abc", "Zed", "Ézz", "éaa", "ébb"], ascending)
+        self.assertEqual(list(reversed(ascending)), descending)
+
+    @db_session
+    def test_get_entries_continuation_health(self) -> None:
+        """
+        Test if entries that are sorted by their health can be paginated, including entries without a health.
+        """
+        for i in range(4):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i)})
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=3))
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x02" * 20, seeders=1, leechers=1))
+
+        page1 = self.metadata_store.get_entries(first=1, last=2, sort_by="HEALTH", sort_desc=False)
+        token = self.metadata_store.get_continuation_token(page1, first=1, last=2, sort_by="HEALTH", sort_desc=False)
+        page2 = self.metadata_store.get_entries(first=1, last=2, sort_by="HEALTH", sort_desc=False,
+                                                continuation=token)
+
+        self.assertEqual(["0", "3"], [entry.title for entry in page1])
+        self.assertEqual(["2", "1"], [entry.title for entry in page2])
+
+    @db_session
+    def test_get_entries_continuation_ranked(self) -> None:
+        """
+        Test if text search results that are ranked by relevance can be paginated with continuation tokens.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Bad Buck Bunny"})
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "Big Buck Bunny"})
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xef" * 20, "title": "Buck Big Bunny"})
+
+        page1 = self.metadata_store.get_entries(first=1, last=2, txt_filter='"big" "buck" "bunny"')
+        token = self.metadata_store.get_continuation_token(page1, first=1, last=2, txt_filter='"big" "buck" "bunny"')
+        page2 = self.metadata_store.get_entries(first=1, last=2, txt_filter='"big" "buck" "bunny"', continuation=token)
+
+        self.assertEqual(["Big Buck Bunny", "Big Bad Buck Bunny"], [e.title for e in page1])
+        self.assertEqual(["Buck Big Bunny"], [e.title for e in page2])
+
+    @db_session
+    def test_get_entries_continuation_mismatch(self) -> None:
+        """
+        Test if a continuation token can not be used for a query with a different order.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+        page = self.metadata_store.get_entries(first=1, last=1, sort_by="size")
+        token = self.metadata_store.get_continuation_token(page, first=1, last=1, sort_by="size")
+
+        with self.assertRaises(ValueError):
+            self.metadata_store.get_entries(first=1, last=1, sort_by="title", continuation=token)
+
+    def test_get_auto_complete_terms(self) -> None:
+        """
+        Test if auto-completion terms are suggested for the titles of added torrents.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "Big Buck Bunny"})
+        self.assertEqual(["big buck"], self.metadata_store.get_auto_complete_terms("Big", 5))
+
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "Bigger Buck Bunny"})
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xef" * 20, "title": "Big Buck Bunny 2"})
+
+        self.assertEqual(["big buck", "bigger"], self.metadata_store.get_auto_complete_terms("big", 5))
+
+    def test_get_auto_complete_terms_bulk(self) -> None:
+        """
+        Test if the titles of torrents that are ingested in bulk are added to the auto-completion index.
+        """
+        with db_session:
+            torrent = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"1" * 20, "title": "Sintel"})
+            payload = self.metadata_store.TorrentMetadata.payload_class.from_signed_blob(torrent.serialized())
+            torrent.delete()
+
+        self.metadata_store.process_payloads_bulk([payload])
+
+        self.assertEqual(["sintel"], self.metadata_store.get_auto_complete_terms("sin", 5))
+
+    @db_session
+    def test_get_entries_cached(self) -> None:
+        """
+        Test if repeated queries with the same parameters are served from the query cache.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc", "size": 20})
+
+        entries1 = self.metadata_store.get_entries(first=1, last=10, sort_by="size")
+        entries2 = self.metadata_store.get_entries(last=10, sort_by="size", sort_desc=True)
+
+        self.assertEqual(entries1, entries2)
+        self.assertEqual(1, self.metadata_store.query_cache.hits)
+        self.assertEqual(1, self.metadata_store.query_cache.misses)
+
+    @db_session
+    def test_get_entries_cache_invalidated_by_insert(self) -> None:
+        """
+        Test if adding a torrent invalidates the cached query results.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+        self.assertEqual(1, len(self.metadata_store.get_entries()))
+
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "def"})
+
+        self.assertEqual(2, len(self.metadata_store.get_entries()))
+        self.assertEqual(0, self.metadata_store.query_cache.hits)
+
+    @db_session
+    def test_get_entries_cache_kept_on_health_update(self) -> None:
+        """
+        Test if health updates do not invalidate the cached results of queries that do not depend on health.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc", "size": 20})
+        self.metadata_store.get_entries(sort_by="size")
+        self.metadata_store.get_entries(sort_by="HEALTH")
+
+        self.metadata_store.process_torrent_health(HealthInfo(b"\xab" * 20, seeders=1, leechers=2))
+        self.metadata_store.get_entries(sort_by="size")
+        self.metadata_store.get_entries(sort_by="HEALTH")
+
+        self.assertEqual(1, self.metadata_store.query_cache.hits)
+        self.assertEqual(3, self.metadata_store.query_cache.misses)
+
+    @db_session
+    def test_get_entries_popular_cache_kept_on_insert(self) -> None:
+        """
+        Test if adding a torrent that is not popular does not invalidate the cached popular torrents.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+        self.metadata_store.process_torrent_health(HealthInfo(b"\xab" * 20, seeders=1, last_check=int(time.time())))
+        self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "def"})
+        popular = self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.assertEqual(["abc"], [entry.title for entry in popular])
+        self.assertEqual(1, self.metadata_store.query_cache.hits)
+
+    @db_session
+    def test_get_entries_popular_cache_invalidated_by_popular_insert(self) -> None:
+        """
+        Test if adding a torrent of which the health makes it popular invalidates the cached popular torrents.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+        self.metadata_store.process_torrent_health(HealthInfo(b"\xab" * 20, seeders=1, last_check=int(time.time())))
+        self.metadata_store.process_torrent_health(HealthInfo(b"\xcd" * 20, seeders=2, last_check=int(time.time())))
+        self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xcd" * 20, "title": "def"})
+        popular = self.metadata_store.get_entries(metadata_type=REGULAR_TORRENT, popular=True)
+
+        self.assertEqual(["def", "abc"], [entry.title for entry in popular])
+        self.assertEqual(0, self.metadata_store.query_cache.hits)
+
+    def test_insert_invalidates_cache_after_commit(self) -> None:
+        """
+        Test if a torrent that is added on the write queue only invalidates the query cache once it is committed.
+        """
+        generations = []
+
+        def add_torrent() -> None:
+            self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+            generations.append(self.metadata_store.query_cache.get_generation([QUERY_SOURCE_TORRENTS]))
+
+        generation = self.metadata_store.query_cache.get_generation([QUERY_SOURCE_TORRENTS])
+        self.metadata_store.write_queue.submit(add_torrent).result()
+
+        self.assertEqual([generation], generations)
+        self.assertNotEqual(generation, self.metadata_store.query_cache.get_generation([QUERY_SOURCE_TORRENTS]))
+
+    @db_session
+    def test_get_total_count_cached(self) -> None:
+        """
+        Test if total counts are cached, ignoring the pagination and sorting parameters.
+        """
+        self.metadata_store.add_ffa_from_dict({"infohash": b"\xab" * 20, "title": "abc"})
+
+        self.assertEqual(1, self.metadata_store.get_total_count(first=1, last=10, sort_by="size"))
+        self.assertEqual(1, self.metadata_store.get_total_count(first=11, last=20))
+        self.assertEqual(1, self.metadata_store.query_cache.hits)
+
+    @db_session
+    def test_get_total_count_estimate_exact(self) -> None:
+        """
+        Test if small total counts are exact.
+        """
+        for i in range(3):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i)})
+
+        self.assertEqual((3, False), self.metadata_store.get_total_count_estimate(metadata_type=REGULAR_TORRENT))
+
+    @db_session
+    def test_get_total_count_estimate_approximate(self) -> None:
+        """
+        Test if large total counts are estimated from the row ids of the matching rows.
+        """
+        for i in range(10):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i), "xxx": i % 2})
+
+        with patch("tribler.core.database.store.TOTAL_COUNT_SAMPLE_SIZE", 2):
+            estimate = self.metadata_store.get_total_count_estimate(hide_xxx=True)
+
+        self.assertEqual((5, True), estimate)
+
+    @db_session
+    def test_get_total_count_estimate_old_matches(self) -> None:
+        """
+        Test if large total counts are estimated from the highest matching row id, not the highest row id.
+        """
+        for i in range(10):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i), "xxx": int(i >= 4)})
+
+        with patch("tribler.core.database.store.TOTAL_COUNT_SAMPLE_SIZE", 2):
+            estimate = self.metadata_store.get_total_count_estimate(hide_xxx=True)
+
+        self.assertEqual((4, True), estimate)
+
+    @db_session
+    def test_get_total_count_estimate_search(self) -> None:
+        """
+        Test if the total count of a text search is known after fetching its results.
+        """
+        for i in range(3):
+            self.metadata_store.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": f"torrent {i}"})
+        self.metadata_store.get_entries(first=1, last=1, txt_filter='"torrent"', sort_by=None)
+
+        with patch.object(self.metadata_store, "get_entries_query") as get_entries_query:
+            estimate = self.metadata_store.get_total_count_estimate(first=1, last=1, txt_filter='"torrent"')
+
+        self.assertEqual((3, False), estimate)
+        get_entries_query.assert_not_called()
+
+    @db_session
+    def test_process_torrent_health_invalidates_cache(self) -> None:
+        """
+        Test if processing new health information invalidates the cached query results.
+        """
+        generation = self.metadata_store.query_cache.get_generation([QUERY_SOURCE_HEALTH])
+
+        self.metadata_store.process_torrent_health(HealthInfo(b"\xab" * 20, seeders=1, leechers=2))
+
+        self.assertNotEqual(generation, self.metadata_store.query_cache.get_generation([QUERY_SOURCE_HEALTH]))
+
+    def test_process_torrent_health_buffered(self) -> None:
+        """
+        Test if buffered health is served from the buffer until it is flushed to the database.
+        """
+        metadata_store = MetadataStore(":memory:", self.private_key(0), check_tables=False, buffer_health=True)
+        with db_session:
+            metadata_store.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "1"})
+            added = metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=3, leechers=2))
+            stored_before = metadata_store.TorrentState.get(infohash=b"\x01" * 20).seeders
+            record, = metadata_store.get_entry_records()
+        metadata_store.health_buffer.flush()
+        with db_session:
+            stored_after = metadata_store.TorrentState.get(infohash=b"\x01" * 20).seeders
+        metadata_store.shutdown()
+
+        self.assertFalse(added)
+        self.assertEqual(0, stored_before)
+        self.assertEqual(3, record.health.seeders)
+        self.assertEqual(3, stored_after)
+
+    def test_process_torrent_health_buffered_coalesce(self) -> None:
+        """
+        Test if repeated health updates of a buffered torrent are written once.
+        """
+        metadata_store = MetadataStore(":memory:", self.private_key(0), check_tables=False, buffer_health=True)
+        now = int(time.time())
+        with db_session:
+            added = [metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=i, last_check=now))
+                     for i in range(1, 4)]
+            health = metadata_store.get_torrent_health(b"\x01" * 20)
+        metadata_store.shutdown()
+
+        self.assertEqual([True, False, False], added)
+        self.assertEqual(3, health.seeders)
+        self.assertEqual(3, metadata_store.health_buffer.updates)
+        self.assertEqual(1, metadata_store.health_buffer.written)
+
+    async def test_run_threaded_read_no_wal(self) -> None:
+        """
+        Test if threaded reads are executed on the default executor without WAL mode.
+        """
+        thread_name = await self.metadata_store.run_threaded_read(lambda: threading.current_thread().name)
+
+        self.assertFalse(thread_name.startswith("MetadataStore-read"))
+
+    async def test_run_threaded_read_wal(self) -> None:
+        """
+        Test if threaded reads are executed on the read-only connection pool in WAL mode.
+        """
+        metadata_store = MetadataStore(":memory:", self.private_key(0), check_tables=False, wal_mode=True)
+
+        def get_query_only() -> tuple[str, int]:
+            with db_session:
+                return threading.current_thread().name, metadata_store.db.select("* FROM pragma_query_only")[0]
+
+        thread_name, query_only = await metadata_store.run_threaded_read(get_query_only)
+        metadata_store.shutdown()
+
+        self.assertTrue(thread_name.startswith("MetadataStore-read"))
+        self.assertEqual(1, query_only)
+
+    async def test_run_threaded_read_executor_pools(self) -> None:
+        """
+        Test if threaded reads are executed on the shared database read pool without WAL mode, if there are pools.
+        """
+        executors = ExecutorPools()
+        metadata_store = MetadataStore(":memory:", self.private_key(0), check_tables=False, executors=executors)
+
+        thread_name = await metadata_store.run_threaded_read(lambda: threading.current_thread().name,
+                                                             priority=Priority.INTERACTIVE)
+        metadata_store.shutdown()
+        executors.shutdown()
+
+        self.assertTrue(thread_name.startswith("db_read"))
+
+    async def test_run_threaded(self) -> None:
+        """
+        Test if threaded writes are executed on the single writer thread.
+        """
+        metadata_store = MetadataStore(Path(self.temporary_directory()) / "metadata.db", self.private_key(0))
+
+        thread_name = await metadata_store.run_threaded(lambda: threading.current_thread().name)
+        metadata_store.shutdown()
+
+        self.assertTrue(thread_name.startswith("MetadataStore-write"))
+
+    async def test_run_threaded_memory(self) -> None:
+        """
+        Test if threaded writes to an in-memory database are executed immediately, on the current thread.
+        """
+        thread_name = await self.metadata_store.run_threaded(lambda: threading.current_thread().name)
+
+        self.assertEqual(threading.current_thread().name, thread_name)
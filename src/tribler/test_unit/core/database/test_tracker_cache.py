@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+from pony.orm import Database
+
+from tribler.core.database.tracker_cache import TrackerCache
+from tribler.core.database.write_queue import WriteQueue
+from tribler.core.libtorrent.trackers import get_uniformed_tracker_url
+
+
+class TestTrackerCache(TestBase):
+    """
+    Tests for the TrackerCache class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an in-memory database and a cache that follows the transactions of its write queue.
+        """
+        super().setUp()
+        self.database = Database()
+        self.database.bind(provider="sqlite", filename=":memory:", create_db=True)
+        self.database.generate_mapping(create_tables=True)
+        self.write_queue = WriteQueue("Test", self.database, threaded=False)
+        self.tracker_cache = TrackerCache(max_urls=2)
+        self.tracker_cache.write_queue = self.write_queue
+
+    async def tearDown(self) -> None:
+        """
+        Disconnect from the database.
+        """
+        self.database.disconnect()
+        await super().tearDown()
+
+    def get_in_thread(self, url: str) -> int | None:
+        """
+        Get the rowid of a tracker on another thread.
+        """
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self.tracker_cache.get(url)))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_normalize(self) -> None:
+        """
+        Test if raw tracker URLs are normalized.
+        """
+        self.assertEqual("http://tracker.org/announce", self.tracker_cache.normalize("http://tracker.org:80/announce"))
+        self.assertEqual("http://tracker.org/announce", self.tracker_cache.normalize("http://tracker.org:80/announce"))
+        self.assertIsNone(self.tracker_cache.normalize("http://tracker.org"))
+
+    def test_normalize_evict(self) -> None:
+        """
+        Test if the least recently used raw URL is evicted if there are too many raw URLs.
+        """
+        with patch("tribler.core.database.tracker_cache.get_uniformed_tracker_url",
+                   side_effect=get_uniformed_tracker_url) as normalize:
+            for url in ["udp://a.org:80", "udp://b.org:80", "udp://a.org:80", "udp://c.org:80", "udp://a.org:80",
+                        "udp://b.org:80"]:
+                self.tracker_cache.normalize(url)
+
+        self.assertEqual(["udp://a.org:80", "udp://b.org:80", "udp://c.org:80", "udp://b.org:80"],
+                         [call.args[0] for call in normalize.call_args_list])
+
+    def test_load(self) -> None:
+        """
+        Test if a loaded tracker is known on every thread.
+        """
+        self.tracker_cache.load([(1, "udp://a.org:80"), (2, "udp://b.org:80")])
+
+        self.assertEqual(2, len(self.tracker_cache))
+        self.assertEqual(2, self.tracker_cache.get("udp://b.org:80"))
+        self.assertEqual(1, self.get_in_thread("udp://a.org:80"))
+        self.assertEqual(2, self.tracker_cache.hits)
+
+    def test_get_unknown(self) -> None:
+        """
+        Test if an unknown tracker is counted as a miss.
+        """
+        self.assertIsNone(self.tracker_cache.get("udp://a.org:80"))
+        self.assertEqual(1, self.tracker_cache.misses)
+
+    def test_add_outside_write_queue(self) -> None:
+        """
+        Test if a tracker that is found outside the operations of the write queue is ignored.
+        """
+        self.tracker_cache.add("udp://a.org:80", 1)
+
+        self.assertIsNone(self.tracker_cache.get("udp://a.org:80"))
+
+    def test_add_committed(self) -> None:
+        """
+        Test if a tracker that is found by a write operation is only known once its transaction is committed.
+        """
+        def add() -> int | None:
+            self.tracker_cache.add("udp://a.org:80", 1)
+            return self.get_in_thread("udp://a.org:80")
+
+        uncommitted = self.write_queue.submit(add).result()
+
+        self.assertIsNone(uncommitted)
+        self.assertEqual(1, self.get_in_thread("udp://a.org:80"))
+
+    def test_add_rolled_back(self) -> None:
+        """
+        Test if a tracker that is found by a write operation is forgotten if its transaction is rolled back.
+        """
+        def add() -> None:
+            self.tracker_cache.add("udp://a.org:80", 1)
+            raise ValueError
+
+        self.write_queue.submit(add)
+
+        self.assertIsNone(self.tracker_cache.get("udp://a.org:80"))
+
+    def test_remove(self) -> None:
+        """
+        Test if a removed tracker is forgotten.
+        """
+        self.tracker_cache.load([(1, "udp://a.org:80")])
+
+        self.tracker_cache.remove("udp://a.org:80")
+
+        self.assertIsNone(self.tracker_cache.get("udp://a.org:80"))
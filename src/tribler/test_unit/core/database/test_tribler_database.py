@@ -1,6 +1,7 @@
 from ipv8.test.base import TestBase
 from pony.orm import db_session
 
+from tribler.core.database.layers.health import ResourceType
 from tribler.core.database.tribler_database import TriblerDatabase
 
 
@@ -58,3 +59,22 @@ class TestTriblerDatabase(TestBase):
         """
         with self.assertRaises(TypeError):
             self.db.version = 'string'
+
+    def test_postings_updated_after_commit(self) -> None:
+        """
+        Test if the posting lists are only updated with the statements of writes that are committed.
+        """
+        self.db.knowledge.postings.load()
+
+        def add_and_fail() -> None:
+            self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "a" * 40, ResourceType.TAG, "tag")
+            raise ValueError
+
+        failed = self.db.write_queue.submit(add_and_fail)
+        postings_after_failure = self.db.knowledge.postings.intersect(["tag"])
+        self.db.write_queue.submit(self.db.knowledge.add_auto_generated_operation, ResourceType.TORRENT, "b" * 40,
+                                   ResourceType.TAG, "tag").result()
+
+        self.assertIsInstance(failed.exception(), ValueError)
+        self.assertEqual([], postings_after_failure)
+        self.assertEqual(1, len(self.db.knowledge.postings.intersect(["tag"])))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from asyncio import gather, wrap_future
+from pathlib import Path
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+from pony import orm
+from pony.orm import Database, db_session
+
+from tribler.core.database.write_queue import WriteQueue
+
+
+class TestWriteQueue(TestBase):
+    """
+    Tests for the WriteQueue class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a database on disk with a single table, in-memory databases cannot be used from other threads.
+        """
+        super().setUp()
+        self.database = Database()
+
+        class Item(self.database.Entity):
+            name = orm.PrimaryKey(str)
+
+        self.Item = Item
+        self.database.bind(provider="sqlite", filename=str(Path(self.temporary_directory()) / "test.db"),
+                           create_db=True)
+        self.database.generate_mapping(create_tables=True)
+        self.write_queue = WriteQueue("Test", self.database, max_latency=0.5, max_batch_size=3)
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the write queue and the database.
+        """
+        self.write_queue.shutdown()
+        self.database.disconnect()
+        await super().tearDown()
+
+    def count_items(self) -> int:
+        """
+        Get the number of committed items.
+        """
+        with db_session:
+            return self.Item.select().count()
+
+    async def test_write(self) -> None:
+        """
+        Test if a write is executed on the writer thread and committed.
+        """
+        def add_item() -> str:
+            self.Item(name="test")
+            return threading.current_thread().name
+
+        thread_name = await self.write_queue.write(add_item)
+
+        self.assertEqual("Test-write", thread_name)
+        self.assertEqual(1, self.count_items())
+
+    async def test_group_commit(self) -> None:
+        """
+        Test if concurrent writes are committed together, in transactions of at most the maximum batch size.
+        """
+        await gather(*[self.write_queue.write(self.Item, name=str(i)) for i in range(5)])
+
+        self.assertEqual(5, self.count_items())
+        self.assertEqual(5, self.write_queue.operations)
+        self.assertEqual(2, self.write_queue.transactions)
+
+    async def test_failed_write(self) -> None:
+        """
+        Test if a failing write only fails its own future, after its group is retried separately.
+        """
+        def fail() -> None:
+            self.Item(name="failed")
+            raise ValueError
+
+        futures = [self.write_queue.submit(self.Item, name="1"), self.write_queue.submit(fail),
+                   self.write_queue.submit(self.Item, name="2")]
+        self.write_queue.shutdown()
+
+        self.assertIsNone(futures[0].exception())
+        self.assertIsInstance(futures[1].exception(), ValueError)
+        self.assertIsNone(futures[2].exception())
+        self.assertEqual(3, self.write_queue.retried_operations)
+        self.assertEqual(2, self.count_items())
+
+    async def test_after_commit(self) -> None:
+        """
+        Test if post-commit callbacks are called after the transaction of their operation is committed.
+        """
+        committed = []
+
+        def add_item() -> None:
+            self.Item(name="test")
+            self.write_queue.after_commit(lambda: committed.append(self.count_items()))
+
+        await self.write_queue.write(add_item)
+
+        self.assertEqual([1], committed)
+
+    async def test_after_commit_rolled_back(self) -> None:
+        """
+        Test if the post-commit callbacks of a rolled back transaction are dropped, but registered again on a retry.
+        """
+        committed = []
+
+        def add_item(name: str) -> None:
+            self.Item(name=name)
+            self.write_queue.after_commit(committed.append, name)
+
+        def fail() -> None:
+            self.write_queue.after_commit(committed.append, "failed")
+            raise ValueError
+
+        self.write_queue.submit(add_item, "1")
+        self.write_queue.submit(fail)
+        self.write_queue.shutdown()
+
+        self.assertEqual(["1"], committed)
+
+    def test_after_commit_no_operation(self) -> None:
+        """
+        Test if post-commit callbacks are refused outside of the operations of the queue.
+        """
+        callback = Mock()
+
+        self.assertFalse(self.write_queue.after_commit(callback))
+        callback.assert_not_called()
+
+    async def test_shutdown(self) -> None:
+        """
+        Test if queued writes are committed on shutdown and later writes are refused.
+        """
+        future = self.write_queue.submit(self.Item, name="test")
+
+        self.write_queue.shutdown()
+
+        self.assertTrue(future.done())
+        self.assertEqual(1, self.count_items())
+        with self.assertRaises(RuntimeError):
+            await self.write_queue.write(self.Item, name="refused")
+
+    async def test_not_threaded(self) -> None:
+        """
+        Test if writes are executed immediately on the current thread if the queue is not threaded.
+        """
+        write_queue = WriteQueue("Test", self.database, threaded=False)
+
+        future = write_queue.submit(lambda: threading.current_thread().name)
+
+        self.assertTrue(future.done())
+        self.assertEqual(threading.current_thread().name, future.result())
+
+    async def test_group_commit_weight(self) -> None:
+        """
+        Test if a group of writes is committed once the weight of its writes reaches the maximum batch weight.
+        """
+        self.write_queue.max_batch_weight = 4
+
+        futures = [self.write_queue.submit(self.Item, name="1"), self.write_queue.submit_weighted(3, self.Item, name="2"),
+                   self.write_queue.submit_weighted(2, self.Item, name="3")]
+        await gather(*map(wrap_future, futures))
+
+        self.assertEqual(3, self.count_items())
+        self.assertEqual(2, self.write_queue.transactions)
+        self.assertEqual(4, self.write_queue.peak_batch_weight)
+        self.assertEqual(2, self.write_queue.last_batch_weight)
+        self.assertEqual(3.0, self.write_queue.get_stats()["mean_batch_weight"])
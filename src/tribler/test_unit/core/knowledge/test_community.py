@@ -11,6 +11,7 @@ from ipv8.test.base import TestBase
 from pony.orm import db_session
 
 from tribler.core.database.layers.knowledge import Operation, ResourceType
+from tribler.core.database.write_queue import WriteQueue
 from tribler.core.knowledge.community import (
     KnowledgeCommunity,
     KnowledgeCommunitySettings,
@@ -103,6 +104,7 @@ class TestKnowledgeCommunity(TestBase[KnowledgeCommunity]):
         Create a mocked database and new key for each node.
         """
         settings.db = Mock()
+        settings.db.write_queue = WriteQueue("TriblerDatabase", settings.db.instance, threaded=False)
         settings.key = default_eccrypto.generate_key("curve25519")
         out = super().create_node(settings, create_dht, enable_statistics)
         out.overlay.cancel_all_pending_tasks()
@@ -55,7 +55,7 @@ class TestCreateTorrentEndpoint(TestBase):
         """
         super().setUp()
 
-        self.download_manager = Mock()
+        self.download_manager = Mock(get_executor=Mock(return_value=None))
         self.endpoint = CreateTorrentEndpoint(self.download_manager)
 
     async def test_no_files(self) -> None:
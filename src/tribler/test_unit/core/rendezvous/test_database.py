@@ -38,10 +38,11 @@ class TestRendezvousDatabase(TestBase):
         Test if we can add a single certificate.
         """
         start_timestamp, stop_timestamp = range(1, 3)
-        self.memdb.add(self.peer, start_timestamp, stop_timestamp)
+        future = self.memdb.add(self.peer, start_timestamp, stop_timestamp)
 
         retrieved = self.memdb.get(self.peer)
 
+        self.assertIsNone(future.result())
         self.assertEqual(1, len(retrieved))
         self.assertEqual((start_timestamp, stop_timestamp), (retrieved[0].start, retrieved[0].stop))
 
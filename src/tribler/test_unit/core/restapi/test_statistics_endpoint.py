@@ -1,7 +1,10 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from ipv8.test.base import TestBase
 
+from tribler.core.database.profiler import QueryProfiler
+from tribler.core.executors import ExecutorPools
+from tribler.core.restapi.rest_endpoint import HTTP_NOT_FOUND
 from tribler.core.restapi.statistics_endpoint import StatisticsEndpoint
 from tribler.test_unit.base_restapi import MockRequest, response_to_json
 
@@ -30,6 +33,30 @@ class IPv8StatsRequest(MockRequest):
         super().__init__({}, "GET", "/statistics/ipv8")
 
 
+class QueryStatsRequest(MockRequest):
+    """
+    A MockRequest that mimics QueryStatsRequests.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new QueryStatsRequest.
+        """
+        super().__init__({}, "GET", "/statistics/queries")
+
+
+class ExecutorStatsRequest(MockRequest):
+    """
+    A MockRequest that mimics ExecutorStatsRequests.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new ExecutorStatsRequest.
+        """
+        super().__init__({}, "GET", "/statistics/executors")
+
+
 class TestStatisticsEndpoint(TestBase):
     """
     Tests for the StatisticsEndpoint class.
@@ -41,7 +68,7 @@ class TestStatisticsEndpoint(TestBase):
         """
         endpoint = StatisticsEndpoint()
 
-        response = endpoint.get_tribler_stats(TriblerStatsRequest())
+        response = await endpoint.get_tribler_stats(TriblerStatsRequest())
         response_body_json = await response_to_json(response)
 
         self.assertEqual({}, response_body_json["tribler_statistics"])
@@ -51,13 +78,21 @@ class TestStatisticsEndpoint(TestBase):
         Test if getting Tribler stats forwards MetadataStore statistics.
         """
         endpoint = StatisticsEndpoint()
-        endpoint.mds = Mock(get_db_file_size=Mock(return_value=42), get_num_torrents=Mock(return_value=7))
+        endpoint.mds = Mock(query_cache=Mock(hits=3, misses=5), tracker_cache=Mock(hits=11, misses=13),
+                            rejected_payloads_count=2, write_queue=Mock(get_stats=Mock(return_value={"transactions": 1})))
+        endpoint.async_db = Mock(get_db_file_size=AsyncMock(return_value=42), get_num_torrents=AsyncMock(return_value=7))
 
-        response = endpoint.get_tribler_stats(TriblerStatsRequest())
+        response = await endpoint.get_tribler_stats(TriblerStatsRequest())
         response_body_json = await response_to_json(response)
 
         self.assertEqual(42, response_body_json["tribler_statistics"]["db_size"])
         self.assertEqual(7, response_body_json["tribler_statistics"]["num_torrents"])
+        self.assertEqual(3, response_body_json["tribler_statistics"]["query_cache_hits"])
+        self.assertEqual(5, response_body_json["tribler_statistics"]["query_cache_misses"])
+        self.assertEqual(11, response_body_json["tribler_statistics"]["tracker_cache_hits"])
+        self.assertEqual(13, response_body_json["tribler_statistics"]["tracker_cache_misses"])
+        self.assertEqual(2, response_body_json["tribler_statistics"]["rejected_payloads"])
+        self.assertEqual({"transactions": 1}, response_body_json["tribler_statistics"]["write_queue"])
 
     async def test_get_ipv8_stats_no_ipv8(self) -> None:
         """
@@ -82,3 +117,54 @@ class TestStatisticsEndpoint(TestBase):
 
         self.assertEqual(42, response_body_json["ipv8_statistics"]["total_down"])
         self.assertEqual(7, response_body_json["ipv8_statistics"]["total_up"])
+
+    async def test_get_query_stats_no_profiler(self) -> None:
+        """
+        Test if getting query stats without query profiling leads to a not found status.
+        """
+        endpoint = StatisticsEndpoint()
+
+        response = await endpoint.get_query_stats(QueryStatsRequest())
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+
+    async def test_get_query_stats(self) -> None:
+        """
+        Test if getting query stats gives the slow queries and histograms of the profiler.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.query_profiler = QueryProfiler(threshold=0.1)
+        endpoint.query_profiler.add("metadata", "SELECT 1", 0.002)
+
+        response = await endpoint.get_query_stats(QueryStatsRequest())
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(0.1, response_body_json["threshold"])
+        self.assertEqual([], response_body_json["slow_queries"])
+        self.assertEqual("SELECT ?", response_body_json["histograms"][0]["shape"])
+        self.assertEqual(1, response_body_json["histograms"][0]["buckets"][1])
+
+    async def test_get_executor_stats_no_executors(self) -> None:
+        """
+        Test if getting executor stats without executor pools leads to a not found status.
+        """
+        endpoint = StatisticsEndpoint()
+
+        response = endpoint.get_executor_stats(ExecutorStatsRequest())
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+
+    async def test_get_executor_stats(self) -> None:
+        """
+        Test if getting executor stats gives the statistics of all pools.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.executors = ExecutorPools({"db_read": 2})
+
+        response = endpoint.get_executor_stats(ExecutorStatsRequest())
+        response_body_json = await response_to_json(response)
+        endpoint.executors.shutdown()
+
+        self.assertEqual(["db_read", "db_write", "disk_io", "crypto", "hashing"],
+                         [stats["name"] for stats in response_body_json["executors"]])
+        self.assertEqual(2, response_body_json["executors"][0]["max_workers"])
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+
+from ipv8.test.base import TestBase
+
+from tribler.core.executors import ExecutorPool, ExecutorPools, Priority, run_in_executor
+
+
+class TestExecutorPool(TestBase):
+    """
+    Tests for the ExecutorPool class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a pool with a single thread.
+        """
+        super().setUp()
+        self.pool = ExecutorPool("test", 1)
+
+    async def tearDown(self) -> None:
+        """
+        Stop the threads of the pool.
+        """
+        self.pool.shutdown(cancel_futures=True)
+        await super().tearDown()
+
+    def block(self) -> threading.Event:
+        """
+        Occupy the thread of the pool until the returned event is set.
+        """
+        started = threading.Event()
+        release = threading.Event()
+        self.pool.submit(lambda: started.set() or release.wait(5))
+        started.wait(5)
+        return release
+
+    def test_submit(self) -> None:
+        """
+        Test if a call is executed on a named thread of the pool.
+        """
+        future = self.pool.submit(lambda: threading.current_thread().name)
+
+        self.assertEqual("test_0", future.result(5))
+
+    def test_submit_exception(self) -> None:
+        """
+        Test if the exception of a call is set on its future.
+        """
+        future = self.pool.submit(lambda: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            future.result(5)
+
+    def test_priority(self) -> None:
+        """
+        Test if queued calls are started in the order of their priority, and in the order of submission otherwise.
+        """
+        order = []
+        release = self.block()
+        futures = [self.pool.submit_with_priority(Priority.BACKGROUND, order.append, "background"),
+                   self.pool.submit_with_priority(Priority.NORMAL, order.append, "normal 1"),
+                   self.pool.submit_with_priority(Priority.NORMAL, order.append, "normal 2"),
+                   self.pool.submit_with_priority(Priority.INTERACTIVE, order.append, "interactive")]
+        release.set()
+        for future in futures:
+            future.result(5)
+
+        self.assertEqual(["interactive", "normal 1", "normal 2", "background"], order)
+
+    def test_stats(self) -> None:
+        """
+        Test if the pool counts the queued and completed calls.
+        """
+        release = self.block()
+        future = self.pool.submit(int)
+        queued = self.pool.get_stats()
+        release.set()
+        future.result(5)
+        self.pool.shutdown()
+        stats = self.pool.get_stats()
+
+        self.assertEqual((1, 1, 1), (queued["queued"], queued["max_queued"], queued["running"]))
+        self.assertEqual((0, 0, 2, 1), (stats["queued"], stats["running"], stats["completed"], stats["threads"]))
+        self.assertGreater(stats["max_wait"], 0)
+
+    def test_max_workers(self) -> None:
+        """
+        Test if the pool does not start more threads than its maximum.
+        """
+        pool = ExecutorPool("test", 2)
+        futures = [pool.submit(threading.current_thread) for _ in range(10)]
+        threads = {future.result(5) for future in futures}
+        pool.shutdown()
+
+        self.assertLessEqual(len(threads), 2)
+
+    def test_shutdown_cancel(self) -> None:
+        """
+        Test if queued calls are cancelled and new calls are refused after a shutdown.
+        """
+        release = self.block()
+        future = self.pool.submit(int)
+        threading.Timer(0.1, release.set).start()
+        self.pool.shutdown(cancel_futures=True)
+
+        self.assertTrue(future.cancelled())
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(int)
+
+    def test_no_workers(self) -> None:
+        """
+        Test if a pool without threads cannot be created.
+        """
+        with self.assertRaises(ValueError):
+            ExecutorPool("test", 0)
+
+    async def test_run_in_executor(self) -> None:
+        """
+        Test if a call can be awaited on a pool and on the default executor.
+        """
+        self.assertEqual(3, await run_in_executor(self.pool, sum, [1, 2], priority=Priority.INTERACTIVE))
+        self.assertEqual(3, await run_in_executor(None, sum, [1, 2]))
+
+
+class TestExecutorPools(TestBase):
+    """
+    Tests for the ExecutorPools class.
+    """
+
+    def test_from_config(self) -> None:
+        """
+        Test if the pools get the sizes of the executors section of a config.
+        """
+        pools = ExecutorPools.from_config(lambda option: {"executors/hashing": 3}.get(option, 1))
+        pools.shutdown()
+
+        self.assertEqual(3, pools.get("hashing").max_workers)
+        self.assertEqual(1, pools.get("db_read").max_workers)
+
+    async def test_run(self) -> None:
+        """
+        Test if a call can be awaited on a named pool.
+        """
+        pools = ExecutorPools()
+
+        value = await pools.run("disk_io", threading.current_thread)
+        pools.shutdown()
+
+        self.assertTrue(value.name.startswith("disk_io_"))
@@ -86,3 +86,21 @@ class TestNotifier(TestBase):
 
         with self.assertRaises(TypeError):
             self.notifier.notify(Notification.tribler_new_version, version="test")
+
+    def test_notify_many(self) -> None:
+        """
+        Test if notifying of multiple events notifies of every event.
+        """
+        callback = Mock()
+        self.notifier.add(Notification.tribler_new_version, callback)
+
+        self.notifier.notify_many(Notification.tribler_new_version, [{"version": "1"}, {"version": "2"}])
+
+        self.assertEqual([call(version="1"), call(version="2")], callback.call_args_list)
+
+    def test_notify_many_wrong_args(self) -> None:
+        """
+        Test if notifying of multiple events with wrong args raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.notifier.notify_many(Notification.tribler_new_version, [{"version": "1"}, {"other": "2"}])
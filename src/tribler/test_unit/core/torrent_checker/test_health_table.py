@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.dataclasses import HealthInfo
+from tribler.core.torrent_checker.health_table import HealthTable
+
+
+class TestHealthTable(TestBase):
+    """
+    Tests for the HealthTable class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a table with a capacity of three torrents.
+        """
+        super().setUp()
+        self.table = HealthTable(capacity=3)
+
+    def test_add(self) -> None:
+        """
+        Test if the health of a torrent can be added and retrieved.
+        """
+        self.table.add(HealthInfo(b"\x01" * 20, seeders=7, leechers=42, last_check=1337, self_checked=True))
+
+        self.assertEqual(1, len(self.table))
+        self.assertIn(b"\x01" * 20, self.table)
+        self.assertEqual(HealthInfo(b"\x01" * 20, 7, 42, 1337, True), self.table.get(b"\x01" * 20))
+
+    def test_get_unknown(self) -> None:
+        """
+        Test if the health of an unknown torrent is None.
+        """
+        self.assertIsNone(self.table.get(b"\x01" * 20))
+
+    def test_replace(self) -> None:
+        """
+        Test if the health of a known torrent is replaced and ranked again.
+        """
+        self.table.add(HealthInfo(b"\x01" * 20, seeders=1))
+        self.table.add(HealthInfo(b"\x02" * 20, seeders=2))
+
+        self.table.add(HealthInfo(b"\x01" * 20, seeders=3))
+
+        self.assertEqual(2, len(self.table))
+        self.assertEqual([3, 2], [health.seeders for health in self.table.values()])
+
+    def test_remove(self) -> None:
+        """
+        Test if the health of a torrent can be removed and its slot is reused.
+        """
+        self.table.add(HealthInfo(b"\x01" * 20, seeders=1))
+        self.table.add(HealthInfo(b"\x02" * 20, seeders=2))
+
+        removed = self.table.remove(b"\x01" * 20)
+        self.table.add(HealthInfo(b"\x03" * 20, seeders=3))
+
+        self.assertEqual(1, removed.seeders)
+        self.assertIsNone(self.table.remove(b"\x01" * 20))
+        self.assertEqual([b"\x03" * 20, b"\x02" * 20], list(self.table))
+
+    def test_top(self) -> None:
+        """
+        Test if the torrents with the most seeders are returned first.
+        """
+        for seeders in [2, 0, 3]:
+            self.table.add(HealthInfo(bytes([seeders]) * 20, seeders=seeders))
+
+        self.assertEqual([3, 2], [health.seeders for health in self.table.top(2)])
+
+    def test_alive(self) -> None:
+        """
+        Test if only torrents with seeders are alive.
+        """
+        for seeders in [2, 0, 3]:
+            self.table.add(HealthInfo(bytes([seeders]) * 20, seeders=seeders, leechers=1))
+
+        self.assertEqual(2, self.table.count_alive())
+        self.assertEqual([3, 2], [health.seeders for health in self.table.alive()])
+
+    def test_sample_alive(self) -> None:
+        """
+        Test if a random sample only contains torrents with seeders.
+        """
+        for seeders in [2, 0, 3]:
+            self.table.add(HealthInfo(bytes([seeders]) * 20, seeders=seeders))
+
+        sample = self.table.sample_alive(5)
+
+        self.assertEqual({2, 3}, {health.seeders for health in sample})
+
+    def test_evict(self) -> None:
+        """
+        Test if the torrent with the fewest seeders is evicted when a healthier torrent is added to a full table.
+        """
+        for seeders in [2, 1, 3]:
+            self.table.add(HealthInfo(bytes([seeders]) * 20, seeders=seeders))
+
+        self.table.add(HealthInfo(b"\x04" * 20, seeders=4))
+
+        self.assertEqual(3, len(self.table))
+        self.assertNotIn(b"\x01" * 20, self.table)
+        self.assertEqual([4, 3, 2], [health.seeders for health in self.table.values()])
+
+    def test_evict_unhealthy(self) -> None:
+        """
+        Test if a torrent with fewer seeders than all torrents in a full table is not added.
+        """
+        for seeders in [2, 1, 3]:
+            self.table.add(HealthInfo(bytes([seeders]) * 20, seeders=seeders))
+
+        self.table.add(HealthInfo(b"\x00" * 20, seeders=0))
+
+        self.assertNotIn(b"\x00" * 20, self.table)
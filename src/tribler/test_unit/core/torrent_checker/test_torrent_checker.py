@@ -64,6 +64,10 @@ class TestTorrentChecker(TestBase):
         self.metadata_store.TorrentState.__class__.instances = []
         self.metadata_store.TrackerState.__class__.instances = []
         self.metadata_store.TorrentMetadata.__class__.instances = []
+        self.metadata_store.get_torrent_health = self.get_torrent_health
+        self.metadata_store.store_torrent_health = self.store_torrent_health
+        self.metadata_store.run_threaded_read = AsyncMock(side_effect=lambda func: func())
+        self.metadata_store.run_threaded = AsyncMock(side_effect=lambda func, *args: func(*args))
 
         self.tracker_manager = TrackerManager(state_dir=Path("."), metadata_store=self.metadata_store)
         self.torrent_checker = TorrentChecker(config=TriblerConfigManager(), tracker_manager=self.tracker_manager,
@@ -77,6 +81,22 @@ class TestTorrentChecker(TestBase):
         await self.torrent_checker.shutdown()
         await super().tearDown()
 
+    def get_torrent_health(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Get the health of a mocked torrent state.
+        """
+        torrent_state = self.metadata_store.TorrentState.get(infohash=infohash)
+        return torrent_state.to_health() if torrent_state else None
+
+    def store_torrent_health(self, health: HealthInfo) -> None:
+        """
+        Store the health of a mocked torrent state.
+        """
+        self.metadata_store.TorrentState.get(infohash=health.infohash).set(
+            seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
+            self_checked=health.self_checked
+        )
+
     async def test_create_socket_fail(self) -> None:
         """
         Test creation of the UDP socket of the torrent checker when it fails.
@@ -122,7 +142,7 @@ class TestTorrentChecker(TestBase):
         self.assertEqual(5, result.seeders)
         self.assertEqual(10, result.leechers)
 
-    def test_load_torrents_check_from_db_no_self_checked(self) -> None:
+    async def test_load_torrents_check_from_db_no_self_checked(self) -> None:
         """
         Test if the torrents_checked only considers self-checked torrents.
         """
@@ -132,10 +152,11 @@ class TestTorrentChecker(TestBase):
                                                                             last_check=int(time.time()),
                                                                             self_checked=False)
                                                            for _ in range(10)]
+        await self.torrent_checker.load_torrents_checked()
 
         self.assertEqual(0, len(self.torrent_checker.torrents_checked))
 
-    def test_load_torrents_check_from_db_only_fresh(self) -> None:
+    async def test_load_torrents_check_from_db_only_fresh(self) -> None:
         """
         Test if the torrents_checked only considers fresh torrents.
         """
@@ -145,10 +166,11 @@ class TestTorrentChecker(TestBase):
                                                                             last_check=0,
                                                                             self_checked=True)
                                                            for _ in range(10)]
+        await self.torrent_checker.load_torrents_checked()
 
         self.assertEqual(0, len(self.torrent_checker.torrents_checked))
 
-    def test_load_torrents_check_from_db_allow_fresh_self_checked(self) -> None:
+    async def test_load_torrents_check_from_db_allow_fresh_self_checked(self) -> None:
         """
         Test if the torrents_checked does consider fresh self-checked torrents.
         """
@@ -158,9 +180,28 @@ class TestTorrentChecker(TestBase):
                                                                             last_check=int(time.time()),
                                                                             self_checked=True)
                                                            for _ in range(10)]
+        await self.torrent_checker.load_torrents_checked()
 
         self.assertEqual(10, len(self.torrent_checker.torrents_checked))
 
+    async def test_load_torrents_checked_after_checks(self) -> None:
+        """
+        Test if the torrents that are checked before the checked torrents are loaded are kept up to date.
+        """
+        self.torrent_checker.mds.TorrentState.instances = [
+            MockTorrentState(infohash=bytes([i]) * 20, seeders=10, leechers=10, last_check=int(time.time()) - 3600,
+                             self_checked=True) for i in range(3)
+        ]
+        await self.torrent_checker.update_torrent_health(HealthInfo(b"\x00" * 20, 0, 0, int(time.time()), True))
+        await self.torrent_checker.update_torrent_health(HealthInfo(b"\x01" * 20, 20, 0, int(time.time()), True))
+        before_load = len(self.torrent_checker.torrents_checked)
+
+        await self.torrent_checker.load_torrents_checked()
+
+        self.assertEqual(1, before_load)
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20], list(self.torrent_checker.torrents_checked))
+        self.assertEqual(20, self.torrent_checker.torrents_checked.get(b"\x01" * 20).seeders)
+
     async def test_task_select_no_tracker(self) -> None:
         """
         Test if we are not checking a random tracker when there are no trackers in the database.
@@ -254,7 +295,7 @@ class TestTorrentChecker(TestBase):
 
         self.assertEqual("http://announce.torrentsmd.com:8080/announce", next_tracker.url)
 
-    def test_update_health(self) -> None:
+    async def test_update_health(self) -> None:
         """
         Test if torrent health can be updated.
         """
@@ -267,9 +308,10 @@ class TestTorrentChecker(TestBase):
         ts = MockTorrentState(infohash=b"\xee" * 20)
         self.torrent_checker.mds.TorrentState.instances = [ts]
 
-        updated = self.torrent_checker.update_torrent_health(health)
+        updated = await self.torrent_checker.update_torrent_health(health)
 
-        self.assertIsNotNone(updated)
+        self.assertTrue(updated)
+        self.metadata_store.run_threaded.assert_awaited_once()
         self.assertEqual(1, len(self.torrent_checker.torrents_checked))
         self.assertEqual(12, ts.leechers)
         self.assertEqual(13, ts.seeders)
@@ -297,29 +339,29 @@ class TestTorrentChecker(TestBase):
         for t in selected_torrents:
             self.assertIn(t.infohash, selection_range)
 
-    def test_update_torrent_health_invalid_health(self) -> None:
+    async def test_update_torrent_health_invalid_health(self) -> None:
         """
         Tests if invalid health is ignored in TorrentChecker.update_torrent_health().
         """
         health = HealthInfo(unhexlify('abcd0123'), last_check=int(time.time()) + TOLERABLE_TIME_DRIFT + 2)
 
-        self.assertFalse(self.torrent_checker.update_torrent_health(health))
+        self.assertFalse(await self.torrent_checker.update_torrent_health(health))
 
-    def test_update_torrent_health_not_self_checked(self) -> None:
+    async def test_update_torrent_health_not_self_checked(self) -> None:
         """
         Tests if non-self-checked health is ignored in TorrentChecker.update_torrent_health().
         """
         health = HealthInfo(unhexlify('abcd0123'))
 
-        self.assertFalse(self.torrent_checker.update_torrent_health(health))
+        self.assertFalse(await self.torrent_checker.update_torrent_health(health))
 
-    def test_update_torrent_health_unknown_torrent(self) -> None:
+    async def test_update_torrent_health_unknown_torrent(self) -> None:
         """
         Tests if unknown torrent's health is ignored in TorrentChecker.update_torrent_health().
         """
         health = HealthInfo(unhexlify('abcd0123'), 1, 2, self_checked=True)
 
-        self.assertFalse(self.torrent_checker.update_torrent_health(health))
+        self.assertFalse(await self.torrent_checker.update_torrent_health(health))
 
     async def test_update_torrent_health_no_replace(self) -> None:
         """
@@ -336,7 +378,7 @@ class TestTorrentChecker(TestBase):
 
         health = HealthInfo(unhexlify('abcd0123'), 1, 2, self_checked=True, last_check=now)
 
-        self.assertFalse(self.torrent_checker.update_torrent_health(health))
+        self.assertFalse(await self.torrent_checker.update_torrent_health(health))
 
         notified = mocked_handler.call_args.kwargs
         self.assertEqual(prev_health.infohash, unhexlify(notified["infohash"]))
@@ -67,6 +67,15 @@ class TestTrackerManager(TestBase):
 
         self.assertIsNone(self.tracker_manager.get_tracker_info("http://test1.com:80/announce"))
 
+    def test_remove_tracker_cached(self) -> None:
+        """
+        Test if a removed tracker is removed from the tracker cache.
+        """
+        self.tracker_manager.add_tracker("http://test1.com:80/announce")
+        self.tracker_manager.remove_tracker("http://test1.com:80/announce")
+
+        self.tracker_manager.tracker_cache.remove.assert_called_once_with("http://test1.com/announce")
+
     def test_update_tracker_info_non_existent(self) -> None:
         """
         Test if a non-existent tracker's info is not updated.
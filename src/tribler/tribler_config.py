@@ -61,6 +61,34 @@ class DatabaseConfig(TypedDict):
     """
 
     enabled: bool
+    wal_mode: bool
+    read_pool_size: int
+    mmap_size: int
+    cache_size: int
+    bulk_ingest: bool
+    debug_event_loop: bool
+    write_max_latency: float
+    write_batch_size: int
+    write_batch_weight: int
+    health_flush_interval: float
+    maintenance_interval: int
+    snapshot_path: str
+    slow_query_threshold: float
+    fts_contentless: bool
+    fts_tokenizer: str
+    fts_prefix: str
+
+
+class ExecutorsConfig(TypedDict):
+    """
+    Settings for the executor pools: the number of threads per kind of blocking work.
+    """
+
+    db_read: int
+    db_write: int
+    disk_io: int
+    crypto: int
+    hashing: int
 
 
 class VersioningConfig(TypedDict):
@@ -156,6 +184,7 @@ class TriblerConfig(TypedDict):
 
     content_discovery_community: ContentDiscoveryCommunityConfig
     database: DatabaseConfig
+    executors: ExecutorsConfig
     knowledge_community: KnowledgeCommunityConfig
     libtorrent: LibtorrentConfig
     recommender: RecommenderConfig
@@ -186,8 +215,15 @@ DEFAULT_CONFIG = {
     "statistics": False,
 
     "content_discovery_community": ContentDiscoveryCommunityConfig(enabled=True),
-    "database": DatabaseConfig(enabled=True),
+    "database": DatabaseConfig(enabled=True, wal_mode=False, read_pool_size=4, mmap_size=0, cache_size=-2000,
+                               bulk_ingest=False, debug_event_loop=False,
+                               write_max_latency=0.05, write_batch_size=100, write_batch_weight=10000,
+                               health_flush_interval=5.0,
+                               maintenance_interval=86400, snapshot_path="",
+                               slow_query_threshold=0.0, fts_contentless=False,
+                               fts_tokenizer="porter unicode61 remove_diacritics 1", fts_prefix="2 3 4 5"),
     "dht_discovery": DHTDiscoveryCommunityConfig(enabled=True),
+    "executors": ExecutorsConfig(db_read=4, db_write=1, disk_io=2, crypto=4, hashing=1),
     "knowledge_community": KnowledgeCommunityConfig(enabled=True),
     "libtorrent": LibtorrentConfig(
         socks_listen_ports=[0, 0, 0, 0, 0],